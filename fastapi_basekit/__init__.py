@@ -1,6 +1,6 @@
 from importlib.metadata import version, PackageNotFoundError
 
-__all__ = ["aio", "exceptions", "schema", "servicios"]
+__all__ = ["aio", "exceptions", "responses", "schema", "servicios"]
 
 try:
     __version__ = version("fastapi-basekit")
@@ -1 +1,8 @@
-__all__ = ["controller", "beanie", "sqlalchemy", "sqlmodel"]
+__all__ = [
+    "controller",
+    "cache",
+    "middleware",
+    "beanie",
+    "sqlalchemy",
+    "sqlmodel",
+]
@@ -17,21 +17,31 @@ class BeanieBaseController(BaseController):
     service: BaseService = Depends()
 
     async def list(self):
-        """Lista documentos con paginación usando Beanie."""
+        """Lista documentos con paginación usando Beanie.
+
+        Con el query param ``cursor`` (vacío = primera página) pagina por
+        keyset: ``pagination`` trae ``cursor``/``next_cursor`` en vez de
+        ``page``/``total``.
+        """
         await self.prepare_action("list")
         params = self._params()
-        items, total = await self.service.list(**params)
-        count = params.get("count") or 0
-        page = params.get("page") or 1
-
-        total_pages = (total + count - 1) // count if count > 0 else 0
-        pagination = {
-            "page": page,
-            "count": count,
-            "total": total,
-            "total_pages": total_pages,
-        }
-        return self.format_response(data=items, pagination=pagination)
+        cursor = params["filters"].pop("cursor", None)
+        if cursor is not None:
+            params["cursor"] = cursor
+
+        async def _load():
+            items, total = await self.service.list(**params)
+            if cursor is None:
+                pagination = self._pagination(params, total)
+            else:
+                pagination = {
+                    "count": params.get("count") or 0,
+                    "cursor": cursor or None,
+                    "next_cursor": total,
+                }
+            return self._render(data=items, pagination=pagination)
+
+        return await self._respond_list(params, _load)
 
     async def create(
         self,
@@ -1,13 +1,41 @@
+import asyncio
+import base64
+import binascii
 import logging
-from typing import Any, Dict, Generic, List, Optional, Type, TypeVar, Union
-from typing import get_args, get_origin
+from datetime import datetime
+from typing import (
+    AbstractSet,
+    Any,
+    Awaitable,
+    Dict,
+    FrozenSet,
+    Generic,
+    Iterable,
+    List,
+    Optional,
+    Type,
+    TypeVar,
+    Union,
+    get_args,
+)
 import re
 
-from bson import ObjectId
+from bson import ObjectId, json_util
 from pydantic import BaseModel
+from pymongo import ReturnDocument, UpdateOne
+from pymongo.errors import BulkWriteError, OperationFailure
 from beanie import Document, Link
+from beanie.odm.fields import ExpressionField
+from beanie.odm.utils.encoder import Encoder
 from beanie.odm.queries.find import FindMany
-from beanie.operators import Or, RegEx
+from beanie.odm.utils.parsing import save_state
+
+from ...cache.base import bump_generation
+from ...hydration import hydrator_for
+from .links import resolve_links
+from .metadata import model_metadata
+from .pipeline import ONE_TO_ONE_STAGES, one_to_one_tail, optimize_pipeline
+from .search import TEXT_SCORE, build_search_condition
 
 logger = logging.getLogger(__name__)
 
@@ -17,6 +45,50 @@ logger = logging.getLogger(__name__)
 #: tipado (autocompletado + mypy para consumidores e IAs).
 ModelT = TypeVar("ModelT", bound=Document)
 
+#: Estrategias de total de `BaseRepository.paginate`.
+TOTAL_STRATEGIES = ("exact", "estimated", "has_next", "none")
+
+#: Modos de conteo de `BaseRepository.paginate_pipeline`.
+PIPELINE_COUNT_MODES = ("facet", "split", "auto")
+
+#: Errores de Mongo por los que un ``$facet`` no entra en memoria o en un
+#: documento: BSONObjectTooLarge, tamaño del resultado de agregación, límite
+#: de memoria sin ``allowDiskUse`` y sort en memoria.
+_FACET_LIMIT_CODES = frozenset({10334, 16389, 292, 16819})
+
+
+class InvalidCursorError(ValueError):
+    """Cursor de keyset corrupto o emitido para otro orden."""
+
+
+def encode_cursor(field: str, value: Any, obj_id: Any) -> str:
+    """Cursor opaco (base64 url-safe) de la posición ``(field, _id)``.
+
+    Se serializa con ``bson.json_util`` para que ``datetime``/``ObjectId``
+    vuelvan con su tipo al decodificar.
+    """
+    raw = json_util.dumps({"f": field, "k": [value, obj_id]})
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, field: str) -> tuple[Any, Any]:
+    """``(value, _id)`` de un cursor de `encode_cursor`.
+
+    ``InvalidCursorError`` si está corrupto o se emitió para otro orden.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json_util.loads(base64.urlsafe_b64decode(padded))
+        value, obj_id = payload["k"]
+        cursor_field = payload["f"]
+    except (binascii.Error, ValueError, TypeError, KeyError) as exc:
+        raise InvalidCursorError("cursor inválido") from exc
+    if cursor_field != field:
+        raise InvalidCursorError(
+            f"cursor emitido para el orden '{cursor_field}', no '{field}'"
+        )
+    return value, obj_id
+
 
 class BaseRepository(Generic[ModelT]):
     """Repositorio base para Beanie ODM (MongoDB), parametrizado por el modelo.
@@ -26,6 +98,8 @@ class BaseRepository(Generic[ModelT]):
       - update:      `update(obj, data)` — el 1er arg es el **Document**, no el
                      id (SQL usa `update(id, dict)`). Fetch primero con
                      `get_by_id`, luego `update(obj, data)`.
+                     `update_fields(id, dict)` hace un ``$set`` parcial sin
+                     traerlo antes.
       - delete:      `delete(obj)` — recibe el Document (SQL usa `delete(id)`).
       - create:      `create(obj | dict)`.
     Listado: `build_list_queryset(...)`→FindMany + `paginate(...)`, o
@@ -35,6 +109,42 @@ class BaseRepository(Generic[ModelT]):
     """
 
     model: Type[ModelT]
+    #: Campo de versión/``updated_at`` usado como validador HTTP (ETag /
+    #: Last-Modified) en GET condicionales. None o ausente en el modelo = el
+    #: controller responde sin validadores.
+    validator_field: Optional[str] = "updated_at"
+    #: Modo de `search` (ver ``repository/search.py``): ``"substring"``,
+    #: ``"prefix"``, ``"text"`` o ``"trigram"``. El service puede pisarlo
+    #: por listado con su propio ``search_mode``.
+    search_mode: str = "substring"
+    #: Campo array con los trigramas del documento (modo ``"trigram"``).
+    search_trigram_field: str = "search_trigrams"
+    #: Profundidad de `resolve_links` para los campos sin entrada en
+    #: ``nesting_depths_per_field``.
+    link_max_depth: int = 3
+    #: Documentos por operación de `create_many`/`bulk_upsert`.
+    bulk_batch_size: int = 1000
+    #: Lecturas confiables: las páginas se arman con `hydrator_for`
+    #: (``model_construct`` + arreglos de tipo) en vez de validar cada fila.
+    trusted_reads: bool = False
+    #: En lecturas confiables, 1 de cada N filas se valida completa (0 =
+    #: ninguna); una fila inválida se descarta con aviso, como sin el modo.
+    trusted_sample_rate: int = 100
+
+    #: Etapas que cambian la forma del documento: tras ellas el campo validador
+    #: puede no existir, así que el pipeline no admite validador.
+    _RESHAPING_STAGES = frozenset(
+        {
+            "$project",
+            "$group",
+            "$replaceRoot",
+            "$replaceWith",
+            "$unset",
+            "$facet",
+            "$bucket",
+            "$bucketAuto",
+        }
+    )
 
     def _parse_order_field(self, order_by: str) -> tuple[str, int, bool]:
         """Parse order_by string into components.
@@ -62,52 +172,24 @@ class BaseRepository(Generic[ModelT]):
     
     def _get_collection_name_from_field(self, field_name: str) -> Optional[str]:
         """Get the collection name for a Link field.
-        
+
         Args:
             field_name: Name of the field in the model
-            
+
         Returns:
             Collection name or None if not a Link field
         """
-        if not hasattr(self.model, "model_fields"):
-            return None
-            
-        model_fields = self.model.model_fields
-        field_info = model_fields.get(field_name)
-        
-        if not field_info:
+        field = model_metadata(self.model).fields.get(field_name)
+        if field is None or field.kind != "link":
             return None
-        
-        field_type = field_info.annotation
-        origin = get_origin(field_type)
-        
-        # Handle Link[Model]
-        if origin is Link:
-            args = get_args(field_type)
-            if args:
-                linked_model = args[0]
-                if hasattr(linked_model, "Settings") and hasattr(linked_model.Settings, "name"):
-                    return linked_model.Settings.name
-        
-        # Handle Optional[Link[Model]]
-        if origin is Union:
-            args = get_args(field_type)
-            for arg in args:
-                arg_origin = get_origin(arg)
-                if arg_origin is Link:
-                    link_args = get_args(arg)
-                    if link_args:
-                        linked_model = link_args[0]
-                        if hasattr(linked_model, "Settings") and hasattr(linked_model.Settings, "name"):
-                            return linked_model.Settings.name
-        
-        return None
+        return field.collection
 
     def _get_query_kwargs(
         self,
         fetch_links: bool = False,
         nesting_depths_per_field: Optional[Dict[str, int]] = None,
         projection: Optional[Union[List[str], Type[BaseModel]]] = None,
+        max_time_ms: Optional[int] = None,
     ):
         kwargs = {
             "fetch_links": fetch_links,
@@ -117,64 +199,128 @@ class BaseRepository(Generic[ModelT]):
         }
         if projection is not None:
             kwargs["projection"] = projection
+        if max_time_ms:
+            kwargs.update(self._max_time_kwargs(fetch_links, max_time_ms))
         return kwargs
 
+    async def resolve_links(
+        self,
+        items: List[ModelT],
+        nesting_depths_per_field: Optional[Dict[str, int]] = None,
+        projections: Optional[Dict[str, Type[BaseModel]]] = None,
+        max_time_ms: Optional[int] = None,
+    ) -> List[ModelT]:
+        """Resuelve los ``Link`` de una página ya traída (sin
+        ``fetch_links``): una query ``$in`` por colección destino y nivel,
+        en vez de un ``$lookup`` por documento (ver `repository/links.py`).
+
+        ``nesting_depths_per_field`` como en ``fetch_links``; los campos sin
+        entrada usan ``link_max_depth``. ``projections``: modelo de
+        proyección por campo.
+        """
+        await resolve_links(
+            items,
+            self.link_max_depth,
+            nesting_depths_per_field,
+            projections,
+            max_time_ms,
+        )
+        return items
+
+    def needs_link_lookup(self, paths: List[str]) -> bool:
+        """True si algún path lee un campo del documento enlazado
+        (``author.name``): solo ``fetch_links`` (el ``$lookup``) lo resuelve.
+        El id del Link (``author.$id``, ``author.id``) no cuenta."""
+        link_fields = model_metadata(self.model).links
+        for path in paths:
+            head, _, rest = path.replace("__", ".").partition(".")
+            if head in link_fields and rest and rest not in (
+                "$id",
+                "id",
+                "_id",
+            ):
+                return True
+        return False
+
+    @staticmethod
+    def _max_time_kwargs(fetch_links: bool, max_time_ms: int) -> Dict[str, int]:
+        """Kwarg pymongo de ``maxTimeMS`` según cómo ejecuta Beanie la query.
+
+        Con ``fetch_links`` Beanie corre un ``aggregate`` (opción de comando
+        ``maxTimeMS``); sin links, un ``find`` de pymongo (``max_time_ms``).
+        """
+        if fetch_links:
+            return {"maxTimeMS": max_time_ms}
+        return {"max_time_ms": max_time_ms}
+
+    def _count_total(
+        self,
+        query: FindMany[Document],
+        total_strategy: str,
+        max_time_ms: Optional[int] = None,
+    ) -> Awaitable[int]:
+        """Conteo del ``query`` como awaitable independiente del FindMany.
+
+        El filtro (o el pipeline con links) se captura acá, antes de que
+        ``paginate`` le ponga skip/limit al query: el conteo corre en su propio
+        cursor, en paralelo con la página. Sin filtros y con
+        ``total_strategy="estimated"`` usa ``estimated_document_count`` (la
+        metadata de la colección, sin recorrer el índice).
+
+        ``FindMany.count()`` de Beanie no reenvía los kwargs pymongo en el
+        camino ``count_documents``, así que se llama a la colección directo.
+        """
+        collection = self.model.get_pymongo_collection()
+        options: Dict[str, Any] = (
+            {"maxTimeMS": max_time_ms} if max_time_ms else {}
+        )
+        filter_query = query.get_filter_query()
+        if total_strategy == "estimated" and not filter_query:
+            return collection.estimated_document_count(**options)
+        if not query.fetch_links:
+            return collection.count_documents(
+                filter_query, session=query.session, **options
+            )
+        stages = [
+            stage
+            for stage in query.build_aggregation_pipeline()
+            if not {"$sort", "$skip", "$limit"} & stage.keys()
+        ]
+        return self._aggregate_count(stages, query.session, options)
+
+    async def _aggregate_count(
+        self,
+        stages: List[Dict[str, Any]],
+        session: Any,
+        options: Dict[str, Any],
+    ) -> int:
+        cursor = await self.model.get_pymongo_collection().aggregate(
+            stages + [{"$count": "total"}], session=session, **options
+        )
+        rows = await cursor.to_list(length=1)
+        return rows[0]["total"] if rows else 0
+
     def build_filter_query(
         self,
         search: Optional[str],
         search_fields: List[str],
         filters: dict = None,
         order_by: Optional[List[tuple]] = None,
+        search_mode: Optional[str] = None,
         **kwargs,
     ) -> FindMany[Document]:
-        """Versión personalizada que soporta campos Link."""
-        exprs = []
+        """Versión personalizada que soporta campos Link.
 
-        if search and search_fields:
-            exprs.append(
-                Or(
-                    *[
-                        RegEx(
-                            getattr(self.model, f),
-                            f".*{search}.*",
-                            options="i",
-                        )
-                        for f in search_fields
-                    ]
-                )
-            )
-
-        # Obtener campos del modelo
-        model_fields = (
-            self.model.model_fields
-            if hasattr(self.model, "model_fields")
-            else {}
+        ``search_mode`` None = ``self.search_mode``. En modo ``"text"`` sin
+        ``order_by`` ordena por relevancia (``textScore``).
+        """
+        exprs = []
+        search_mode = search_mode or self.search_mode
+        search_condition = self._search_condition(
+            search, search_fields, search_mode
         )
 
-        def _is_link_field(field_name: str) -> bool:
-            """Verifica si un campo es de tipo Link."""
-            field_info = model_fields.get(field_name)
-            if not field_info:
-                return False
-
-            field_type = field_info.annotation
-            origin = get_origin(field_type)
-
-            # Caso directo: Link[Model]
-            if origin is Link:
-                return True
-
-            # Caso Optional[Link[Model]] = Union[Link[Model], None]
-            # O cualquier Union que contenga Link
-            if origin is not None:
-                args = get_args(field_type)
-                for arg in args:
-                    # Verificar si el argumento es Link
-                    arg_origin = get_origin(arg)
-                    if arg_origin is Link:
-                        return True
-
-            return False
+        meta = model_metadata(self.model)
 
         raw_filters: Dict[str, Any] = {}
 
@@ -189,6 +335,24 @@ class BaseRepository(Generic[ModelT]):
                     return value
             return value
 
+        def _match(path: str, value: Any) -> Dict[str, Any]:
+            """Igualdad, o ``$in`` si el filtro es una lista (clave repetida
+            en la query string: ``status=a&status=b``)."""
+            if isinstance(value, (list, tuple, set)):
+                return {path: {"$in": list(value)}}
+            return {path: value}
+
+        def _match_link(path: str, value: Any) -> Dict[str, Any]:
+            """Sobre el id del Link como ``ExpressionField`` (``<link>.id``,
+            igual que ``Model.link.id``): Beanie lo traduce a ``<link>.$id``,
+            o a ``<link>._id`` con ``fetch_links`` (el ``$match`` corre
+            después del ``$lookup``, sobre el documento ya unido)."""
+            if isinstance(value, (list, tuple, set)):
+                value = [_coerce_objectid(v) for v in value]
+            else:
+                value = _coerce_objectid(value)
+            return _match(ExpressionField(f"{path}.id"), value)
+
         for k, v in (filters or {}).items():
             # MongoDB-style keys (dot-notation like "user.$id" or operators like "$or")
             # cannot be resolved via hasattr — pass them as a raw dict to find()
@@ -196,25 +360,17 @@ class BaseRepository(Generic[ModelT]):
                 raw_filters[k] = v
                 continue
 
-            if hasattr(self.model, k):
-                field_attr = getattr(self.model, k)
-                if _is_link_field(k):
-                    exprs.append(field_attr.id == _coerce_objectid(v))
+            # Nombre de campo, o alias `<field>_id` de un Link field
+            # (`customer_id`, `user_id`…): el caller no necesita conocer la
+            # sintaxis Mongo nested.
+            field = meta.resolve(k)
+            if field is not None:
+                if field.is_link:
+                    exprs.append(_match_link(field.alias, v))
                 else:
-                    exprs.append(field_attr == v)
+                    exprs.append(_match(field.alias, v))
                 continue
 
-            # `<field>_id` alias para Link fields. Permite filtros con
-            # `customer_id`, `user_id`, etc. sin que el caller deba conocer
-            # la sintaxis Mongo nested. Sólo se activa si <field> existe en
-            # el modelo y es un Link[X].
-            if k.endswith("_id"):
-                base = k[:-3]
-                if hasattr(self.model, base) and _is_link_field(base):
-                    field_attr = getattr(self.model, base)
-                    exprs.append(field_attr.id == _coerce_objectid(v))
-                    continue
-
             # Clave no resoluble (typo, campo inexistente, nesting mal escrito).
             # Se descarta — pero se AVISA: si la clave venía de `get_filters`
             # (scoping por tenant/owner), su desaparición silenciosa deja el
@@ -230,17 +386,119 @@ class BaseRepository(Generic[ModelT]):
 
         # Raw MongoDB filters go first so Beanie processes them as a dict condition
         query_args: list = ([raw_filters] if raw_filters else []) + exprs
+        if search_condition:
+            query_args.append(search_condition)
         query = self.model.find(*query_args, **self._get_query_kwargs(**kwargs))
         
         # Apply ordering if provided
         if order_by:
             query = query.sort(order_by)
+        elif search_condition and search_mode == "text":
+            query = query.sort(("score", TEXT_SCORE))
         
         return query
 
+    def _search_condition(
+        self,
+        search: Optional[str],
+        search_fields: Optional[List[str]],
+        search_mode: str,
+    ) -> Optional[Dict[str, Any]]:
+        """Condición de `search` (dict Mongo) según el modo."""
+        return build_search_condition(
+            search,
+            search_fields or [],
+            mode=search_mode,
+            trigram_field=self.search_trigram_field,
+        )
+
+    def _validator_group(self) -> Optional[Dict[str, Any]]:
+        field = self.validator_field
+        if not field or field not in getattr(self.model, "model_fields", {}):
+            return None
+        return {
+            "$group": {
+                "_id": None,
+                "max": {"$max": f"${field}"},
+                "count": {"$sum": 1},
+            }
+        }
+
+    async def list_validator(
+        self, query: Union[FindMany[Document], List[Dict[str, Any]]]
+    ) -> Optional[tuple[Any, int]]:
+        """``(max(validator_field), count)`` del conjunto filtrado en un único
+        ``$group`` (sin traer documentos). Acepta el FindMany de
+        `build_list_queryset` o el pipeline de `build_list_pipeline` (se le
+        quitan sort/skip/limit). None si no hay campo validador o el pipeline
+        reforma los documentos."""
+        group = self._validator_group()
+        if group is None:
+            return None
+        if isinstance(query, list):
+            stages = []
+            for stage in query:
+                if self._RESHAPING_STAGES & stage.keys():
+                    return None
+                if not {"$sort", "$skip", "$limit"} & stage.keys():
+                    stages.append(stage)
+            rows = await self.model.aggregate(stages + [group]).to_list()
+        else:
+            rows = await query.aggregate([group]).to_list()
+        if not rows:
+            return None, 0
+        return rows[0]["max"], int(rows[0]["count"])
+
+    async def get_validator(
+        self, obj_id: Union[str, ObjectId]
+    ) -> Optional[Any]:
+        """Valor de `validator_field` de un documento sin traerlo completo
+        (None si no hay campo validador o el documento no existe)."""
+        if not isinstance(obj_id, ObjectId):
+            obj_id = ObjectId(obj_id)
+        result = await self.list_validator(
+            self.model.find(self.model.id == obj_id)
+        )
+        if not result or not result[1]:
+            return None
+        return result[0]
+
+    def _trusted_for(self, query: FindMany[Document]) -> bool:
+        """Si la página de ``query`` puede armarse con `hydrator_for`: solo
+        para el propio modelo, sin herencia (el ``_class_id`` elige la
+        subclase), sin ``lazy_parse`` ni cache de Beanie."""
+        model = self.model
+        return (
+            self.trusted_reads
+            and query.get_projection_model() is model
+            and not query.lazy_parse
+            and not getattr(model, "_inheritance_inited", False)
+            and not model.get_settings().use_cache
+        )
+
+    def _hydrate(self, row: Dict[str, Any]) -> Any:
+        item = hydrator_for(self.model).hydrate(row, self.trusted_sample_rate)
+        save_state(item)
+        return item
+
+    async def _fetch(self, query: FindMany[Document]) -> List[Any]:
+        """``query.to_list()``, o las filas crudas hidratadas sin validar
+        si `trusted_reads` aplica (ver `_trusted_for`)."""
+        if not self._trusted_for(query):
+            return await query.to_list()
+        cursor = await query.get_cursor()
+        rows = await cursor.to_list(length=None)
+        return self._validate_rows(rows)
+
     async def paginate(
-        self, query: FindMany[Document], page: int, count: int, order_by: Optional[List[tuple]] = None
-    ) -> tuple[List[Document], int]:
+        self,
+        query: FindMany[Document],
+        page: int,
+        count: int,
+        order_by: Optional[List[tuple]] = None,
+        max_time_ms: Optional[int] = None,
+        total_strategy: str = "estimated",
+    ) -> tuple[List[Document], Optional[int]]:
         """MOTOR DE PAGINACIÓN (FindMany) — NO LO REIMPLEMENTES.
 
         Único loop de paginación offset (count + skip/limit). Para personalizar
@@ -251,14 +509,52 @@ class BaseRepository(Generic[ModelT]):
         - orden por defecto            → `Service.get_order`
         - enriquecer items de la página→ `Service.post_process_list`
         - scroll infinito / cursor     → `paginate_keyset` (método+endpoint aparte)
+
+        El conteo y la página van en paralelo (``asyncio.gather``, cursores
+        separados). ``total_strategy`` (ver `TOTAL_STRATEGIES`):
+
+        - ``"exact"``: ``count_documents`` del filtro.
+        - ``"estimated"`` (default): sin filtros, ``estimated_document_count``
+          (metadata de la colección); con filtros, exacto.
+        - ``"has_next"``: sin conteo; trae ``count + 1`` y el total es una
+          cota: ``skip + len(items)``, +1 si hay página siguiente.
+        - ``"none"``: sin conteo; el total es None.
+
+        ``max_time_ms`` aplica ``maxTimeMS`` al conteo y a la página: Mongo
+        aborta la operación en el servidor (``ExecutionTimeout``).
         """
+        if total_strategy not in TOTAL_STRATEGIES:
+            raise ValueError(
+                f"total_strategy inválido: {total_strategy!r} "
+                f"(opciones: {', '.join(TOTAL_STRATEGIES)})"
+            )
         # Apply ordering if provided and not already applied
         if order_by:
             query = query.sort(order_by)
 
-        total = await query.count()
-        items = await query.skip(count * (page - 1)).limit(count).to_list()
-        return items, total
+        counting = total_strategy in ("exact", "estimated")
+        total_aw = (
+            self._count_total(query, total_strategy, max_time_ms)
+            if counting
+            else None
+        )
+        if max_time_ms:
+            query.pymongo_kwargs.update(
+                self._max_time_kwargs(query.fetch_links, max_time_ms)
+            )
+        skip = count * (page - 1)
+        limit = count + 1 if total_strategy == "has_next" else count
+        page_aw = self._fetch(query.skip(skip).limit(limit))
+
+        if total_aw is not None:
+            items, total = await asyncio.gather(page_aw, total_aw)
+            return items, total
+        items = await page_aw
+        if total_strategy == "none":
+            return items, None
+        more = len(items) > count
+        items = items[:count]
+        return items, skip + len(items) + (1 if more else 0)
 
     async def paginate_keyset(
         self,
@@ -288,16 +584,119 @@ class BaseRepository(Generic[ModelT]):
         Returns:
             (items, has_more). El caller deriva el próximo cursor del último
             item devuelto (`getattr(items[-1], cursor_field)`).
+
+        Con un ``cursor_field`` no único los empates en el borde de página se
+        pierden: para eso está `paginate_cursor` (desempata por ``_id``).
         """
         limit = max(1, int(limit))
         op = "$gt" if ascending else "$lt"
         if cursor_value is not None:
             query = query.find({cursor_field: {op: cursor_value}})
         query = query.sort((cursor_field, 1 if ascending else -1))
-        docs = await query.limit(limit + 1).to_list()
+        docs = await self._fetch(query.limit(limit + 1))
         has_more = len(docs) > limit
         return docs[:limit], has_more
 
+    @staticmethod
+    def _keyset_match(
+        field: str, direction: int, value: Any, obj_id: Any
+    ) -> Dict[str, Any]:
+        """Rango estrictamente posterior a ``(value, _id)`` en el orden
+        ``(field, _id)``: los empates en ``field`` los desempata ``_id``.
+
+        Mongo ordena null (o ausente) antes que cualquier valor, pero
+        ``$gt``/``$lt`` nunca matchean null: con un cursor null en orden
+        ascendente siguen todos los no-null, y en descendente los null van
+        al final y hay que incluirlos explícitamente."""
+        op = "$gt" if direction == 1 else "$lt"
+        if field == "_id":
+            return {"_id": {op: obj_id}}
+        tie = {field: value, "_id": {op: obj_id}}
+        if value is None:
+            if direction == 1:
+                return {"$or": [{field: {"$ne": None}}, tie]}
+            return tie
+        after = [{field: {op: value}}, tie]
+        if direction != 1:
+            after.append({field: None})
+        return {"$or": after}
+
+    @staticmethod
+    def _cursor_value(item: Any, path: str) -> Any:
+        """Valor de ``path`` (dot-notation Mongo) en un Document o un dict."""
+        value = item
+        for part in path.split("."):
+            if isinstance(value, dict):
+                value = value.get(part)
+            else:
+                value = getattr(value, "id" if part == "_id" else part, None)
+            if value is None:
+                return None
+        return value
+
+    def _next_cursor(
+        self, items: List[Any], field: str, more: bool
+    ) -> Optional[str]:
+        if not more or not items:
+            return None
+        last = items[-1]
+        return encode_cursor(
+            field,
+            self._cursor_value(last, field),
+            self._cursor_value(last, "_id"),
+        )
+
+    async def paginate_cursor(
+        self,
+        query: FindMany[Document],
+        limit: int,
+        order_by: Optional[str] = None,
+        cursor: Optional[str] = None,
+        max_time_ms: Optional[int] = None,
+    ) -> tuple[List[Document], Optional[str]]:
+        """Keyset compuesto ``(order_by, _id)`` con cursor opaco.
+
+        A diferencia de `paginate_keyset`, el orden se desempata por ``_id``:
+        con un campo no único (``created_at``) los documentos empatados en el
+        borde de la página no se saltean ni se repiten.
+
+        Args:
+            query: FindMany ya filtrado y SIN orden (lo pone este método).
+            limit: tamaño de página.
+            order_by: ``"-created_at"``/``"name"``; None = ``_id`` ascendente.
+            cursor: ``next_cursor`` de la página previa; None = primera.
+            max_time_ms: ``maxTimeMS`` de la consulta.
+
+        Returns:
+            (items, next_cursor). ``next_cursor`` es None en la última página.
+
+        Raises:
+            InvalidCursorError: cursor corrupto o emitido para otro
+                ``order_by``.
+        """
+        limit = max(1, int(limit))
+        field, direction, _ = self._parse_order_field(order_by or "_id")
+        if field == "id":
+            field = "_id"
+        if cursor:
+            value, obj_id = decode_cursor(cursor, field)
+            query = query.find(
+                self._keyset_match(field, direction, value, obj_id)
+            )
+        sort = [(field, direction)]
+        if field != "_id":
+            sort.append(("_id", direction))
+        query.sort_expressions = []  # p. ej. el `textScore` del modo "text"
+        query = query.sort(sort)
+        if max_time_ms:
+            query.pymongo_kwargs.update(
+                self._max_time_kwargs(query.fetch_links, max_time_ms)
+            )
+        docs = await self._fetch(query.limit(limit + 1))
+        more = len(docs) > limit
+        docs = docs[:limit]
+        return docs, self._next_cursor(docs, field, more)
+
     def build_list_queryset(
         self,
         search: Optional[str] = None,
@@ -326,6 +725,7 @@ class BaseRepository(Generic[ModelT]):
         search: Optional[str],
         search_fields: Optional[List[str]],
         filters: Optional[dict],
+        search_mode: Optional[str] = None,
     ) -> Dict[str, Any]:
         """Build a `$match` stage dict (without the `$match` wrapper)."""
         match_conditions: Dict[str, Any] = {}
@@ -338,21 +738,16 @@ class BaseRepository(Generic[ModelT]):
                 else:
                     match_conditions[key] = value
 
-        if search and search_fields:
-            search_conditions = [
-                {field: {"$regex": f".*{search}.*", "$options": "i"}}
-                for field in search_fields
-            ]
-            if search_conditions:
-                if match_conditions:
-                    match_conditions = {
-                        "$and": [
-                            match_conditions,
-                            {"$or": search_conditions},
-                        ]
-                    }
-                else:
-                    match_conditions = {"$or": search_conditions}
+        search_condition = self._search_condition(
+            search, search_fields, search_mode or self.search_mode
+        )
+        if search_condition:
+            if match_conditions:
+                match_conditions = {
+                    "$and": [match_conditions, search_condition]
+                }
+            else:
+                match_conditions = search_condition
         return match_conditions
 
     def build_list_pipeline(
@@ -361,6 +756,7 @@ class BaseRepository(Generic[ModelT]):
         search_fields: Optional[List[str]] = None,
         filters: Optional[dict] = None,
         order_by: Optional[str] = None,
+        search_mode: Optional[str] = None,
         **kwargs,
     ) -> List[Dict[str, Any]]:
         """Hook: returns the aggregation pipeline used by `list` endpoints.
@@ -372,12 +768,17 @@ class BaseRepository(Generic[ModelT]):
         stage is appended later by `paginate_pipeline`.
         """
         pipeline: List[Dict[str, Any]] = []
+        search_mode = search_mode or self.search_mode
 
-        match_conditions = self._build_match_stage(search, search_fields, filters)
+        match_conditions = self._build_match_stage(
+            search, search_fields, filters, search_mode
+        )
         if match_conditions:
             pipeline.append({"$match": match_conditions})
 
         if not order_by:
+            if search and search_mode == "text":
+                pipeline.append({"$sort": {"score": TEXT_SCORE}})
             return pipeline
 
         field_path, direction, is_nested = self._parse_order_field(order_by)
@@ -417,13 +818,45 @@ class BaseRepository(Generic[ModelT]):
         pipeline.append({"$sort": {sort_field: direction}})
         return pipeline
 
+    def optimize_list_pipeline(
+        self, pipeline: List[Dict[str, Any]], validate: bool = True
+    ) -> List[Dict[str, Any]]:
+        """Reordena ``pipeline`` sin cambiar su resultado (ver
+        `repository/pipeline.py`): ``$match`` antes de los ``$lookup``,
+        ``$lookup`` uno-a-uno después del ``$sort`` que no los usa (la página
+        se corta antes del join) y ``$lookup`` recortados a los campos que se
+        leen.
+
+        Con ``validate`` las filas se validan contra el modelo: solo sus
+        campos importan en la salida y un ``$lookup`` que solo sirve para
+        ordenar se reduce al campo de orden (sub-pipeline ``$project``,
+        MongoDB 5.0+).
+        """
+        output_fields = None
+        if validate:
+            output_fields = set()
+            for name, field in model_metadata(self.model).fields.items():
+                output_fields.update({name, field.alias})
+        return optimize_pipeline(
+            pipeline, output_fields, self._scalar_paths()
+        )
+
+    def _scalar_paths(self) -> FrozenSet[str]:
+        """``localField`` del modelo que no son arrays: solo un ``$lookup``
+        + ``$unwind`` sobre uno de ellos es uno-a-uno."""
+        return model_metadata(self.model).scalar_paths
+
     async def paginate_pipeline(
         self,
         pipeline: List[Dict[str, Any]],
         page: int,
         count: int,
         validate: bool = True,
-    ) -> tuple[List[Any], int]:
+        max_time_ms: Optional[int] = None,
+        count_mode: str = "facet",
+        total_strategy: str = "estimated",
+        optimized: bool = False,
+    ) -> tuple[List[Any], Optional[int]]:
         """MOTOR DE PAGINACIÓN (aggregation `$facet`) — NO LO REIMPLEMENTES.
 
         Ejecuta el pipeline con paginación `$facet`. Para un listado agregado
@@ -438,35 +871,205 @@ class BaseRepository(Generic[ModelT]):
             validate: If True, validates each row against `self.model`.
                 Set False when the pipeline projects a non-model shape (e.g.
                 joined columns) — the raw dicts are returned untouched.
+            max_time_ms: `maxTimeMS` for the aggregation (server-side abort).
+            count_mode: ``"facet"`` (default) cuenta y pagina en un solo
+                ``$facet``, que materializa todo el conjunto filtrado en un
+                documento. ``"split"`` corre en paralelo el pipeline de datos
+                (``$skip``/``$limit`` lo antes posible, ver `_page_pipeline`)
+                y un pipeline de conteo reducido (`_count_pipeline`).
+                ``"auto"`` usa ``$facet`` y cae a ``"split"`` si Mongo lo
+                rechaza por memoria/tamaño.
+            total_strategy: conteo del modo split, como en `paginate`
+                (``"has_next"``/``"none"`` implican split sin conteo).
+            optimized: el pipeline pasó por `optimize_list_pipeline`; en el
+                ``$facet`` las etapas finales uno-a-uno van después de
+                ``$skip``/``$limit`` (solo corren para la página).
         """
-        full_pipeline = list(pipeline) + [
+        if count_mode not in PIPELINE_COUNT_MODES:
+            raise ValueError(
+                f"count_mode inválido: {count_mode!r} "
+                f"(opciones: {', '.join(PIPELINE_COUNT_MODES)})"
+            )
+        if total_strategy not in TOTAL_STRATEGIES:
+            raise ValueError(
+                f"total_strategy inválido: {total_strategy!r} "
+                f"(opciones: {', '.join(TOTAL_STRATEGIES)})"
+            )
+        aggregate_kwargs = {"maxTimeMS": max_time_ms} if max_time_ms else {}
+        split = count_mode == "split" or total_strategy in ("has_next", "none")
+        if split:
+            items_raw, total = await self._paginate_split(
+                pipeline, page, count, total_strategy, aggregate_kwargs
+            )
+        else:
+            try:
+                items_raw, total = await self._paginate_facet(
+                    pipeline, page, count, aggregate_kwargs, optimized
+                )
+            except OperationFailure as exc:
+                if count_mode != "auto" or not self._exceeds_facet_limits(
+                    exc
+                ):
+                    raise
+                logger.warning(
+                    "paginate_pipeline: $facet excede los límites de Mongo "
+                    "en %s (%s); se pagina con conteo separado",
+                    getattr(self.model, "__name__", self.model),
+                    exc,
+                )
+                items_raw, total = await self._paginate_split(
+                    pipeline, page, count, total_strategy, aggregate_kwargs
+                )
+
+        if not validate:
+            return items_raw, total
+        return self._validate_rows(items_raw, total), total
+
+    @staticmethod
+    def _exceeds_facet_limits(exc: OperationFailure) -> bool:
+        if exc.code in _FACET_LIMIT_CODES:
+            return True
+        message = str(exc).lower()
+        return "memory limit" in message or "too large" in message
+
+    async def _paginate_facet(
+        self,
+        pipeline: List[Dict[str, Any]],
+        page: int,
+        count: int,
+        aggregate_kwargs: Dict[str, Any],
+        optimized: bool = False,
+    ) -> tuple[List[Dict[str, Any]], int]:
+        # Optimizado: las etapas finales uno-a-uno van dentro de `data`,
+        # después de `$skip`/`$limit`, y corren solo para la página.
+        at = (
+            one_to_one_tail(pipeline, self._scalar_paths())
+            if optimized
+            else len(pipeline)
+        )
+        full_pipeline = list(pipeline[:at]) + [
             {
                 "$facet": {
                     "metadata": [{"$count": "total"}],
                     "data": [
                         {"$skip": count * (page - 1)},
                         {"$limit": count},
+                        *pipeline[at:],
                     ],
                 }
             }
         ]
-
-        results = await self.model.aggregate(full_pipeline).to_list()
+        results = await self.model.aggregate(
+            full_pipeline, **aggregate_kwargs
+        ).to_list()
         if not results or not results[0].get("metadata"):
             return [], 0
 
         data = results[0]
         total = data["metadata"][0]["total"] if data["metadata"] else 0
-        items_raw = data["data"]
+        return data["data"], total
 
-        if not validate:
-            return items_raw, total
+    @staticmethod
+    def _page_pipeline(
+        pipeline: List[Dict[str, Any]],
+        skip: int,
+        limit: int,
+        scalar_fields: Optional[AbstractSet[str]] = None,
+    ) -> List[Dict[str, Any]]:
+        """El pipeline con ``$skip``/``$limit`` antes de las etapas finales
+        uno-a-uno (``$lookup``, ``$project``…): esas corren solo para los
+        documentos de la página. Un ``$lookup`` + ``$unwind`` solo cuenta
+        si su ``localField`` está en ``scalar_fields``."""
+        at = one_to_one_tail(pipeline, scalar_fields)
+        page_stages = [{"$skip": skip}] if skip else []
+        page_stages.append({"$limit": limit})
+        return list(pipeline[:at]) + page_stages + list(pipeline[at:])
+
+    @staticmethod
+    def _count_pipeline(
+        pipeline: List[Dict[str, Any]],
+    ) -> List[Dict[str, Any]]:
+        """Pipeline mínimo para contar el conjunto de ``pipeline``.
+
+        Se corta después del último ``$match`` si lo que sigue no cambia la
+        cantidad de documentos, y se quitan los ``$sort`` (salvo que un
+        ``$skip``/``$limit`` dependa del orden).
+        """
+        last_match = max(
+            (i for i, stage in enumerate(pipeline) if "$match" in stage),
+            default=-1,
+        )
+        tail = pipeline[last_match + 1 :]
+        if all(
+            next(iter(stage)) in ONE_TO_ONE_STAGES | {"$sort"}
+            for stage in tail
+        ):
+            stages = list(pipeline[: last_match + 1])
+        else:
+            stages = list(pipeline)
+        if any("$skip" in stage or "$limit" in stage for stage in stages):
+            return stages
+        return [stage for stage in stages if "$sort" not in stage]
 
+    async def _paginate_split(
+        self,
+        pipeline: List[Dict[str, Any]],
+        page: int,
+        count: int,
+        total_strategy: str,
+        aggregate_kwargs: Dict[str, Any],
+    ) -> tuple[List[Dict[str, Any]], Optional[int]]:
+        skip = count * (page - 1)
+        limit = count + 1 if total_strategy == "has_next" else count
+        rows_aw = self.model.aggregate(
+            self._page_pipeline(pipeline, skip, limit, self._scalar_paths()),
+            **aggregate_kwargs,
+        ).to_list()
+        if total_strategy in ("exact", "estimated"):
+            rows, total = await asyncio.gather(
+                rows_aw,
+                self._pipeline_total(
+                    pipeline, total_strategy, aggregate_kwargs
+                ),
+            )
+            return rows, total
+        rows = await rows_aw
+        if total_strategy == "none":
+            return rows, None
+        more = len(rows) > count
+        rows = rows[:count]
+        return rows, skip + len(rows) + (1 if more else 0)
+
+    async def _pipeline_total(
+        self,
+        pipeline: List[Dict[str, Any]],
+        total_strategy: str,
+        aggregate_kwargs: Dict[str, Any],
+    ) -> int:
+        stages = self._count_pipeline(pipeline)
+        if not stages and total_strategy == "estimated":
+            collection = self.model.get_pymongo_collection()
+            return await collection.estimated_document_count(
+                **aggregate_kwargs
+            )
+        rows = await self.model.aggregate(
+            stages + [{"$count": "total"}], **aggregate_kwargs
+        ).to_list()
+        return rows[0]["total"] if rows else 0
+
+    def _validate_rows(
+        self, items_raw: List[Dict[str, Any]], total: Optional[int] = None
+    ) -> List[Any]:
+        """Valida las filas crudas del pipeline contra ``self.model`` (con
+        `trusted_reads`, las hidrata y valida solo la muestra)."""
+        parse = (
+            self._hydrate if self.trusted_reads else self.model.model_validate
+        )
         items: List[Any] = []
         dropped = 0
         for raw_item in items_raw:
             try:
-                items.append(self.model.model_validate(raw_item))
+                items.append(parse(raw_item))
             except Exception as exc:
                 # No tragar en silencio: una fila que no valida se pierde de la
                 # respuesta sin aviso (menos items que el limit, total inflado).
@@ -482,13 +1085,68 @@ class BaseRepository(Generic[ModelT]):
         if dropped:
             logger.warning(
                 "paginate_pipeline: %d/%d filas descartadas en %s "
-                "(total reportado=%d)",
+                "(total reportado=%s)",
                 dropped,
                 len(items_raw),
                 getattr(self.model, "__name__", self.model),
                 total,
             )
-        return items, total
+        return items
+
+    async def paginate_pipeline_cursor(
+        self,
+        pipeline: List[Dict[str, Any]],
+        limit: int,
+        cursor: Optional[str] = None,
+        validate: bool = True,
+        max_time_ms: Optional[int] = None,
+    ) -> tuple[List[Any], Optional[str]]:
+        """`paginate_cursor` para el camino de agregación.
+
+        El orden es el del último ``$sort`` del pipeline (su primera clave),
+        al que se agrega ``_id`` como desempate; sin ``$sort``, ``_id``
+        ascendente. El ``$match`` del rango se inyecta justo antes de ese
+        ``$sort`` (después de los ``$lookup`` que producen el campo de orden)
+        y se trae ``limit + 1`` en vez de un ``$facet``. Un orden no
+        comparable (``textScore``) se reemplaza por ``_id``.
+        """
+        limit = max(1, int(limit))
+        stages = list(pipeline)
+        sort_at = next(
+            (
+                i
+                for i in range(len(stages) - 1, -1, -1)
+                if "$sort" in stages[i]
+            ),
+            None,
+        )
+        sort_spec = (
+            dict(stages[sort_at]["$sort"]) if sort_at is not None else {}
+        )
+        if not sort_spec or next(iter(sort_spec.values())) not in (1, -1):
+            # Sin orden, o uno no comparable (`textScore`): `_id`.
+            stages.append({"$sort": {"_id": 1}})
+            sort_at = len(stages) - 1
+            sort_spec = {"_id": 1}
+        field, direction = next(iter(sort_spec.items()))
+        sort_spec.setdefault("_id", direction)
+        stages[sort_at] = {"$sort": sort_spec}
+        if cursor:
+            value, obj_id = decode_cursor(cursor, field)
+            match = self._keyset_match(field, direction, value, obj_id)
+            stages.insert(sort_at, {"$match": match})
+        stages = self._page_pipeline(
+            stages, 0, limit + 1, self._scalar_paths()
+        )
+
+        aggregate_kwargs = {"maxTimeMS": max_time_ms} if max_time_ms else {}
+        rows = await self.model.aggregate(stages, **aggregate_kwargs).to_list()
+        more = len(rows) > limit
+        rows = rows[:limit]
+        next_cursor = self._next_cursor(rows, field, more)
+        if not validate:
+            return rows, next_cursor
+        return self._validate_rows(rows), next_cursor
 
     async def list_with_aggregation(
         self,
@@ -579,6 +1237,7 @@ class BaseRepository(Generic[ModelT]):
         if isinstance(obj, dict):
             obj = self.model(**obj)
         await obj.insert()
+        bump_generation(self.model)
         return obj
 
     async def update(self, obj: ModelT, data: Dict[str, Any]) -> ModelT:
@@ -591,7 +1250,279 @@ class BaseRepository(Generic[ModelT]):
         for key, value in data.items():
             setattr(obj, key, value)
         await obj.save()
+        bump_generation(self.model)
         return obj
 
+    def _set_document(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """``data`` validado campo a campo contra ``self.model`` (tipos,
+        constraints y ``field_validator``) y codificado para Mongo: el
+        documento del ``$set`` de `update_fields`."""
+        validator = self.model.__pydantic_validator__
+        draft = self.model.model_construct()
+        encoder = Encoder(
+            to_db=True, custom_encoders=self.model.get_settings().bson_encoders
+        )
+        fields = model_metadata(self.model).fields
+        changes: Dict[str, Any] = {}
+        for key, value in data.items():
+            validator.validate_assignment(draft, key, value)
+            value = getattr(draft, key)
+            field = fields.get(key)
+            if field is not None and field.is_link:
+                value = (
+                    [self._link_ref(v) for v in value]
+                    if isinstance(value, list)
+                    else self._link_ref(value)
+                )
+            else:
+                value = encoder.encode(value)
+            changes[field.alias if field else key] = value
+        return changes
+
+    def _update_document(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Update de `update_fields`/`update_by_filters`: el ``$set`` de
+        ``data`` (ver `_set_document`) y, si ``data`` no lo trae, el
+        `validator_field` avanzado en el servidor (``$currentDate`` para un
+        datetime, ``$inc`` para un entero). Estas escrituras no corren los
+        hooks de Beanie que lo mantienen: sin esto el ETag/Last-Modified no
+        cambiaría y un GET condicional respondería 304 con datos viejos."""
+        changes = self._set_document(data)
+        update: Dict[str, Any] = {"$set": changes}
+        field = self.validator_field
+        info = getattr(self.model, "model_fields", {}).get(field or "")
+        if info is None:
+            return update
+        alias = info.alias or field
+        if field in data or alias in changes:
+            return update
+        types = {info.annotation, *get_args(info.annotation)}
+        if datetime in types:
+            update["$currentDate"] = {alias: True}
+        elif int in types:
+            update["$inc"] = {alias: 1}
+        return update
+
+    @staticmethod
+    def _link_ref(value: Any) -> Any:
+        """DBRef de un Link o Document (None queda None)."""
+        if isinstance(value, Document):
+            return value.to_ref()
+        if isinstance(value, Link):
+            return value.ref
+        return value
+
+    async def update_fields(
+        self,
+        obj_id: Union[str, ObjectId],
+        data: Dict[str, Any],
+        filters: Optional[Dict[str, Any]] = None,
+    ) -> Optional[ModelT]:
+        """Actualización parcial en un round trip, sin traer el documento.
+
+        ``find_one_and_update({_id, **filters}, {$set: data},
+        return_document=AFTER)``: solo viajan los campos de ``data``
+        (validados contra el modelo, ver `_set_document`) y escritores
+        concurrentes sobre otros campos no se pisan. Devuelve el Document
+        validado, o None si no hay documento con ese id (y ``filters``, p.
+        ej. el scoping del tenant). ``filters`` se resuelve como en
+        `update_by_filters` (alias ``<link>_id``, ObjectId); una clave no
+        resoluble es ValueError, no un scope ignorado.
+
+        A diferencia de `update`, no corre los event hooks de Beanie
+        (``before_event(Save)``…) ni resuelve Links; el `validator_field` sí
+        avanza (ver `_update_document`).
+        """
+        if not isinstance(obj_id, ObjectId):
+            obj_id = ObjectId(obj_id)
+        collection = self.model.get_pymongo_collection()
+        query: Dict[str, Any] = {"_id": obj_id}
+        if filters:
+            query = {"$and": [query, self._bulk_filter(filters)]}
+        if not data:
+            raw = await collection.find_one(query)
+        else:
+            raw = await collection.find_one_and_update(
+                query,
+                self._update_document(data),
+                return_document=ReturnDocument.AFTER,
+            )
+            bump_generation(self.model)
+        if raw is None:
+            return None
+        return self.model.model_validate(raw)
+
     async def delete(self, obj: ModelT) -> None:
         await obj.delete()
+        bump_generation(self.model)
+
+    def _batches(
+        self, items: List[Any], batch_size: Optional[int]
+    ) -> Iterable[tuple[int, List[Any]]]:
+        size = max(1, int(batch_size or self.bulk_batch_size))
+        for start in range(0, len(items), size):
+            yield start, items[start : start + size]
+
+    def _resolves_filter_key(self, key: str) -> bool:
+        """True si `build_filter_query` usa ``key`` (no la descarta)."""
+        if "." in key or key.startswith("$"):
+            return True
+        return model_metadata(self.model).resolve(key) is not None
+
+    def _bulk_filter(self, filters: Dict[str, Any]) -> Dict[str, Any]:
+        """Filtro Mongo de ``filters`` resuelto como en `build_filter_query`
+        (alias ``<link>_id``, ObjectId, listas → ``$in``).
+
+        En una escritura masiva una clave descartada ampliaría el conjunto
+        afectado: claves no resolubles o un filtro vacío → ValueError.
+        """
+        unresolved = [k for k in filters if not self._resolves_filter_key(k)]
+        if unresolved:
+            raise ValueError(
+                f"filtros no resolubles en "
+                f"{getattr(self.model, '__name__', self.model)}: "
+                f"{', '.join(unresolved)}"
+            )
+        query = self.build_filter_query(None, [], filters).get_filter_query()
+        if not query:
+            raise ValueError(
+                "escritura masiva sin filtros: afectaría toda la colección"
+            )
+        return query
+
+    @staticmethod
+    def _raise_bulk_errors(
+        errors: List[Dict[str, Any]], details: Dict[str, Any]
+    ) -> None:
+        if errors:
+            raise BulkWriteError({**details, "writeErrors": errors})
+
+    async def create_many(
+        self,
+        objs: List[Union[ModelT, Dict[str, Any]]],
+        batch_size: Optional[int] = None,
+    ) -> int:
+        """Inserta ``objs`` con ``insert_many(ordered=False)`` en lotes de
+        ``batch_size`` (default `bulk_batch_size`). Devuelve la cantidad
+        insertada.
+
+        Un documento que falla (clave duplicada…) no frena al resto: al
+        final se lanza ``BulkWriteError`` con ``nInserted`` y los
+        ``writeErrors`` de todos los lotes (``index`` sobre ``objs``).
+        """
+        docs = [self.model(**o) if isinstance(o, dict) else o for o in objs]
+        inserted = 0
+        errors: List[Dict[str, Any]] = []
+        for start, batch in self._batches(docs, batch_size):
+            try:
+                result = await self.model.insert_many(batch, ordered=False)
+                inserted += len(result.inserted_ids)
+            except BulkWriteError as exc:
+                inserted += exc.details.get("nInserted", 0)
+                errors.extend(
+                    {**error, "index": error["index"] + start}
+                    for error in exc.details.get("writeErrors", [])
+                )
+        if inserted:
+            bump_generation(self.model)
+        self._raise_bulk_errors(errors, {"nInserted": inserted})
+        return inserted
+
+    async def update_by_filters(
+        self, filters: Dict[str, Any], data: Dict[str, Any]
+    ) -> int:
+        """``update_many`` con ``$set`` de ``data`` (validado y con el
+        `validator_field` avanzado como en `update_fields`) sobre los
+        documentos de ``filters``. Devuelve la cantidad modificada.
+
+        Como `delete_by_filters` y `bulk_upsert`, solo invalida los listados
+        cacheados (`bump_generation`): no conoce los ids afectados, así que
+        el cache de `retrieve` (``cache_ttl`` del servicio) los sigue
+        sirviendo hasta su TTL salvo que se invaliden con
+        ``service.invalidate_cache(id)``."""
+        query = self._bulk_filter(filters)
+        result = await self.model.get_pymongo_collection().update_many(
+            query, self._update_document(data)
+        )
+        if result.modified_count:
+            bump_generation(self.model)
+        return result.modified_count
+
+    async def delete_by_filters(self, filters: Dict[str, Any]) -> int:
+        """``delete_many`` de los documentos de ``filters``. Devuelve la
+        cantidad borrada. No invalida el cache de `retrieve` (ver
+        `update_by_filters`)."""
+        query = self._bulk_filter(filters)
+        result = await self.model.get_pymongo_collection().delete_many(query)
+        if result.deleted_count:
+            bump_generation(self.model)
+        return result.deleted_count
+
+    async def bulk_upsert(
+        self,
+        objs: List[Union[ModelT, Dict[str, Any]]],
+        key_fields: List[str],
+        batch_size: Optional[int] = None,
+    ) -> Dict[str, int]:
+        """Upsert por ``key_fields`` con ``bulk_write(ordered=False)`` en
+        lotes: cada documento (validado contra el modelo) reemplaza los
+        campos del existente con la misma clave, o se inserta.
+
+        Devuelve ``{"inserted", "matched", "modified"}``. Los errores se
+        acumulan como en `create_many`. Un documento sin valor (o None) en
+        alguna de ``key_fields`` es ValueError antes de escribir: su filtro
+        coincidiría con documentos arbitrarios. No invalida el cache de
+        `retrieve` (ver `update_by_filters`).
+        """
+        if not key_fields:
+            raise ValueError("bulk_upsert requiere key_fields")
+        encoder = Encoder(
+            to_db=True, custom_encoders=self.model.get_settings().bson_encoders
+        )
+        fields = model_metadata(self.model).fields
+        keys = [fields[k].alias if k in fields else k for k in key_fields]
+        operations = []
+        for index, obj in enumerate(objs):
+            doc = self.model(**obj) if isinstance(obj, dict) else obj
+            data = encoder.encode(doc)
+            missing = [k for k in keys if data.get(k) is None]
+            if missing:
+                raise ValueError(
+                    f"bulk_upsert: objs[{index}] sin valor para "
+                    f"{', '.join(missing)}"
+                )
+            obj_id = data.pop("_id", None)
+            update: Dict[str, Any] = {"$set": data}
+            if obj_id is not None:
+                update["$setOnInsert"] = {"_id": obj_id}
+            operations.append(
+                UpdateOne({k: data.get(k) for k in keys}, update, upsert=True)
+            )
+
+        counts = {"inserted": 0, "matched": 0, "modified": 0}
+        errors: List[Dict[str, Any]] = []
+        collection = self.model.get_pymongo_collection()
+        for start, batch in self._batches(operations, batch_size):
+            try:
+                result = await collection.bulk_write(batch, ordered=False)
+                counts["inserted"] += result.upserted_count
+                counts["matched"] += result.matched_count
+                counts["modified"] += result.modified_count
+            except BulkWriteError as exc:
+                counts["inserted"] += exc.details.get("nUpserted", 0)
+                counts["matched"] += exc.details.get("nMatched", 0)
+                counts["modified"] += exc.details.get("nModified", 0)
+                errors.extend(
+                    {**error, "index": error["index"] + start}
+                    for error in exc.details.get("writeErrors", [])
+                )
+        if counts["inserted"] or counts["modified"]:
+            bump_generation(self.model)
+        self._raise_bulk_errors(
+            errors,
+            {
+                "nUpserted": counts["inserted"],
+                "nMatched": counts["matched"],
+                "nModified": counts["modified"],
+            },
+        )
+        return counts
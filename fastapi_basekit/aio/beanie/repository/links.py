@@ -0,0 +1,148 @@
+"""Resolución de ``Link[...]`` por página (`resolve_links`).
+
+``fetch_links=True`` hace que Beanie resuelva cada Link con un ``$lookup``
+por documento dentro de la query. `resolve_links` lo hace después de traer
+la página: junta los ids de cada colección destino, trae cada colección con
+UNA query ``{_id: {$in: ids}}`` (con proyección opcional) y reemplaza cada
+``Link`` por su documento. Los niveles anidados se resuelven igual, un
+nivel por vuelta, hasta la profundidad pedida.
+
+Profundidad (como Beanie): ``nesting_depths_per_field={"author": 1}``
+resuelve ``author`` pero no los Links del autor; ``0`` no lo resuelve.
+Un Link cuyo documento ya no existe queda como ``Link``.
+"""
+
+import asyncio
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple, Type
+
+from beanie import Link
+from beanie.odm.fields import LinkTypes
+from beanie.operators import In
+from pydantic import BaseModel
+
+#: Links "hacia adelante" (el documento guarda el DBRef). Los BackLink se
+#: siguen resolviendo con ``fetch_links``.
+FORWARD_LINK_TYPES = frozenset(
+    {
+        LinkTypes.DIRECT,
+        LinkTypes.OPTIONAL_DIRECT,
+        LinkTypes.LIST,
+        LinkTypes.OPTIONAL_LIST,
+    }
+)
+
+_Key = Tuple[Type[Any], Optional[Type[BaseModel]]]
+
+
+def _link_ids(value: Any) -> List[Any]:
+    values = value if isinstance(value, list) else [value]
+    return [v.ref.id for v in values if isinstance(v, Link)]
+
+
+def _stitch(value: Any, fetched: Dict[Any, Any]) -> Any:
+    def one(link: Any) -> Any:
+        if isinstance(link, Link):
+            return fetched.get(link.ref.id, link)
+        return link
+
+    if isinstance(value, list):
+        return [one(v) for v in value]
+    return one(value)
+
+
+async def resolve_links(
+    items: Sequence[Any],
+    default_depth: int,
+    nesting_depths_per_field: Optional[Dict[str, int]] = None,
+    projections: Optional[Dict[str, Type[BaseModel]]] = None,
+    max_time_ms: Optional[int] = None,
+) -> Sequence[Any]:
+    """Resuelve los Links de ``items`` en el lugar y devuelve ``items``.
+
+    Args:
+        default_depth: profundidad de los campos que no están en
+            ``nesting_depths_per_field``.
+        nesting_depths_per_field: profundidad por campo de primer nivel.
+        projections: modelo de proyección por campo de primer nivel (debe
+            incluir ``id``). Un campo proyectado no resuelve sus Links.
+        max_time_ms: ``maxTimeMS`` de cada query.
+    """
+    per_field = nesting_depths_per_field or {}
+    projections = projections or {}
+    level = [
+        (
+            item,
+            {
+                name: per_field.get(name, default_depth)
+                for name in (type(item).get_link_fields() or {})
+            },
+            True,
+        )
+        for item in items
+    ]
+    find_kwargs = {"max_time_ms": max_time_ms} if max_time_ms else {}
+
+    while level:
+        wanted: Dict[_Key, Set[Any]] = {}
+        slots = []
+        for doc, depths, top in level:
+            infos = type(doc).get_link_fields() or {}
+            for name, depth in depths.items():
+                info = infos.get(name)
+                if (
+                    info is None
+                    or depth <= 0
+                    or not info.is_fetchable
+                    or info.link_type not in FORWARD_LINK_TYPES
+                ):
+                    continue
+                value = getattr(doc, name, None)
+                ids = _link_ids(value)
+                if not ids:
+                    continue
+                key = (
+                    info.document_class,
+                    projections.get(name) if top else None,
+                )
+                wanted.setdefault(key, set()).update(ids)
+                slots.append((doc, name, value, depth, key))
+        if not slots:
+            break
+
+        keys = list(wanted)
+        results = await asyncio.gather(
+            *(
+                key[0]
+                .find(
+                    In("_id", list(wanted[key])),
+                    projection_model=key[1],
+                    with_children=True,
+                    **find_kwargs,
+                )
+                .to_list()
+                for key in keys
+            )
+        )
+        fetched = {
+            key: {getattr(doc, "id", None): doc for doc in docs}
+            for key, docs in zip(keys, results)
+        }
+
+        next_level: Dict[int, Tuple[Any, Dict[str, int]]] = {}
+        for doc, name, value, depth, key in slots:
+            setattr(doc, name, _stitch(value, fetched[key]))
+            if depth <= 1 or key[1] is not None:
+                continue
+            for linked in _link_ids(value):
+                child = fetched[key].get(linked)
+                if child is None:
+                    continue
+                _, depths = next_level.setdefault(id(child), (child, {}))
+                for child_name in type(child).get_link_fields() or {}:
+                    depths[child_name] = max(
+                        depths.get(child_name, 0), depth - 1
+                    )
+        level = [
+            (child, depths, False) for child, depths in next_level.values()
+        ]
+    return items
@@ -0,0 +1,140 @@
+"""Metadata de campos por modelo Beanie (`model_metadata`).
+
+Se calcula una vez por clase (primer uso) a partir de ``model_fields``: tipo
+de campo, modelo destino y colección de los ``Link``, alias Mongo, si el
+valor es escalar (no un array) y los alias ``<link>_id`` de los filtros.
+Así resolver un filtro o un orden anidado es una búsqueda en dicts, sin
+``hasattr``/``get_origin`` por request, y una clave desconocida se detecta
+sin reflexión.
+"""
+
+import types
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Dict, FrozenSet, Optional, Tuple, Type, Union
+from typing import get_args, get_origin
+
+from beanie import BackLink, Link
+
+#: Tipos de campo de `FieldMeta.kind`.
+FIELD_KINDS = ("field", "link", "link_list", "back_link")
+
+_UNION_TYPES = (Union, types.UnionType)
+_ARRAY_TYPES = (list, set, frozenset, tuple)
+
+
+@dataclass(frozen=True)
+class FieldMeta:
+    """Un campo del modelo."""
+
+    name: str
+    #: Nombre del campo en Mongo (``id`` → ``_id``).
+    alias: str
+    kind: str = "field"
+    #: Document destino de un Link / BackLink.
+    target: Optional[Type[Any]] = None
+    #: Colección destino (``Settings.name`` del destino) de un Link.
+    collection: Optional[str] = None
+    #: El valor guardado no es un array (``List[...]``, ``Set[...]``…).
+    scalar: bool = True
+
+    @property
+    def is_link(self) -> bool:
+        return self.kind in ("link", "link_list")
+
+
+@dataclass(frozen=True)
+class ModelMeta:
+    """Índice de campos de un modelo."""
+
+    fields: Dict[str, FieldMeta] = field(default_factory=dict)
+    #: ``"<link>_id"`` → nombre del campo Link.
+    link_id_aliases: Dict[str, str] = field(default_factory=dict)
+
+    def resolve(self, key: str) -> Optional[FieldMeta]:
+        """Campo de una clave de filtro (nombre o alias ``<link>_id``), o
+        None si no resuelve a ningún campo."""
+        meta = self.fields.get(key)
+        if meta is not None:
+            return meta
+        link = self.link_id_aliases.get(key)
+        return self.fields[link] if link else None
+
+    @property
+    def links(self) -> Dict[str, FieldMeta]:
+        return {n: f for n, f in self.fields.items() if f.is_link}
+
+    @property
+    def scalar_paths(self) -> FrozenSet[str]:
+        """Paths Mongo que nunca son arrays: campos escalares y el ``$id``
+        de los ``Link`` simples (``localField`` de sus ``$lookup``)."""
+        paths = set()
+        for meta in self.fields.values():
+            if meta.kind == "field" and meta.scalar:
+                paths.add(meta.alias)
+            elif meta.kind == "link":
+                paths.add(f"{meta.alias}.$id")
+        return frozenset(paths)
+
+
+def _link_target(annotation: Any) -> Tuple[str, Optional[Type[Any]]]:
+    """``(kind, destino)`` de una anotación: ``Link[X]``,
+    ``Optional[Link[X]]``, ``List[Link[X]]``, ``BackLink[X]``…"""
+    origin = get_origin(annotation)
+    if origin is Link:
+        return "link", get_args(annotation)[0]
+    if origin is BackLink:
+        return "back_link", get_args(annotation)[0]
+    if origin in _UNION_TYPES:
+        for arg in get_args(annotation):
+            kind, target = _link_target(arg)
+            if target is not None:
+                return kind, target
+        return "field", None
+    if origin is not None:
+        for arg in get_args(annotation):
+            arg_origin = get_origin(arg)
+            if arg_origin is Link:
+                return "link_list", get_args(arg)[0]
+            if arg_origin is BackLink:
+                return "back_link", get_args(arg)[0]
+    return "field", None
+
+
+def _is_scalar(annotation: Any) -> bool:
+    """False si la anotación admite un array (o no se sabe: ``Any``)."""
+    if annotation is Any:
+        return False
+    origin = get_origin(annotation)
+    if origin in _UNION_TYPES:
+        return all(_is_scalar(arg) for arg in get_args(annotation))
+    return (origin or annotation) not in _ARRAY_TYPES
+
+
+def _collection(target: Optional[Type[Any]]) -> Optional[str]:
+    settings = getattr(target, "Settings", None)
+    return getattr(settings, "name", None)
+
+
+@lru_cache(maxsize=None)
+def model_metadata(model: Type[Any]) -> ModelMeta:
+    """`ModelMeta` de ``model`` (cacheado por clase)."""
+    fields: Dict[str, FieldMeta] = {}
+    aliases: Dict[str, str] = {}
+    for name, info in getattr(model, "model_fields", {}).items():
+        kind, target = _link_target(info.annotation)
+        fields[name] = FieldMeta(
+            name=name,
+            alias=info.alias or name,
+            kind=kind,
+            target=target,
+            collection=_collection(target) if kind != "field" else None,
+            scalar=kind == "link"
+            or (kind == "field" and _is_scalar(info.annotation)),
+        )
+        if kind in ("link", "link_list"):
+            aliases[f"{name}_id"] = name
+    return ModelMeta(
+        fields=fields,
+        link_id_aliases={k: v for k, v in aliases.items() if k not in fields},
+    )
@@ -0,0 +1,341 @@
+"""Optimizador del pipeline de listado (`optimize_pipeline`).
+
+Reordena un pipeline de agregación sin cambiar su resultado, para que Mongo
+haga el trabajo caro (``$lookup``) sobre la menor cantidad de documentos:
+
+1. ``$match`` lo antes posible: sube por encima de ``$lookup``, ``$unwind``,
+   ``$addFields``/``$set`` y ``$sort`` que no producen los campos que filtra.
+2. ``$lookup`` lo más tarde posible: un ``$lookup`` uno-a-uno (sin
+   ``$unwind``, o con ``$unwind`` que preserva vacíos sobre ``_id`` desde un
+   ``localField`` escalar) baja por debajo de los
+   ``$match``/``$sort``/``$skip``/``$limit`` que no lo usan.
+   Con un orden sobre campos base, la paginación (``$skip``/``$limit``) queda
+   antes del join y solo se unen los documentos de la página.
+3. ``$lookup`` con solo los campos necesarios: si del documento unido solo
+   se usan algunos subcampos, se le agrega un sub-pipeline ``$project`` con
+   ellos (sintaxis ``localField`` + ``pipeline``, MongoDB 5.0+); si no se usa
+   nada, el ``$lookup`` se elimina.
+
+"Se usa" incluye la salida del pipeline: ``output_fields`` son los campos
+que el caller necesita en cada fila (None = todos, el ``$lookup`` nunca se
+recorta si su campo llega a la salida).
+
+``scalar_fields`` son los ``localField`` que se sabe que NO son arrays (ver
+`ModelMeta.scalar_paths`). Sobre un array (``List[Link]``, lista de ids) el
+``$lookup`` trae varios documentos y su ``$unwind`` multiplica las filas:
+solo un ``localField`` de ``scalar_fields`` hace uno-a-uno al bloque
+``$lookup`` + ``$unwind``; sin ``scalar_fields`` ninguno lo es.
+"""
+
+from typing import AbstractSet, Any, Dict, Iterable, List, Optional, Set
+
+Stage = Dict[str, Any]
+
+#: Etapas que emiten exactamente un documento por documento de entrada: no
+#: cambian el conteo y pueden ir después de ``$skip``/``$limit``.
+ONE_TO_ONE_STAGES = frozenset(
+    {"$lookup", "$project", "$addFields", "$set", "$unset"}
+)
+#: Etapas que ``$match`` puede cruzar hacia arriba si no producen sus campos.
+_MATCH_CROSSABLE = frozenset(
+    {"$lookup", "$unwind", "$addFields", "$set", "$sort"}
+)
+#: Etapas que un ``$lookup`` uno-a-uno puede cruzar hacia abajo.
+_LOOKUP_CROSSABLE = frozenset({"$match", "$sort", "$skip", "$limit"})
+#: Etapas que definen la forma de la salida: lo que no referencian se pierde.
+_RESHAPING = frozenset(
+    {
+        "$group",
+        "$replaceRoot",
+        "$replaceWith",
+        "$count",
+        "$facet",
+        "$bucket",
+        "$bucketAuto",
+        "$sortByCount",
+    }
+)
+
+
+def _op(stage: Stage) -> str:
+    return next(iter(stage))
+
+
+def _conflict(a: str, b: str) -> bool:
+    """True si un path contiene al otro (``a`` y ``a.b``)."""
+    return a == b or a.startswith(b + ".") or b.startswith(a + ".")
+
+
+def _expression_paths(value: Any) -> Optional[Set[str]]:
+    """Campos (``"$campo"``) de una expresión; None = todo el documento
+    (``$$ROOT``/``$$CURRENT``)."""
+    paths: Set[str] = set()
+    pending = [value]
+    while pending:
+        item = pending.pop()
+        if isinstance(item, str):
+            if item.startswith("$$"):
+                if item[2:].split(".")[0] in ("ROOT", "CURRENT"):
+                    return None
+            elif item.startswith("$"):
+                paths.add(item[1:])
+        elif isinstance(item, dict):
+            pending.extend(item.values())
+        elif isinstance(item, (list, tuple)):
+            pending.extend(item)
+    return paths
+
+
+def _query_paths(query: Dict[str, Any]) -> Optional[Set[str]]:
+    """Campos que filtra un ``$match``; None = no se puede saber."""
+    paths: Set[str] = set()
+    for key, value in query.items():
+        if key in ("$and", "$or", "$nor"):
+            for sub in value:
+                sub_paths = _query_paths(sub)
+                if sub_paths is None:
+                    return None
+                paths |= sub_paths
+        elif key == "$expr":
+            sub_paths = _expression_paths(value)
+            if sub_paths is None:
+                return None
+            paths |= sub_paths
+        elif key == "$comment":
+            continue
+        elif key.startswith("$"):  # $text, $where…
+            return None
+        else:
+            paths.add(key)
+    return paths
+
+
+def _is_exclusion(spec: Dict[str, Any]) -> bool:
+    values = [v for k, v in spec.items() if k != "_id"]
+    return bool(values) and all(v in (0, False) for v in values)
+
+
+def stage_paths(stage: Stage) -> Optional[Set[str]]:
+    """Campos que lee una etapa; None = potencialmente todos."""
+    op = _op(stage)
+    spec = stage[op]
+    if op == "$match":
+        return _query_paths(spec)
+    if op == "$sort":
+        return set(spec)
+    if op in ("$skip", "$limit", "$sample", "$count", "$unset"):
+        return set()
+    if op == "$unwind":
+        path = spec if isinstance(spec, str) else spec["path"]
+        return {path[1:]}
+    if op == "$lookup":
+        paths = {spec["localField"]} if "localField" in spec else set()
+        let_paths = _expression_paths(spec.get("let", {}))
+        return None if let_paths is None else paths | let_paths
+    if op == "$project":
+        if _is_exclusion(spec):
+            return set()
+        paths = set()
+        for key, value in spec.items():
+            if value in (1, True):
+                paths.add(key)
+                continue
+            value_paths = _expression_paths(value)
+            if value_paths is None:
+                return None
+            paths |= value_paths
+        return paths
+    return _expression_paths(spec)
+
+
+def _produced(stage: Stage) -> Set[str]:
+    op = _op(stage)
+    spec = stage[op]
+    if op == "$lookup":
+        return {spec["as"]}
+    if op == "$unwind":
+        if isinstance(spec, str):
+            return {spec[1:]}
+        produced = {spec["path"][1:]}
+        if spec.get("includeArrayIndex"):
+            produced.add(spec["includeArrayIndex"])
+        return produced
+    if op in ("$addFields", "$set"):
+        return set(spec)
+    return set()
+
+
+def _touches(paths: Optional[Set[str]], field: str) -> bool:
+    return paths is None or any(_conflict(path, field) for path in paths)
+
+
+def hoist_matches(stages: List[Stage]) -> List[Stage]:
+    """Sube cada ``$match`` por encima de las etapas que no lo afectan."""
+    result: List[Stage] = []
+    for stage in stages:
+        if _op(stage) != "$match":
+            result.append(stage)
+            continue
+        paths = _query_paths(stage["$match"])
+        at = len(result)
+        while at:
+            previous = result[at - 1]
+            op = _op(previous)
+            if op not in _MATCH_CROSSABLE:
+                break
+            if op != "$sort" and (
+                paths is None
+                or any(_touches(paths, f) for f in _produced(previous))
+            ):
+                break
+            at -= 1
+        result.insert(at, stage)
+    return result
+
+
+def _lookup_block(
+    stages: List[Stage],
+    at: int,
+    scalar_fields: Optional[AbstractSet[str]] = None,
+) -> int:
+    """Largo del bloque ``$lookup`` uno-a-uno que empieza en ``at`` (0 si no
+    hay uno): el ``$lookup`` y, si lo sigue, su ``$unwind`` que preserva
+    vacíos sobre un ``foreignField`` ``_id`` con un ``localField`` de
+    ``scalar_fields`` (a lo sumo un documento)."""
+    if _op(stages[at]) != "$lookup":
+        return 0
+    lookup = stages[at]["$lookup"]
+    if at + 1 < len(stages) and _op(stages[at + 1]) == "$unwind":
+        unwind = stages[at + 1]["$unwind"]
+        path = unwind if isinstance(unwind, str) else unwind["path"]
+        if path == f"${lookup['as']}":
+            one_to_one = (
+                isinstance(unwind, dict)
+                and unwind.get("preserveNullAndEmptyArrays") is True
+                and not unwind.get("includeArrayIndex")
+                and lookup.get("foreignField") == "_id"
+                and lookup.get("localField") in (scalar_fields or ())
+            )
+            return 2 if one_to_one else 0
+    return 1
+
+
+def one_to_one_tail(
+    stages: List[Stage], scalar_fields: Optional[AbstractSet[str]] = None
+) -> int:
+    """Índice donde empiezan las etapas finales uno-a-uno de ``stages``
+    (incluidos los bloques ``$lookup`` + ``$unwind`` uno-a-uno)."""
+    at = len(stages)
+    while at:
+        if _op(stages[at - 1]) in ONE_TO_ONE_STAGES:
+            at -= 1
+        elif at > 1 and _lookup_block(stages, at - 2, scalar_fields) == 2:
+            at -= 2
+        else:
+            break
+    return at
+
+
+def defer_lookups(
+    stages: List[Stage], scalar_fields: Optional[AbstractSet[str]] = None
+) -> List[Stage]:
+    """Baja cada bloque ``$lookup`` uno-a-uno por debajo de las etapas de
+    filtro/orden/paginación que no usan su campo."""
+    stages = list(stages)
+    at = 0
+    while at < len(stages):
+        size = _lookup_block(stages, at, scalar_fields)
+        if not size:
+            at += 1
+            continue
+        field = stages[at]["$lookup"]["as"]
+        end = at + size
+        while (
+            end < len(stages)
+            and _op(stages[end]) in _LOOKUP_CROSSABLE
+            and not _touches(stage_paths(stages[end]), field)
+        ):
+            end += 1
+        block = stages[at : at + size]
+        stages[at:end] = stages[at + size : end] + block
+        at = end
+    return stages
+
+
+def _lookup_usage(
+    stages: List[Stage], field: str, output_fields: Optional[Set[str]]
+) -> Optional[Set[str]]:
+    """Subcampos de ``field`` usados después (None = el documento entero)."""
+    used: Set[str] = set()
+
+    def add(paths: Optional[Set[str]]) -> bool:
+        for path in paths if paths is not None else {field}:
+            if path == field or field.startswith(path + "."):
+                return False
+            if path.startswith(field + "."):
+                used.add(path[len(field) + 1 :])
+        return True
+
+    for stage in stages:
+        op = _op(stage)
+        spec = stage[op]
+        if op == "$unset":
+            removed = [spec] if isinstance(spec, str) else spec
+            if field in removed:
+                return used
+        elif op == "$project" and _is_exclusion(spec):
+            if spec.get(field) in (0, False):
+                return used
+        elif op == "$project" or op in _RESHAPING:
+            return used if add(stage_paths(stage)) else None
+        elif not add(stage_paths(stage)):
+            return None
+    if output_fields is None:
+        return None
+    return used if add(set(output_fields)) else None
+
+
+def prune_lookups(
+    stages: List[Stage],
+    output_fields: Optional[Iterable[str]] = None,
+    scalar_fields: Optional[AbstractSet[str]] = None,
+) -> List[Stage]:
+    """Recorta los ``$lookup`` uno-a-uno a los subcampos que se usan, o los
+    elimina si no se usa ninguno."""
+    output = set(output_fields) if output_fields is not None else None
+    stages = list(stages)
+    at = 0
+    while at < len(stages):
+        size = _lookup_block(stages, at, scalar_fields)
+        if not size:
+            at += 1
+            continue
+        lookup = stages[at]["$lookup"]
+        used = _lookup_usage(stages[at + size :], lookup["as"], output)
+        if used is not None and not used:
+            del stages[at : at + size]
+            continue
+        if used and "localField" in lookup and "pipeline" not in lookup:
+            stages[at] = {
+                "$lookup": {
+                    **lookup,
+                    "pipeline": [
+                        {"$project": {path: 1 for path in sorted(used)}}
+                    ],
+                }
+            }
+        at += size
+    return stages
+
+
+def optimize_pipeline(
+    stages: List[Stage],
+    output_fields: Optional[Iterable[str]] = None,
+    scalar_fields: Optional[AbstractSet[str]] = None,
+) -> List[Stage]:
+    """Aplica `hoist_matches`, `defer_lookups` y `prune_lookups`."""
+    return prune_lookups(
+        defer_lookups(hoist_matches(stages), scalar_fields),
+        output_fields,
+        scalar_fields,
+    )
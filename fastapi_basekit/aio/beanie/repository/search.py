@@ -0,0 +1,81 @@
+"""Modos de búsqueda (`search`) del listado Beanie.
+
+El término del usuario nunca llega a Mongo como regex cruda: se escapa con
+``re.escape`` (sin backtracking patológico ni operadores inyectados).
+
+- ``"substring"`` (default): regex escapada, sin anclar, case-insensitive.
+  No usa índice: para colecciones chicas.
+- ``"prefix"``: ``^término`` sobre campos normalizados (ver
+  `normalize_search`), case-sensitive y anclado → usa el índice del campo.
+  ``search_fields`` apunta a los campos normalizados (``name_norm``…).
+- ``"text"``: ``$text`` sobre el índice de texto declarado en el modelo
+  (``IndexModel([("name", TEXT)])``); sin orden explícito ordena por
+  relevancia (``textScore``). No usa ``search_fields``.
+- ``"trigram"``: sin Atlas Search; el documento guarda los trigramas de su
+  texto (`search_trigrams`) en un array indexado y la búsqueda pide
+  ``$all`` de los trigramas del término. Un término de menos de 3
+  caracteres cae a ``"prefix"`` sobre ``search_fields``.
+"""
+
+import re
+import unicodedata
+from typing import Any, Dict, List, Optional, Sequence
+
+SEARCH_MODES = ("substring", "prefix", "text", "trigram")
+
+#: Orden por relevancia del modo ``"text"`` (FindMany y ``$sort``).
+TEXT_SCORE = {"$meta": "textScore"}
+
+
+def normalize_search(text: str) -> str:
+    """Minúsculas, sin acentos y con espacios colapsados.
+
+    Usar la misma función al escribir el campo normalizado del documento
+    (``name_norm = normalize_search(name)``) y al buscar.
+    """
+    decomposed = unicodedata.normalize("NFKD", text)
+    stripped = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return " ".join(stripped.casefold().split())
+
+
+def search_trigrams(text: str) -> List[str]:
+    """Trigramas (ordenados, sin repetir) de las palabras de ``text``
+    normalizado. Palabras de menos de 3 caracteres no aportan trigramas."""
+    grams = {
+        word[i : i + 3]
+        for word in normalize_search(text).split()
+        for i in range(len(word) - 2)
+    }
+    return sorted(grams)
+
+
+def build_search_condition(
+    search: Optional[str],
+    search_fields: Sequence[str],
+    mode: str = "substring",
+    trigram_field: str = "search_trigrams",
+) -> Optional[Dict[str, Any]]:
+    """Condición Mongo (dict) de la búsqueda, o None si no aplica."""
+    if mode not in SEARCH_MODES:
+        raise ValueError(
+            f"search_mode inválido: {mode!r} "
+            f"(opciones: {', '.join(SEARCH_MODES)})"
+        )
+    if not search:
+        return None
+    if mode == "text":
+        return {"$text": {"$search": search}}
+    if mode == "trigram":
+        grams = search_trigrams(search)
+        if grams:
+            return {trigram_field: {"$all": grams}}
+        mode = "prefix"
+    if not search_fields:
+        return None
+    if mode == "prefix":
+        condition: Dict[str, Any] = {
+            "$regex": "^" + re.escape(normalize_search(search))
+        }
+    else:
+        condition = {"$regex": re.escape(search), "$options": "i"}
+    return {"$or": [{field: dict(condition)} for field in search_fields]}
@@ -1,18 +1,58 @@
-from typing import Any, Dict, Generic, List, Optional, Tuple, Union
+from contextlib import contextmanager
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    ClassVar,
+    Dict,
+    Generic,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Type,
+    Union,
+)
 
 from beanie import Document
 from beanie.odm.queries.find import FindMany
 from fastapi import Request
 from pydantic import BaseModel
+from pymongo.errors import ExecutionTimeout
 
 
-from ...beanie.repository.base import BaseRepository, ModelT
+from ...beanie.repository.base import (
+    BaseRepository,
+    InvalidCursorError,
+    ModelT,
+)
+from ...cache.base import (
+    BaseCacheBackend,
+    RetrieveCache,
+    get_default_cache_backend,
+    model_namespace,
+    scope_key,
+)
+from ...cache.singleflight import flight_key, single_flight
+from ...class_defaults import install_copy_on_access
 from ....exceptions.api_exceptions import (
     NotFoundException,
     DatabaseIntegrityException,
+    QueryTimeoutException,
+    ValidationException,
 )
 
 
+@contextmanager
+def _translate_query_timeout(timeout: Optional[float]) -> Iterator[None]:
+    """``ExecutionTimeout`` de Mongo (``maxTimeMS`` vencido) →
+    ``QueryTimeoutException`` (HTTP 504)."""
+    try:
+        yield
+    except ExecutionTimeout as exc:
+        raise QueryTimeoutException(data={"timeout": timeout}) from exc
+
+
 class BaseService(Generic[ModelT]):
     """Servicio base específico para Beanie ODM (async), parametrizado.
 
@@ -32,20 +72,63 @@ class BaseService(Generic[ModelT]):
     order_by: Optional[List[tuple]] = None
     use_aggregation: bool = False
     aggregation_validate: bool = True
+    # Tope (segundos) de las lecturas list/retrieve, aplicado como `maxTimeMS`.
+    # Override por acción devolviendo {"query_timeout": N} desde
+    # `get_kwargs_query`. None = sin tope.
+    query_timeout: Optional[float] = None
+    # Cache de `retrieve` (ver `retrieve_cached`). None = desactivado.
+    # `cache_negative_ttl`: vida de un 404 cacheado (None = `cache_ttl`, 0 = no
+    # cachear 404). `cache_backend`: None = LRU en proceso compartido.
+    cache_ttl: Optional[float] = None
+    cache_negative_ttl: Optional[float] = None
+    cache_backend: Optional[BaseCacheBackend] = None
+    # Single-flight de list/retrieve (ver `_coalesce`): lecturas idénticas
+    # concurrentes comparten una consulta. `coalesce_max_wait`: segundos que un
+    # request espera la consulta de otro antes de lanzar la suya.
+    coalesce_reads: bool = False
+    coalesce_max_wait: Optional[float] = 1.0
+    # Total del listado FindMany: "exact" | "estimated" | "has_next" | "none"
+    # (ver `BaseRepository.paginate`). None = default del repositorio.
+    total_strategy: Optional[str] = None
+    # Modo de `search`: "substring" | "prefix" | "text" | "trigram" (ver
+    # `repository/search.py`). None = el `search_mode` del repositorio.
+    search_mode: Optional[str] = None
+    # Conteo del camino de agregación: "facet" | "split" | "auto" (ver
+    # `BaseRepository.paginate_pipeline`). None = default del repositorio.
+    pipeline_count_mode: Optional[str] = None
+    # Reordena el pipeline del listado antes de paginar (`$match` antes de
+    # los `$lookup`, joins después de la página; ver
+    # `BaseRepository.optimize_list_pipeline`).
+    optimize_pipeline: bool = False
+    # Con `fetch_links` en los kwargs de consulta, el listado FindMany trae la
+    # página sin `$lookup` y resuelve los Links después, una query `$in` por
+    # colección (ver `BaseRepository.resolve_links`). `link_projections`:
+    # modelo de proyección por campo Link.
+    batch_links: bool = False
+    link_projections: Dict[str, Type[BaseModel]] = {}
+    # `update` con `$set` parcial en un round trip, sin traer el documento
+    # antes (ver `BaseRepository.update_fields`; no corre los event hooks de
+    # Beanie).
+    partial_updates: bool = False
+
+    # Config mutable de clase: cada instancia la copia recién al leerla
+    # (`CopyOnAccess`, instalado en `__init_subclass__`), no en cada __init__.
+    _mutable_defaults: ClassVar[Tuple[str, ...]] = (
+        "search_fields",
+        "duplicate_check_fields",
+        "kwargs_query",
+        "link_projections",
+    )
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        install_copy_on_access(cls, cls._mutable_defaults)
 
     def __init__(
         self, repository: BaseRepository, request: Optional[Request] = None
     ):
         self.repository = repository
         self.request = request
-        # Copia por instancia de los defaults mutables (heredados como
-        # atributos de CLASE, compartidos por todo el proceso). Sin esto, una
-        # mutación en runtime (`self.search_fields.append(...)`) se filtraría a
-        # la clase y contaminaría otras requests. Respeta el override del
-        # subclass: `list(self.search_fields)` lee su atributo de clase.
-        self.search_fields = list(self.search_fields)
-        self.duplicate_check_fields = list(self.duplicate_check_fields)
-        self.kwargs_query = dict(self.kwargs_query)
         endpoint_func = (
             self.request.scope.get("endpoint") if self.request else None
         )
@@ -66,6 +149,25 @@ class BaseService(Generic[ModelT]):
     def get_kwargs_query(self) -> Dict[str, Any]:
         return self.kwargs_query
 
+    def get_query_timeout(
+        self, kwargs: Optional[Dict[str, Any]] = None
+    ) -> Optional[float]:
+        """Timeout efectivo de la acción actual: `query_timeout` de
+        `get_kwargs_query()` si está, si no el `query_timeout` del servicio."""
+        if kwargs is None:
+            kwargs = self.get_kwargs_query()
+        return kwargs.get("query_timeout", self.query_timeout)
+
+    def _query_kwargs(self) -> Dict[str, Any]:
+        """`get_kwargs_query()` listo para el repositorio: `query_timeout`
+        (segundos, clave del servicio) se traduce a `max_time_ms` (pymongo)."""
+        kwargs = dict(self.get_kwargs_query())
+        timeout = self.get_query_timeout(kwargs)
+        kwargs.pop("query_timeout", None)
+        if timeout:
+            kwargs["max_time_ms"] = max(1, int(timeout * 1000))
+        return kwargs
+
     def get_order(self) -> Optional[List[tuple]]:
         """Override this method to define custom ordering.
         
@@ -83,12 +185,154 @@ class BaseService(Generic[ModelT]):
         return filters
 
     async def retrieve(self, id: str) -> ModelT:
-        kwargs = self.get_kwargs_query()
-        obj = await self.repository.get_by_id(id, **kwargs)
+        kwargs = self._query_kwargs()
+        with _translate_query_timeout(self.get_query_timeout()):
+            obj = await self._coalesce(
+                "retrieve",
+                {"id": str(id), "kwargs": kwargs},
+                lambda: self.repository.get_by_id(id, **kwargs),
+            )
         if not obj:
             raise NotFoundException(f"id={id} no encontrado")
         return obj
 
+    async def _coalesce(
+        self,
+        action: str,
+        params: Dict[str, Any],
+        load: Callable[[], Awaitable[Any]],
+    ) -> Any:
+        """Single-flight de una lectura (`coalesce_reads`).
+
+        `params` debe incluir todo lo que cambia el resultado (id y kwargs, o
+        filtros YA pasados por `get_filters` — el scope — y paginación). Si
+        otro request ya ejecuta la misma consulta se usa su resultado, copiado
+        (`_adopt_shared`).
+        """
+        if not self.coalesce_reads:
+            return await load()
+        namespace = model_namespace(self.repository.model)
+        key = flight_key(namespace, action, params)
+        result, shared = await single_flight(
+            key, load, max_wait=self.coalesce_max_wait
+        )
+        if shared:
+            result = self._adopt_shared(result)
+        return result
+
+    def _adopt_shared(self, result: Any) -> Any:
+        """Copia profunda de documentos cargados por otro request, para que
+        `post_process_list` o un update no muten la instancia compartida."""
+        if result is None:
+            return None
+        if isinstance(result, tuple):  # (items, total) de list
+            items, total = result
+            return [self._copy_document(i) for i in items], total
+        return self._copy_document(result)
+
+    @staticmethod
+    def _copy_document(item: Any) -> Any:
+        if isinstance(item, BaseModel):
+            return item.model_copy(deep=True)
+        return item
+
+    async def retrieve_validator(self, id: str) -> Optional[Any]:
+        """Validador HTTP (`validator_field`, p. ej. `updated_at`) de `id`,
+        leído sin traer el documento. None = sin GET condicional."""
+        return await self.repository.get_validator(id)
+
+    async def list_validator(
+        self,
+        search: Optional[str] = None,
+        filters: Optional[Dict[str, Any]] = None,
+        **kwargs: Any,
+    ) -> Optional[Tuple[Any, int]]:
+        """`(max(validator_field), count)` del mismo conjunto que `list`
+        (filtros pasados por `get_filters`, búsqueda) en un `$group`, sin
+        traer documentos. None = sin GET condicional."""
+        applied_filters = self.get_filters(filters)
+        if self.use_aggregation:
+            query = self.build_list_pipeline(
+                search=search,
+                search_fields=self.search_fields,
+                filters=applied_filters,
+            )
+        else:
+            query = self.build_list_queryset(
+                search=search,
+                search_fields=self.search_fields,
+                filters=applied_filters,
+            )
+        return await self.repository.list_validator(query)
+
+    def get_cache_scope(self) -> Any:
+        """Scope del llamador en la clave de `retrieve_cached` (tenant,
+        owner…): por defecto, lo que `get_filters` inyecta sin filtros
+        entrantes. Sobrescribe si `retrieve` se scopea por otra vía; con
+        `retrieve` sobrescrito y este hook sin sobrescribir no se cachea.
+        Debe ser serializable a JSON."""
+        return self.get_filters({})
+
+    def _retrieve_cacheable(self) -> bool:
+        """False si `retrieve` está sobrescrito sin `get_cache_scope`: su
+        resultado puede depender del llamador y no se sabe cómo separarlo."""
+        cls = type(self)
+        return (
+            cls.retrieve is BaseService.retrieve
+            or cls.get_cache_scope is not BaseService.get_cache_scope
+        )
+
+    def get_retrieve_cache(self) -> Optional[RetrieveCache]:
+        """Cache de `retrieve` de este servicio, o None si `cache_ttl` no está."""
+        if not self.cache_ttl:
+            return None
+        return RetrieveCache(
+            self.cache_backend or get_default_cache_backend(),
+            namespace=model_namespace(self.repository.model),
+            ttl=self.cache_ttl,
+            negative_ttl=self.cache_negative_ttl,
+        )
+
+    async def retrieve_cached(
+        self,
+        id: str,
+        render: Callable[[ModelT], bytes],
+        variant: str = "",
+    ) -> bytes:
+        """`retrieve` + `render(obj)` cacheado por (modelo, id, kwargs, variant).
+
+        Los kwargs de consulta (`fetch_links`, `nesting_depth`, …) forman parte
+        de la clave, igual que los joins en SQL. Un hit no toca Mongo ni
+        Pydantic; un 404 también se cachea (`cache_negative_ttl`). Las
+        entradas se separan por `get_cache_scope()`.
+        """
+        cache = self.get_retrieve_cache()
+        if cache is None or not self._retrieve_cacheable():
+            return render(await self.retrieve(id))
+        kwargs = self._query_kwargs()
+        kwargs.pop("max_time_ms", None)
+        return await cache.get_or_render(
+            id,
+            f"{variant}|{sorted(kwargs.items())}",
+            load=lambda: self.retrieve(id),
+            render=render,
+            not_found=lambda: NotFoundException(f"id={id} no encontrado"),
+            scope=scope_key(self.get_cache_scope()),
+        )
+
+    async def invalidate_cache(self, id: Any) -> None:
+        """Descarta la entrada cacheada de `id` (todas sus variantes)."""
+        cache = self.get_retrieve_cache()
+        if cache is not None:
+            await cache.invalidate(id)
+
+    def _with_search_mode(
+        self, search: Optional[str], kwargs: Dict[str, Any]
+    ) -> None:
+        # Solo con búsqueda: repos custom sin `search_mode` siguen andando.
+        if search and self.search_mode:
+            kwargs.setdefault("search_mode", self.search_mode)
+
     def build_list_queryset(
         self,
         search: Optional[str] = None,
@@ -102,6 +346,7 @@ class BaseService(Generic[ModelT]):
         Override here to compose query options across repositories or to
         decorate the FindMany before pagination.
         """
+        self._with_search_mode(search, kwargs)
         return self.repository.build_list_queryset(
             search=search,
             search_fields=search_fields or self.search_fields,
@@ -126,6 +371,7 @@ class BaseService(Generic[ModelT]):
         Set `aggregation_validate = False` if the projection produces a
         non-model shape (joined columns / flattened rows).
         """
+        self._with_search_mode(search, kwargs)
         return self.repository.build_list_pipeline(
             search=search,
             search_fields=search_fields or self.search_fields,
@@ -134,6 +380,11 @@ class BaseService(Generic[ModelT]):
             **kwargs,
         )
 
+    def _search_mode(self) -> Optional[str]:
+        return self.search_mode or getattr(
+            self.repository, "search_mode", None
+        )
+
     async def list(
         self,
         search: Optional[str] = None,
@@ -141,13 +392,24 @@ class BaseService(Generic[ModelT]):
         count: int = 25,
         filters: Optional[Dict[str, Any]] = None,
         order_by: Optional[str] = None,  # Dynamic ordering (e.g., "-created_at" or "tool__name")
-    ) -> Tuple[List[ModelT], int]:
-        kwargs = self.get_kwargs_query()
+        cursor: Optional[str] = None,
+    ) -> Tuple[List[ModelT], Any]:
+        """Página del listado: ``(items, total)``.
+
+        Con ``cursor`` (``""`` = primera página) pagina por keyset compuesto
+        ``(order_by, _id)`` en vez de ``skip``/conteo, ignora ``page`` y
+        devuelve ``(items, next_cursor)`` (None en la última página). Un
+        cursor corrupto o de otro orden → ``ValidationException``.
+        """
+        kwargs = self._query_kwargs()
+        max_time_ms = kwargs.get("max_time_ms")
         applied_filters = self.get_filters(filters)
 
         # Resolve ordering
         if order_by:
             order_str = order_by
+        elif search and cursor is None and self._search_mode() == "text":
+            order_str = None  # relevancia (`textScore`), no el orden default
         else:
             default_order = self.get_order()
             if default_order:
@@ -159,38 +421,126 @@ class BaseService(Generic[ModelT]):
         nested_order = bool(order_str and ("__" in order_str or "." in order_str))
         use_pipeline = self.use_aggregation or nested_order
 
-        if use_pipeline:
-            pipeline = self.build_list_pipeline(
-                search=search,
-                search_fields=self.search_fields,
-                filters=applied_filters,
-                order_by=order_str,
-                **kwargs,
-            )
-            items, total = await self.repository.paginate_pipeline(
-                pipeline,
-                page=page,
-                count=count,
-                validate=self.aggregation_validate,
+        # `max_time_ms` solo se pasa si hay timeout: repos custom con la firma
+        # histórica de `paginate`/`paginate_pipeline` siguen funcionando.
+        timeout_kwargs = {"max_time_ms": max_time_ms} if max_time_ms else {}
+        paginate_kwargs = dict(timeout_kwargs)
+        if self.total_strategy:
+            paginate_kwargs["total_strategy"] = self.total_strategy
+        pipeline_kwargs = dict(paginate_kwargs)
+        if self.pipeline_count_mode:
+            pipeline_kwargs["count_mode"] = self.pipeline_count_mode
+        if self.optimize_pipeline:
+            pipeline_kwargs["optimized"] = True
+
+        batch_links = (
+            not use_pipeline
+            and self.batch_links
+            and bool(kwargs.get("fetch_links"))
+            and not self.repository.needs_link_lookup(
+                [
+                    *(applied_filters or {}),
+                    *self.search_fields,
+                    (order_str or "").lstrip("-"),
+                ]
             )
-        else:
-            # FindMany path
-            order_list = None
-            if order_str:
-                direction = -1 if order_str.startswith("-") else 1
-                field = order_str.lstrip("-")
-                order_list = [(field, direction)]
+        )
+        query_kwargs = (
+            {**kwargs, "fetch_links": False} if batch_links else kwargs
+        )
 
-            query = self.build_list_queryset(
-                search=search,
-                search_fields=self.search_fields,
-                filters=applied_filters,
-                order_by=order_list,
-                **kwargs,
-            )
-            items, total = await self.repository.paginate(
-                query, page, count, order_by=order_list
-            )
+        async def _page() -> Tuple[List[ModelT], Any]:
+            if use_pipeline:
+                pipeline = self.build_list_pipeline(
+                    search=search,
+                    search_fields=self.search_fields,
+                    filters=applied_filters,
+                    order_by=order_str,
+                    **kwargs,
+                )
+                if self.optimize_pipeline:
+                    pipeline = self.repository.optimize_list_pipeline(
+                        pipeline, validate=self.aggregation_validate
+                    )
+                if cursor is not None:
+                    return await self.repository.paginate_pipeline_cursor(
+                        pipeline,
+                        limit=count,
+                        cursor=cursor,
+                        validate=self.aggregation_validate,
+                        **timeout_kwargs,
+                    )
+                items, total = await self.repository.paginate_pipeline(
+                    pipeline,
+                    page=page,
+                    count=count,
+                    validate=self.aggregation_validate,
+                    **pipeline_kwargs,
+                )
+            elif cursor is not None:
+                # El orden (con desempate por `_id`) lo pone el repositorio.
+                query = self.build_list_queryset(
+                    search=search,
+                    search_fields=self.search_fields,
+                    filters=applied_filters,
+                    **query_kwargs,
+                )
+                items, total = await self.repository.paginate_cursor(
+                    query,
+                    count,
+                    order_by=order_str,
+                    cursor=cursor,
+                    **timeout_kwargs,
+                )
+            else:
+                # FindMany path
+                order_list = None
+                if order_str:
+                    direction = -1 if order_str.startswith("-") else 1
+                    field = order_str.lstrip("-")
+                    order_list = [(field, direction)]
+
+                query = self.build_list_queryset(
+                    search=search,
+                    search_fields=self.search_fields,
+                    filters=applied_filters,
+                    order_by=order_list,
+                    **query_kwargs,
+                )
+                items, total = await self.repository.paginate(
+                    query, page, count, order_by=order_list, **paginate_kwargs
+                )
+            if batch_links:
+                await self.repository.resolve_links(
+                    items,
+                    nesting_depths_per_field=kwargs.get(
+                        "nesting_depths_per_field"
+                    ),
+                    projections=self.link_projections or None,
+                    **timeout_kwargs,
+                )
+            return items, total
+
+        with _translate_query_timeout(self.get_query_timeout()):
+            try:
+                items, total = await self._coalesce(
+                    "list",
+                    {
+                        "search": search,
+                        "page": page,
+                        "count": count,
+                        "filters": applied_filters,
+                        "order_by": order_str,
+                        "cursor": cursor,
+                        "pipeline": use_pipeline,
+                        "kwargs": kwargs,
+                    },
+                    _page,
+                )
+            except InvalidCursorError as exc:
+                raise ValidationException(
+                    data={"cursor": str(exc)}, message="Cursor inválido"
+                ) from exc
 
         items = await self.post_process_list(items)
         return items, total
@@ -232,7 +582,10 @@ class BaseService(Generic[ModelT]):
         if fields:
             await self._check_duplicate(data, fields)
         created = await self.repository.create(data)
-        kwargs = self.get_kwargs_query()
+        if self.cache_ttl:
+            await self.invalidate_cache(created.id)
+        kwargs = self._query_kwargs()
+        kwargs.pop("max_time_ms", None)
         return (
             await self.repository.get_by_id(created.id, **kwargs)
             if kwargs
@@ -240,13 +593,33 @@ class BaseService(Generic[ModelT]):
         )
 
     async def update(self, id: str, data: BaseModel) -> ModelT:
-        kwargs = self.get_kwargs_query()
+        kwargs = self._query_kwargs()
+        kwargs.pop("max_time_ms", None)
+        if self.partial_updates:
+            return await self._update_fields(id, data, kwargs)
         obj = await self.repository.get_by_id(id, **kwargs)
         if not obj:
             raise NotFoundException(f"id={id} no encontrado")
         if isinstance(data, BaseModel):
             data = data.model_dump(exclude_unset=True)
         updated = await self.repository.update(obj, data)
+        await self.invalidate_cache(id)
+        return updated
+
+    async def _update_fields(
+        self, id: str, data: BaseModel, kwargs: Dict[str, Any]
+    ) -> ModelT:
+        if isinstance(data, BaseModel):
+            data = data.model_dump(exclude_unset=True)
+        updated = await self.repository.update_fields(id, data)
+        if not updated:
+            raise NotFoundException(f"id={id} no encontrado")
+        if kwargs.get("fetch_links"):
+            await self.repository.resolve_links(
+                [updated],
+                nesting_depths_per_field=kwargs.get("nesting_depths_per_field"),
+            )
+        await self.invalidate_cache(id)
         return updated
 
     async def delete(self, id: str) -> str:
@@ -254,4 +627,8 @@ class BaseService(Generic[ModelT]):
         if not obj:
             raise NotFoundException(f"id={id} no encontrado")
         await self.repository.delete(obj)
+        await self.invalidate_cache(id)
         return "deleted"
+
+
+install_copy_on_access(BaseService, BaseService._mutable_defaults)
@@ -0,0 +1,23 @@
+from .base import (
+    BaseCacheBackend,
+    InMemoryCacheBackend,
+    LRUCacheBackend,
+    RetrieveCache,
+    StaleWhileRevalidateCache,
+    bump_generation,
+    get_default_cache_backend,
+    get_generation,
+    model_namespace,
+)
+
+__all__ = [
+    "BaseCacheBackend",
+    "InMemoryCacheBackend",
+    "LRUCacheBackend",
+    "RetrieveCache",
+    "StaleWhileRevalidateCache",
+    "bump_generation",
+    "get_default_cache_backend",
+    "get_generation",
+    "model_namespace",
+]
@@ -0,0 +1,336 @@
+"""Cache de resultados para ``retrieve`` (backends + entrada por id).
+
+Los servicios (SQLAlchemy, SQLModel, Beanie) lo activan con ``cache_ttl``.
+Cada id ocupa UNA clave del backend cuyo valor es un dict de variantes
+``{variante: bytes}`` (una por combinación de joins/schema del controller y
+scope del llamador), así invalidar un id es un único ``delete`` sin importar
+cuántas variantes haya.
+Los valores se guardan ya serializados (JSON listo para responder): un hit no
+toca el ORM ni Pydantic.
+
+Para listados, ``StaleWhileRevalidateCache`` sirve la última página conocida
+mientras UNA sola task la refresca, y las claves llevan el contador de
+generación del modelo (``bump_generation``, que incrementan las escrituras de
+los repositorios) para que cualquier write deje obsoletas las páginas cacheadas.
+"""
+
+import asyncio
+import json
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+#: Marca de "no existe" (caching negativo de 404).
+MISSING = "__basekit_missing__"
+
+# Referencias fuertes a las invalidaciones diferidas (post-commit) en vuelo;
+# el event loop solo guarda referencias débiles a las tasks.
+_background_tasks: Set["asyncio.Task[Any]"] = set()
+
+# Generación por modelo (ver `bump_generation`) y refrescos SWR en vuelo.
+_generations: Dict[str, int] = {}
+_refreshing: Dict[str, "asyncio.Task[Any]"] = {}
+
+
+def model_namespace(model: Any) -> str:
+    """Identificador estable de un modelo para claves de cache."""
+    return f"{model.__module__}.{model.__qualname__}"
+
+
+def scope_key(scope: Any) -> str:
+    """Serializa el scope de un llamador (tenant, owner…) para una clave de
+    cache; vacío si no hay scope."""
+    if not scope:
+        return ""
+    return json.dumps(scope, sort_keys=True, default=str)
+
+
+def get_generation(model: Any) -> int:
+    """Generación actual de ``model`` en este proceso (0 si nunca se escribió)."""
+    return _generations.get(model_namespace(model), 0)
+
+
+def bump_generation(model: Any) -> int:
+    """Marca una escritura sobre ``model``: invalida sus listados cacheados.
+
+    Es un contador en proceso; con varios workers cada uno ve solo sus propias
+    escrituras (el TTL acota la desactualización del resto).
+    """
+    if model is None:
+        return 0
+    namespace = model_namespace(model)
+    _generations[namespace] = _generations.get(namespace, 0) + 1
+    return _generations[namespace]
+
+
+class BaseCacheBackend:
+    """Interfaz async de un backend de cache (Redis, Memcached, …).
+
+    Implementaciones deben ser seguras para uso concurrente desde el event
+    loop. ``ttl`` en segundos; ``None`` = sin expiración propia.
+    """
+
+    async def get(self, key: str) -> Optional[Any]:
+        raise NotImplementedError
+
+    async def set(
+        self, key: str, value: Any, ttl: Optional[float] = None
+    ) -> None:
+        raise NotImplementedError
+
+    async def delete(self, key: str) -> None:
+        raise NotImplementedError
+
+    async def clear(self) -> None:
+        raise NotImplementedError
+
+
+class LRUCacheBackend(BaseCacheBackend):
+    """Cache en proceso, LRU acotado a ``maxsize`` entradas con TTL.
+
+    Operaciones O(1) sobre un ``OrderedDict``; la expiración es perezosa (se
+    descarta al leer). Vive por proceso: con varios workers cada uno tiene su
+    copia, así que la invalidación solo alcanza al worker que escribió — usar
+    un backend compartido si eso importa.
+    """
+
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = maxsize
+        self._data: "OrderedDict[str, Tuple[Any, Optional[float]]]" = (
+            OrderedDict()
+        )
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    async def get(self, key: str) -> Optional[Any]:
+        item = self._data.get(key)
+        if item is None:
+            return None
+        value, expires_at = item
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return value
+
+    async def set(
+        self, key: str, value: Any, ttl: Optional[float] = None
+    ) -> None:
+        expires_at = time.monotonic() + ttl if ttl else None
+        self._data[key] = (value, expires_at)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    async def delete(self, key: str) -> None:
+        self._data.pop(key, None)
+
+    async def clear(self) -> None:
+        self._data.clear()
+
+
+class InMemoryCacheBackend(BaseCacheBackend):
+    """Fake local de un backend remoto, para tests.
+
+    Sin límite de tamaño; cede el loop en cada operación (como haría un
+    round-trip de red) y cuenta las llamadas para poder afirmar hits/misses.
+    """
+
+    def __init__(self) -> None:
+        self._data: Dict[str, Tuple[Any, Optional[float]]] = {}
+        self.gets = 0
+        self.sets = 0
+        self.deletes = 0
+
+    async def get(self, key: str) -> Optional[Any]:
+        await asyncio.sleep(0)
+        self.gets += 1
+        item = self._data.get(key)
+        if item is None:
+            return None
+        value, expires_at = item
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self._data[key]
+            return None
+        return value
+
+    async def set(
+        self, key: str, value: Any, ttl: Optional[float] = None
+    ) -> None:
+        await asyncio.sleep(0)
+        self.sets += 1
+        expires_at = time.monotonic() + ttl if ttl else None
+        self._data[key] = (value, expires_at)
+
+    async def delete(self, key: str) -> None:
+        await asyncio.sleep(0)
+        self.deletes += 1
+        self._data.pop(key, None)
+
+    async def clear(self) -> None:
+        self._data.clear()
+
+
+_default_backend: Optional[BaseCacheBackend] = None
+
+
+def get_default_cache_backend() -> BaseCacheBackend:
+    """Backend por defecto del proceso (``LRUCacheBackend`` compartido)."""
+    global _default_backend
+    if _default_backend is None:
+        _default_backend = LRUCacheBackend()
+    return _default_backend
+
+
+def spawn_background(coro: Awaitable[Any]) -> "asyncio.Task[Any]":
+    """Lanza ``coro`` como task manteniendo una referencia fuerte hasta que
+    termine (fire-and-forget seguro)."""
+    task = asyncio.ensure_future(coro)
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+    return task
+
+
+class RetrieveCache:
+    """Entradas cacheadas de ``retrieve`` para un modelo.
+
+    Args:
+        backend: backend donde viven las entradas.
+        namespace: identifica al modelo (``módulo.Clase``).
+        ttl: segundos de vida de los hits.
+        negative_ttl: segundos de vida de un 404 cacheado; ``0`` lo desactiva.
+    """
+
+    def __init__(
+        self,
+        backend: BaseCacheBackend,
+        namespace: str,
+        ttl: float,
+        negative_ttl: Optional[float] = None,
+    ):
+        self.backend = backend
+        self.namespace = namespace
+        self.ttl = ttl
+        self.negative_ttl = ttl if negative_ttl is None else negative_ttl
+
+    def key(self, id: Any) -> str:
+        return f"basekit:retrieve:{self.namespace}:{id}"
+
+    async def get_or_render(
+        self,
+        id: Any,
+        variant: str,
+        load: Callable[[], Awaitable[Any]],
+        render: Callable[[Any], bytes],
+        not_found: Callable[[], Exception],
+        scope: str = "",
+    ) -> bytes:
+        """Devuelve los bytes cacheados de ``(id, variant, scope)`` o los
+        produce.
+
+        En miss llama ``load()`` (que debe lanzar la excepción de 404 del
+        servicio si no existe) y ``render(obj)``; guarda el resultado. Un 404
+        cacheado relanza ``not_found()`` sin consultar la base. ``scope``
+        (ver ``scope_key``) separa a los llamadores para los que ``load``
+        devuelve otra cosa: ni los bytes ni el 404 de un scope se sirven a
+        otro. El 404 guarda su vencimiento en la entrada, así que vive como
+        mucho lo que la entrada del id.
+        """
+        key = self.key(id)
+        entry = await self.backend.get(key)
+        # Dict nuevo (no mutar el leído): un backend en proceso lo comparte.
+        variants = dict(entry) if isinstance(entry, dict) else {}
+        missing = f"{MISSING}|{scope}"
+        variant = f"{variant}|scope={scope}"
+        if variants.get(missing, 0) > time.time():
+            raise not_found()
+        if variant in variants:
+            return variants[variant]
+
+        try:
+            obj = await load()
+        except Exception as exc:
+            if self.negative_ttl and _is_not_found(exc):
+                ttl = self.ttl if variants else self.negative_ttl
+                variants[missing] = time.time() + self.negative_ttl
+                await self.backend.set(key, variants, ttl)
+            raise
+        body = render(obj)
+        variants.pop(missing, None)
+        variants[variant] = body
+        await self.backend.set(key, variants, self.ttl)
+        return body
+
+    async def invalidate(self, id: Any) -> None:
+        await self.backend.delete(self.key(id))
+
+
+def _is_not_found(exc: BaseException) -> bool:
+    return getattr(exc, "status", None) == 404
+
+
+class StaleWhileRevalidateCache:
+    """Cache stale-while-revalidate de respuestas serializadas.
+
+    Una entrada es fresca durante ``ttl`` segundos y luego puede servirse
+    vencida ``stale_ttl`` segundos más. El primer request que la encuentra
+    vencida lanza UN refresco en segundo plano (`spawn_background`) y
+    devuelve la vencida sin esperarlo, igual que los demás mientras el
+    refresco está en vuelo. Si el refresco falla se loguea y la entrada
+    vencida sigue sirviéndose.
+    """
+
+    def __init__(
+        self, backend: BaseCacheBackend, ttl: float, stale_ttl: float = 0
+    ):
+        self.backend = backend
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+
+    async def get_or_load(
+        self,
+        key: str,
+        load: Callable[[], Awaitable[bytes]],
+        refresh: Optional[Callable[[], Awaitable[bytes]]] = None,
+    ) -> bytes:
+        """Bytes de ``key``: en un miss espera ``load()``; vencida, devuelve
+        la versión vencida y refresca en segundo plano con ``refresh()``
+        (``load`` si es None). ``refresh`` no debe depender de recursos del
+        request (p. ej. su sesión SQL), que puede terminar antes."""
+        entry = await self.backend.get(key)
+        if entry is None:
+            return await self._store(key, load)
+        body, fresh_until = entry
+        if time.time() < fresh_until or key in _refreshing:
+            return body
+
+        task = spawn_background(self._refresh(key, refresh or load))
+        _refreshing[key] = task
+        task.add_done_callback(lambda _t: _refreshing.pop(key, None))
+        return body
+
+    async def _refresh(
+        self, key: str, load: Callable[[], Awaitable[bytes]]
+    ) -> None:
+        try:
+            await self._store(key, load)
+        except Exception:
+            logger.warning(
+                "Refresco de cache fallido para %s; se sigue sirviendo la "
+                "versión vencida",
+                key,
+                exc_info=True,
+            )
+
+    async def _store(
+        self, key: str, load: Callable[[], Awaitable[bytes]]
+    ) -> bytes:
+        body = await load()
+        await self.backend.set(
+            key, (body, time.time() + self.ttl), self.ttl + self.stale_ttl
+        )
+        return body
@@ -0,0 +1,65 @@
+"""Single-flight: lecturas idénticas concurrentes comparten UNA consulta.
+
+El primer request con una clave (líder) ejecuta la consulta; los que llegan
+mientras está en vuelo (seguidores) esperan ese mismo resultado en vez de abrir
+la suya. Reglas:
+
+- Cada seguidor espera con ``asyncio.shield``: si lo cancelan, la consulta
+  compartida sigue para los demás.
+- Un seguidor espera como mucho ``max_wait`` segundos; pasado eso ejecuta su
+  propia consulta.
+- La consulta corre en la sesión del líder, así que si el líder se cancela la
+  consulta también; los seguidores entonces hacen su propia consulta.
+- Un error del líder (404, timeout, error de base) se propaga a los seguidores:
+  la misma consulta fallaría igual.
+
+El registro es por proceso.
+"""
+
+import asyncio
+import hashlib
+import json
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+_inflight: Dict[str, "asyncio.Task[Any]"] = {}
+
+
+def flight_key(namespace: str, action: str, payload: Any) -> str:
+    """Clave estable para ``(modelo, acción, params + scope)``."""
+    raw = json.dumps(payload, sort_keys=True, default=str)
+    digest = hashlib.sha256(raw.encode()).hexdigest()
+    return f"basekit:flight:{namespace}:{action}:{digest}"
+
+
+async def single_flight(
+    key: str,
+    load: Callable[[], Awaitable[Any]],
+    max_wait: Optional[float] = None,
+) -> Tuple[Any, bool]:
+    """Ejecuta ``load()`` o se une a la ejecución en vuelo de ``key``.
+
+    Devuelve ``(resultado, compartido)``: ``compartido`` es True si el
+    resultado viene de la consulta de OTRO request (el llamador debe adoptarlo
+    en su propia sesión antes de usarlo).
+    """
+    task = _inflight.get(key)
+    if task is None or task.done():
+        task = asyncio.ensure_future(load())
+        _inflight[key] = task
+        task.add_done_callback(lambda done: _release(key, done))
+        # Sin shield: cancelar al líder cancela la consulta en su sesión.
+        return await task, False
+
+    try:
+        return await asyncio.wait_for(asyncio.shield(task), max_wait), True
+    except asyncio.TimeoutError:
+        pass
+    except asyncio.CancelledError:
+        if not task.cancelled() or asyncio.current_task().cancelling():
+            raise  # el cancelado es este seguidor, no el líder
+    return await load(), False
+
+
+def _release(key: str, task: "asyncio.Task[Any]") -> None:
+    if _inflight.get(key) is task:
+        del _inflight[key]
@@ -0,0 +1,56 @@
+"""Defaults mutables de clase compartidos, copiados recién al usarlos.
+
+Los servicios declaran config mutable como atributos de CLASE
+(``search_fields = [...]``, ``kwargs_query = {...}``). Antes cada
+``__init__`` copiaba todos por instancia —en cada request— para que una
+mutación en runtime no contaminara la clase. ``CopyOnAccess`` hace esa copia
+solo la primera vez que la instancia LEE el atributo (y la guarda en su
+``__dict__``, así los accesos siguientes son un lookup normal). Un request que
+nunca toca ``mangle_fields`` no paga su copia.
+
+Acceso desde la clase (``UserService.search_fields``) devuelve el default
+declarado, como antes.
+"""
+
+from typing import Any, Iterable, Optional, Type
+
+
+class CopyOnAccess:
+    """Descriptor no-data: copia superficial del default por instancia."""
+
+    __slots__ = ("default", "name")
+
+    def __init__(self, default: Any, name: Optional[str] = None) -> None:
+        self.default = default
+        self.name = name
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        self.name = name
+
+    def __get__(self, instance: Any, owner: Optional[type] = None) -> Any:
+        if instance is None:
+            return self.default
+        value = _copy(self.default)
+        instance.__dict__[self.name] = value
+        return value
+
+
+def _copy(value: Any) -> Any:
+    if isinstance(value, list):
+        return list(value)
+    if isinstance(value, dict):
+        return dict(value)
+    if isinstance(value, set):
+        return set(value)
+    return value
+
+
+def install_copy_on_access(cls: Type[Any], names: Iterable[str]) -> None:
+    """Envuelve en ``CopyOnAccess`` los ``names`` que ``cls`` declara en su
+    propio cuerpo (se llama desde ``__init_subclass__``)."""
+    for name in names:
+        value = cls.__dict__.get(name)
+        if value is None or isinstance(value, CopyOnAccess):
+            continue
+        if isinstance(value, (list, dict, set)):
+            setattr(cls, name, CopyOnAccess(value, name))
@@ -1,19 +1,29 @@
+import asyncio
 import functools
+import hashlib
 import inspect
+import json
+import logging
 import types
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
 from typing import (
     Any,
+    Awaitable,
+    Callable,
     ClassVar,
     Dict,
+    FrozenSet,
     List,
     Optional,
     Type,
     Set,
+    Tuple,
     Union,
     get_args,
     get_origin,
 )
-from fastapi import Depends, Request
+from fastapi import Depends, Request, Response
 from pydantic import BaseModel, TypeAdapter
 
 
@@ -51,6 +61,28 @@ def _endpoint_param_types_cached(endpoint: Any) -> Dict[str, Any]:
     }
 
 
+@functools.lru_cache(maxsize=256)
+def _list_adapter_for(schema: Type[BaseModel]) -> TypeAdapter:
+    """``TypeAdapter(List[schema])`` compilado una vez por schema (antes se
+    construía en cada listado)."""
+    return TypeAdapter(List[schema])
+
+
+@functools.lru_cache(maxsize=256)
+def _envelope_for(
+    schema: Type[BaseModel], paginated: bool
+) -> Optional[Type[BaseModel]]:
+    """Envelope tipado (``BaseResponse[schema]`` /
+    ``BasePaginationResponse[schema]``) compilado una vez por schema: valida
+    ORM/Documents con ``from_attributes`` y serializa a JSON en Rust. None si
+    el schema no se puede parametrizar."""
+    envelope = BasePaginationResponse if paginated else BaseResponse
+    try:
+        return envelope[schema]
+    except Exception:
+        return None
+
+
 def _unwrap_optional(annotation: Any) -> Any:
     """Strip ``Optional[X]`` / ``Union[X, None]`` / ``X | None`` → ``X``.
 
@@ -64,11 +96,206 @@ def _unwrap_optional(annotation: Any) -> Any:
             return non_none[0]
     return annotation
 
+
+_STANDARD_PARAMS = frozenset({"page", "count", "search", "order_by"})
+_TRUE_VALUES = frozenset({"1", "true", "t", "yes", "on"})
+
+# Clasificación de un query param en el plan de `_params`.
+_PARAM_STANDARD = "standard"
+_PARAM_EXCLUDED = "excluded"
+_PARAM_FILTER = "filter"
+
+
+def _identity(raw: Any) -> Any:
+    return raw
+
+
+def _compile_coercer(annotation: Any) -> Tuple[Callable[[str], Any], bool]:
+    """``(coercer, many)`` para una anotación, resuelto una sola vez (única
+    implementación de la coerción: ``BaseController._coerce_param`` delega
+    acá). El coercer recibe el string crudo y devuelve el valor tipado (o el
+    crudo si falla).
+    ``many`` es True para ``List[X]``/``Set[X]``/``Tuple[X, ...]``: cada
+    valor se coacciona a ``X`` y el filtro es siempre una lista (→ IN)."""
+    if annotation is None:
+        return _identity, False
+    target = _unwrap_optional(annotation)
+    if get_origin(target) in (list, set, frozenset, tuple):
+        args = [a for a in get_args(target) if a is not Ellipsis]
+        coercer, _ = _compile_coercer(args[0] if args else None)
+        return coercer, True
+    if target is bool:
+        return (lambda raw: raw.strip().lower() in _TRUE_VALUES), False
+    if target is int or target is float:
+
+        def _number(raw: str, _cast: Any = target) -> Any:
+            try:
+                return _cast(raw)
+            except (TypeError, ValueError):
+                return raw
+
+        return _number, False
+    if target is str or target is Any:
+        return _identity, False
+    adapter = _type_adapter_for(target)
+    if adapter is None:
+        return _identity, False
+
+    def _adapt(raw: str) -> Any:
+        try:
+            return adapter.validate_python(raw)
+        except Exception:
+            return raw
+
+    return _adapt, False
+
+
+def _classify_param(name: str, excluded: FrozenSet[str]) -> str:
+    if name in _STANDARD_PARAMS:
+        return _PARAM_STANDARD
+    if name in excluded:
+        return _PARAM_EXCLUDED
+    return _PARAM_FILTER
+
+
+@functools.lru_cache(maxsize=512)
+def _cached_coercer(annotation: Any) -> Tuple[Callable[[str], Any], bool]:
+    return _compile_coercer(annotation)
+
+
+def _coercer_for(annotation: Any) -> Tuple[Callable[[str], Any], bool]:
+    """``_compile_coercer`` cacheado por anotación (sin cache si la anotación
+    no es hasheable)."""
+    try:
+        return _cached_coercer(annotation)
+    except TypeError:
+        return _compile_coercer(annotation)
+
+
+def _plan_coercer(
+    annotation: Any, coerce: Optional[Callable[[Any, Any], Any]]
+) -> Tuple[Callable[[str], Any], bool]:
+    """Coercer de un parámetro del plan: el compilado, o uno que llama a
+    ``coerce(raw, anotación)`` cuando el controller overridea
+    ``_coerce_param`` (con el tipo del ítem para ``List[X]``)."""
+    if coerce is None:
+        return _coercer_for(annotation)
+    target = _unwrap_optional(annotation)
+    many = get_origin(target) in (list, set, frozenset, tuple)
+    if many:
+        args = [a for a in get_args(target) if a is not Ellipsis]
+        annotation = args[0] if args else None
+    return functools.partial(_call_coerce, coerce, annotation), many
+
+
+def _call_coerce(
+    coerce: Callable[[Any, Any], Any], annotation: Any, raw: str
+) -> Any:
+    return coerce(raw, annotation)
+
+
+def _build_param_plan(
+    param_types: Dict[str, Any],
+    excluded: FrozenSet[str],
+    coerce: Optional[Callable[[Any, Any], Any]] = None,
+) -> Dict[str, Tuple[str, Callable[[str], Any], bool]]:
+    """``{nombre: (clasificación, coercer, many)}`` para cada parámetro
+    declarado en ``param_types``."""
+    plan = {}
+    for name, annotation in param_types.items():
+        try:
+            coercer, many = _plan_coercer(annotation, coerce)
+        except Exception:
+            coercer, many = _identity, False
+        plan[name] = (_classify_param(name, excluded), coercer, many)
+    return plan
+
+
+@functools.lru_cache(maxsize=1024)
+def _endpoint_param_plan_cached(
+    endpoint: Any,
+    excluded: FrozenSet[str],
+    coerce: Optional[Callable[[Any, Any], Any]] = None,
+) -> Dict[str, Tuple[str, Callable[[str], Any], bool]]:
+    """Plan de parseo de query params por endpoint (y set de excluidos y
+    ``_coerce_param`` del controller), CACHEADO junto a
+    ``_endpoint_param_types_cached``: ``{nombre: (clasificación, coercer,
+    many)}`` para cada parámetro declarado. ``_params`` lo recorre en un
+    solo loop, sin re-desenvolver ``Optional`` ni re-decidir el tipo en cada
+    request.
+
+    El dict devuelto es compartido (cacheado): tratar como SOLO-LECTURA.
+    """
+    return _build_param_plan(
+        _endpoint_param_types_cached(endpoint), excluded, coerce
+    )
+
+from ..cache.base import (
+    BaseCacheBackend,
+    StaleWhileRevalidateCache,
+    get_default_cache_backend,
+    get_generation,
+    model_namespace,
+)
+from ..hydration import hydrator_for
 from ..permissions.base import BasePermission
 
+_permission_instances: Dict[type, BasePermission] = {}
+
+
+def _permission_instance(permission: Any) -> BasePermission:
+    """Instancia de una clase de permiso: nueva en cada llamada, o la
+    compartida por proceso si la clase declara `reusable`. Acepta también una
+    instancia ya construida."""
+    if not isinstance(permission, type):
+        return permission
+    instance = _permission_instances.get(permission)
+    if instance is None:
+        instance = permission()
+        if getattr(permission, "reusable", False):
+            _permission_instances[permission] = instance
+    return instance
+
+
+_PERMISSION_MEMO_ATTR = "_basekit_permissions_granted"
+
+
+def _permission_memo(request: Any) -> Optional[Dict[Any, bool]]:
+    """Memo de permisos concedidos del request (en ``request.state``), o
+    None si el request no tiene ``state`` (tests, llamadas directas)."""
+    state = getattr(request, "state", None)
+    if state is None:
+        return None
+    memo = getattr(state, _PERMISSION_MEMO_ATTR, None)
+    if not isinstance(memo, dict):
+        memo = {}
+        try:
+            setattr(state, _PERMISSION_MEMO_ATTR, memo)
+        except Exception:
+            return None
+    return memo
+
+
+def _permission_key(permission: Any) -> Any:
+    return permission if isinstance(permission, type) else id(permission)
+
+from ...responses import BaseKitJSONResponse
 from ...schema.base import BasePaginationResponse, BaseResponse
 from ...exceptions.api_exceptions import PermissionException
 
+logger = logging.getLogger(__name__)
+
+
+def _as_utc(value: datetime) -> datetime:
+    """Fecha aware en UTC; una naive (SQLite, Mongo) se asume UTC."""
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def _weak(tag: str) -> str:
+    return tag[2:] if tag.startswith("W/") else tag
+
 
 class BaseController:
     """Montar rutas CRUD genericas y captura errores de negocio."""
@@ -79,6 +306,40 @@ class BaseController:
     # DRF Style: Permisos globales por defecto
     permission_classes: ClassVar[List[Type[BasePermission]]] = []
 
+    # Cache stale-while-revalidate de `list` (ver `_cached_list`).
+    # `list_cache_ttl`: segundos de frescura (None = desactivado);
+    # `list_cache_stale_ttl`: segundos extra en que se sirve vencido mientras
+    # se refresca; `list_cache_backend`: None = LRU en proceso compartido.
+    list_cache_ttl: ClassVar[Optional[float]] = None
+    list_cache_stale_ttl: ClassVar[float] = 30
+    list_cache_backend: ClassVar[Optional[BaseCacheBackend]] = None
+
+    # GET condicional (ver `_respond_list` / `_respond_retrieve`).
+    # `conditional_get`: emite ETag (y Last-Modified en `retrieve`) desde el
+    # `validator_field` del repositorio y responde 304 a
+    # `If-None-Match`/`If-Modified-Since` antes de cargar filas.
+    # `cache_control`: valor del header `Cache-Control` de list/retrieve
+    # (p. ej. "private, max-age=0, must-revalidate"); None = no se emite.
+    conditional_get: ClassVar[bool] = False
+    cache_control: ClassVar[Optional[str]] = None
+
+    # True: `list`/`retrieve` devuelven un `Response` ya serializado con el
+    # envelope compilado de `schema_class` (ver `serialize_response`), sin
+    # copia a dict por ítem ni re-validación de FastAPI.
+    compiled_responses: ClassVar[bool] = False
+
+    # Clase de las respuestas de list/retrieve (con o sin cache, GET
+    # condicional o `compiled_responses`): el envelope no pasa por
+    # `jsonable_encoder` de FastAPI.
+    response_class: ClassVar[Type[Response]] = BaseKitJSONResponse
+
+    # Lecturas confiables (ver `_hydrate_items`): las filas de `list` se
+    # convierten al schema con `model_construct` desde los atributos, sin
+    # validar cada una; 1 de cada `trusted_sample_rate` sí se valida (0 =
+    # ninguna) y, si falla, el listado sigue por la validación normal.
+    trusted_reads: ClassVar[bool] = False
+    trusted_sample_rate: ClassVar[int] = 100
+
     request: Request
 
     @property
@@ -129,6 +390,22 @@ class BaseController:
         "validated_data",
     }
 
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        # Compila los envelopes del `schema_class` declarado al definir la
+        # clase, no en el primer request.
+        schema = cls.__dict__.get("schema_class")
+        if isinstance(schema, type) and issubclass(schema, BaseModel):
+            _envelope_for(schema, False)
+            _envelope_for(schema, True)
+        # Ídem el set de excluidos de `_params` y los permisos declarados.
+        cls._excluded_params()
+        for permission in cls.__dict__.get("permission_classes") or ():
+            try:
+                _permission_instance(permission)
+            except Exception:
+                pass  # p. ej. constructor con argumentos: falla al usarla
+
     def __init__(self) -> None:
         """Inicializa el controller."""
         pass
@@ -184,17 +461,84 @@ class BaseController:
     async def check_permissions(self):
         """Run each declared permission. Raises ``PermissionException``
         on the first denial.
+
+        Permission classes are instantiated per call, or once per process
+        when they declare ``BasePermission.reusable``. Consecutive permissions marked
+        ``independent`` run concurrently; the first denial cancels the
+        siblings still pending. Granted permissions are memoized on
+        ``request.state`` for the rest of the request
+        (``BasePermission.memoize``).
         """
+        memo = _permission_memo(self.request)
+        group: List[Tuple[Any, BasePermission]] = []
         for permission_class in self.get_permissions():
-            permission = permission_class()
-            has_perm = await permission.has_permission(self.request)
-            if not has_perm:
-                message = getattr(
-                    permission,
-                    "message_exception",
-                    "No tienes permiso para realizar esta acción.",
+            key = _permission_key(permission_class)
+            if memo is not None and key in memo:
+                continue
+            permission = _permission_instance(permission_class)
+            if getattr(permission, "independent", False):
+                group.append((key, permission))
+                continue
+            if group:
+                await self._check_permission_group(group, memo)
+                group = []
+            await self._check_permission_group([(key, permission)], memo)
+        if group:
+            await self._check_permission_group(group, memo)
+
+    async def _check_permission_group(
+        self,
+        group: List[Tuple[Any, BasePermission]],
+        memo: Optional[Dict[Any, bool]],
+    ) -> None:
+        """Evalúa ``group`` (en paralelo si tiene más de una) y lanza
+        ``PermissionException`` con el mensaje de la primera que niega."""
+        if len(group) == 1:
+            key, permission = group[0]
+            if not await permission.has_permission(self.request):
+                self._deny(permission)
+            self._remember(memo, key, permission)
+            return
+        tasks = {
+            asyncio.ensure_future(permission.has_permission(self.request)): (
+                key,
+                permission,
+            )
+            for key, permission in group
+        }
+        order = {task: index for index, task in enumerate(tasks)}
+        pending = set(tasks)
+        try:
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
                 )
-                raise PermissionException(message)
+                # Orden declarado entre las que terminaron juntas: el mensaje
+                # no depende de cuál resolvió primero dentro del mismo tick.
+                for task in sorted(done, key=order.__getitem__):
+                    key, permission = tasks[task]
+                    if not task.result():
+                        self._deny(permission)
+                    self._remember(memo, key, permission)
+        finally:
+            for task in pending:
+                task.cancel()
+
+    @staticmethod
+    def _remember(
+        memo: Optional[Dict[Any, bool]], key: Any, permission: BasePermission
+    ) -> None:
+        if memo is not None and getattr(permission, "memoize", True):
+            memo[key] = True
+
+    @staticmethod
+    def _deny(permission: BasePermission) -> None:
+        message = getattr(
+            permission,
+            "message_exception",
+            "No tienes permiso para realizar esta acción.",
+        )
+        raise PermissionException(message)
 
     async def check_permissions_class(self):
         """Backward-compat alias for ``check_permissions``.
@@ -218,23 +562,347 @@ class BaseController:
     async def list(self):
         await self.prepare_action("list")
         params = self._params()
-        items, total = await self.service.list(**params)
+
+        async def _load():
+            items, total = await self.service.list(**params)
+            pagination = self._pagination(params, total)
+            return self._render(data=items, pagination=pagination)
+
+        return await self._respond_list(params, _load)
+
+    def _pagination(
+        self, params: Dict[str, Any], total: Optional[int]
+    ) -> Dict[str, Any]:
+        """Bloque ``pagination`` de ``list`` según la ``total_strategy`` del
+        service: con ``"has_next"`` el total es una cota y solo se informa si
+        hay página siguiente; sin total (``"none"``) no hay ``total_pages``.
+        """
         count = params.get("count") or 0
         page = params.get("page") or 1
-
+        strategy = getattr(self.service, "total_strategy", None)
+        if strategy == "has_next" and total is not None:
+            return {
+                "page": page,
+                "count": count,
+                "total": None,
+                "total_pages": None,
+                "has_next": total > page * count,
+            }
+        if total is None:
+            return {
+                "page": page,
+                "count": count,
+                "total": None,
+                "total_pages": None,
+            }
         total_pages = (total + count - 1) // count if count > 0 else 0
-        pagination = {
+        return {
             "page": page,
             "count": count,
             "total": total,
             "total_pages": total_pages,
         }
-        return self.format_response(data=items, pagination=pagination)
+
+    def _list_cache_enabled(self) -> bool:
+        """True si el controller declara `list_cache_ttl`."""
+        ttl = self.list_cache_ttl
+        return isinstance(ttl, (int, float)) and ttl > 0
+
+    def get_list_cache_scope(self) -> Any:
+        """Sobrescribe para agregar a la clave del cache de `list` el scoping
+        que NO pasa por `service.get_filters` (p. ej. un filtro por usuario
+        aplicado en `build_list_queryset`). Debe ser serializable a JSON."""
+        return None
+
+    def _view_name(self) -> str:
+        """Controller + schema: dos vistas del mismo modelo no comparten
+        bytes cacheados ni ETag."""
+        schema = self.get_schema_class()
+        controller = type(self)
+        return (
+            f"{controller.__module__}.{controller.__qualname__}:"
+            f"{schema.__module__}.{schema.__qualname__}"
+        )
+
+    def _list_identity(self, params: Dict[str, Any]) -> str:
+        """Digest de vista + `_params()` normalizados + el scope efectivo de
+        `service.get_filters` (tenant, owner…), para que dos scopes nunca
+        compartan página (ni ETag)."""
+        scope = self.service.get_filters(dict(params.get("filters") or {}))
+        raw = json.dumps(
+            {
+                "view": self._view_name(),
+                "params": params,
+                "scope": scope,
+                "extra": self.get_list_cache_scope(),
+            },
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    def _list_cache_key(self, params: Dict[str, Any]) -> str:
+        """Clave del listado: modelo + generación + `_list_identity`."""
+        model = self.service.repository.model
+        return (
+            f"basekit:list:{model_namespace(model)}:"
+            f"g{get_generation(model)}:{self._list_identity(params)}"
+        )
+
+    async def _cached_list(
+        self,
+        params: Dict[str, Any],
+        load: Callable[[], Awaitable[BaseModel]],
+    ) -> Response:
+        """Sirve `list` desde el cache SWR; `load()` produce la respuesta
+        (BaseModel) en un miss o refresco y se guarda serializada. El
+        refresco corre en segundo plano dentro de `service.detached()` (si
+        existe; en SQL, una sesión propia), no con la sesión del request."""
+        cache = StaleWhileRevalidateCache(
+            self.list_cache_backend or get_default_cache_backend(),
+            ttl=self.list_cache_ttl,
+            stale_ttl=self.list_cache_stale_ttl,
+        )
+
+        async def _render() -> bytes:
+            return self._response_body(await load())
+
+        async def _refresh() -> bytes:
+            detached = getattr(self.service, "detached", None)
+            if detached is None:
+                return await _render()
+            async with detached():
+                return await _render()
+
+        body = await cache.get_or_load(
+            self._list_cache_key(params), _render, refresh=_refresh
+        )
+        return self.response_class(content=body)
 
     async def retrieve(self, id: str):
         await self.prepare_action("retrieve")
-        item = await self.service.retrieve(id)
-        return self.format_response(data=item)
+        return await self._respond_retrieve(id)
+
+    def _retrieve_cache_enabled(self) -> bool:
+        """True si el servicio tiene `cache_ttl` (cache de `retrieve`)."""
+        ttl = getattr(self.service, "cache_ttl", None)
+        return isinstance(ttl, (int, float)) and ttl > 0
+
+    async def _cached_retrieve(self, id: str, **kwargs: Any) -> Response:
+        """`retrieve` vía `service.retrieve_cached`: la respuesta completa se
+        cachea serializada (JSON) y un hit se devuelve tal cual, sin
+        `format_response` ni validación. La variante incluye controller y
+        schema para que dos vistas del mismo modelo no compartan bytes."""
+        body = await self.service.retrieve_cached(
+            id,
+            render=lambda obj: self._response_body(self._render(data=obj)),
+            variant=self._view_name(),
+            **kwargs,
+        )
+        return self.response_class(content=body)
+
+    async def _respond_list(
+        self,
+        params: Dict[str, Any],
+        load: Callable[[], Awaitable[BaseModel]],
+    ) -> Any:
+        """Responde `list`: 304 si el ETag del cliente sigue vigente; si no,
+        cache SWR (si está activo) o `load()`, con ETag/Cache-Control.
+
+        El ETag sale de `service.list_validator` — `(max(updated_at), count)`
+        del conjunto filtrado en una sola query/`$group` — más la identidad
+        del listado. No se emite Last-Modified: un borrado puede bajar el
+        count sin mover el máximo, y If-Modified-Since no lo vería."""
+        etag = None
+        if self.conditional_get:
+            validator = await self.service.list_validator(**params)
+            if validator is not None:
+                etag = self._make_etag(self._list_identity(params), validator)
+                if self._is_not_modified(etag, None):
+                    return self._not_modified(etag, None)
+        if self._list_cache_enabled():
+            response = await self._cached_list(params, load)
+        else:
+            response = await load()
+        return self._with_validators(response, etag, None)
+
+    async def _respond_retrieve(self, id: str, **kwargs: Any) -> Any:
+        """Responde `retrieve`: 304 si ETag/Last-Modified del cliente siguen
+        vigentes (leyendo solo `validator_field` de la fila); si no, cache de
+        `retrieve` (si está activo) o `service.retrieve`."""
+        etag = last_modified = None
+        if self.conditional_get:
+            validator = await self.service.retrieve_validator(id)
+            if validator is not None:
+                identity = json.dumps(
+                    {"view": self._view_name(), "id": str(id), **kwargs},
+                    sort_keys=True,
+                    default=str,
+                )
+                etag = self._make_etag(identity, validator)
+                if isinstance(validator, datetime):
+                    last_modified = _as_utc(validator)
+                if self._is_not_modified(etag, last_modified):
+                    return self._not_modified(etag, last_modified)
+        if self._retrieve_cache_enabled():
+            response = await self._cached_retrieve(id, **kwargs)
+        else:
+            item = await self.service.retrieve(id, **kwargs)
+            response = self._render(data=item)
+        return self._with_validators(response, etag, last_modified)
+
+    @staticmethod
+    def _make_etag(identity: str, validator: Any) -> str:
+        """ETag débil: la representación depende del schema/serializador, no
+        solo de los bytes de la fila."""
+        raw = json.dumps([identity, validator], default=str)
+        return f'W/"{hashlib.sha256(raw.encode()).hexdigest()[:32]}"'
+
+    def _is_not_modified(
+        self, etag: str, last_modified: Optional[datetime]
+    ) -> bool:
+        """RFC 9110 §13.2.2: `If-None-Match` manda (comparación débil); sin
+        él, `If-Modified-Since` a precisión de segundos."""
+        headers = self.request.headers
+        if_none_match = headers.get("if-none-match")
+        if if_none_match is not None:
+            tags = [tag.strip() for tag in if_none_match.split(",")]
+            if "*" in tags:
+                return True
+            return _weak(etag) in {_weak(tag) for tag in tags}
+        if_modified_since = headers.get("if-modified-since")
+        if if_modified_since is None or last_modified is None:
+            return False
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        return last_modified.replace(microsecond=0) <= _as_utc(since)
+
+    def _validator_headers(
+        self, etag: Optional[str], last_modified: Optional[datetime]
+    ) -> Dict[str, str]:
+        headers: Dict[str, str] = {}
+        if etag is not None:
+            headers["ETag"] = etag
+        if last_modified is not None:
+            headers["Last-Modified"] = format_datetime(
+                last_modified, usegmt=True
+            )
+        if self.cache_control:
+            headers["Cache-Control"] = self.cache_control
+        return headers
+
+    def _not_modified(
+        self, etag: Optional[str], last_modified: Optional[datetime]
+    ) -> Response:
+        return Response(
+            status_code=304,
+            headers=self._validator_headers(etag, last_modified),
+        )
+
+    def _with_validators(
+        self,
+        response: Any,
+        etag: Optional[str],
+        last_modified: Optional[datetime],
+    ) -> Any:
+        """Agrega ETag/Last-Modified/Cache-Control. Un BaseModel (p. ej. de
+        un `_render` sobrescrito) se serializa a `Response` solo si hay
+        headers que poner; si no, se devuelve tal cual para FastAPI."""
+        headers = self._validator_headers(etag, last_modified)
+        if not headers:
+            return response
+        if not isinstance(response, Response):
+            response = self.response_class(
+                content=self._response_body(response)
+            )
+        response.headers.update(headers)
+        return response
+
+    def _render(
+        self, data: Any, pagination: Optional[Dict[str, Any]] = None
+    ) -> Any:
+        """Respuesta de list/retrieve: `response_class` con el envelope
+        compilado si `compiled_responses`, si no con el BaseModel de
+        `format_response` (que `response_class` serializa directo, sin
+        `jsonable_encoder`)."""
+        if self.trusted_reads and isinstance(data, list):
+            data = self._hydrate_items(data)
+        if self.compiled_responses:
+            return self.response_class(
+                content=self.serialize_response(data, pagination=pagination)
+            )
+        return self.response_class(
+            content=self.format_response(data=data, pagination=pagination)
+        )
+
+    def _hydrate_items(self, items: List[Any]) -> List[Any]:
+        """Filas ORM/Documents → instancias del schema vía `hydrator_for`
+        (``from_attributes``). Ante cualquier error (fila muestreada
+        inválida, atributo lazy no cargado) devuelve ``items`` tal cual."""
+        schema = self.get_schema_class()
+        hydrator = hydrator_for(schema, from_attributes=True)
+        try:
+            return [
+                item
+                if isinstance(item, schema)
+                else hydrator.hydrate(item, self.trusted_sample_rate)
+                for item in items
+            ]
+        except Exception as exc:
+            logger.warning(
+                "trusted_reads: %s no se pudo hidratar sin validar (%s); "
+                "se valida el listado completo",
+                getattr(schema, "__name__", schema),
+                exc,
+            )
+            return items
+
+    @staticmethod
+    def _response_body(response: Any) -> bytes:
+        if isinstance(response, Response):
+            return bytes(response.body)
+        return response.model_dump_json().encode()
+
+    def serialize_response(
+        self,
+        data: Any,
+        pagination: Optional[Dict[str, Any]] = None,
+        message: Optional[str] = None,
+        response_status: str = "success",
+    ) -> bytes:
+        """JSON del envelope en un solo paso: ORM/Documents validados con
+        `from_attributes` contra el envelope compilado del schema (por
+        controller/acción vía `get_schema_class`) y volcados por el
+        serializador de Pydantic. Si los datos no encajan en el schema (p. ej.
+        un endpoint custom), cae a `format_response`."""
+        envelope = _envelope_for(self.get_schema_class(), bool(pagination))
+        if envelope is not None:
+            payload: Dict[str, Any] = {
+                "data": data,
+                "message": message or "Operación exitosa",
+                "status": response_status,
+            }
+            if pagination:
+                payload["pagination"] = pagination
+            try:
+                validated = envelope.model_validate(
+                    payload, from_attributes=True
+                )
+                return validated.model_dump_json().encode()
+            except Exception:
+                pass
+        return (
+            self.format_response(
+                data,
+                pagination=pagination,
+                message=message,
+                response_status=response_status,
+            )
+            .model_dump_json()
+            .encode()
+        )
 
     async def create(self, validated_data: Any):
         await self.prepare_action("create")
@@ -285,12 +953,20 @@ class BaseController:
             ):
                 data_parsed = [self.to_dict(item) for item in data]
             else:
-                data_dicts = [self.to_dict(item) for item in data]
+                # Directo desde los atributos (sin copia a dict por ítem);
+                # si falla (p. ej. relación lazy no cargada) se reintenta
+                # con `to_dict`, como antes.
+                adapter = _list_adapter_for(schema)
                 try:
-                    adapter = TypeAdapter(List[schema])
-                    data_parsed = adapter.validate_python(data_dicts)
+                    data_parsed = adapter.validate_python(
+                        data, from_attributes=True
+                    )
                 except Exception:
-                    data_parsed = data_dicts
+                    data_dicts = [self.to_dict(item) for item in data]
+                    try:
+                        data_parsed = adapter.validate_python(data_dicts)
+                    except Exception:
+                        data_parsed = data_dicts
 
         elif isinstance(data, dict):
             try:
@@ -342,35 +1018,68 @@ class BaseController:
         llaman ``super()._params(skip_frames + 1)`` (p.ej. mixins de path
         params). Ya no se usa: la coerción no depende de frames. No lo pases en
         código nuevo.
+
+        La clasificación (estándar / excluido / filtro) y el coercer de cada
+        parámetro declarado salen de un plan compilado por endpoint
+        (``_endpoint_param_plan_cached``); aquí solo queda un loop. Una clave
+        repetida (``status=a&status=b``) o anotada ``List[X]`` llega como
+        lista al filtro, que el repositorio traduce a IN.
         """
-        query_params = (
-            dict(self.request.query_params) if self.request else {}
+        request = self.request
+        query_params = request.query_params if request else {}
+        multi_items = getattr(query_params, "multi_items", None)
+        items = multi_items() if multi_items else query_params.items()
+        excluded = self._excluded_params()
+        coerce = self._coerce_override()
+        plan = self._param_plan(excluded, coerce)
+        undeclared = (
+            _identity
+            if coerce is None
+            else functools.partial(_call_coerce, coerce, None)
         )
-        declared = self._endpoint_param_types()
 
-        standard_params = {"page", "count", "search", "order_by"}
         page = 1
         count = 10
         search = None
         order_by = None
         filters: Dict[str, Any] = {}
+        repeated: Set[str] = set()
 
-        for param_name, raw_value in query_params.items():
-            value = self._coerce_param(raw_value, declared.get(param_name))
+        for param_name, raw_value in items:
+            entry = plan.get(param_name)
+            if entry is None:  # no declarado en la firma → string
+                entry = (
+                    _classify_param(param_name, excluded),
+                    undeclared,
+                    False,
+                )
+            kind, coercer, many = entry
+            if kind == _PARAM_EXCLUDED:
+                continue
+            value = raw_value
+            if isinstance(raw_value, str):
+                value = coercer(raw_value)
 
-            if param_name == "page":
+            if kind == _PARAM_FILTER:
+                # Clave repetida (`status=a&status=b`) o `List[X]` → lista
+                # (IN en el repositorio).
+                if many:
+                    filters.setdefault(param_name, []).append(value)
+                elif param_name not in filters:
+                    filters[param_name] = value
+                elif param_name in repeated:
+                    filters[param_name].append(value)
+                else:
+                    filters[param_name] = [filters[param_name], value]
+                    repeated.add(param_name)
+            elif param_name == "page":
                 page = self._as_int(value, 1)
             elif param_name == "count":
                 count = self._as_int(value, 10)
             elif param_name == "search":
                 search = value
-            elif param_name == "order_by":
+            else:
                 order_by = value
-            elif (
-                param_name not in standard_params
-                and param_name not in self._params_excluded_fields
-            ):
-                filters[param_name] = value
 
         return {
             "page": page,
@@ -380,6 +1089,57 @@ class BaseController:
             "filters": filters,
         }
 
+    @classmethod
+    def _excluded_params(cls) -> FrozenSet[str]:
+        """``_params_excluded_fields`` congelado (clave del plan), calculado
+        una vez por clase mientras el set declarado no se reemplace."""
+        fields = cls._params_excluded_fields
+        cached = cls.__dict__.get("_params_excluded_cache")
+        if cached is None or cached[0] is not fields:
+            cached = (fields, frozenset(fields))
+            cls._params_excluded_cache = cached
+        return cached[1]
+
+    def _current_endpoint(self) -> Any:
+        """Función de ruta que FastAPI está ejecutando, o None."""
+        request = getattr(self, "request", None)
+        scope = getattr(request, "scope", None) if request is not None else None
+        return scope.get("endpoint") if isinstance(scope, dict) else None
+
+    def _coerce_override(self) -> Optional[Callable[[Any, Any], Any]]:
+        """``_coerce_param`` de la subclase si lo overridea; None con el de
+        ``BaseController`` (el plan usa entonces los coercers compilados)."""
+        coerce = type(self)._coerce_param
+        if coerce is BaseController._coerce_param:
+            return None
+        return coerce
+
+    def _param_plan(
+        self,
+        excluded: FrozenSet[str],
+        coerce: Optional[Callable[[Any, Any], Any]] = None,
+    ) -> Dict[str, Tuple[str, Callable[[str], Any], bool]]:
+        """Plan compilado del endpoint activo (``{}`` sin endpoint).
+
+        Si la subclase overridea ``_endpoint_param_types`` el plan se arma
+        con sus tipos en cada request (no hay clave de cache confiable).
+        """
+        if (
+            type(self)._endpoint_param_types
+            is not BaseController._endpoint_param_types
+        ):
+            return _build_param_plan(
+                self._endpoint_param_types(), excluded, coerce
+            )
+        endpoint = self._current_endpoint()
+        if endpoint is None:
+            return {}
+        try:
+            return _endpoint_param_plan_cached(endpoint, excluded, coerce)
+        except TypeError:
+            # endpoint no hasheable (raro) → sin coerción, valores string.
+            return {}
+
     def _endpoint_param_types(self) -> Dict[str, Any]:
         """Mapea {nombre_param: anotación} desde la firma del endpoint activo.
 
@@ -387,9 +1147,7 @@ class BaseController:
         ejecutando) y delega en el cache por-endpoint. Devuelve ``{}`` si no hay
         endpoint o su firma no es introspectable (los valores quedan como string).
         """
-        request = getattr(self, "request", None)
-        scope = getattr(request, "scope", None) if request is not None else None
-        endpoint = scope.get("endpoint") if isinstance(scope, dict) else None
+        endpoint = self._current_endpoint()
         if endpoint is None:
             return {}
         try:
@@ -406,36 +1164,19 @@ class BaseController:
         vía pydantic ``TypeAdapter`` — el MISMO motor que usa FastAPI, para que
         el filtro reciba el objeto tipado (ej. un `date` real que compara contra
         una columna DATE) y no el string. Sin anotación, str, o si la coacción
-        falla → se devuelve el valor original sin romper.
+        falla → se devuelve el valor original sin romper. ``List[X]``
+        coacciona a ``X``.
+
+        Delega en el coercer compilado (``_compile_coercer``) que usa el plan
+        de ``_params``; una subclase que lo overridee se respeta en el plan.
 
         Nota: FastAPI ya rechaza (422) un query param tipado con valor inválido
         antes de llegar acá, así que en la práctica la coacción siempre aplica.
         """
         if annotation is None or not isinstance(raw, str):
             return raw
-        target = _unwrap_optional(annotation)
-        if target is bool:
-            return raw.strip().lower() in {"1", "true", "t", "yes", "on"}
-        if target is int:
-            try:
-                return int(raw)
-            except (TypeError, ValueError):
-                return raw
-        if target is float:
-            try:
-                return float(raw)
-            except (TypeError, ValueError):
-                return raw
-        if target is str or target is Any:
-            return raw
-        # date / datetime / UUID / Decimal / Enum / etc. → pydantic (FastAPI-parity)
-        adapter = _type_adapter_for(target)
-        if adapter is None:
-            return raw
-        try:
-            return adapter.validate_python(raw)
-        except Exception:
-            return raw
+        coercer, _ = _coercer_for(annotation)
+        return coercer(raw)
 
     @staticmethod
     def _as_int(value: Any, default: int) -> int:
@@ -0,0 +1,243 @@
+"""Hidratación rápida de datos confiables (`hydrator_for`).
+
+Para listados de datos que escribimos nosotros (exportes de 500 filas, etc.)
+la validación completa de Pydantic por fila es la mayor parte del CPU. El
+hidratador arma las instancias con ``model_construct`` a partir de un plan
+compilado una vez por modelo (clave de lectura, requerido o no, y un
+arreglo liviano de tipo por campo: ``str`` → ObjectId/datetime/UUID/Enum,
+DBRef → ``Link``, dict → modelo anidado).
+
+Cada ``sample_every`` filas una se valida completa con ``model_validate``:
+si no valida, `hydrate` propaga el error igual que el camino normal, así la
+corrupción sigue apareciendo en los logs. Una fila a la que le falta un
+campo requerido también pasa por la validación completa.
+"""
+
+import itertools
+import logging
+import types
+from datetime import date, datetime
+from decimal import Decimal
+from enum import Enum
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type, Union
+from typing import get_args, get_origin
+from uuid import UUID
+
+from pydantic import BaseModel
+
+try:  # pragma: no cover - dependencia opcional
+    from bson import DBRef, Decimal128, ObjectId  # type: ignore
+except ImportError:  # pragma: no cover
+    DBRef = Decimal128 = ObjectId = None  # type: ignore[assignment,misc]
+
+try:  # pragma: no cover - dependencia opcional
+    from beanie import Link  # type: ignore
+except ImportError:  # pragma: no cover
+    Link = None  # type: ignore[assignment,misc]
+
+logger = logging.getLogger(__name__)
+
+_UNION_TYPES = (Union, types.UnionType)
+_MISSING = object()
+
+Fixer = Callable[[Any], Any]
+
+
+def _unwrap_optional(annotation: Any) -> Any:
+    if get_origin(annotation) in _UNION_TYPES:
+        args = [a for a in get_args(annotation) if a is not type(None)]
+        if len(args) == 1:
+            return args[0]
+    return annotation
+
+
+def _is_subclass(annotation: Any, base: Any) -> bool:
+    return (
+        base is not None
+        and isinstance(annotation, type)
+        and issubclass(annotation, base)
+    )
+
+
+def _fix_str(value: Any) -> Any:
+    if ObjectId is not None and isinstance(value, ObjectId):
+        return str(value)
+    if isinstance(value, UUID):
+        return str(value)
+    return value
+
+
+def _fix_datetime(value: Any) -> Any:
+    if isinstance(value, str):
+        return datetime.fromisoformat(value)
+    return value
+
+
+def _fix_date(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, str):
+        return date.fromisoformat(value)
+    return value
+
+
+def _fix_uuid(value: Any) -> Any:
+    if isinstance(value, str):
+        return UUID(value)
+    if hasattr(value, "as_uuid"):  # bson.Binary subtipo 4
+        return value.as_uuid()
+    return value
+
+
+def _fix_decimal(value: Any) -> Any:
+    if Decimal128 is not None and isinstance(value, Decimal128):
+        return value.to_decimal()
+    return value
+
+
+def _type_fixer(target: type) -> Fixer:
+    def fix(value: Any) -> Any:
+        if type(value) is target:
+            return value
+        return target(value)
+
+    return fix
+
+
+def _list_fixer(item_fixer: Fixer) -> Fixer:
+    def fix(value: Any) -> Any:
+        if isinstance(value, list):
+            return [
+                None if item is None else item_fixer(item) for item in value
+            ]
+        return value
+
+    return fix
+
+
+def _link_fixer(target: Any, from_attributes: bool) -> Fixer:
+    def fix(value: Any) -> Any:
+        if isinstance(value, DBRef):
+            return Link(value, target)
+        if isinstance(value, dict) or (
+            from_attributes and not isinstance(value, (Link, BaseModel))
+        ):
+            return hydrator_for(target, from_attributes).construct(value)
+        return value
+
+    return fix
+
+
+def _model_fixer(target: Type[BaseModel], from_attributes: bool) -> Fixer:
+    def fix(value: Any) -> Any:
+        if isinstance(value, target):
+            return value
+        if isinstance(value, dict) or from_attributes:
+            return hydrator_for(target, from_attributes).construct(value)
+        return value
+
+    return fix
+
+
+def _fixer_for(annotation: Any, from_attributes: bool) -> Optional[Fixer]:
+    """Arreglo liviano de tipo para ``annotation`` (None = el valor se usa
+    tal cual)."""
+    annotation = _unwrap_optional(annotation)
+    origin = get_origin(annotation)
+    if Link is not None and origin is Link:
+        return _link_fixer(get_args(annotation)[0], from_attributes)
+    if origin in (list, List):
+        args = get_args(annotation)
+        item = _fixer_for(args[0], from_attributes) if args else None
+        return _list_fixer(item) if item is not None else None
+    if origin is not None:
+        return None
+    if annotation is str:
+        return _fix_str
+    if _is_subclass(annotation, ObjectId):
+        return _type_fixer(annotation)
+    if _is_subclass(annotation, datetime):
+        return _fix_datetime
+    if _is_subclass(annotation, date):
+        return _fix_date
+    if _is_subclass(annotation, Enum):
+        return _type_fixer(annotation)
+    if _is_subclass(annotation, UUID):
+        return _fix_uuid
+    if _is_subclass(annotation, Decimal):
+        return _fix_decimal
+    if _is_subclass(annotation, BaseModel):
+        return _model_fixer(annotation, from_attributes)
+    return None
+
+
+class TrustedHydrator:
+    """Constructor compilado de ``model`` para filas confiables.
+
+    ``from_attributes=True`` lee los campos por atributo (ORM, Documents)
+    en vez de por clave de dict.
+    """
+
+    def __init__(self, model: Type[BaseModel], from_attributes: bool = False):
+        self.model = model
+        self.from_attributes = from_attributes
+        #: ``(nombre, clave de lectura, requerido, fixer)`` por campo.
+        self.plan: Tuple[Tuple[str, str, bool, Optional[Fixer]], ...] = (
+            tuple(
+                (
+                    name,
+                    self._read_key(name, info),
+                    info.is_required(),
+                    _fixer_for(info.annotation, from_attributes),
+                )
+                for name, info in model.model_fields.items()
+            )
+        )
+        self._seen = itertools.count()
+
+    @staticmethod
+    def _read_key(name: str, info: Any) -> str:
+        if isinstance(info.validation_alias, str):
+            return info.validation_alias
+        return info.alias or name
+
+    def _read(self, row: Any, key: str) -> Any:
+        if self.from_attributes:
+            return getattr(row, key, _MISSING)
+        return row.get(key, _MISSING)
+
+    def _validate(self, row: Any) -> BaseModel:
+        return self.model.model_validate(
+            row, from_attributes=self.from_attributes or None
+        )
+
+    def construct(self, row: Any) -> BaseModel:
+        """Instancia sin validar; cae a `model_validate` si a la fila le
+        falta un campo requerido."""
+        values: Dict[str, Any] = {}
+        for name, key, required, fixer in self.plan:
+            value = self._read(row, key)
+            if value is _MISSING:
+                if required:
+                    return self._validate(row)
+                continue
+            if fixer is not None and value is not None:
+                value = fixer(value)
+            values[name] = value
+        return self.model.model_construct(**values)
+
+    def hydrate(self, row: Any, sample_every: int = 100) -> BaseModel:
+        """`construct` de ``row``; 1 de cada ``sample_every`` filas (0 =
+        ninguna) se valida completa y su error se propaga."""
+        if sample_every > 0 and next(self._seen) % sample_every == 0:
+            return self._validate(row)
+        return self.construct(row)
+
+
+@lru_cache(maxsize=256)
+def hydrator_for(
+    model: Type[BaseModel], from_attributes: bool = False
+) -> TrustedHydrator:
+    """`TrustedHydrator` de ``model`` (compilado una vez por modelo)."""
+    return TrustedHydrator(model, from_attributes)
@@ -0,0 +1,3 @@
+from .auth import AuthenticationMiddleware, CachedUserResolver
+
+__all__ = ["AuthenticationMiddleware", "CachedUserResolver"]
@@ -0,0 +1,202 @@
+"""Middleware de autenticación JWT en ASGI puro, con cache de usuarios.
+
+``AuthenticationMiddleware`` verifica el bearer token con el ``JWTService``
+compartido del proceso (``get_jwt_service``) y deja en ``request.state``:
+
+- ``auth_sub``: el ``sub`` verificado del token.
+- ``auth_token``: el ``TokenSchema`` decodificado.
+- ``user``: el usuario, si se configuró un ``resolver``.
+
+Es ASGI puro (no ``BaseHTTPMiddleware``): no crea una task ni un memory
+stream por request y no toca el body.
+
+``CachedUserResolver`` cachea ``sub`` → usuario (LRU con TTL) para que un
+request autenticado no pague la consulta del usuario en cada llamada.
+Invalidar con ``invalidate(sub)`` al editar/desactivar un usuario. Lo que se
+cachea es compartido entre requests: el loader debe devolver un snapshot
+que no dependa de una sesión viva (schema pydantic, documento, instancia ORM
+``expunge``-ada).
+
+Dos modos:
+
+- Eager: ``AuthenticationMiddleware(app, resolver=resolver)`` resuelve el
+  usuario en el middleware (el loader abre su propia sesión en un miss).
+- Lazy: sin ``resolver`` el middleware solo verifica el token; una dependencia
+  llama ``resolver.for_request(request, session)`` y el miss se consulta con la
+  sesión del propio request (sin segunda sesión).
+"""
+
+import time
+from collections import OrderedDict
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Iterable,
+    Optional,
+    Tuple,
+)
+
+from starlette.requests import Request
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from ...exceptions.api_exceptions import JWTAuthenticationException
+from ...servicios.thrid.jwt import JWTService, get_jwt_service
+from ...servicios.thrid.revocation import RevocationList
+
+UserLoader = Callable[..., Awaitable[Optional[Any]]]
+
+
+def _is_active(user: Any) -> bool:
+    return bool(getattr(user, "is_active", True))
+
+
+class CachedUserResolver:
+    """``sub`` → usuario con cache LRU + TTL en proceso.
+
+    Args:
+        load: ``async load(sub, *args)`` → usuario o None. ``args`` son los
+            que reciba ``get`` (p. ej. la sesión del request).
+        ttl: segundos de vida de cada entrada.
+        maxsize: máximo de usuarios cacheados (se descarta el menos usado).
+        is_active: predicado; un usuario inactivo se trata como anónimo.
+        clock: reloj monotónico (inyectable en tests).
+    """
+
+    def __init__(
+        self,
+        load: UserLoader,
+        ttl: float = 60,
+        maxsize: int = 10_000,
+        is_active: Callable[[Any], bool] = _is_active,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.load = load
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.is_active = is_active
+        self.clock = clock
+        self._entries: "OrderedDict[str, Tuple[Any, float]]" = OrderedDict()
+
+    async def get(self, sub: str, *args: Any) -> Optional[Any]:
+        """Usuario activo de ``sub`` (cache o ``load``), o None."""
+        now = self.clock()
+        entry = self._entries.get(sub)
+        if entry is not None and entry[1] > now:
+            self._entries.move_to_end(sub)
+            user = entry[0]
+        else:
+            user = await self.load(sub, *args)
+            if user is None:
+                self._entries.pop(sub, None)
+                return None
+            self._entries[sub] = (user, now + self.ttl)
+            self._entries.move_to_end(sub)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return user if self.is_active(user) else None
+
+    async def for_request(self, request: Request, *args: Any) -> Optional[Any]:
+        """Modo lazy: ``request.state.user`` o el usuario de
+        ``request.state.auth_sub`` (guardado en ``state`` para el resto del
+        request)."""
+        state = request.state
+        user = getattr(state, "user", None)
+        if user is not None:
+            return user
+        sub = getattr(state, "auth_sub", None)
+        if sub is None:
+            return None
+        user = await self.get(sub, *args)
+        if user is not None:
+            state.user = user
+        return user
+
+    def invalidate(self, sub: Any) -> None:
+        """Olvida el usuario de ``sub`` (tras editarlo, desactivarlo…)."""
+        self._entries.pop(str(sub), None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+def _bearer_token(scope: Scope) -> Optional[str]:
+    for name, value in scope.get("headers") or ():
+        if name == b"authorization":
+            scheme, _, token = value.decode("latin-1").partition(" ")
+            if scheme.lower() != "bearer" or not token or " " in token:
+                return None
+            return token
+    return None
+
+
+class AuthenticationMiddleware:
+    """Middleware ASGI: verifica el bearer token y resuelve el usuario.
+
+    Un token inválido, vencido o revocado (``revocation``) deja el request
+    anónimo (la dependencia de usuario actual responde 401). Cualquier otro
+    error (p. ej. la base caída al cargar el usuario) se propaga: no se
+    convierte en un anónimo silencioso.
+
+    Args:
+        app: la app ASGI envuelta.
+        resolver: modo eager; None = solo verifica el token (modo lazy).
+        jwt_service: verificador; None = ``get_jwt_service()``.
+        revocation: lista de revocación (logout/blacklist); None = sin
+            chequeo.
+        excluded_paths: paths exactos sin autenticación.
+        excluded_path_prefixes: prefijos sin autenticación.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        resolver: Optional[CachedUserResolver] = None,
+        jwt_service: Optional[JWTService] = None,
+        revocation: Optional[RevocationList] = None,
+        excluded_paths: Iterable[str] = (),
+        excluded_path_prefixes: Iterable[str] = (),
+    ) -> None:
+        self.app = app
+        self.resolver = resolver
+        self._jwt_service = jwt_service
+        self.revocation = revocation
+        self.excluded_paths = frozenset(excluded_paths)
+        self.excluded_path_prefixes = tuple(excluded_path_prefixes)
+
+    @property
+    def jwt_service(self) -> JWTService:
+        # Perezoso: la config JWT se valida en el primer request, no al
+        # construir la app (que Starlette hace al armar el stack).
+        if self._jwt_service is None:
+            self._jwt_service = get_jwt_service()
+        return self._jwt_service
+
+    def is_excluded(self, path: str) -> bool:
+        return path in self.excluded_paths or path.startswith(
+            self.excluded_path_prefixes
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http" and not self.is_excluded(scope["path"]):
+            token = _bearer_token(scope)
+            if token is not None:
+                await self.authenticate(scope, token)
+        await self.app(scope, receive, send)
+
+    async def authenticate(self, scope: Scope, token: str) -> None:
+        try:
+            payload = self.jwt_service.decode_token(token)
+        except JWTAuthenticationException:
+            return
+        if self.revocation is not None and await self.revocation.is_revoked(
+            payload
+        ):
+            return
+        state = scope.setdefault("state", {})
+        state["auth_sub"] = payload.sub
+        state["auth_token"] = payload
+        if self.resolver is not None:
+            user = await self.resolver.get(payload.sub)
+            if user is not None:
+                state["user"] = user
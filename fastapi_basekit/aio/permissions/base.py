@@ -5,6 +5,23 @@ class BasePermission:
     message_exception: str = "Permiso denegado"
     """Clase base de permisos, para extender según lógica."""
 
+    #: `True`: el controller reutiliza UNA instancia de la clase para todos
+    #: los requests en vez de construirla en cada `check_permissions`. Solo
+    #: para permissions sin estado del request en `self` (ni en `__init__`).
+    reusable: bool = False
+
+    #: Sin dependencias de orden con las demás (no lee estado que otra
+    #: permission deja en `request.state`): `check_permissions` evalúa en
+    #: paralelo las independientes CONSECUTIVAS de la lista y cancela las
+    #: hermanas ante la primera denegación.
+    independent: bool = False
+
+    #: Un permiso CONCEDIDO se recuerda en `request.state` durante el request:
+    #: si otra acción del mismo request (p. ej. un endpoint custom que delega
+    #: en `super().list()`) la vuelve a pedir, no se reevalúa. `False` para
+    #: permisos cuyo resultado cambia a mitad del request.
+    memoize: bool = True
+
     async def has_permission(self, request: Request) -> bool:
         """Sobreescribir con la lógica de permiso."""
         return True
@@ -0,0 +1,241 @@
+"""Matriz rol → acción precargada en memoria.
+
+Los permisos por rol suelen consultar la base en cada request (roles del
+usuario, tabla ``role_permissions``…). ``PermissionMatrix`` carga TODA la
+matriz ``(rol, controller, acción)`` una vez (al arrancar o en el primer uso)
+y responde ``allows`` con búsquedas O(1) en un ``frozenset``.
+
+Refresco:
+
+- ``bump()``: invalida en este proceso; el siguiente chequeo recarga. Un
+  ``bump()`` durante una carga en vuelo deja la matriz invalidada (las filas
+  pueden ser previas) y el chequeo que esperaba esa carga recarga otra vez.
+- ``version``: callable async barato (``SELECT max(version)``, un ``GET`` de
+  Redis) consultado como mucho cada ``version_interval`` segundos; si cambia,
+  el siguiente chequeo recarga. Así un cambio de permisos hecho por otro
+  worker se aplica sin esperar al TTL. Si la consulta (o esa recarga) falla
+  se loguea y se sigue sirviendo la matriz anterior.
+- ``ttl``: respaldo. Vencido, el request que lo detecta recarga y el resto
+  sigue con la matriz anterior mientras tanto; si la recarga falla se loguea
+  y se sigue sirviendo la anterior.
+
+Las cargas concurrentes se unen a la misma (una sola consulta en vuelo).
+
+``"*"`` en controller o acción concede todas.
+"""
+
+import asyncio
+import logging
+import time
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    FrozenSet,
+    Iterable,
+    Optional,
+    Tuple,
+)
+
+from fastapi import Request
+
+from .base import BasePermission
+
+logger = logging.getLogger(__name__)
+
+Grant = Tuple[str, str, str]
+
+_UNSET = object()
+
+
+def _key(value: Any) -> str:
+    """Enums (``UserRoleEnum.admin``) y strings comparan por valor."""
+    return str(getattr(value, "value", value))
+
+
+class PermissionMatrix:
+    """Matriz de permisos ``(rol, controller, acción)`` en memoria.
+
+    Args:
+        loader: callable async que devuelve TODAS las tuplas
+            ``(rol, controller, acción)`` concedidas.
+        ttl: segundos de vida de la matriz cargada (None = sin vencimiento).
+        version: callable async que devuelve la versión actual de los
+            permisos (cualquier valor comparable con ``==``).
+        version_interval: segundos mínimos entre consultas a ``version``.
+        wildcard: comodín para controller/acción.
+        clock: reloj monotónico (inyectable en tests).
+    """
+
+    def __init__(
+        self,
+        loader: Callable[[], Awaitable[Iterable[Tuple[Any, Any, Any]]]],
+        ttl: Optional[float] = 300,
+        version: Optional[Callable[[], Awaitable[Any]]] = None,
+        version_interval: float = 5,
+        wildcard: str = "*",
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.loader = loader
+        self.ttl = ttl
+        self.version = version
+        self.version_interval = version_interval
+        self.wildcard = wildcard
+        self.clock = clock
+        self._grants: FrozenSet[Grant] = frozenset()
+        self._loaded_at: Optional[float] = None
+        self._loaded_version: Any = _UNSET
+        self._version_checked_at = 0.0
+        self._stale = True
+        # Se incrementa en cada `bump()`: una carga solo limpia `_stale` si
+        # no hubo bump desde que empezó.
+        self._generation = 0
+        self._loading: Optional["asyncio.Task[None]"] = None
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded_at is not None
+
+    def bump(self) -> None:
+        """Invalida la matriz: el próximo ``ensure_fresh`` recarga."""
+        self._generation += 1
+        self._stale = True
+
+    async def load(self) -> None:
+        """Carga (o recarga) la matriz completa. Llamadas concurrentes
+        comparten la misma carga."""
+        task = self._loading
+        if task is None or task.done():
+            task = asyncio.ensure_future(self._load())
+            self._loading = task
+        # shield: si este request se cancela, la carga igual termina.
+        await asyncio.shield(task)
+
+    async def _load(self) -> None:
+        # La versión se lee ANTES que las filas: un cambio que ocurra durante
+        # la carga se detecta en la próxima consulta de versión.
+        generation = self._generation
+        version = await self.version() if self.version is not None else None
+        rows = await self.loader()
+        self._grants = frozenset(
+            (_key(role), _key(controller), _key(action))
+            for role, controller, action in rows
+        )
+        self._loaded_version = version
+        self._loaded_at = self._version_checked_at = self.clock()
+        if self._generation == generation:
+            self._stale = False
+
+    async def ensure_fresh(self) -> None:
+        """Recarga si hace falta (ver docstring del módulo)."""
+        if self._stale or self._loaded_at is None:
+            await self.load()
+            if self._stale:
+                # `bump()` durante esa carga: se relee con los cambios.
+                await self.load()
+            return
+        now = self.clock()
+        if (
+            self.version is not None
+            and now - self._version_checked_at >= self.version_interval
+        ):
+            self._version_checked_at = now
+            if await self._version_changed():
+                await self._keep_previous_on_error(self.load)
+                return
+        if self.ttl is None or now - self._loaded_at < self.ttl:
+            return
+        if self._loading is not None and not self._loading.done():
+            return  # otro request ya recarga: se sirve la matriz actual
+        await self._keep_previous_on_error(self.load)
+
+    async def _version_changed(self) -> bool:
+        """Consulta ``version``; si falla se loguea y se toma como sin
+        cambios (se reintenta en ``version_interval``)."""
+        try:
+            return await self.version() != self._loaded_version
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.warning(
+                "Consulta de versión de la matriz de permisos fallida; se "
+                "sirve la anterior",
+                exc_info=True,
+            )
+            return False
+
+    async def _keep_previous_on_error(
+        self, refresh: Callable[[], Awaitable[None]]
+    ) -> None:
+        """Una recarga fallida (base caída) no convierte cada chequeo en un
+        500: se loguea y se sirve la matriz anterior."""
+        try:
+            await refresh()
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.warning(
+                "Recarga de la matriz de permisos fallida; se sirve la "
+                "anterior",
+                exc_info=True,
+            )
+
+    def allows(self, role: Any, controller: Any, action: Any) -> bool:
+        """O(1): ``(rol, controller, acción)`` concedido, con comodines."""
+        role, controller, action = _key(role), _key(controller), _key(action)
+        grants, wildcard = self._grants, self.wildcard
+        return (
+            (role, controller, action) in grants
+            or (role, controller, wildcard) in grants
+            or (role, wildcard, action) in grants
+            or (role, wildcard, wildcard) in grants
+        )
+
+    async def has(self, role: Any, controller: Any, action: Any) -> bool:
+        await self.ensure_fresh()
+        return self.allows(role, controller, action)
+
+
+class MatrixPermission(BasePermission):
+    """Permiso respaldado por una ``PermissionMatrix``.
+
+    El controller y la acción salen del endpoint que FastAPI ejecuta
+    (``UserController.list_users`` → ``("UserController", "list_users")``),
+    la misma convención de nombres de acción que ``get_filters`` /
+    ``get_schema_class``. Los roles salen de ``request.state.user``
+    (``roles`` o ``role``). Sobrescribir ``get_roles`` / ``get_target`` para
+    otra convención.
+    """
+
+    matrix: Optional[PermissionMatrix] = None
+    message_exception: str = "Permiso denegado"
+    # Solo lee `request.state.user` (lo setea el middleware de auth) y no
+    # guarda nada en `self`: una instancia por proceso alcanza.
+    independent: bool = True
+    reusable: bool = True
+
+    def get_roles(self, request: Request) -> Iterable[Any]:
+        user = getattr(request.state, "user", None)
+        if user is None:
+            return ()
+        roles = getattr(user, "roles", None)
+        if roles:
+            return roles
+        role = getattr(user, "role", None)
+        return (role,) if role is not None else ()
+
+    def get_target(self, request: Request) -> Tuple[str, str]:
+        endpoint = request.scope.get("endpoint")
+        parts = getattr(endpoint, "__qualname__", "").split(".")
+        if len(parts) < 2:
+            return "", parts[-1]
+        return parts[-2], parts[-1]
+
+    async def has_permission(self, request: Request) -> bool:
+        matrix = self.matrix
+        roles = self.get_roles(request)
+        if matrix is None or not roles:
+            return False
+        await matrix.ensure_fresh()
+        controller, action = self.get_target(request)
+        return any(matrix.allows(role, controller, action) for role in roles)
@@ -1,7 +1,8 @@
 from .controller.base import SQLAlchemyBaseController
-from .session import make_session_lifecycle
+from .session import make_readonly_session_lifecycle, make_session_lifecycle
 
 __all__ = [
     "SQLAlchemyBaseController",
     "make_session_lifecycle",
+    "make_readonly_session_lifecycle",
 ]
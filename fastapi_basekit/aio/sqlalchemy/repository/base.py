@@ -1,6 +1,9 @@
 from typing import (
     Any,
+    Awaitable,
+    Callable,
     Dict,
+    FrozenSet,
     Generic,
     List,
     Optional,
@@ -11,12 +14,18 @@ from typing import (
     Union,
 )
 from uuid import UUID
+import functools
+import inspect
 import logging
 
 from sqlalchemy import Select, and_, or_, select, func
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Relationship, joinedload, selectinload
 
+from ...cache.base import bump_generation
+from ..session import current_session, on_commit
+from ..timeout import STATEMENT_TIMEOUT_DIALECTS, dialect_name  # noqa: F401
+from ..timeout import run_with_timeout as _run_with_timeout
 from ....exceptions.api_exceptions import NotFoundException
 
 logger = logging.getLogger(__name__)
@@ -26,6 +35,38 @@ logger = logging.getLogger(__name__)
 #: ``get``/``create``/``update``/``list_paginated`` devuelvan ``User`` tipado
 #: (autocompletado + mypy para consumidores e IAs).
 ModelT = TypeVar("ModelT")
+T = TypeVar("T")
+
+
+def list_hook_kwargs(
+    hook: Callable[..., Any], query_kwargs: Dict[str, Any]
+) -> Dict[str, Any]:
+    """Los kwargs de ``query_kwargs`` que acepta ``build_list_queryset``:
+    todos con ``**kwargs``, solo los nombrados si no (ninguno en un override
+    legacy sin argumentos). Se decide por la firma, no atrapando
+    ``TypeError``: uno lanzado DENTRO del override se propaga en vez de
+    reintentar sin filtros."""
+    accepted = _hook_params(getattr(hook, "__func__", hook))
+    if accepted is None:
+        return query_kwargs
+    return {k: v for k, v in query_kwargs.items() if k in accepted}
+
+
+@functools.lru_cache(maxsize=256)
+def _hook_params(func: Callable[..., Any]) -> Optional[FrozenSet[str]]:
+    """Nombres de parámetros por keyword de ``func``; None si tiene
+    ``**kwargs`` (o su firma no se puede leer)."""
+    try:
+        parameters = inspect.signature(func).parameters.values()
+    except (TypeError, ValueError):
+        return None
+    names = set()
+    for param in parameters:
+        if param.kind is param.VAR_KEYWORD:
+            return None
+        if param.kind in (param.KEYWORD_ONLY, param.POSITIONAL_OR_KEYWORD):
+            names.add(param.name)
+    return frozenset(names)
 
 
 class BaseRepository(Generic[ModelT]):
@@ -45,6 +86,10 @@ class BaseRepository(Generic[ModelT]):
 
     model: Type[ModelT]
     service: Optional[Any] = None
+    #: Columna de versión/``updated_at`` usada como validador HTTP (ETag /
+    #: Last-Modified) en GET condicionales. None o ausente en el modelo = el
+    #: controller responde sin validadores.
+    validator_field: Optional[str] = "updated_at"
 
     def __init__(self, db: AsyncSession):
         """Inicializa el repositorio con la sesión a reutilizar."""
@@ -53,7 +98,38 @@ class BaseRepository(Generic[ModelT]):
 
     @property
     def session(self) -> AsyncSession:
-        return self._session
+        return current_session(self._session)
+
+    def _bump_generation(self, model: Optional[Type[Any]] = None) -> None:
+        """Marca una escritura sobre el modelo (invalida listados cacheados).
+
+        Se incrementa ya y otra vez tras el commit, para que un listado que se
+        cachee con datos previos al commit no sobreviva a la escritura.
+        """
+        model = model or self.model
+        if not model:
+            return
+        bump_generation(model)
+        on_commit(
+            self.session,
+            ("generation", model),
+            lambda: bump_generation(model),
+        )
+
+    def _dialect_name(self) -> str:
+        """Nombre del dialecto de la sesión (``""`` si no está ligada)."""
+        return dialect_name(self.session)
+
+    async def run_with_timeout(
+        self,
+        operation: Callable[[], Awaitable[T]],
+        timeout: Optional[float],
+    ) -> T:
+        """Ejecuta ``operation()`` con un tope de ``timeout`` segundos (ver
+        `fastapi_basekit.aio.sqlalchemy.timeout`: cancelación en el
+        servidor en PostgreSQL y MySQL/MariaDB; en el resto solo se
+        abandona el lado cliente)."""
+        return await _run_with_timeout(self.session, operation, timeout)
 
     def _get_field(self, field_name: str):
         """Valida y retorna el atributo (columna) del modelo."""
@@ -449,6 +525,7 @@ class BaseRepository(Generic[ModelT]):
         db.add(obj_in)
         await db.flush()
         await db.refresh(obj_in)
+        self._bump_generation()
         return obj_in
 
     async def _get_one(
@@ -763,12 +840,8 @@ class BaseRepository(Generic[ModelT]):
             "search": search,
             "search_fields": search_fields,
         }
-        try:
-            # Intentar con argumentos (subclases modernas)
-            queryset = self.build_list_queryset(**query_kwargs)
-        except TypeError:
-            # Fallback sin argumentos (subclases legacy)
-            queryset = self.build_list_queryset()
+        hook = self.build_list_queryset
+        queryset = hook(**list_hook_kwargs(hook, query_kwargs))
 
         # 2. Aplicar filtros estándar
         queryset = self.apply_list_filters(
@@ -818,6 +891,60 @@ class BaseRepository(Generic[ModelT]):
 
         return items, int(total)
 
+    def _validator_column(self) -> Optional[Any]:
+        """Columna `validator_field` del modelo, o None si no existe."""
+        if not self.validator_field or not self.model:
+            return None
+        return getattr(self.model, self.validator_field, None)
+
+    async def get_validator(
+        self, record_id: Union[str, UUID]
+    ) -> Optional[Any]:
+        """Valor de `validator_field` de un registro SIN cargar la fila
+        completa (None si no hay columna o el registro no existe)."""
+        column = self._validator_column()
+        if column is None:
+            return None
+        query = select(column).where(self.model.id == record_id)
+        return (await self.session.execute(query)).scalar_one_or_none()
+
+    async def list_validator(
+        self,
+        filters: Optional[Dict[str, Any]] = None,
+        use_or: bool = False,
+        search: Optional[str] = None,
+        search_fields: Optional[List[str]] = None,
+        **kwargs: Any,
+    ) -> Optional[Tuple[Any, int]]:
+        """``(max(validator_field), count)`` del conjunto filtrado, en UNA
+        consulta agregada sobre el mismo query que `list_paginated` (mismo
+        `build_list_queryset` y filtros; sin orden, joins de carga ni página).
+        None si el modelo no tiene la columna."""
+        column = self._validator_column()
+        if column is None:
+            return None
+        query_kwargs = {
+            "filters": filters,
+            "use_or": use_or,
+            "joins": None,
+            "order_by": None,
+            "search": search,
+            "search_fields": search_fields,
+        }
+        hook = self.build_list_queryset
+        queryset = hook(**list_hook_kwargs(hook, query_kwargs))
+        queryset = self.apply_list_filters(queryset=queryset, **query_kwargs)
+        subquery = queryset.subquery()
+        validator = subquery.c.get(column.property.columns[0].name)
+        if validator is None:
+            return None
+        row = (
+            await self.session.execute(
+                select(func.max(validator), func.count()).select_from(subquery)
+            )
+        ).one()
+        return row[0], int(row[1])
+
     async def update(
         self,
         record_id: Union[str, UUID],
@@ -843,6 +970,7 @@ class BaseRepository(Generic[ModelT]):
                 setattr(record, key, value)
         await db.flush()
         await db.refresh(record)
+        self._bump_generation()
         return record
 
     async def delete(
@@ -860,15 +988,18 @@ class BaseRepository(Generic[ModelT]):
             raise NotFoundException(message=f"{model.__name__} no encontrado")
         await db.delete(record)
         await db.flush()
+        self._bump_generation(model)
         return True
 
     async def save(self, obj: ModelT) -> ModelT:
         """Persiste una entidad nueva o mutada (add + flush)."""
         self.session.add(obj)
         await self.session.flush()
+        self._bump_generation(type(obj))
         return obj
 
     async def hard_delete(self, obj: ModelT) -> None:
         """Elimina físicamente la fila (sin soft delete)."""
         await self.session.delete(obj)
-        await self.session.flush()
\ No newline at end of file
+        await self.session.flush()
+        self._bump_generation(type(obj))
@@ -20,6 +20,13 @@ Usage:
 
     # then in routes: ... session: AsyncSession = Depends(get_db)
 
+Read endpoints (GET list/retrieve) can use the read-only variant, which
+skips the commit round trip when nothing was written:
+
+    get_read_db = make_readonly_session_lifecycle(SessionFactory)
+
+    # ... session: AsyncSession = Depends(get_read_db)
+
 Rule of thumb for callers:
 - Services SHOULD NOT call session.flush / session.commit / session.refresh.
 - Repositories own flush via BaseRepository.create / update.
@@ -28,15 +35,92 @@ Rule of thumb for callers:
 
 from __future__ import annotations
 
-from collections.abc import AsyncGenerator, Awaitable, Callable
-from typing import Optional
+from collections.abc import AsyncGenerator, Awaitable, Callable, Hashable
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import Any, AsyncIterator, Dict, Optional
 
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import Session
+
+#: Dialectos que aceptan ``SET TRANSACTION READ ONLY`` como primera sentencia
+#: de una transacción ya abierta. MySQL/MariaDB exigen fijarlo ANTES del
+#: ``START TRANSACTION`` y SQLite no tiene el concepto, así que quedan fuera.
+READ_ONLY_DIALECTS = frozenset({"postgresql", "cockroachdb"})
+
+#: Clave en ``session.info`` que marca que la sesión hizo flush (hubo escrituras
+#: aunque ``new``/``dirty``/``deleted`` ya estén vacíos tras el flush).
+_FLUSHED_KEY = "basekit_flushed"
+
+#: Clave en ``session.info`` con los callbacks pendientes de `on_commit`.
+_ON_COMMIT_KEY = "basekit_on_commit"
+
+#: Sesiones reemplazadas en la tarea actual (``id(sesión)`` → propia), ver
+#: `detached_session`. Un ContextVar: no se filtra a otras tareas.
+_detached_sessions: ContextVar[Optional[Dict[int, Any]]] = ContextVar(
+    "basekit_detached_sessions", default=None
+)
 
 ErrorHook = Callable[[Exception, AsyncSession], Awaitable[None]]
 SuccessHook = Callable[[AsyncSession], Awaitable[None]]
 
 
+def _run_on_commit(session: Session) -> None:
+    """Listener ``after_commit``: corre y descarta los callbacks pendientes."""
+    pending = session.info.pop(_ON_COMMIT_KEY, None) or {}
+    for callback in pending.values():
+        callback()
+
+
+def on_commit(
+    session: Any, key: Hashable, callback: Callable[[], Any]
+) -> None:
+    """Corre ``callback()`` tras el próximo commit de ``session``.
+
+    Los callbacks se guardan en ``session.info`` por ``key`` (uno por clave
+    y transacción) y un único listener ``after_commit`` por sesión los
+    corre: N escrituras no registran N listeners. Sesiones que no son de
+    SQLAlchemy (stubs) se ignoran.
+    """
+    sync_session = getattr(session, "sync_session", session)
+    if not isinstance(sync_session, Session):
+        return
+    sync_session.info.setdefault(_ON_COMMIT_KEY, {})[key] = callback
+    if not event.contains(sync_session, "after_commit", _run_on_commit):
+        event.listen(sync_session, "after_commit", _run_on_commit)
+
+
+def current_session(session: Any) -> Any:
+    """La sesión a usar en lugar de ``session`` en la tarea actual: la
+    propia de un `detached_session` activo, o ``session`` tal cual."""
+    detached = _detached_sessions.get()
+    if detached is None:
+        return session
+    return detached.get(id(session), session)
+
+
+@asynccontextmanager
+async def detached_session(session: Any) -> AsyncIterator[Any]:
+    """Dentro del bloque, y solo en la tarea actual, los repositorios que
+    usan ``session`` usan una sesión nueva del mismo bind (cerrada al
+    salir). Para trabajo en segundo plano (p. ej. el refresco del cache de
+    `list`) que no debe usar la sesión del request, que se cierra con él.
+    Sin bind (stubs) el bloque corre con ``session``."""
+    bind = getattr(session, "bind", None)
+    if bind is None:
+        yield session
+        return
+    async with type(session)(bind=bind, expire_on_commit=False) as own:
+        token = _detached_sessions.set(
+            {**(_detached_sessions.get() or {}), id(session): own}
+        )
+        try:
+            yield own
+        finally:
+            _detached_sessions.reset(token)
+
+
 def make_session_lifecycle(
     session_factory: async_sessionmaker[AsyncSession],
     *,
@@ -65,3 +149,83 @@ def make_session_lifecycle(
                 raise
 
     return get_db
+
+
+def _mark_read_only(session, transaction, connection) -> None:
+    """Listener ``after_begin``: abre la transacción como ``READ ONLY``.
+
+    Corre cuando la sesión pide la conexión por primera vez (autobegin), NO al
+    crear la sesión — así un request que no consulta nunca hace checkout del
+    pool. Solo la transacción raíz: los savepoints heredan el modo.
+    """
+    if transaction.nested or transaction.parent is not None:
+        return
+    if connection.dialect.name in READ_ONLY_DIALECTS:
+        connection.exec_driver_sql("SET TRANSACTION READ ONLY")
+
+
+def _mark_flushed(session, flush_context) -> None:
+    """Listener ``after_flush``: recuerda que la transacción tiene escrituras."""
+    session.info[_FLUSHED_KEY] = True
+
+
+def has_pending_writes(session: AsyncSession) -> bool:
+    """True si la sesión tiene cambios sin commitear.
+
+    Mira el estado de la unit of work (``new``/``dirty``/``deleted``) y,
+    además, si ya hubo un flush en la transacción: un ``repository.create``
+    hace flush, lo que vacía ``new`` pero deja la fila pendiente de commit.
+    """
+    if session.new or session.dirty or session.deleted:
+        return True
+    return bool(session.info.get(_FLUSHED_KEY))
+
+
+def make_readonly_session_lifecycle(
+    session_factory: async_sessionmaker[AsyncSession],
+    *,
+    on_success: Optional[SuccessHook] = None,
+    on_error: Optional[ErrorHook] = None,
+) -> Callable[[], AsyncGenerator[AsyncSession, None]]:
+    """Variante de ``make_session_lifecycle`` para requests de solo lectura.
+
+    Pensada para GET list/retrieve. Respecto del lifecycle normal:
+
+    - La transacción se abre como ``READ ONLY`` en los dialectos que lo
+      soportan (``READ_ONLY_DIALECTS``); una escritura accidental falla en
+      el servidor en vez de commitearse.
+    - ``autoflush`` queda deshabilitado en la sesión.
+    - El commit se OMITE si la sesión no tiene escrituras pendientes
+      (``has_pending_writes``); el cierre de la sesión devuelve la conexión
+      al pool, que hace el reset. Si algo sí escribió (dialectos sin
+      ``READ ONLY``), se commitea igual que en el lifecycle normal.
+    - La conexión se adquiere de forma perezosa: el ``READ ONLY`` se aplica
+      en el primer ``begin``, no al crear la sesión, así que un request
+      servido desde cache nunca hace checkout del pool.
+
+    ``on_success`` corre también cuando se omite el commit.
+    """
+
+    async def get_db() -> AsyncGenerator[AsyncSession, None]:
+        async with session_factory() as session:
+            sync_session = session.sync_session
+            sync_session.autoflush = False
+            event.listen(sync_session, "after_begin", _mark_read_only)
+            event.listen(sync_session, "after_flush", _mark_flushed)
+            try:
+                yield session
+                if has_pending_writes(session):
+                    await session.commit()
+                if on_success is not None:
+                    await on_success(session)
+            except Exception as exc:
+                await session.rollback()
+                if on_error is not None:
+                    await on_error(exc, session)
+                raise
+            finally:
+                event.remove(sync_session, "after_begin", _mark_read_only)
+                event.remove(sync_session, "after_flush", _mark_flushed)
+                session.info.pop(_FLUSHED_KEY, None)
+
+    return get_db
@@ -0,0 +1,55 @@
+"""Copias detached de entidades ORM (`detached_copy`).
+
+El single-flight (`coalesce_reads`) comparte el resultado del líder con los
+seguidores. Publicar las instancias vivas no es seguro: el líder sigue
+usándolas (``post_process_list``, mutaciones) y ``merge(load=False)`` falla
+sobre una instancia dirty. Se publica en cambio una copia tomada apenas
+termina la consulta: instancias nuevas, detached, con el estado ya cargado
+(columnas y relaciones cargadas, recursivamente) y sin historial, que nadie
+más muta y cada seguidor adopta con ``merge(load=False)``.
+"""
+
+from typing import Any, Dict
+
+from sqlalchemy import inspect
+from sqlalchemy.orm import make_transient_to_detached
+from sqlalchemy.orm.attributes import set_committed_value
+
+
+def _copy_instance(obj: Any, memo: Dict[int, Any]) -> Any:
+    copied = memo.get(id(obj))
+    if copied is not None:
+        return copied
+    state = inspect(obj)
+    mapper = state.mapper
+    copied = mapper.class_manager.new_instance()
+    memo[id(obj)] = copied
+    loaded = state.dict
+    for attr in mapper.column_attrs:
+        if attr.key in loaded:
+            set_committed_value(copied, attr.key, loaded[attr.key])
+    for rel in mapper.relationships:
+        if rel.key not in loaded:
+            continue
+        value = loaded[rel.key]
+        if value is None:
+            pass
+        elif rel.uselist:
+            value = [_copy_instance(v, memo) for v in value]
+        else:
+            value = _copy_instance(value, memo)
+        set_committed_value(copied, rel.key, value)
+    make_transient_to_detached(copied)
+    return copied
+
+
+def detached_copy(result: Any) -> Any:
+    """Copia detached de una entidad, de ``(items, total)`` de `list` o de
+    None."""
+    if result is None:
+        return None
+    memo: Dict[int, Any] = {}
+    if isinstance(result, tuple):
+        items, total = result
+        return [_copy_instance(item, memo) for item in items], total
+    return _copy_instance(result, memo)
@@ -0,0 +1,114 @@
+"""Tope de tiempo por consulta (`run_with_timeout`) para sesiones SQL.
+
+Compartido por los repositorios SQLAlchemy y SQLModel. Según el dialecto:
+
+- PostgreSQL/CockroachDB: ``SET LOCAL statement_timeout``; el servidor
+  cancela la sentencia. Al terminar se restaura el valor previo (el de la
+  transacción o de un ``run_with_timeout`` que envuelve a este).
+- MySQL/MariaDB: ``asyncio.wait_for`` y, al vencer, ``KILL QUERY`` del id de
+  conexión de la sesión desde otra conexión del mismo engine.
+- Resto (SQLite…): solo ``asyncio.wait_for``. Se abandona el lado cliente
+  (la conexión se descarta); la sentencia NO se cancela en el servidor.
+"""
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Optional, TypeVar
+
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from ...exceptions.api_exceptions import QueryTimeoutException
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+#: Dialectos con timeout de sentencia del lado del servidor
+#: (``SET LOCAL statement_timeout``).
+STATEMENT_TIMEOUT_DIALECTS = frozenset({"postgresql", "cockroachdb"})
+
+#: Dialectos en los que un timeout se cancela con ``KILL QUERY``.
+KILL_QUERY_DIALECTS = frozenset({"mysql", "mariadb"})
+
+
+def dialect_name(session: Any) -> str:
+    """Nombre del dialecto de la sesión (``""`` si no está ligada)."""
+    try:
+        return session.get_bind().dialect.name
+    except Exception:
+        return ""
+
+
+async def _with_statement_timeout(
+    session: Any, operation: Callable[[], Awaitable[T]], timeout: float
+) -> T:
+    ms = max(1, int(timeout * 1000))
+    previous = (await session.execute(text("SHOW statement_timeout"))).scalar()
+    await session.execute(text(f"SET LOCAL statement_timeout = {ms}"))
+    try:
+        return await operation()
+    except DBAPIError as exc:
+        if QueryTimeoutException.is_timeout_error(exc):
+            raise QueryTimeoutException(data={"timeout": timeout}) from exc
+        raise
+    finally:
+        try:
+            # `set_config(..., true)` es un `SET LOCAL` con el valor como
+            # parámetro.
+            await session.execute(
+                text("SELECT set_config('statement_timeout', :value, true)"),
+                {"value": str(previous)},
+            )
+        except DBAPIError:
+            # Transacción abortada por el error: el rollback descarta el
+            # `SET LOCAL` igual.
+            pass
+
+
+async def _kill_query(session: Any, connection_id: Any) -> None:
+    """``KILL QUERY`` de ``connection_id`` desde otra conexión del engine."""
+    try:
+        engine = AsyncEngine(session.get_bind())
+        async with engine.connect() as conn:
+            await conn.execute(text(f"KILL QUERY {int(connection_id)}"))
+    except Exception as exc:
+        logger.warning(
+            "run_with_timeout: no se pudo cancelar la consulta de la "
+            "conexión %s: %s",
+            connection_id,
+            exc,
+        )
+
+
+async def run_with_timeout(
+    session: Any,
+    operation: Callable[[], Awaitable[T]],
+    timeout: Optional[float],
+) -> T:
+    """Ejecuta ``operation()`` con un tope de ``timeout`` segundos.
+
+    Un timeout se traduce a ``QueryTimeoutException``. Fuera de
+    PostgreSQL, al vencer la sesión se invalida (la conexión se descarta en
+    vez de volver al pool). ``timeout`` vacío/``None``/``0`` ejecuta la
+    operación sin tope.
+    """
+    if not timeout:
+        return await operation()
+
+    dialect = dialect_name(session)
+    if dialect in STATEMENT_TIMEOUT_DIALECTS:
+        return await _with_statement_timeout(session, operation, timeout)
+
+    connection_id = None
+    if dialect in KILL_QUERY_DIALECTS:
+        result = await session.execute(text("SELECT CONNECTION_ID()"))
+        connection_id = result.scalar()
+    try:
+        return await asyncio.wait_for(operation(), timeout)
+    except asyncio.TimeoutError as exc:
+        if connection_id is not None:
+            await _kill_query(session, connection_id)
+        await session.invalidate()
+        raise QueryTimeoutException(data={"timeout": timeout}) from exc
@@ -56,16 +56,20 @@ class SQLModelBaseController(BaseController):
             "use_or": use_or,
             "joins": joins,
         }
-        items, total = await self.service.list(**service_params)
-        count = params.get("count") or 0
-        total_pages = (total + count - 1) // count if count > 0 else 0
-        pagination = {
-            "page": params.get("page"),
-            "count": count,
-            "total": total,
-            "total_pages": total_pages,
-        }
-        return self.format_response(data=items, pagination=pagination)
+
+        async def _load():
+            items, total = await self.service.list(**service_params)
+            count = params.get("count") or 0
+            total_pages = (total + count - 1) // count if count > 0 else 0
+            pagination = {
+                "page": params.get("page"),
+                "count": count,
+                "total": total,
+                "total_pages": total_pages,
+            }
+            return self._render(data=items, pagination=pagination)
+
+        return await self._respond_list(service_params, _load)
 
     async def retrieve(self, id: str, *, joins: Optional[List[str]] = None):
         """Obtiene un registro por ID.
@@ -75,8 +79,7 @@ class SQLModelBaseController(BaseController):
             joins: Lista de relaciones para eager loading.
         """
         await self.prepare_action("retrieve")
-        item = await self.service.retrieve(id, joins=joins)
-        return self.format_response(data=item)
+        return await self._respond_retrieve(id, joins=joins)
 
     async def create(
         self,
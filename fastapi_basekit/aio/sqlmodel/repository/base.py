@@ -1,5 +1,7 @@
 from typing import (
     Any,
+    Awaitable,
+    Callable,
     Dict,
     Generic,
     List,
@@ -19,6 +21,14 @@ from sqlmodel.ext.asyncio.session import AsyncSession
 from sqlalchemy import and_, or_, func, Select
 from sqlalchemy.orm import Relationship, joinedload, selectinload
 
+from ...cache.base import bump_generation
+from ...sqlalchemy.repository.base import list_hook_kwargs
+from ...sqlalchemy.session import current_session, on_commit
+from ...sqlalchemy.timeout import (  # noqa: F401
+    STATEMENT_TIMEOUT_DIALECTS,
+    dialect_name,
+)
+from ...sqlalchemy.timeout import run_with_timeout as _run_with_timeout
 from ....exceptions.api_exceptions import NotFoundException
 
 logger = logging.getLogger(__name__)
@@ -26,6 +36,7 @@ logger = logging.getLogger(__name__)
 #: Tipo del modelo SQLModel que gestiona el repositorio. Parametrízalo al
 #: declarar la subclase — ``class UserRepository(BaseRepository[User])``.
 ModelT = TypeVar("ModelT")
+T = TypeVar("T")
 
 
 class BaseRepository(Generic[ModelT]):
@@ -46,6 +57,10 @@ class BaseRepository(Generic[ModelT]):
 
     model: Type[ModelT]
     service: Optional[Any] = None
+    #: Columna de versión/``updated_at`` usada como validador HTTP (ETag /
+    #: Last-Modified) en GET condicionales. None o ausente en el modelo = el
+    #: controller responde sin validadores.
+    validator_field: Optional[str] = "updated_at"
 
     def __init__(self, db: AsyncSession):
         """Inicializa el repositorio con la sesión a reutilizar."""
@@ -54,7 +69,38 @@ class BaseRepository(Generic[ModelT]):
 
     @property
     def session(self) -> AsyncSession:
-        return self._session
+        return current_session(self._session)
+
+    def _bump_generation(self, model: Optional[Type[Any]] = None) -> None:
+        """Marca una escritura sobre el modelo (invalida listados cacheados).
+
+        Se incrementa ya y otra vez tras el commit, para que un listado que se
+        cachee con datos previos al commit no sobreviva a la escritura.
+        """
+        model = model or self.model
+        if not model:
+            return
+        bump_generation(model)
+        on_commit(
+            self.session,
+            ("generation", model),
+            lambda: bump_generation(model),
+        )
+
+    def _dialect_name(self) -> str:
+        """Nombre del dialecto de la sesión (``""`` si no está ligada)."""
+        return dialect_name(self.session)
+
+    async def run_with_timeout(
+        self,
+        operation: Callable[[], Awaitable[T]],
+        timeout: Optional[float],
+    ) -> T:
+        """Ejecuta ``operation()`` con un tope de ``timeout`` segundos (ver
+        `fastapi_basekit.aio.sqlalchemy.timeout`: cancelación en el
+        servidor en PostgreSQL y MySQL/MariaDB; en el resto solo se
+        abandona el lado cliente)."""
+        return await _run_with_timeout(self.session, operation, timeout)
 
     def _get_field(self, field_name: str):
         """Valida y retorna el atributo (columna) del modelo."""
@@ -348,6 +394,7 @@ class BaseRepository(Generic[ModelT]):
         db.add(obj_in)
         await db.flush()
         await db.refresh(obj_in)
+        self._bump_generation()
         return obj_in
 
     async def _get_one(
@@ -600,10 +647,8 @@ class BaseRepository(Generic[ModelT]):
             "search": search,
             "search_fields": search_fields,
         }
-        try:
-            queryset = self.build_list_queryset(**query_kwargs)
-        except TypeError:
-            queryset = self.build_list_queryset()
+        hook = self.build_list_queryset
+        queryset = hook(**list_hook_kwargs(hook, query_kwargs))
 
         # 2. Aplicar filtros estándar
         queryset = self.apply_list_filters(
@@ -646,6 +691,60 @@ class BaseRepository(Generic[ModelT]):
 
         return items, int(total)
 
+    def _validator_column(self) -> Optional[Any]:
+        """Columna `validator_field` del modelo, o None si no existe."""
+        if not self.validator_field or not self.model:
+            return None
+        return getattr(self.model, self.validator_field, None)
+
+    async def get_validator(
+        self, record_id: Union[str, UUID]
+    ) -> Optional[Any]:
+        """Valor de `validator_field` de un registro SIN cargar la fila
+        completa (None si no hay columna o el registro no existe)."""
+        column = self._validator_column()
+        if column is None:
+            return None
+        query = select(column).where(self.model.id == record_id)
+        return (await self.session.execute(query)).scalar_one_or_none()
+
+    async def list_validator(
+        self,
+        filters: Optional[Dict[str, Any]] = None,
+        use_or: bool = False,
+        search: Optional[str] = None,
+        search_fields: Optional[List[str]] = None,
+        **kwargs: Any,
+    ) -> Optional[Tuple[Any, int]]:
+        """``(max(validator_field), count)`` del conjunto filtrado, en UNA
+        consulta agregada sobre el mismo query que `list_paginated` (mismo
+        `build_list_queryset` y filtros; sin orden, joins de carga ni página).
+        None si el modelo no tiene la columna."""
+        column = self._validator_column()
+        if column is None:
+            return None
+        query_kwargs = {
+            "filters": filters,
+            "use_or": use_or,
+            "joins": None,
+            "order_by": None,
+            "search": search,
+            "search_fields": search_fields,
+        }
+        hook = self.build_list_queryset
+        queryset = hook(**list_hook_kwargs(hook, query_kwargs))
+        queryset = self.apply_list_filters(queryset=queryset, **query_kwargs)
+        subquery = queryset.subquery()
+        validator = subquery.c.get(column.property.columns[0].name)
+        if validator is None:
+            return None
+        row = (
+            await self.session.execute(
+                select(func.max(validator), func.count()).select_from(subquery)
+            )
+        ).one()
+        return row[0], int(row[1])
+
     async def update(
         self,
         record_id: Union[str, UUID],
@@ -665,6 +764,7 @@ class BaseRepository(Generic[ModelT]):
                 setattr(record, key, value)
         await db.flush()
         await db.refresh(record)
+        self._bump_generation()
         return record
 
     async def delete(
@@ -682,4 +782,5 @@ class BaseRepository(Generic[ModelT]):
             raise NotFoundException(message=f"{model.__name__} no encontrado")
         await db.delete(record)
         await db.flush()
+        self._bump_generation(model)
         return True
@@ -1,9 +1,32 @@
-from typing import Any, Dict, Generic, List, Optional, Tuple
+from typing import (
+    Any,
+    AsyncContextManager,
+    Awaitable,
+    Callable,
+    ClassVar,
+    Dict,
+    Generic,
+    List,
+    Optional,
+    Tuple,
+)
 
 from fastapi import Request
 from pydantic import BaseModel
 
 from ..repository.base import BaseRepository, ModelT
+from ...cache.base import (
+    BaseCacheBackend,
+    RetrieveCache,
+    get_default_cache_backend,
+    model_namespace,
+    scope_key,
+    spawn_background,
+)
+from ...cache.singleflight import flight_key, single_flight
+from ...class_defaults import install_copy_on_access
+from ...sqlalchemy.session import detached_session, on_commit
+from ...sqlalchemy.snapshot import detached_copy
 from ....exceptions.api_exceptions import (
     NotFoundException,
     DatabaseIntegrityException,
@@ -27,6 +50,32 @@ class BaseService(Generic[ModelT]):
     order_by: Optional[str] = None
     action: str | None = None
     kwargs_query: Dict[str, Any] = {}
+    # Tope (segundos) de las lecturas list/retrieve. Override por acción
+    # devolviendo {"query_timeout": N} desde `get_kwargs_query`. None = sin tope.
+    query_timeout: Optional[float] = None
+    # Cache de `retrieve` (ver `retrieve_cached`). None = desactivado.
+    # `cache_negative_ttl`: vida de un 404 cacheado (None = `cache_ttl`, 0 = no
+    # cachear 404). `cache_backend`: None = LRU en proceso compartido.
+    cache_ttl: Optional[float] = None
+    cache_negative_ttl: Optional[float] = None
+    cache_backend: Optional[BaseCacheBackend] = None
+    # Single-flight de list/retrieve (ver `_coalesce`): lecturas idénticas
+    # concurrentes comparten una consulta. `coalesce_max_wait`: segundos que un
+    # request espera la consulta de otro antes de lanzar la suya.
+    coalesce_reads: bool = False
+    coalesce_max_wait: Optional[float] = 1.0
+
+    # Config mutable de clase: cada instancia la copia recién al leerla
+    # (`CopyOnAccess`, instalado en `__init_subclass__`), no en cada __init__.
+    _mutable_defaults: ClassVar[Tuple[str, ...]] = (
+        "search_fields",
+        "duplicate_check_fields",
+        "kwargs_query",
+    )
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        install_copy_on_access(cls, cls._mutable_defaults)
 
     def __init__(
         self,
@@ -37,14 +86,6 @@ class BaseService(Generic[ModelT]):
         self.repository = repository
         self.request = request
 
-        # Copia por instancia de los defaults mutables (heredados como
-        # atributos de CLASE, compartidos por el proceso). Sin esto, mutar
-        # `self.search_fields.append(...)` en runtime contamina la clase y
-        # otras requests. Respeta el override del subclass.
-        self.search_fields = list(self.search_fields)
-        self.duplicate_check_fields = list(self.duplicate_check_fields)
-        self.kwargs_query = dict(self.kwargs_query)
-
         if self.repository:
             self.repository.service = self
 
@@ -88,6 +129,25 @@ class BaseService(Generic[ModelT]):
         """
         return self.kwargs_query or {}
 
+    def get_query_timeout(
+        self, kwargs: Optional[Dict[str, Any]] = None
+    ) -> Optional[float]:
+        """Timeout efectivo de la acción actual: `query_timeout` de
+        `get_kwargs_query()` si está, si no el `query_timeout` del servicio."""
+        if kwargs is None:
+            kwargs = self.get_kwargs_query()
+        return kwargs.get("query_timeout", self.query_timeout)
+
+    async def _run_with_query_timeout(
+        self, operation: Callable[[], Awaitable[Any]], kwargs: Dict[str, Any]
+    ) -> Any:
+        """Ejecuta una lectura bajo `get_query_timeout` (vía el repositorio).
+        Sin timeout configurado la llama directo, sin pasar por el repo."""
+        timeout = self.get_query_timeout(kwargs)
+        if not timeout:
+            return await operation()
+        return await self.repository.run_with_timeout(operation, timeout)
+
     async def retrieve(
         self, id: str, joins: Optional[List[str]] = None
     ) -> ModelT:
@@ -95,13 +155,172 @@ class BaseService(Generic[ModelT]):
         if joins is None:
             joins = kwargs.get("joins")
 
-        obj = await self.repository.get_with_joins(id, joins=joins)
-        if not obj:
-            obj = await self.repository.get(id)
+        async def _load():
+            found = await self.repository.get_with_joins(id, joins=joins)
+            if not found:
+                found = await self.repository.get(id)
+            return found
+
+        obj = await self._coalesce(
+            "retrieve",
+            {"id": str(id), "joins": joins},
+            lambda: self._run_with_query_timeout(_load, kwargs),
+        )
         if not obj:
             raise NotFoundException(f"id={id} no encontrado")
         return obj
 
+    async def _coalesce(
+        self,
+        action: str,
+        params: Dict[str, Any],
+        load: Callable[[], Awaitable[Any]],
+    ) -> Any:
+        """Single-flight de una lectura (`coalesce_reads`).
+
+        `params` debe incluir todo lo que cambia el resultado (id/joins, o
+        filtros YA pasados por `get_filters` — el scope — y paginación). Si
+        otro request ya ejecuta la misma consulta se espera su resultado y se
+        adopta en la sesión propia (`_adopt_shared`).
+        """
+        if not self.coalesce_reads:
+            return await load()
+        namespace = model_namespace(self.repository.model)
+        key = flight_key(namespace, action, params)
+
+        async def _publish() -> Tuple[Any, Any]:
+            # La copia se toma en la tarea del líder, antes de que su
+            # `post_process_list` (u otro código) mute las instancias.
+            result = await load()
+            return result, detached_copy(result)
+
+        (result, snapshot), shared = await single_flight(
+            key, _publish, max_wait=self.coalesce_max_wait
+        )
+        if shared:
+            result = await self._adopt_shared(snapshot)
+        return result
+
+    async def _adopt_shared(self, result: Any) -> Any:
+        """Copia a la sesión de este request la copia detached
+        (`detached_copy`) del resultado de otro request.
+
+        `merge(load=False)` no emite SELECT: copia el estado ya cargado. Así
+        cada request muta/refresca SU instancia, no la del líder.
+        """
+        if result is None:
+            return None
+        session = self.repository.session
+        if isinstance(result, tuple):  # (items, total) de list
+            items, total = result
+            return [await session.merge(i, load=False) for i in items], total
+        return await session.merge(result, load=False)
+
+    async def retrieve_validator(self, id: str) -> Optional[Any]:
+        """Validador HTTP (`validator_field`, p. ej. `updated_at`) de `id`,
+        leído sin cargar la fila. None = sin GET condicional."""
+        return await self.repository.get_validator(id)
+
+    async def list_validator(
+        self,
+        search: Optional[str] = None,
+        filters: Optional[Dict[str, Any]] = None,
+        use_or: Optional[bool] = None,
+        **kwargs: Any,
+    ) -> Optional[Tuple[Any, int]]:
+        """`(max(validator_field), count)` del mismo conjunto que `list`
+        (filtros pasados por `get_filters`, búsqueda), sin paginar ni cargar
+        filas. None = sin GET condicional."""
+        if filters is None:
+            filters = self.params["filters"]
+        return await self.repository.list_validator(
+            filters=self.get_filters(filters),
+            use_or=self.params["use_or"] if use_or is None else use_or,
+            search=self.params["search"] if search is None else search,
+            search_fields=self.params["search_fields"],
+        )
+
+    def get_cache_scope(self) -> Any:
+        """Scope del llamador en la clave de `retrieve_cached` (tenant,
+        owner…): por defecto, lo que `get_filters` inyecta sin filtros
+        entrantes. Sobrescribe si `retrieve` se scopea por otra vía; con
+        `retrieve` sobrescrito y este hook sin sobrescribir no se cachea.
+        Debe ser serializable a JSON."""
+        return self.get_filters({})
+
+    def _retrieve_cacheable(self) -> bool:
+        """False si `retrieve` está sobrescrito sin `get_cache_scope`: su
+        resultado puede depender del llamador y no se sabe cómo separarlo."""
+        cls = type(self)
+        return (
+            cls.retrieve is BaseService.retrieve
+            or cls.get_cache_scope is not BaseService.get_cache_scope
+        )
+
+    def get_retrieve_cache(self) -> Optional[RetrieveCache]:
+        """Cache de `retrieve` de este servicio, o None si `cache_ttl` no está."""
+        if not self.cache_ttl:
+            return None
+        return RetrieveCache(
+            self.cache_backend or get_default_cache_backend(),
+            namespace=model_namespace(self.repository.model),
+            ttl=self.cache_ttl,
+            negative_ttl=self.cache_negative_ttl,
+        )
+
+    async def retrieve_cached(
+        self,
+        id: str,
+        render: Callable[[ModelT], bytes],
+        joins: Optional[List[str]] = None,
+        variant: str = "",
+    ) -> bytes:
+        """`retrieve` + `render(obj)` cacheado por (modelo, id, joins, variant).
+
+        `render` produce los bytes a devolver (el controller serializa la
+        respuesta completa), así un hit no toca la base, el ORM ni Pydantic.
+        Un 404 también se cachea (`cache_negative_ttl`). Las entradas se
+        separan por `get_cache_scope()`. Sin `cache_ttl` (o con `retrieve`
+        sobrescrito sin ese hook) equivale a
+        `render(await self.retrieve(id, joins))`.
+        """
+        cache = self.get_retrieve_cache()
+        if cache is None or not self._retrieve_cacheable():
+            return render(await self.retrieve(id, joins=joins))
+        if joins is None:
+            joins = self.get_kwargs_query().get("joins")
+        return await cache.get_or_render(
+            id,
+            f"{variant}|joins={sorted(joins or [])}",
+            load=lambda: self.retrieve(id, joins=joins),
+            render=render,
+            not_found=lambda: NotFoundException(f"id={id} no encontrado"),
+            scope=scope_key(self.get_cache_scope()),
+        )
+
+    def detached(self) -> AsyncContextManager[Any]:
+        """Contexto en el que, en la tarea actual, el repositorio usa una
+        sesión propia (ver `detached_session`): para refrescos en segundo
+        plano que sobreviven al request."""
+        return detached_session(self.repository.session)
+
+    async def invalidate_cache(self, id: Any) -> None:
+        """Descarta la entrada cacheada de `id` (todas sus variantes).
+
+        Invalida ya y de nuevo tras el commit de la sesión: un `retrieve`
+        concurrente que lea la fila vieja entre la escritura y el commit no
+        deja en cache un valor obsoleto por todo el TTL.
+        """
+        cache = self.get_retrieve_cache()
+        if cache is None:
+            return
+        await cache.invalidate(id)
+        on_commit(
+            self.repository.session,
+            ("retrieve", cache.namespace, id),
+            lambda: spawn_background(cache.invalidate(id)),
+        )
+
     async def list(
         self,
         search: Optional[str] = None,
@@ -138,15 +357,23 @@ class BaseService(Generic[ModelT]):
         if order_by is None:
             final_order_by = kwargs.get("order_by", self.params["order_by"])
 
-        items, total = await self.repository.list_paginated(
-            page=self.params["page"],
-            count=self.params["count"],
-            filters=applied_filters,
-            use_or=self.params["use_or"],
-            joins=final_joins,
-            order_by=final_order_by,
-            search=self.params["search"],
-            search_fields=self.params["search_fields"],
+        query_params = {
+            "page": self.params["page"],
+            "count": self.params["count"],
+            "filters": applied_filters,
+            "use_or": self.params["use_or"],
+            "joins": final_joins,
+            "order_by": final_order_by,
+            "search": self.params["search"],
+            "search_fields": self.params["search_fields"],
+        }
+        items, total = await self._coalesce(
+            "list",
+            query_params,
+            lambda: self._run_with_query_timeout(
+                lambda: self.repository.list_paginated(**query_params),
+                kwargs,
+            ),
         )
         items = await self.post_process_list(items)
         return items, total
@@ -182,7 +409,11 @@ class BaseService(Generic[ModelT]):
                     raise DatabaseIntegrityException(
                         message="Registro ya existe", data=field_filters
                     )
-        return await self.repository.create(data)
+        created = await self.repository.create(data)
+        if self.cache_ttl:
+            # Un 404 cacheado de este id (id elegido por el cliente) deja de valer.
+            await self.invalidate_cache(created.id)
+        return created
 
     async def update(
         self, id: str, data: BaseModel | Dict[str, Any]
@@ -192,7 +423,14 @@ class BaseService(Generic[ModelT]):
             if isinstance(data, BaseModel)
             else data
         )
-        return await self.repository.update(id, update_data)
+        updated = await self.repository.update(id, update_data)
+        await self.invalidate_cache(id)
+        return updated
 
     async def delete(self, id: str) -> bool:
-        return await self.repository.delete(id)
+        deleted = await self.repository.delete(id)
+        await self.invalidate_cache(id)
+        return deleted
+
+
+install_copy_on_access(BaseService, BaseService._mutable_defaults)
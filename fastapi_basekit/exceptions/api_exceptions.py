@@ -1,4 +1,5 @@
 # System
+import asyncio
 from typing import Optional, Union
 
 # fastapi
@@ -117,3 +118,51 @@ class NotFoundException(APIException):
             data=data,
             status=status.HTTP_404_NOT_FOUND,
         )
+
+
+class QueryTimeoutException(APIException):
+    """La consulta excedió el ``query_timeout`` del servicio.
+
+    Se lanza cuando el motor cancela la sentencia (``statement_timeout`` de
+    PostgreSQL, ``maxTimeMS`` de Mongo) o cuando vence la cancelación asyncio
+    en dialectos sin timeout de servidor. HTTP 504: el request no falló por
+    culpa del cliente, la base no respondió a tiempo.
+    """
+
+    #: SQLSTATE de PostgreSQL para ``statement_timeout`` / ``query_canceled``.
+    PG_QUERY_CANCELED = "57014"
+    #: Código de error de MongoDB para ``MaxTimeMSExpired``.
+    MONGO_MAX_TIME_MS_EXPIRED = 50
+
+    def __init__(
+        self,
+        data: Optional[Union[dict, str]] = None,
+        message: str = "La consulta excedió el tiempo máximo permitido",
+    ):
+        super().__init__(
+            message=message,
+            status_code="QUERY_TIMEOUT",
+            data=data,
+            status=status.HTTP_504_GATEWAY_TIMEOUT,
+        )
+
+    @classmethod
+    def is_timeout_error(cls, exc: BaseException) -> bool:
+        """True si ``exc`` es un timeout de consulta de algún backend.
+
+        Reconoce ``asyncio.TimeoutError``, errores de driver PostgreSQL con
+        SQLSTATE ``57014`` (envueltos o no por SQLAlchemy) y el
+        ``ExecutionTimeout`` de pymongo (código 50), sin importar los drivers.
+        """
+        if isinstance(exc, (asyncio.TimeoutError, cls)):
+            return True
+        if getattr(exc, "code", None) == cls.MONGO_MAX_TIME_MS_EXPIRED:
+            return True
+        candidates = [exc, getattr(exc, "orig", None), exc.__cause__]
+        for candidate in candidates:
+            if candidate is None:
+                continue
+            for attr in ("sqlstate", "pgcode"):
+                if getattr(candidate, attr, None) == cls.PG_QUERY_CANCELED:
+                    return True
+        return False
@@ -41,6 +41,14 @@ except ImportError:  # pragma: no cover
 
         ...
 
+try:  # pragma: no cover - dependencia opcional
+    from pymongo.errors import ExecutionTimeout  # type: ignore
+except ImportError:  # pragma: no cover
+    class ExecutionTimeout(Exception):  # type: ignore[no-redef]
+        """Fallback cuando pymongo no está instalado."""
+
+        ...
+
 try:  # pragma: no cover - dependencia opcional
     from beanie.exceptions import DocumentNotFound  # type: ignore
 except ImportError:  # pragma: no cover
@@ -49,11 +57,13 @@ except ImportError:  # pragma: no cover
 
         ...
 
+from ..responses import BaseKitJSONResponse
 from ..schema.base import BaseResponse
 
 from .api_exceptions import (
     APIException,
     DatabaseIntegrityException,
+    QueryTimeoutException,
     ValidationException,
 )
 from .domain import DomainError
@@ -65,7 +75,7 @@ async def api_exception_handler(request: Request, exc: APIException):
     )
     return _apply_cors(
         request,
-        JSONResponse(status_code=exc.status, content=response.model_dump()),
+        BaseKitJSONResponse(status_code=exc.status, content=response),
     )
 
 
@@ -79,9 +89,7 @@ async def domain_error_handler(request: Request, exc: DomainError):
     response = BaseResponse(status=exc.code, message=exc.message, data=None)
     return _apply_cors(
         request,
-        JSONResponse(
-            status_code=exc.http_status(), content=response.model_dump()
-        ),
+        BaseKitJSONResponse(status_code=exc.http_status(), content=response),
     )
 
 
@@ -117,9 +125,9 @@ async def document_not_found_handler(request: Request, exc: DocumentNotFound):
     )
     return _apply_cors(
         request,
-        JSONResponse(
+        BaseKitJSONResponse(
             status_code=status.HTTP_404_NOT_FOUND,
-            content=response.model_dump(),
+            content=response,
         ),
     )
 
@@ -135,9 +143,9 @@ async def global_exception_handler(request: Request, exc: Exception):
     )
     return _apply_cors(
         request,
-        JSONResponse(
+        BaseKitJSONResponse(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            content=response.model_dump(),
+            content=response,
         ),
     )
 
@@ -161,9 +169,9 @@ async def value_exception_handler(
 
     return _apply_cors(
         request,
-        JSONResponse(
+        BaseKitJSONResponse(
             status_code=status.HTTP_400_BAD_REQUEST,
-            content=response.model_dump(mode="json"),
+            content=response,
         ),
     )
 
@@ -184,9 +192,9 @@ async def request_validation_handler(
     )
     return _apply_cors(
         request,
-        JSONResponse(
+        BaseKitJSONResponse(
             status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-            content=response.model_dump(mode="json"),
+            content=response,
         ),
     )
 
@@ -201,13 +209,26 @@ async def integrity_error_handler(request: Request, exc: Exception):
     )
     return _apply_cors(
         request,
-        JSONResponse(
+        BaseKitJSONResponse(
             status_code=status.HTTP_400_BAD_REQUEST,
-            content=response.model_dump(mode="json"),
+            content=response,
         ),
     )
 
 
+async def query_timeout_handler(request: Request, exc: Exception):
+    """Timeout de driver que escapó sin traducir → ``QueryTimeoutException``.
+
+    Cubre ``ExecutionTimeout`` de pymongo (``maxTimeMS``) y los ``DBAPIError``
+    de SQLAlchemy con SQLSTATE 57014 (``statement_timeout``) lanzados desde
+    código que no pasó por ``run_with_timeout`` del servicio. Cualquier otro
+    error de driver sigue al catch-all 500.
+    """
+    if not QueryTimeoutException.is_timeout_error(exc):
+        return await global_exception_handler(request, exc)
+    return await api_exception_handler(request, QueryTimeoutException())
+
+
 def register_exception_handlers(
     app,
     *,
@@ -219,7 +240,11 @@ def register_exception_handlers(
     Un solo punto de cableado para que cada proyecto NO copie-pegue el
     mapeo de excepciones → ``BaseResponse``. Todas las subclases de
     ``APIException`` (NotFound, Permission, JWT, Validation, Integrity,
-    Global...) las atiende ``api_exception_handler`` vía resolución por MRO.
+    QueryTimeout, Global...) las atiende ``api_exception_handler`` vía
+    resolución por MRO. Los timeouts crudos de driver (``statement_timeout``,
+    ``maxTimeMS``) también salen como ``QUERY_TIMEOUT`` (504).
+    El envelope se serializa con ``BaseKitJSONResponse`` (UUID, datetime y
+    ObjectId en ``data`` no rompen la respuesta de error).
 
     Args:
         app: instancia FastAPI.
@@ -237,11 +262,12 @@ def register_exception_handlers(
 
     if sqlalchemy:
         try:  # pragma: no cover - dependencia opcional
-            from sqlalchemy.exc import IntegrityError
+            from sqlalchemy.exc import DBAPIError, IntegrityError
 
             app.add_exception_handler(
                 IntegrityError, integrity_error_handler
             )
+            app.add_exception_handler(DBAPIError, query_timeout_handler)
         except ImportError:
             pass
 
@@ -251,6 +277,8 @@ def register_exception_handlers(
             app.add_exception_handler(
                 DuplicateKeyError, duplicate_key_exception_handler
             )
+        if ExecutionTimeout.__module__ != __name__:
+            app.add_exception_handler(ExecutionTimeout, query_timeout_handler)
         if DocumentNotFound.__module__ != __name__:
             app.add_exception_handler(
                 DocumentNotFound, document_not_found_handler
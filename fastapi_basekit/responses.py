@@ -0,0 +1,70 @@
+"""Respuesta JSON rápida para el envelope ``BaseResponse``.
+
+``BaseKitJSONResponse`` reemplaza a ``JSONResponse`` (``json.dumps``) en los
+controllers y en ``register_exception_handlers``:
+
+- Un ``BaseModel`` (el envelope) se serializa con el serializador en Rust de
+  Pydantic (``model_dump_json``), sin pasar por dicts intermedios.
+- Cualquier otro contenido se serializa con ``orjson`` si está instalado, o
+  con ``pydantic_core.to_json`` si no.
+- ``bytes`` se consideran JSON ya serializado y se envían tal cual.
+
+UUID, datetime/date, Decimal, Enum y modelos Pydantic se serializan de forma
+nativa; ``ObjectId`` (y cualquier tipo desconocido) vía ``_fallback``.
+"""
+
+from decimal import Decimal
+from typing import Any
+
+import pydantic_core
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+try:  # pragma: no cover - dependencia opcional
+    import orjson  # type: ignore
+except ImportError:  # pragma: no cover
+    orjson = None  # type: ignore[assignment]
+
+try:  # pragma: no cover - dependencia opcional
+    from bson import ObjectId  # type: ignore
+except ImportError:  # pragma: no cover
+    class ObjectId:  # type: ignore[no-redef]
+        """Fallback cuando bson no está instalado."""
+
+        ...
+
+
+def _fallback(value: Any) -> Any:
+    """Tipos que ni orjson ni pydantic_core conocen."""
+    if isinstance(value, ObjectId):
+        return str(value)
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    # Mismo criterio que el resto de handlers: nunca romper por un tipo raro.
+    return str(value)
+
+
+def dumps(content: Any) -> bytes:
+    """``content`` → JSON (bytes) con el motor más rápido disponible."""
+    if isinstance(content, BaseModel):
+        return content.model_dump_json(fallback=_fallback).encode()
+    if orjson is not None:
+        return orjson.dumps(
+            content,
+            default=_fallback,
+            option=orjson.OPT_NON_STR_KEYS,
+        )
+    return pydantic_core.to_json(content, fallback=_fallback)
+
+
+class BaseKitJSONResponse(JSONResponse):
+    """``JSONResponse`` con serialización rápida (ver módulo)."""
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, (bytes, bytearray, memoryview)):
+            return bytes(content)
+        return dumps(content)
@@ -1,6 +1,10 @@
+from typing import Optional
+
 from pydantic import BaseModel
 
 
 class TokenSchema(BaseModel):
     sub: str
     exp: int
+    iat: Optional[int] = None
+    jti: Optional[str] = None
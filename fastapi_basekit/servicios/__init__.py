@@ -1,3 +1,14 @@
-from .thrid.jwt import JWTService
+from .thrid.jwt import JWTService, get_jwt_service
+from .thrid.revocation import (
+    BaseRevocationStore,
+    InMemoryRevocationStore,
+    RevocationList,
+)
 
-__all__ = ["JWTService"]
+__all__ = [
+    "JWTService",
+    "get_jwt_service",
+    "BaseRevocationStore",
+    "InMemoryRevocationStore",
+    "RevocationList",
+]
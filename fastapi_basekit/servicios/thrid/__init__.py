@@ -1 +1,7 @@
-from .jwt import JWTService  # noqa
+from .jwt import JWTService, get_jwt_service  # noqa
+from .revocation import (  # noqa
+    BaseRevocationStore,
+    BloomFilter,
+    InMemoryRevocationStore,
+    RevocationList,
+)
@@ -1,13 +1,18 @@
+import functools
 import os
+import threading
 import time
-from uuid import UUID
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+from uuid import UUID, uuid4
 
 import jwt
+from jwt.algorithms import get_default_algorithms
 from jwt.exceptions import ExpiredSignatureError, PyJWTError
 
 try:
     from bson import ObjectId  # type: ignore
-except ImportError:  # pragma: no cover - bson is opcional
+except ImportError:  # pragma: no cover - bson es opcional
     ObjectId = None  # type: ignore
 
 from ...exceptions.api_exceptions import JWTAuthenticationException
@@ -15,13 +20,67 @@ from ...schema.jwt import TokenSchema
 
 _INSECURE_DEV_SECRET = "secret_dev_key"
 _TRUTHY = {"1", "true", "t", "yes", "on"}
+_ASYMMETRIC_PREFIXES = ("RS", "PS", "ES", "EdDSA")
+
+
+@functools.lru_cache(maxsize=32)
+def _read_file(path: str) -> str:
+    with open(path, encoding="utf-8") as handle:
+        return handle.read()
+
+
+@functools.lru_cache(maxsize=32)
+def _prepare_key(algorithm: str, material: str) -> Any:
+    """Clave PEM parseada UNA vez por proceso (objeto de ``cryptography``)."""
+    try:
+        implementation = get_default_algorithms()[algorithm]
+    except KeyError:
+        raise RuntimeError(
+            f"JWT_ALGORITHM={algorithm} requiere `cryptography` "
+            "(pip install 'fastapi-basekit[crypto]')."
+        )
+    return implementation.prepare_key(material)
+
+
+@functools.lru_cache(maxsize=8)
+def _load_jwks(path: str) -> Dict[Optional[str], Any]:
+    """JWKS local (``{"keys": [...]}``) → ``{kid: clave parseada}``."""
+    keys: Dict[Optional[str], Any] = {}
+    for jwk in jwt.PyJWKSet.from_json(_read_file(path)).keys:
+        keys[jwk.key_id] = jwk.key
+    return keys
+
+
+def _env_key(name: str) -> Optional[str]:
+    """PEM desde ``NAME`` o desde el archivo de ``NAME_FILE``."""
+    value = os.getenv(name)
+    if value:
+        return value.replace("\\n", "\n")
+    path = os.getenv(f"{name}_FILE")
+    return _read_file(path) if path else None
 
 
 class JWTService:
-    """Servicio JWT (HS256 por defecto).
+    """Servicio JWT (HS256 por defecto; RS*/PS*/ES*/EdDSA con claves locales).
+
+    Config por env: ``JWT_SECRET`` (OBLIGATORIO con HS*), ``JWT_ALGORITHM``
+    (def HS256), ``JWT_EXPIRE_SECONDS`` (def 3600),
+    ``JWT_VERIFIED_CACHE_SIZE`` (def 1024; 0 desactiva).
 
-    Config por env: ``JWT_SECRET`` (OBLIGATORIO), ``JWT_ALGORITHM`` (def HS256),
-    ``JWT_EXPIRE_SECONDS`` (def 3600).
+    Algoritmos asimétricos (requieren ``cryptography``):
+
+    - ``JWT_PRIVATE_KEY`` / ``JWT_PRIVATE_KEY_FILE``: PEM para firmar
+      (opcional: un servicio que solo verifica no la necesita).
+    - ``JWT_PUBLIC_KEY`` / ``JWT_PUBLIC_KEY_FILE``: PEM para verificar, o
+      ``JWT_JWKS_FILE``: un JWKS local; la clave se elige por el ``kid`` del
+      header. Sin ninguna, se verifica con la pública de la privada.
+    - ``JWT_KID``: ``kid`` que ``create_token`` pone en el header.
+
+    Las claves se parsean una vez por proceso. ``decode_token`` recuerda los
+    tokens ya verificados (LRU de ``JWT_VERIFIED_CACHE_SIZE`` entradas, cada
+    una válida hasta el ``exp`` del token): una ráfaga de requests con el
+    mismo bearer no repite la verificación criptográfica. Usar
+    ``get_jwt_service()`` para compartir ese cache en todo el proceso.
 
     FALLA FUERTE si falta ``JWT_SECRET`` — antes caía a una clave pública
     (`secret_dev_key`) y firmaba tokens de producción con un secreto conocido
@@ -30,24 +89,15 @@ class JWTService:
     """
 
     def __init__(self):
-        secret = os.getenv("JWT_SECRET")
-        if not secret:
-            allow_dev = (
-                os.getenv("JWT_ALLOW_INSECURE_DEV_SECRET", "").strip().lower()
-                in _TRUTHY
-            )
-            if not allow_dev:
-                raise RuntimeError(
-                    "JWT_SECRET no está seteado. fastapi-basekit se niega a "
-                    "firmar tokens con una clave por defecto pública (riesgo: "
-                    "cualquiera forja tokens de cualquier usuario). Setea "
-                    "JWT_SECRET a un valor aleatorio de >=32 bytes. Solo para "
-                    "desarrollo local podés setear "
-                    "JWT_ALLOW_INSECURE_DEV_SECRET=1."
-                )
-            secret = _INSECURE_DEV_SECRET
-        self.JWT_SECRET = secret
         self.JWT_ALGORITHM = os.getenv("JWT_ALGORITHM", "HS256")
+        self.JWT_SECRET: Optional[str] = None
+        self._jwks: Optional[Dict[Optional[str], Any]] = None
+        self._kid = os.getenv("JWT_KID") or None
+        if self.JWT_ALGORITHM.startswith(_ASYMMETRIC_PREFIXES):
+            self._configure_asymmetric()
+        else:
+            self.JWT_SECRET = self._hmac_secret()
+            self._signing_key = self._verify_key = self.JWT_SECRET
         raw_expire = os.getenv("JWT_EXPIRE_SECONDS", "3600")
         try:
             self.JWT_EXPIRE_SECONDS = int(raw_expire)
@@ -56,11 +106,125 @@ class JWTService:
                 f"JWT_EXPIRE_SECONDS debe ser un entero de segundos, "
                 f"recibí {raw_expire!r}."
             )
+        raw_size = os.getenv("JWT_VERIFIED_CACHE_SIZE", "1024")
+        try:
+            self._verified_size = max(int(raw_size), 0)
+        except (TypeError, ValueError):
+            raise RuntimeError(
+                f"JWT_VERIFIED_CACHE_SIZE debe ser un entero, "
+                f"recibí {raw_size!r}."
+            )
+        self._verified: "OrderedDict[str, Tuple[TokenSchema, float]]" = (
+            OrderedDict()
+        )
+        self._verified_lock = threading.Lock()
+
+    @staticmethod
+    def _hmac_secret() -> str:
+        secret = os.getenv("JWT_SECRET")
+        if secret:
+            return secret
+        allow_dev = (
+            os.getenv("JWT_ALLOW_INSECURE_DEV_SECRET", "").strip().lower()
+            in _TRUTHY
+        )
+        if not allow_dev:
+            raise RuntimeError(
+                "JWT_SECRET no está seteado. fastapi-basekit se niega a "
+                "firmar tokens con una clave por defecto pública (riesgo: "
+                "cualquiera forja tokens de cualquier usuario). Setea "
+                "JWT_SECRET a un valor aleatorio de >=32 bytes. Solo para "
+                "desarrollo local podés setear "
+                "JWT_ALLOW_INSECURE_DEV_SECRET=1."
+            )
+        return _INSECURE_DEV_SECRET
+
+    def _configure_asymmetric(self) -> None:
+        algorithm = self.JWT_ALGORITHM
+        private_pem = _env_key("JWT_PRIVATE_KEY")
+        public_pem = _env_key("JWT_PUBLIC_KEY")
+        jwks_file = os.getenv("JWT_JWKS_FILE")
+        self._signing_key = (
+            _prepare_key(algorithm, private_pem) if private_pem else None
+        )
+        if jwks_file:
+            self._jwks = _load_jwks(jwks_file)
+            self._verify_key = None
+        elif public_pem:
+            self._verify_key = _prepare_key(algorithm, public_pem)
+        elif self._signing_key is not None:
+            self._verify_key = self._signing_key.public_key()
+        else:
+            raise RuntimeError(
+                f"JWT_ALGORITHM={algorithm} necesita JWT_PUBLIC_KEY(_FILE), "
+                "JWT_JWKS_FILE o JWT_PRIVATE_KEY(_FILE)."
+            )
+
+    def _key_for(self, token: str) -> Any:
+        """Clave de verificación; con JWKS, la del ``kid`` del header."""
+        if self._jwks is None:
+            return self._verify_key
+        kid = jwt.get_unverified_header(token).get("kid")
+        key = self._jwks.get(kid)
+        if key is None and kid is None and len(self._jwks) == 1:
+            key = next(iter(self._jwks.values()))
+        if key is None:
+            raise jwt.InvalidKeyError(f"kid desconocido: {kid!r}")
+        return key
+
+    def _decode(self, token: str, **options: Any) -> Dict[str, Any]:
+        return jwt.decode(
+            token,
+            self._key_for(token),
+            algorithms=[self.JWT_ALGORITHM],
+            options=options or None,
+        )
+
+    def _encode(self, payload: Dict[str, Any]) -> str:
+        if self._signing_key is None:
+            raise RuntimeError(
+                "JWTService sin clave privada (JWT_PRIVATE_KEY): solo puede "
+                "verificar tokens."
+            )
+        headers = {"kid": self._kid} if self._kid else None
+        return jwt.encode(
+            payload,
+            self._signing_key,
+            algorithm=self.JWT_ALGORITHM,
+            headers=headers,
+        )
+
+    def _cached(self, token: str) -> Optional[TokenSchema]:
+        with self._verified_lock:
+            entry = self._verified.get(token)
+            if entry is None:
+                return None
+            if entry[1] <= time.time():
+                del self._verified[token]
+                return None
+            self._verified.move_to_end(token)
+            return entry[0]
+
+    def _remember(self, token: str, data: TokenSchema) -> None:
+        if not self._verified_size:
+            return
+        with self._verified_lock:
+            self._verified[token] = (data, data.exp)
+            self._verified.move_to_end(token)
+            while len(self._verified) > self._verified_size:
+                self._verified.popitem(last=False)
 
     def create_token(self, subject: str, extra_data: dict = None) -> str:
         now = int(time.time())
         expiration = now + self.JWT_EXPIRE_SECONDS
-        payload = {"sub": str(subject), "exp": expiration, "iat": now}
+        # `jti` identifica la sesión para revocarla (ver `RevocationList`);
+        # `refresh_token` lo conserva.
+        payload = {
+            "sub": str(subject),
+            "exp": expiration,
+            "iat": now,
+            "jti": uuid4().hex,
+        }
 
         if extra_data is not None:
 
@@ -75,20 +239,14 @@ class JWTService:
                 {k: convert_to_serializable(v) for k, v in extra_data.items()}
             )
 
-        return jwt.encode(
-            payload,
-            self.JWT_SECRET,
-            algorithm=self.JWT_ALGORITHM,
-        )
+        return self._encode(payload)
 
     def decode_token(self, token: str) -> TokenSchema:
+        cached = self._cached(token)
+        if cached is not None:
+            return cached
         try:
-            payload = jwt.decode(
-                token,
-                self.JWT_SECRET,
-                algorithms=[self.JWT_ALGORITHM],
-            )
-            return TokenSchema(**payload)
+            data = TokenSchema(**self._decode(token))
         except ExpiredSignatureError:
             raise JWTAuthenticationException(
                 message="El token ha expirado", data={"token": token}
@@ -97,23 +255,37 @@ class JWTService:
             raise JWTAuthenticationException(
                 message="Token inválido", data={"token": token}
             )
+        self._remember(token, data)
+        return data
 
     def refresh_token(self, token: str) -> str:
+        """Token nuevo con ``exp`` renovado para la MISMA sesión.
+
+        Se conservan ``jti`` e ``iat``: el ``jti`` identifica la sesión (el
+        linaje de refrescos), así que un token revocado por ``jti`` sigue
+        revocado tras refrescarlo, y revocar cualquier token del linaje
+        revoca a todos; una revocación por ``sub`` (tokens emitidos antes de
+        X) también alcanza a los refrescados. Un token previo a los ``jti``
+        recibe uno nuevo.
+        """
         try:
-            payload = jwt.decode(
-                token,
-                self.JWT_SECRET,
-                algorithms=[self.JWT_ALGORITHM],
-                options={"verify_exp": False},
-            )
+            payload = self._decode(token, verify_exp=False)
             payload["exp"] = int(time.time()) + self.JWT_EXPIRE_SECONDS
-            return jwt.encode(
-                payload,
-                self.JWT_SECRET,
-                algorithm=self.JWT_ALGORITHM,
-            )
+            payload.setdefault("jti", uuid4().hex)
+            return self._encode(payload)
         except PyJWTError:
             raise JWTAuthenticationException(
                 message="Token inválido, no se puede refrescar",
                 data={"token": token},
             )
+
+
+@functools.lru_cache(maxsize=1)
+def get_jwt_service() -> JWTService:
+    """``JWTService`` compartido por el proceso: lee la config de env UNA vez.
+
+    Para middlewares y dependencias que verifican tokens en cada request.
+    Tras cambiar las variables ``JWT_*`` en runtime (tests), llamar
+    ``get_jwt_service.cache_clear()``.
+    """
+    return JWTService()
@@ -0,0 +1,299 @@
+"""Revocación de JWT (logout, blacklist) sin consultar la base en cada request.
+
+``RevocationList`` mantiene en memoria un filtro de Bloom con todas las
+revocaciones vigentes (``jti`` de un token o ``sub`` de un usuario). Un token
+cuyo ``jti``/``sub`` NO está en el filtro seguro no fue revocado: responde sin
+tocar el storage (el caso de casi todos los requests). Solo un acierto
+probable se confirma contra el storage; el resultado queda en un set exacto
+de positivos (y los falsos positivos en un LRU acotado), así que cada clave se
+confirma una vez.
+
+- Revocar un ``jti`` invalida ese token y los obtenidos al refrescarlo
+  (``JWTService.refresh_token`` conserva el ``jti``).
+- Revocar un ``sub`` invalida los tokens de ese usuario emitidos (``iat``)
+  hasta el segundo de la revocación inclusive ("cerrar todas las sesiones");
+  los logins de los segundos siguientes valen. ``iat`` tiene resolución de
+  segundos y no distingue un token de antes o de después dentro del mismo
+  segundo, así que ese segundo se trata como revocado (falla cerrado): un
+  login en ese mismo segundo queda revocado y el usuario vuelve a entrar.
+
+El filtro se alimenta del storage de forma incremental
+(``changes_since(cursor)`` cada ``refresh_interval`` segundos) y se
+reconstruye completo cada ``rebuild_interval`` segundos para descartar las
+revocaciones vencidas. ``revoke()`` escribe en el storage y aplica la
+revocación en este proceso al instante; los demás workers la ven en el
+siguiente refresco incremental.
+"""
+
+import asyncio
+import hashlib
+import logging
+import math
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+#: ``(tipo, valor, revoked_at)`` con tipo ``"jti"`` o ``"sub"``.
+Revocation = Tuple[str, str, float]
+
+
+class BloomFilter:
+    """Filtro de Bloom en un ``bytearray`` (doble hashing sobre blake2b).
+
+    Sin falsos negativos; la tasa de falsos positivos ronda ``error_rate``
+    mientras no se superen ``capacity`` elementos.
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.001) -> None:
+        capacity = max(capacity, 1)
+        bits = -capacity * math.log(error_rate) / (math.log(2) ** 2)
+        self.size = max(int(math.ceil(bits)), 8)
+        self.hashes = max(int(round(self.size / capacity * math.log(2))), 1)
+        self.count = 0
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, key: str) -> List[int]:
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        return [(first + i * second) % self.size for i in range(self.hashes)]
+
+    def add(self, key: str) -> None:
+        for position in self._positions(key):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, key: str) -> bool:
+        bits = self._bits
+        return all(
+            bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(key)
+        )
+
+
+class BaseRevocationStore:
+    """Storage de revocaciones (tabla ``revoked_tokens``, colección, Redis…).
+
+    Implementar sobre el repositorio del proyecto. ``expires_at`` (epoch) es
+    cuándo la revocación deja de importar (el ``exp`` del token, o el máximo
+    de vida de un token para un ``sub``).
+    """
+
+    async def add(
+        self,
+        kind: str,
+        value: str,
+        revoked_at: float,
+        expires_at: Optional[float] = None,
+    ) -> None:
+        raise NotImplementedError
+
+    async def changes_since(
+        self, cursor: Any
+    ) -> Tuple[List[Revocation], Any]:
+        """Revocaciones agregadas después de ``cursor`` y el cursor nuevo.
+
+        ``cursor=None``: todas las vigentes (no vencidas).
+        """
+        raise NotImplementedError
+
+    async def lookup(self, kind: str, value: str) -> Optional[float]:
+        """``revoked_at`` vigente de ``(kind, value)``, o None."""
+        raise NotImplementedError
+
+
+class InMemoryRevocationStore(BaseRevocationStore):
+    """Storage en proceso (tests, un solo worker). El cursor es un índice."""
+
+    def __init__(self, clock: Callable[[], float] = time.time) -> None:
+        self.clock = clock
+        self._log: List[Tuple[str, str, float, Optional[float]]] = []
+
+    async def add(self, kind, value, revoked_at, expires_at=None) -> None:
+        self._log.append((kind, str(value), revoked_at, expires_at))
+
+    def _alive(self, entry: Tuple[str, str, float, Optional[float]]) -> bool:
+        return entry[3] is None or entry[3] > self.clock()
+
+    async def changes_since(self, cursor):
+        start = cursor or 0
+        entries = [
+            (kind, value, revoked_at)
+            for kind, value, revoked_at, expires_at in self._log[start:]
+            if self._alive((kind, value, revoked_at, expires_at))
+        ]
+        return entries, len(self._log)
+
+    async def lookup(self, kind, value):
+        found = [
+            entry[2]
+            for entry in self._log
+            if entry[0] == kind and entry[1] == value and self._alive(entry)
+        ]
+        return max(found) if found else None
+
+
+class RevocationList:
+    """Chequeo de revocación con un Bloom en memoria delante del storage.
+
+    Args:
+        store: storage de revocaciones.
+        capacity: revocaciones vigentes esperadas (dimensiona el filtro; al
+            reconstruir se agranda si hace falta).
+        error_rate: tasa de falsos positivos objetivo del filtro.
+        refresh_interval: segundos entre refrescos incrementales.
+        rebuild_interval: segundos entre reconstrucciones completas.
+        negative_cache_size: falsos positivos confirmados que se recuerdan.
+        clock: reloj (epoch; inyectable en tests).
+    """
+
+    def __init__(
+        self,
+        store: BaseRevocationStore,
+        capacity: int = 100_000,
+        error_rate: float = 0.001,
+        refresh_interval: float = 5,
+        rebuild_interval: float = 3600,
+        negative_cache_size: int = 10_000,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.store = store
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.refresh_interval = refresh_interval
+        self.rebuild_interval = rebuild_interval
+        self.negative_cache_size = negative_cache_size
+        self.clock = clock
+        #: Consultas al storage por aciertos probables (observabilidad).
+        self.store_lookups = 0
+        self._bloom = BloomFilter(capacity, error_rate)
+        self._positives: Dict[str, float] = {}
+        self._negatives: "OrderedDict[str, None]" = OrderedDict()
+        self._cursor: Any = None
+        self._loaded_at: Optional[float] = None
+        self._refreshed_at = 0.0
+        self._syncing: Optional["asyncio.Task[None]"] = None
+
+    @staticmethod
+    def _key(kind: str, value: Any) -> str:
+        return f"{kind}:{value}"
+
+    def _apply(self, kind: str, value: str, revoked_at: float) -> None:
+        key = self._key(kind, value)
+        self._bloom.add(key)
+        self._negatives.pop(key, None)
+        if key in self._positives:
+            self._positives[key] = max(self._positives[key], revoked_at)
+
+    async def _sync(self, full: bool) -> None:
+        entries, cursor = await self.store.changes_since(
+            None if full else self._cursor
+        )
+        if full:
+            self._bloom = BloomFilter(
+                max(self.capacity, 2 * len(entries)), self.error_rate
+            )
+            self._positives.clear()
+            self._negatives.clear()
+        for kind, value, revoked_at in entries:
+            self._apply(kind, value, revoked_at)
+        self._cursor = cursor
+        now = self.clock()
+        if full:
+            self._loaded_at = now
+        self._refreshed_at = now
+
+    async def _run(self, full: bool) -> None:
+        task = self._syncing
+        if task is None or task.done():
+            task = asyncio.ensure_future(self._sync(full))
+            self._syncing = task
+        await asyncio.shield(task)
+
+    async def load(self) -> None:
+        """Reconstruye el filtro con todas las revocaciones vigentes."""
+        await self._run(full=True)
+
+    async def refresh(self) -> None:
+        """Agrega al filtro las revocaciones nuevas desde el último cursor."""
+        await self._run(full=False)
+
+    async def ensure_fresh(self) -> None:
+        if self._loaded_at is None:
+            await self.load()
+            return
+        now = self.clock()
+        full = now - self._loaded_at >= self.rebuild_interval
+        if not full and now - self._refreshed_at < self.refresh_interval:
+            return
+        try:
+            await self._run(full=full)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.warning(
+                "Refresco de revocaciones fallido; se sigue con el filtro "
+                "actual",
+                exc_info=True,
+            )
+
+    async def revoke(
+        self,
+        jti: Optional[str] = None,
+        sub: Optional[Any] = None,
+        expires_at: Optional[float] = None,
+    ) -> None:
+        """Revoca un token (``jti``) y/o todos los tokens emitidos antes de
+        este segundo para un usuario (``sub``).
+
+        ``expires_at`` de un ``jti`` debe cubrir lo que el token todavía
+        pueda refrescarse (``refresh_token`` acepta tokens vencidos); None
+        la mantiene hasta que el storage la descarte.
+        """
+        # Carga primero: una carga completa posterior descartaría los
+        # positivos exactos agregados acá.
+        await self.ensure_fresh()
+        # Segundos enteros, como `iat` (ver `is_revoked`).
+        revoked_at = int(self.clock())
+        for kind, value in (("jti", jti), ("sub", sub)):
+            if value is None:
+                continue
+            value = str(value)
+            await self.store.add(kind, value, revoked_at, expires_at)
+            self._apply(kind, value, revoked_at)
+            self._positives[self._key(kind, value)] = revoked_at
+
+    async def _revoked_at(self, kind: str, value: Any) -> Optional[float]:
+        key = self._key(kind, value)
+        if key not in self._bloom:
+            return None
+        if key in self._positives:
+            return self._positives[key]
+        if key in self._negatives:
+            self._negatives.move_to_end(key)
+            return None
+        self.store_lookups += 1
+        revoked_at = await self.store.lookup(kind, str(value))
+        if revoked_at is None:
+            self._negatives[key] = None
+            while len(self._negatives) > self.negative_cache_size:
+                self._negatives.popitem(last=False)
+        else:
+            self._positives[key] = revoked_at
+        return revoked_at
+
+    async def is_revoked(self, token: Any) -> bool:
+        """``token``: ``TokenSchema`` (o cualquier objeto con ``sub``,
+        ``jti`` e ``iat``)."""
+        await self.ensure_fresh()
+        jti = getattr(token, "jti", None)
+        if jti and await self._revoked_at("jti", jti) is not None:
+            return True
+        revoked_at = await self._revoked_at("sub", token.sub)
+        if revoked_at is None:
+            return False
+        iat = getattr(token, "iat", None)
+        # `<=`: un `iat` del mismo segundo puede ser previo a la revocación.
+        return iat is None or iat <= int(revoked_at)
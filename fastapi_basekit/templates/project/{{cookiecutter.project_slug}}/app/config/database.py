@@ -58,6 +58,9 @@ async def close_db():
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    from app.permissions.user import role_matrix
+
+    await role_matrix.load()
     try:
         yield
     finally:
@@ -99,7 +102,10 @@ async def close_db() -> None:
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    from app.permissions.user import role_matrix
+
     await init_db()
+    await role_matrix.load()
     try:
         yield
     finally:
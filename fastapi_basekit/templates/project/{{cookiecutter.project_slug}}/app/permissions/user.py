@@ -2,12 +2,18 @@
 
 from fastapi import Request
 from fastapi_basekit.aio.permissions.base import BasePermission
+from fastapi_basekit.aio.permissions.matrix import (
+    MatrixPermission,
+    PermissionMatrix,
+)
 
 from app.models.enums import UserRoleEnum
 
 
 class AdminPermission(BasePermission):
     message_exception: str = "Admin role required"
+    # Stateless: one shared instance per process.
+    reusable: bool = True
 
     async def has_permission(self, request: Request) -> bool:
         user = getattr(request.state, "user", None)
@@ -18,9 +24,29 @@ class AdminPermission(BasePermission):
 
 class PlatformAdminPermission(BasePermission):
     message_exception: str = "Platform admin required"
+    reusable: bool = True
 
     async def has_permission(self, request: Request) -> bool:
         user = getattr(request.state, "user", None)
         if not user:
             return False
         return bool(getattr(user, "is_platform_admin", False))
+
+
+async def load_role_matrix():
+    """All granted (role, controller, action) tuples.
+
+    Replace with a query over your roles/permissions tables; the matrix is
+    loaded once at startup and refreshed on `role_matrix.bump()` or TTL.
+    """
+    return [(UserRoleEnum.admin, "*", "*")]
+
+
+role_matrix = PermissionMatrix(load_role_matrix, ttl=300)
+
+
+class RolePermission(MatrixPermission):
+    """O(1) lookup of (user.role, controller, action) in `role_matrix`."""
+
+    matrix = role_matrix
+    message_exception: str = "Role not allowed for this action"
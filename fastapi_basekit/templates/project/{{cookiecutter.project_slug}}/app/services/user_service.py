@@ -13,6 +13,7 @@ from fastapi_basekit.exceptions.api_exceptions import DatabaseIntegrityException
 from sqlalchemy.ext.asyncio import AsyncSession
 {%- endif %}
 
+from app.middleware.auth import user_resolver
 from app.repositories.user.repository import UserRepository
 from app.utils.security import get_password_hash
 
@@ -44,3 +45,13 @@ class UserService(BaseService):
 
         data["password_hash"] = get_password_hash(password)
         return await self.repository.create(data)
+
+    async def update(self, id, data) -> Any:
+        updated = await super().update(id, data)
+        user_resolver.invalidate(id)
+        return updated
+
+    async def delete(self, id) -> Any:
+        deleted = await super().delete(id)
+        user_resolver.invalidate(id)
+        return deleted
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+bench_request_overhead.py — microbenchmark del costo por request de basekit.
+
+Usage:
+    python scripts/bench_request_overhead.py               # 20000 iteraciones
+    python scripts/bench_request_overhead.py -n 50000
+
+Mide, sin base de datos, lo que cada request paga antes de tocar el
+repositorio:
+    1. Construcción del servicio (`BaseService.__init__`).
+    2. `check_permissions` con dos permisos.
+    3. `_params()` sobre una query string típica.
+    4. Un GET de listado no-op completo (FastAPI + cbv + Depends) vía ASGI,
+       con un repositorio que devuelve una página vacía.
+
+Imprime µs por operación (el mejor de varios intentos, para filtrar ruido);
+compara antes/después de un cambio corriendo el script en ambas revisiones.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from fastapi import APIRouter, Depends, FastAPI, Query, Request
+from fastapi_restful.cbv import cbv
+from httpx import ASGITransport, AsyncClient
+from pydantic import BaseModel
+from starlette.datastructures import QueryParams
+
+from fastapi_basekit.aio.permissions.base import BasePermission
+from fastapi_basekit.aio.sqlalchemy.controller.base import (
+    SQLAlchemyBaseController,
+)
+from fastapi_basekit.aio.sqlalchemy.repository.base import BaseRepository
+from fastapi_basekit.aio.sqlalchemy.service.base import BaseService
+
+
+class _Schema(BaseModel):
+    id: int
+
+
+class _NoopRepository(BaseRepository):
+    model = None
+
+    def __init__(self) -> None:
+        super().__init__(db=None)
+
+    async def list_paginated(self, **kwargs: Any) -> Tuple[List[Any], int]:
+        return [], 0
+
+
+class _Service(BaseService):
+    search_fields = ["name", "email"]
+    duplicate_check_fields = ["email"]
+    kwargs_query = {"joins": ["role"]}
+
+
+class _AllowA(BasePermission):
+    reusable = True
+
+    async def has_permission(self, request: Request) -> bool:
+        return True
+
+
+class _AllowB(_AllowA):
+    pass
+
+
+router = APIRouter(prefix="/things")
+
+
+def get_service(request: Request) -> _Service:
+    return _Service(repository=_NoopRepository(), request=request)
+
+
+@cbv(router)
+class _Controller(SQLAlchemyBaseController):
+    schema_class = _Schema
+    service: _Service = Depends(get_service)
+    permission_classes = [_AllowA, _AllowB]
+
+    @router.get("/")
+    async def list_things(
+        self,
+        page: int = Query(1),
+        count: int = Query(10),
+        is_active: Optional[bool] = Query(None),
+    ):
+        return await self.list()
+
+
+class _FakeRequest:
+    def __init__(self, query_string: str) -> None:
+        self.query_params = QueryParams(query_string)
+        endpoint = _Controller.list_things
+        self.scope: Dict[str, Any] = {"endpoint": endpoint}
+
+
+REPEATS = 5
+
+
+def _report(label: str, n: int, best: float) -> None:
+    print(f"{label:<28} {best / n * 1e6:8.2f} µs/op (mejor de {REPEATS})")
+
+
+def _bench(label: str, n: int, fn) -> None:
+    best = float("inf")
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        for _ in range(n):
+            fn()
+        best = min(best, time.perf_counter() - start)
+    _report(label, n, best)
+
+
+async def _abench(label: str, n: int, fn) -> None:
+    best = float("inf")
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        for _ in range(n):
+            await fn()
+        best = min(best, time.perf_counter() - start)
+    _report(label, n, best)
+
+
+async def main(n: int) -> None:
+    request = _FakeRequest("page=2&count=20&is_active=true&status=a&status=b")
+    repository = _NoopRepository()
+
+    _bench(
+        "service construction",
+        n,
+        lambda: _Service(repository=repository, request=request),
+    )
+
+    controller = _Controller.__new__(_Controller)
+    controller.request = request
+    await _abench("check_permissions", n, controller.check_permissions)
+    _bench("_params", n, controller._params)
+
+    app = FastAPI()
+    app.include_router(router)
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://bench"
+    ) as client:
+        url = "/things/?page=1&count=10&is_active=true"
+        for _ in range(200):  # warm-up
+            await client.get(url)
+        await _abench(
+            "no-op list request", max(n // 20, 1), lambda: client.get(url)
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("-n", type=int, default=20000, help="iteraciones")
+    args = parser.parse_args()
+    asyncio.run(main(args.n))
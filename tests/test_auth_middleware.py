@@ -0,0 +1,175 @@
+"""Tests del middleware ASGI de autenticación y `CachedUserResolver`.
+
+Cubre el modo eager (usuario en `request.state` con una sola carga por `sub`
+mientras dura el TTL), la invalidación explícita, el LRU acotado, los tokens
+inválidos como anónimos, los paths excluidos, la propagación de errores del
+loader y el modo lazy con la sesión del request.
+"""
+
+from types import SimpleNamespace
+
+import pytest
+from fastapi import Depends, FastAPI, Request
+from httpx import ASGITransport
+from httpx import AsyncClient as HTTPXAsyncClient
+
+from fastapi_basekit.aio.middleware import (
+    AuthenticationMiddleware,
+    CachedUserResolver,
+)
+from fastapi_basekit.servicios import JWTService, get_jwt_service
+
+
+class _Users:
+    def __init__(self):
+        self.rows = {
+            "1": SimpleNamespace(id="1", name="Ana", is_active=True),
+            "2": SimpleNamespace(id="2", name="Beto", is_active=False),
+        }
+        self.loads = []
+        self.fail = False
+
+    async def __call__(self, sub, *args):
+        self.loads.append((sub, args))
+        if self.fail:
+            raise RuntimeError("db caída")
+        return self.rows.get(sub)
+
+
+def _app(resolver=None, **kwargs):
+    app = FastAPI()
+
+    @app.get("/me")
+    async def me(request: Request):
+        user = getattr(request.state, "user", None)
+        return {
+            "user": user.name if user else None,
+            "sub": getattr(request.state, "auth_sub", None),
+        }
+
+    @app.get("/health")
+    async def health(request: Request):
+        return {"sub": getattr(request.state, "auth_sub", None)}
+
+    app.add_middleware(AuthenticationMiddleware, resolver=resolver, **kwargs)
+    return app
+
+
+def _client(app):
+    return HTTPXAsyncClient(
+        transport=ASGITransport(app=app, raise_app_exceptions=False),
+        base_url="http://test",
+    )
+
+
+def _auth(sub):
+    return {"Authorization": f"Bearer {JWTService().create_token(sub)}"}
+
+
+async def test_eager_mode_caches_user_per_sub():
+    loader = _Users()
+    app = _app(CachedUserResolver(loader, ttl=60))
+    async with _client(app) as client:
+        for _ in range(3):
+            response = await client.get("/me", headers=_auth("1"))
+            assert response.json() == {"user": "Ana", "sub": "1"}
+    assert loader.loads == [("1", ())]
+
+
+async def test_inactive_and_missing_users_are_anonymous():
+    loader = _Users()
+    app = _app(CachedUserResolver(loader))
+    async with _client(app) as client:
+        inactive = await client.get("/me", headers=_auth("2"))
+        missing = await client.get("/me", headers=_auth("9"))
+    assert inactive.json() == {"user": None, "sub": "2"}
+    assert missing.json() == {"user": None, "sub": "9"}
+
+
+async def test_invalid_token_and_excluded_paths_skip_auth():
+    loader = _Users()
+    app = _app(CachedUserResolver(loader), excluded_path_prefixes=["/health"])
+    async with _client(app) as client:
+        bad = await client.get("/me", headers={"Authorization": "Bearer x.y.z"})
+        basic = await client.get("/me", headers={"Authorization": "Basic abc"})
+        excluded = await client.get("/health", headers=_auth("1"))
+    assert bad.json() == {"user": None, "sub": None}
+    assert basic.json() == {"user": None, "sub": None}
+    assert excluded.json() == {"sub": None}
+    assert loader.loads == []
+
+
+async def test_loader_errors_are_not_swallowed():
+    loader = _Users()
+    loader.fail = True
+    app = _app(CachedUserResolver(loader))
+    async with _client(app) as client:
+        response = await client.get("/me", headers=_auth("1"))
+    assert response.status_code == 500
+
+
+async def test_resolver_ttl_invalidate_and_lru():
+    now = [0.0]
+    loader = _Users()
+    loader.rows["3"] = SimpleNamespace(id="3", name="Caro", is_active=True)
+    resolver = CachedUserResolver(
+        loader, ttl=10, maxsize=2, clock=lambda: now[0]
+    )
+    await resolver.get("1")
+    await resolver.get("1")
+    assert len(loader.loads) == 1
+
+    now[0] = 11
+    await resolver.get("1")
+    assert len(loader.loads) == 2
+
+    resolver.invalidate(1)
+    await resolver.get("1")
+    assert len(loader.loads) == 3
+
+    await resolver.get("3")
+    await resolver.get("2")  # desaloja "1", el menos usado
+    await resolver.get("1")
+    assert [sub for sub, _ in loader.loads[-3:]] == ["3", "2", "1"]
+
+
+async def test_lazy_mode_uses_the_request_session():
+    loader = _Users()
+    resolver = CachedUserResolver(loader)
+    session = object()
+
+    def get_session():
+        return session
+
+    async def current_user(request: Request, db=Depends(get_session)):
+        return await resolver.for_request(request, db)
+
+    app = FastAPI()
+
+    @app.get("/me")
+    async def me(request: Request, user=Depends(current_user)):
+        return {"user": user.name, "state": request.state.user.name}
+
+    app.add_middleware(AuthenticationMiddleware)
+    async with _client(app) as client:
+        response = await client.get("/me", headers=_auth("1"))
+    assert response.json() == {"user": "Ana", "state": "Ana"}
+    assert loader.loads == [("1", (session,))]
+
+
+def test_jwt_service_is_shared():
+    get_jwt_service.cache_clear()
+    assert get_jwt_service() is get_jwt_service()
+    get_jwt_service.cache_clear()
+
+
+@pytest.mark.parametrize("scope_type", ["websocket", "lifespan"])
+async def test_non_http_scopes_pass_through(scope_type):
+    seen = []
+
+    async def app(scope, receive, send):
+        seen.append(scope)
+
+    middleware = AuthenticationMiddleware(app)
+    await middleware({"type": scope_type, "path": "/"}, None, None)
+    assert "state" not in seen[0]
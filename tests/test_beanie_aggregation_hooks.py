@@ -97,8 +97,8 @@ class TestBuildListPipeline:
         assert len(pipeline) == 1
         match = pipeline[0]["$match"]
         assert "$or" in match
-        assert {"name": {"$regex": ".*ana.*", "$options": "i"}} in match["$or"]
-        assert {"email": {"$regex": ".*ana.*", "$options": "i"}} in match["$or"]
+        assert {"name": {"$regex": "ana", "$options": "i"}} in match["$or"]
+        assert {"email": {"$regex": "ana", "$options": "i"}} in match["$or"]
 
     def test_filters_plus_search_combined_with_and(self):
         repo = FakeRepo()
@@ -110,7 +110,7 @@ class TestBuildListPipeline:
         match = pipeline[0]["$match"]
         assert "$and" in match
         assert {"is_active": True} in match["$and"]
-        assert {"$or": [{"name": {"$regex": ".*ana.*", "$options": "i"}}]} in match["$and"]
+        assert {"$or": [{"name": {"$regex": "ana", "$options": "i"}}]} in match["$and"]
 
     def test_simple_order_by_appends_sort_stage(self):
         repo = FakeRepo()
@@ -0,0 +1,153 @@
+"""Tests de la resolución de Links por página (`resolve_links`, Beanie).
+
+Cubre una query `$in` por colección destino (no una por documento), los
+Links en listas, los niveles anidados con `nesting_depths_per_field`, la
+proyección por campo, los Links huérfanos y `BaseService.batch_links`
+(y la detección de filtros que leen el documento enlazado, que siguen
+con `fetch_links`).
+"""
+
+from typing import List, Optional
+
+import mongomock_motor
+import pytest
+from beanie import Document, Link, init_beanie
+from pydantic import BaseModel, Field
+
+from fastapi_basekit.aio.beanie.repository.base import BaseRepository
+from fastapi_basekit.aio.beanie.service.base import BaseService
+
+
+class Country(Document):
+    name: str
+
+    class Settings:
+        name = "link_countries"
+
+
+class Publisher(Document):
+    name: str
+    country: Optional[Link[Country]] = None
+
+    class Settings:
+        name = "link_publishers"
+
+
+class Author(Document):
+    name: str
+    bio: str = ""
+
+    class Settings:
+        name = "link_authors"
+
+
+class Book(Document):
+    title: str
+    author: Link[Author]
+    reviewers: List[Link[Author]] = Field(default_factory=list)
+    publisher: Optional[Link[Publisher]] = None
+
+    class Settings:
+        name = "link_books"
+
+
+class AuthorName(BaseModel):
+    id: object = Field(alias="_id")
+    name: str
+
+
+class BookRepo(BaseRepository):
+    model = Book
+
+
+@pytest.fixture
+async def books():
+    client = mongomock_motor.AsyncMongoMockClient()
+    await init_beanie(
+        database=client.test_db,
+        document_models=[Country, Publisher, Author, Book],
+    )
+    country = await Country(name="AR").insert()
+    publisher = await Publisher(name="Sur", country=country).insert()
+    authors = [
+        await Author(name=f"a{i}", bio="x" * 50).insert() for i in range(3)
+    ]
+    for i in range(6):
+        await Book(
+            title=f"b{i}",
+            author=authors[i % 3],
+            reviewers=[authors[(i + 1) % 3], authors[(i + 2) % 3]],
+            publisher=publisher if i % 2 else None,
+        ).insert()
+    yield BookRepo()
+    client.close()
+
+
+@pytest.fixture
+def finds(monkeypatch):
+    calls = []
+    for model in (Country, Publisher, Author):
+        original = model.find
+
+        def spy(*args, _model=model, _original=original, **kwargs):
+            calls.append(_model.__name__)
+            return _original(*args, **kwargs)
+
+        monkeypatch.setattr(model, "find", spy)
+    return calls
+
+
+async def _page(repo):
+    return await repo.model.find().sort("title").to_list()
+
+
+async def test_one_query_per_collection_and_level(books, finds):
+    items = await books.resolve_links(await _page(books))
+    assert [b.author.name for b in items] == ["a0", "a1", "a2"] * 2
+    assert [r.name for r in items[0].reviewers] == ["a1", "a2"]
+    assert items[1].publisher.country.name == "AR"
+    assert items[0].publisher is None
+    # Nivel 1: autores y editoriales; nivel 2: países.
+    assert sorted(finds) == ["Author", "Country", "Publisher"]
+
+
+async def test_nesting_depths_per_field(books, finds):
+    items = await books.resolve_links(
+        await _page(books),
+        nesting_depths_per_field={"publisher": 1, "reviewers": 0},
+    )
+    assert items[1].publisher.name == "Sur"
+    assert isinstance(items[1].publisher.country, Link)
+    assert all(isinstance(r, Link) for r in items[0].reviewers)
+    assert sorted(finds) == ["Author", "Publisher"]
+
+
+async def test_projection_and_orphan_links(books):
+    items = await _page(books)
+    await Author.find(Author.name == "a2").delete()
+    await books.resolve_links(items, projections={"author": AuthorName})
+    assert items[0].author == AuthorName(_id=items[0].author.id, name="a0")
+    assert isinstance(items[2].author, Link)  # a2 ya no existe
+    assert isinstance(items[0].reviewers[0], Author)  # sin proyección
+
+
+async def test_service_batch_links(books, monkeypatch):
+    class BookService(BaseService):
+        kwargs_query = {"fetch_links": True}
+        batch_links = True
+
+    service = BookService(books)
+    queries = []
+    original = books.build_list_queryset
+
+    def spy(**kwargs):
+        queries.append(kwargs["fetch_links"])
+        return original(**kwargs)
+
+    monkeypatch.setattr(books, "build_list_queryset", spy)
+    items, total = await service.list(order_by="title", count=4)
+    assert total == 6 and queries == [False]
+    assert [b.author.name for b in items] == ["a0", "a1", "a2", "a0"]
+
+    assert books.needs_link_lookup(["author.name"])
+    assert not books.needs_link_lookup(["author.$id", "title", "author_id"])
@@ -0,0 +1,149 @@
+"""Tests de las escrituras masivas del repo Beanie.
+
+Cubre `create_many` en lotes con `ordered=False` (un duplicado no frena al
+resto), `update_by_filters`/`delete_by_filters` con la resolución de
+filtros de `build_filter_query` (alias `<link>_id`, listas) y el rechazo de
+filtros vacíos o no resolubles, y `bulk_upsert` por `key_fields` (sin
+aceptar documentos con una clave ausente o None).
+"""
+
+from typing import Optional
+
+import mongomock_motor
+import pytest
+from beanie import Document, Link, init_beanie
+from bson import ObjectId
+from mongomock.collection import BulkOperationBuilder
+from pymongo.errors import BulkWriteError
+
+from fastapi_basekit.aio.beanie.repository.base import BaseRepository
+
+from example_crud_beanie.models import UserDocument
+from example_crud_beanie.repository import UserBeanieRepository
+
+
+class Shelter(Document):
+    name: str
+
+    class Settings:
+        name = "bulk_shelters"
+
+
+class Dog(Document):
+    name: str
+    shelter: Optional[Link[Shelter]] = None
+
+    class Settings:
+        name = "bulk_dogs"
+
+
+class DogRepo(BaseRepository):
+    model = Dog
+
+
+@pytest.fixture
+async def db(monkeypatch):
+    # pymongo reciente pasa `sort=` a `add_update`; mongomock no lo acepta.
+    original = BulkOperationBuilder.add_update
+
+    def add_update(self, *args, sort=None, **kwargs):
+        return original(self, *args, **kwargs)
+
+    monkeypatch.setattr(BulkOperationBuilder, "add_update", add_update)
+    client = mongomock_motor.AsyncMongoMockClient()
+    await init_beanie(
+        database=client.test_db, document_models=[UserDocument, Shelter, Dog]
+    )
+    yield client.test_db
+    client.close()
+
+
+def _users(n, start=0):
+    return [
+        {"name": f"u{i}", "email": f"u{i}@x.com", "age": 20 + i}
+        for i in range(start, start + n)
+    ]
+
+
+async def test_create_many_in_batches(db, monkeypatch):
+    repo = UserBeanieRepository()
+    batches = []
+    original = UserDocument.insert_many
+
+    async def spy(documents, **kwargs):
+        batches.append((len(documents), kwargs))
+        return await original(documents, **kwargs)
+
+    monkeypatch.setattr(UserDocument, "insert_many", spy)
+    assert await repo.create_many(_users(5), batch_size=2) == 5
+    unordered = {"ordered": False}
+    assert batches == [(2, unordered), (2, unordered), (1, unordered)]
+    assert await UserDocument.count() == 5
+
+
+async def test_create_many_keeps_going_after_a_duplicate(db):
+    repo = UserBeanieRepository()
+    existing = await UserDocument(name="x", email="x@x.com").insert()
+    docs = _users(3)
+    docs[1]["_id"] = existing.id
+    with pytest.raises(BulkWriteError) as info:
+        await repo.create_many(docs, batch_size=2)
+    assert info.value.details["nInserted"] == 2
+    assert [e["index"] for e in info.value.details["writeErrors"]] == [1]
+    assert await UserDocument.count() == 3
+
+
+async def test_update_and_delete_by_filters(db):
+    repo = UserBeanieRepository()
+    await repo.create_many(_users(4))
+    updated = await repo.update_by_filters(
+        {"name": ["u0", "u1"]}, {"is_active": "false"}
+    )
+    assert updated == 2
+    assert await UserDocument.find({"is_active": False}).count() == 2
+    assert await repo.delete_by_filters({"is_active": False}) == 2
+    assert await UserDocument.count() == 2
+
+
+def test_link_id_alias_resolves_like_the_list():
+    # mongomock no consulta `campo.$id` sobre DBRef: se verifica el filtro.
+    shelter_id = ObjectId()
+    query = DogRepo()._bulk_filter({"shelter_id": str(shelter_id)})
+    assert query == {"shelter.$id": shelter_id}
+
+
+async def test_unsafe_filters_are_rejected(db):
+    repo = UserBeanieRepository()
+    await repo.create_many(_users(2))
+    with pytest.raises(ValueError, match="typo"):
+        await repo.delete_by_filters({"typo": 1})
+    with pytest.raises(ValueError, match="sin filtros"):
+        await repo.update_by_filters({}, {"age": 1})
+    assert await UserDocument.count() == 2
+
+
+async def test_bulk_upsert_by_key_fields(db):
+    repo = UserBeanieRepository()
+    await repo.create_many(_users(3))
+    rows = _users(2, start=2)
+    rows[0]["age"] = 99
+    counts = await repo.bulk_upsert(rows, key_fields=["email"], batch_size=1)
+    assert counts == {"inserted": 1, "matched": 1, "modified": 1}
+    by_email = {u.email: u for u in await UserDocument.find_all().to_list()}
+    assert len(by_email) == 4
+    assert by_email["u2@x.com"].age == 99 and by_email["u3@x.com"].age == 23
+
+    with pytest.raises(ValueError):
+        await repo.bulk_upsert(rows, key_fields=[])
+
+
+async def test_bulk_upsert_rejects_missing_key_values(db):
+    repo = UserBeanieRepository()
+    await repo.create_many(_users(2))
+    rows = _users(2, start=5)
+    rows[1]["age"] = None
+    # Con `age` None el filtro `{email, age: None}` podría pisar cualquier
+    # documento sin `age`: se rechaza todo antes de escribir.
+    with pytest.raises(ValueError, match=r"objs\[1\].*age"):
+        await repo.bulk_upsert(rows, key_fields=["email", "age"])
+    assert await UserDocument.count() == 2
@@ -0,0 +1,213 @@
+"""Tests de la paginación por cursor compuesto `(order_by, _id)` en Beanie.
+
+Cubre el recorrido completo sin saltos ni repetidos cuando hay empates en el
+campo de orden o valores null, los cursores inválidos o de otro orden, el
+camino de agregación (rango `$match` antes del `$sort`),
+`BaseService.list(cursor=...)` y `next_cursor` en el bloque `pagination` del
+controller por HTTP.
+"""
+
+from datetime import datetime, timedelta
+
+import mongomock_motor
+import pytest
+from beanie import init_beanie
+from beanie.odm.queries.aggregation import AggregationQuery
+from fastapi import APIRouter, Depends, FastAPI, Query, Request
+from fastapi_restful.cbv import cbv
+from httpx import ASGITransport
+from httpx import AsyncClient as HTTPXAsyncClient
+
+from fastapi_basekit.aio.beanie.controller.base import BeanieBaseController
+from fastapi_basekit.aio.beanie.repository.base import (
+    InvalidCursorError,
+    encode_cursor,
+)
+from fastapi_basekit.exceptions.api_exceptions import ValidationException
+from fastapi_basekit.schema.base import BasePaginationResponse
+
+from example_crud_beanie.models import UserDocument
+from example_crud_beanie.repository import UserBeanieRepository
+from example_crud_beanie.schemas import UserBeanieSchema
+from example_crud_beanie.service import UserBeanieService
+
+BASE = datetime(2026, 1, 1)
+
+
+@pytest.fixture
+async def users(monkeypatch):
+    # Beanie 2.x hace `await collection.aggregate(...)`, pero el cursor de
+    # mongomock-motor no es awaitable (ver test_beanie_aggregation_integration).
+    async def get_cursor(self):
+        return self.document_model.get_pymongo_collection().aggregate(
+            self.get_aggregation_pipeline()
+        )
+
+    monkeypatch.setattr(AggregationQuery, "get_cursor", get_cursor)
+    client = mongomock_motor.AsyncMongoMockClient()
+    await init_beanie(database=client.test_db, document_models=[UserDocument])
+    # 7 usuarios; 4 comparten `created_at` (empates en el borde de página).
+    offsets = [0, 1, 1, 1, 1, 2, 3]
+    docs = [
+        await UserDocument(
+            name=f"u{i}",
+            email=f"u{i}@x.com",
+            created_at=BASE + timedelta(minutes=minutes),
+        ).insert()
+        for i, minutes in enumerate(offsets)
+    ]
+    yield docs
+    client.close()
+
+
+def _expected(docs, descending):
+    return [
+        doc.id
+        for doc in sorted(
+            docs, key=lambda d: (d.created_at, d.id), reverse=descending
+        )
+    ]
+
+
+async def _walk(fetch):
+    seen, cursor, pages = [], None, 0
+    while True:
+        items, cursor = await fetch(cursor)
+        seen.extend(items)
+        pages += 1
+        if cursor is None:
+            return seen, pages
+
+
+@pytest.mark.parametrize("order_by", ["created_at", "-created_at"])
+async def test_walk_has_no_gaps_or_duplicates_with_ties(users, order_by):
+    repo = UserBeanieRepository()
+
+    async def fetch(cursor):
+        return await repo.paginate_cursor(
+            repo.model.find(), 2, order_by=order_by, cursor=cursor
+        )
+
+    seen, pages = await _walk(fetch)
+    assert [doc.id for doc in seen] == _expected(
+        users, order_by.startswith("-")
+    )
+    assert pages == 4
+
+
+@pytest.mark.parametrize("order_by", ["age", "-age"])
+async def test_walk_covers_null_sort_values(users, order_by):
+    # Mongo ordena null antes que cualquier valor; un cursor sobre una fila
+    # con `age` null no debe cortar el recorrido.
+    for doc, age in zip(users, [None, 30, None, 20, None, 30, 10]):
+        doc.age = age
+        await doc.save()
+    repo = UserBeanieRepository()
+
+    async def fetch(cursor):
+        return await repo.paginate_cursor(
+            repo.model.find(), 2, order_by=order_by, cursor=cursor
+        )
+
+    seen, _ = await _walk(fetch)
+    expected = sorted(
+        users,
+        key=lambda d: (d.age is not None, d.age or 0, d.id),
+        reverse=order_by.startswith("-"),
+    )
+    assert [doc.id for doc in seen] == [doc.id for doc in expected]
+
+
+async def test_default_order_is_id(users):
+    repo = UserBeanieRepository()
+    items, cursor = await repo.paginate_cursor(repo.model.find(), 5)
+    rest, last = await repo.paginate_cursor(repo.model.find(), 5, cursor=cursor)
+    assert [d.id for d in items + rest] == sorted(d.id for d in users)
+    assert last is None
+
+
+async def test_bad_cursors_are_rejected(users):
+    repo = UserBeanieRepository()
+    other_order = encode_cursor("name", "u1", users[1].id)
+    for cursor in ("%%%", "bm90LWpzb24", other_order):
+        with pytest.raises(InvalidCursorError):
+            await repo.paginate_cursor(
+                repo.model.find(), 2, order_by="created_at", cursor=cursor
+            )
+
+
+async def test_pipeline_cursor_matches_before_sort(users, monkeypatch):
+    repo = UserBeanieRepository()
+    pipelines = []
+    original = UserDocument.aggregate
+
+    def spy(pipeline, *args, **kwargs):
+        pipelines.append(pipeline)
+        return original(pipeline, *args, **kwargs)
+
+    monkeypatch.setattr(UserDocument, "aggregate", spy)
+
+    async def fetch(cursor):
+        pipeline = repo.build_list_pipeline(order_by="-created_at")
+        return await repo.paginate_pipeline_cursor(
+            pipeline, 3, cursor=cursor
+        )
+
+    seen, _ = await _walk(fetch)
+    assert [doc.id for doc in seen] == _expected(users, descending=True)
+    stages = [next(iter(stage)) for stage in pipelines[1]]
+    assert stages == ["$match", "$sort", "$limit"]
+    assert pipelines[1][1]["$sort"] == {"created_at": -1, "_id": -1}
+
+
+async def test_service_list_with_cursor(users):
+    service = UserBeanieService(UserBeanieRepository())
+
+    async def fetch(cursor):
+        return await service.list(
+            count=3, order_by="-created_at", cursor=cursor or ""
+        )
+
+    seen, pages = await _walk(fetch)
+    assert [doc.id for doc in seen] == _expected(users, descending=True)
+    assert pages == 3
+
+    with pytest.raises(ValidationException):
+        await service.list(count=3, order_by="name", cursor="%%%")
+
+
+async def test_controller_exposes_next_cursor(users):
+    router = APIRouter(prefix="/users")
+
+    def get_service(request: Request) -> UserBeanieService:
+        return UserBeanieService(UserBeanieRepository(), request=request)
+
+    @cbv(router)
+    class UsersController(BeanieBaseController):
+        schema_class = UserBeanieSchema
+        service: UserBeanieService = Depends(get_service)
+
+        @router.get("/", response_model=BasePaginationResponse[UserBeanieSchema])
+        async def list_users(self, count: int = Query(10, ge=1)):
+            return await super().list()
+
+    app = FastAPI()
+    app.include_router(router)
+    names = []
+    async with HTTPXAsyncClient(
+        transport=ASGITransport(app=app), base_url="http://test"
+    ) as client:
+        params = {"count": 4, "order_by": "created_at", "cursor": ""}
+        first = (await client.get("/users/", params=params)).json()
+        assert first["pagination"]["cursor"] is None
+        names += [item["name"] for item in first["data"]]
+
+        params["cursor"] = first["pagination"]["next_cursor"]
+        second = (await client.get("/users/", params=params)).json()
+        assert second["pagination"]["next_cursor"] is None
+        names += [item["name"] for item in second["data"]]
+
+        offset = (await client.get("/users/", params={"count": 4})).json()
+    assert sorted(names) == sorted(doc.name for doc in users)
+    assert len(names) == len(users)
+    assert offset["pagination"]["total"] == len(users)
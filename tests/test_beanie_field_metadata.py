@@ -0,0 +1,146 @@
+"""Tests de la metadata de campos por modelo Beanie (`model_metadata`).
+
+Cubre los tipos de campo (Link, Optional, lista, BackLink), colecciones,
+alias, los paths escalares (`localField` de un `$lookup` uno-a-uno), el
+cacheo por clase y su uso en `build_filter_query` (alias `<link>_id`, claves
+desconocidas, `._id` con `fetch_links`) y `_get_collection_name_from_field`.
+"""
+
+import logging
+from typing import List, Optional
+
+import mongomock_motor
+from beanie import BackLink, Document, Link, PydanticObjectId, init_beanie
+from bson import ObjectId
+from pydantic import Field
+
+from fastapi_basekit.aio.beanie.repository.base import BaseRepository
+from fastapi_basekit.aio.beanie.repository.metadata import model_metadata
+
+
+class Team(Document):
+    name: str
+    members: List[BackLink["Member"]] = Field(
+        default_factory=list, json_schema_extra={"original_field": "team"}
+    )
+
+    class Settings:
+        name = "meta_teams"
+
+
+class Member(Document):
+    name: str
+    team: Link[Team]
+    mentor: Optional[Link["Member"]] = None
+    squads: List[Link[Team]] = Field(default_factory=list)
+    legacy_id: str = ""
+
+    class Settings:
+        name = "meta_members"
+
+
+class Crew(Document):
+    name: str
+
+    class Settings:
+        name = "meta_crews"
+
+
+class Sailor(Document):
+    name: str
+    crew: Link[Crew]
+
+    class Settings:
+        name = "meta_sailors"
+
+
+class Tagged(Document):
+    tags: Optional[List[PydanticObjectId]] = None
+
+    class Settings:
+        name = "meta_tagged"
+
+
+class MemberRepo(BaseRepository):
+    model = Member
+
+
+def test_field_kinds_and_targets():
+    meta = model_metadata(Member)
+    assert meta.fields["id"].alias == "_id"
+    assert meta.fields["name"].kind == "field"
+    team = meta.fields["team"]
+    assert (team.kind, team.target, team.collection) == (
+        "link",
+        Team,
+        "meta_teams",
+    )
+    assert meta.fields["mentor"].kind == "link"
+    assert meta.fields["squads"].kind == "link_list"
+    assert model_metadata(Team).fields["members"].kind == "back_link"
+    assert set(meta.links) == {"team", "mentor", "squads"}
+
+
+def test_link_id_aliases():
+    meta = model_metadata(Member)
+    assert meta.resolve("team_id").name == "team"
+    assert meta.resolve("squads_id").name == "squads"
+    assert meta.resolve("legacy_id").kind == "field"  # campo real, no alias
+    assert meta.resolve("nope") is None
+    assert model_metadata(Member) is meta
+
+
+def test_scalar_paths_skip_arrays():
+    paths = model_metadata(Member).scalar_paths
+    assert {"_id", "name", "legacy_id", "team.$id", "mentor.$id"} <= paths
+    assert not {"squads", "squads.$id", "team"} & paths
+    assert "tags" not in model_metadata(Tagged).scalar_paths
+
+
+def test_collection_name_from_field():
+    repo = MemberRepo()
+    assert repo._get_collection_name_from_field("team") == "meta_teams"
+    assert repo._get_collection_name_from_field("mentor") == "meta_members"
+    assert repo._get_collection_name_from_field("squads") is None
+    assert repo._get_collection_name_from_field("name") is None
+
+
+async def test_filter_query_uses_the_cached_index(caplog):
+    client = mongomock_motor.AsyncMongoMockClient()
+    await init_beanie(database=client.test_db, document_models=[Team, Member])
+    repo = MemberRepo()
+    team_id = ObjectId()
+    repo.build_filter_query(None, [], {"team_id": str(team_id)})
+    misses = model_metadata.cache_info().misses
+    with caplog.at_level(logging.WARNING):
+        query = repo.build_filter_query(
+            None, [], {"team_id": str(team_id), "save": 1, "name": "a"}
+        )
+    assert model_metadata.cache_info().misses == misses
+    assert query.get_filter_query() == {
+        "$and": [{"team.$id": team_id}, {"name": "a"}]
+    }
+    # `save` es un método del modelo, no un campo: se descarta con aviso.
+    assert "filtro 'save' descartado" in caplog.text
+
+
+async def test_link_filter_follows_fetch_links():
+    client = mongomock_motor.AsyncMongoMockClient()
+    await init_beanie(database=client.test_db, document_models=[Crew, Sailor])
+    crew = await Crew(name="c").insert()
+
+    class SailorRepo(BaseRepository):
+        model = Sailor
+
+    repo = SailorRepo()
+    plain = repo.build_filter_query(None, [], {"crew_id": str(crew.id)})
+    assert plain.get_filter_query() == {"crew.$id": crew.id}
+    # Con `fetch_links` el `$match` va después del `$lookup`: `crew._id`.
+    fetched = repo.build_filter_query(
+        None, [], {"crew_id": str(crew.id)}, fetch_links=True
+    )
+    # mongomock no resuelve `localField` sobre un DBRef: se verifica el
+    # pipeline que arma Beanie, con el `$match` al final.
+    pipeline = fetched.build_aggregation_pipeline()
+    assert pipeline[0]["$lookup"]["localField"] == "crew.$id"
+    assert pipeline[-1] == {"$match": {"crew._id": crew.id}}
@@ -0,0 +1,194 @@
+"""Tests de `BaseRepository.paginate` (Beanie): conteo y página en paralelo y
+estrategias de total (`exact` / `estimated` / `has_next` / `none`).
+
+Cubre que el conteo no espera a la página, `estimated_document_count` sin
+filtros, `count_documents` con filtros (y con `exact` siempre), la cota de
+`has_next`, el conteo con `fetch_links` y el bloque `pagination` del
+controller según la estrategia del service.
+"""
+
+import asyncio
+from types import SimpleNamespace
+from typing import Optional
+
+import mongomock_motor
+import pytest
+from beanie import Document, Link, init_beanie
+from beanie.odm.queries.find import FindMany
+
+from fastapi_basekit.aio.beanie.repository.base import BaseRepository
+from fastapi_basekit.aio.beanie.service.base import BaseService
+from fastapi_basekit.aio.controller.base import BaseController
+
+
+class Team(Document):
+    name: str
+
+    class Settings:
+        name = "strategy_teams"
+
+
+class Player(Document):
+    name: str
+    active: bool = True
+    team: Optional[Link[Team]] = None
+
+    class Settings:
+        name = "strategy_players"
+
+
+class PlayerRepo(BaseRepository):
+    model = Player
+
+
+@pytest.fixture
+async def players():
+    client = mongomock_motor.AsyncMongoMockClient()
+    await init_beanie(database=client.test_db, document_models=[Team, Player])
+    team = await Team(name="Rojos").insert()
+    for i in range(5):
+        await Player(name=f"p{i}", active=i % 2 == 0, team=team).insert()
+    yield PlayerRepo()
+    client.close()
+
+
+@pytest.fixture
+def count_calls(monkeypatch):
+    collection = Player.get_pymongo_collection()
+    calls = []
+    for name in ("count_documents", "estimated_document_count"):
+        original = getattr(collection, name)
+
+        def spy(*args, _name=name, _original=original, **kwargs):
+            calls.append(_name)
+            return _original(*args, **kwargs)
+
+        monkeypatch.setattr(collection, name, spy)
+    return calls
+
+
+def _query(repo, **filters):
+    return repo.build_filter_query(
+        search=None, search_fields=[], filters=filters
+    )
+
+
+async def test_count_runs_concurrently_with_page(players, monkeypatch):
+    page_started = asyncio.Event()
+    original = FindMany.to_list
+
+    async def to_list(self, *args, **kwargs):
+        page_started.set()
+        return await original(self, *args, **kwargs)
+
+    async def blocked_count():
+        # Si el conteo esperara a la página (secuencial) esto no termina.
+        await asyncio.wait_for(page_started.wait(), timeout=1)
+        return 5
+
+    monkeypatch.setattr(FindMany, "to_list", to_list)
+    monkeypatch.setattr(
+        players, "_count_total", lambda *args, **kwargs: blocked_count()
+    )
+    items, total = await players.paginate(_query(players), 1, 2)
+    assert len(items) == 2 and total == 5
+
+
+async def test_estimated_without_filters(players, count_calls):
+    items, total = await players.paginate(_query(players), 1, 2)
+    assert (len(items), total) == (2, 5)
+    assert count_calls == ["estimated_document_count"]
+
+
+async def test_filters_and_exact_use_count_documents(players, count_calls):
+    _, total = await players.paginate(_query(players, active=True), 1, 2)
+    assert total == 3
+    _, total = await players.paginate(
+        _query(players), 1, 2, total_strategy="exact"
+    )
+    assert total == 5
+    assert count_calls == ["count_documents", "count_documents"]
+
+
+@pytest.mark.parametrize(
+    "page,expected_len,expected_total",
+    [(1, 2, 3), (2, 2, 5), (3, 1, 5)],
+)
+async def test_has_next_returns_lower_bound(
+    players, count_calls, page, expected_len, expected_total
+):
+    items, total = await players.paginate(
+        _query(players), page, 2, order_by=[("name", 1)],
+        total_strategy="has_next",
+    )
+    assert len(items) == expected_len
+    assert total == expected_total
+    assert count_calls == []
+
+
+async def test_none_skips_the_count(players, count_calls):
+    items, total = await players.paginate(
+        _query(players), 1, 2, total_strategy="none"
+    )
+    assert len(items) == 2 and total is None
+    assert count_calls == []
+
+
+async def test_fetch_links_counts_with_the_lookup_pipeline(
+    players, monkeypatch
+):
+    pipelines = []
+
+    class _Cursor:
+        async def to_list(self, length=None):
+            return [{"total": 3}]
+
+    async def aggregate(pipeline, **kwargs):
+        pipelines.append(pipeline)
+        return _Cursor()
+
+    monkeypatch.setattr(Player.get_pymongo_collection(), "aggregate", aggregate)
+    query = players.build_filter_query(
+        search=None,
+        search_fields=[],
+        filters={"active": True},
+        order_by=[("name", 1)],
+        fetch_links=True,
+    )
+    assert await players._count_total(query.skip(2).limit(2), "exact") == 3
+    stages = [next(iter(stage)) for stage in pipelines[0]]
+    assert "$lookup" in stages and "$match" in stages
+    assert stages[-1] == "$count"
+    assert not {"$sort", "$skip", "$limit"} & set(stages)
+
+
+async def test_invalid_strategy_is_rejected(players):
+    with pytest.raises(ValueError, match="total_strategy"):
+        await players.paginate(_query(players), 1, 2, total_strategy="fast")
+
+
+async def test_service_passes_its_strategy(players):
+    class PlayerService(BaseService):
+        total_strategy = "has_next"
+
+    items, total = await PlayerService(players).list(page=3, count=2)
+    assert len(items) == 1 and total == 5
+
+
+@pytest.mark.parametrize(
+    "strategy,total,expected",
+    [
+        (None, 5, {"total": 5, "total_pages": 3}),
+        ("has_next", 5, {"total": None, "total_pages": None, "has_next": True}),
+        ("has_next", 4, {"total": None, "total_pages": None, "has_next": False}),
+        ("none", None, {"total": None, "total_pages": None}),
+    ],
+)
+def test_controller_pagination_block(strategy, total, expected):
+    controller = SimpleNamespace(
+        service=SimpleNamespace(total_strategy=strategy)
+    )
+    pagination = BaseController._pagination(
+        controller, {"page": 2, "count": 2}, total
+    )
+    assert pagination == {"page": 2, "count": 2, **expected}
@@ -0,0 +1,164 @@
+"""Tests de la actualización parcial (`update_fields`) del repo Beanie.
+
+Cubre el `$set` solo de los campos enviados (sin pisar escrituras
+concurrentes sobre otros campos), la validación/coerción por campo, los
+Links, el scoping por `filters` (resuelto como en `update_by_filters`), el
+`validator_field` avanzado (ETag nuevo) y `BaseService.partial_updates` sin
+traer el documento antes.
+"""
+
+from datetime import datetime
+from typing import Optional
+
+import mongomock_motor
+import pytest
+from beanie import Document, Link, init_beanie
+from bson import DBRef, ObjectId
+from pydantic import BaseModel, ValidationError
+
+from fastapi_basekit.aio.beanie.repository.base import BaseRepository
+from fastapi_basekit.aio.beanie.service.base import BaseService
+from fastapi_basekit.aio.controller.base import BaseController
+from fastapi_basekit.exceptions.api_exceptions import NotFoundException
+
+from example_crud_beanie.models import UserDocument
+from example_crud_beanie.repository import UserBeanieRepository
+
+
+class Owner(Document):
+    name: str
+
+    class Settings:
+        name = "partial_owners"
+
+
+class Pet(Document):
+    name: str
+    owner: Optional[Link[Owner]] = None
+
+    class Settings:
+        name = "partial_pets"
+
+
+class UserPatch(BaseModel):
+    name: Optional[str] = None
+    age: Optional[int] = None
+
+
+@pytest.fixture
+async def user():
+    client = mongomock_motor.AsyncMongoMockClient()
+    await init_beanie(
+        database=client.test_db, document_models=[UserDocument, Owner, Pet]
+    )
+    yield await UserDocument(name="ana", email="ana@x.com", age=30).insert()
+    client.close()
+
+
+async def test_sets_only_the_given_fields(user):
+    repo = UserBeanieRepository()
+    collection = UserDocument.get_pymongo_collection()
+    # Otro escritor cambia `email` después de que leímos `user`.
+    await collection.update_one(
+        {"_id": user.id}, {"$set": {"email": "new@x.com"}}
+    )
+    updated = await repo.update_fields(
+        str(user.id), {"age": "31", "updated_at": "2026-02-01T00:00:00"}
+    )
+    assert isinstance(updated, UserDocument)
+    assert updated.age == 31 and updated.email == "new@x.com"
+    raw = await collection.find_one({"_id": user.id})
+    assert raw["age"] == 31 and raw["updated_at"].year == 2026
+
+
+async def test_partial_update_moves_the_etag(user):
+    repo = UserBeanieRepository()
+    collection = UserDocument.get_pymongo_collection()
+    old = datetime(2020, 1, 1)
+    etag = BaseController._make_etag("users", old)
+
+    async def validator_after(write):
+        await collection.update_one(
+            {"_id": user.id}, {"$set": {"updated_at": old}}
+        )
+        await write
+        return (await collection.find_one({"_id": user.id}))["updated_at"]
+
+    after = await validator_after(repo.update_fields(user.id, {"age": 31}))
+    assert after > old
+    assert BaseController._make_etag("users", after) != etag
+    bulk = repo.update_by_filters({"name": "ana"}, {"age": 32})
+    assert await validator_after(bulk) > old
+
+
+async def test_invalid_values_are_rejected_before_writing(user):
+    repo = UserBeanieRepository()
+    with pytest.raises(ValidationError):
+        await repo.update_fields(user.id, {"age": -1})
+    with pytest.raises(ValidationError):
+        await repo.update_fields(user.id, {"nope": 1})
+    assert (await repo.get_by_id(user.id)).age == 30
+
+
+async def test_missing_or_out_of_scope_returns_none(user):
+    repo = UserBeanieRepository()
+    assert await repo.update_fields(ObjectId(), {"age": 1}) is None
+    scoped = await repo.update_fields(
+        user.id, {"age": 1}, filters={"is_active": False}
+    )
+    assert scoped is None
+    assert (await repo.update_fields(user.id, {})).age == 30
+
+
+async def test_scope_filters_resolve_link_aliases(user, monkeypatch):
+    class PetRepo(BaseRepository):
+        model = Pet
+
+    queries = []
+
+    class _Collection:
+        async def find_one_and_update(self, query, update, **kwargs):
+            queries.append(query)
+            return None
+
+    # mongomock no compara `owner.$id` contra un DBRef: se verifica la query.
+    monkeypatch.setattr(
+        Pet, "get_pymongo_collection", classmethod(lambda cls: _Collection())
+    )
+    owner_id, pet_id = ObjectId(), ObjectId()
+    repo = PetRepo()
+    await repo.update_fields(
+        pet_id, {"name": "x"}, filters={"owner_id": str(owner_id)}
+    )
+    assert queries == [{"$and": [{"_id": pet_id}, {"owner.$id": owner_id}]}]
+    with pytest.raises(ValueError):
+        await repo.update_fields(pet_id, {"name": "y"}, filters={"nope": 1})
+
+
+async def test_link_fields_are_stored_as_refs(user):
+    class PetRepo(BaseRepository):
+        model = Pet
+
+    owner = await Owner(name="o").insert()
+    pet = await Pet(name="p").insert()
+    updated = await PetRepo().update_fields(pet.id, {"owner": owner})
+    assert isinstance(updated.owner, Link)
+    raw = await Pet.get_pymongo_collection().find_one({"_id": pet.id})
+    assert raw["owner"] == DBRef("partial_owners", owner.id)
+
+
+async def test_service_partial_updates_skip_the_fetch(user, monkeypatch):
+    class UserService(BaseService):
+        partial_updates = True
+
+    repo = UserBeanieRepository()
+
+    async def no_fetch(*args, **kwargs):
+        raise AssertionError("partial_updates no debe traer el documento")
+
+    monkeypatch.setattr(repo, "get_by_id", no_fetch)
+    service = UserService(repo)
+    updated = await service.update(str(user.id), UserPatch(age=40))
+    assert updated.age == 40 and updated.name == "ana"
+    with pytest.raises(NotFoundException):
+        await service.update(str(ObjectId()), UserPatch(age=1))
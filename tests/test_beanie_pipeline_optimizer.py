@@ -0,0 +1,196 @@
+"""Tests del optimizador del pipeline de listado (`repository/pipeline.py`).
+
+Cubre el `$match` subido por encima de los `$lookup`/`$sort`, los `$lookup`
+uno-a-uno bajados por debajo del `$sort` (la página se corta antes del
+join, también dentro del `$facet`), el recorte del `$lookup` a los campos
+que se leen y el `optimize_pipeline` del service con el mismo resultado que
+sin optimizar.
+"""
+
+import mongomock_motor
+import pytest
+from beanie import init_beanie
+from beanie.odm.queries.aggregation import AggregationQuery
+
+from fastapi_basekit.aio.beanie.repository.base import BaseRepository
+from fastapi_basekit.aio.beanie.repository.pipeline import (
+    defer_lookups,
+    hoist_matches,
+    optimize_pipeline,
+)
+from fastapi_basekit.aio.beanie.service.base import BaseService
+
+from example_crud_beanie.models import UserDocument
+from example_crud_beanie.repository import UserBeanieRepository
+
+LOOKUP = {
+    "$lookup": {
+        "from": "profiles",
+        "localField": "email",
+        "foreignField": "_id",
+        "as": "profile",
+    }
+}
+UNWIND = {"$unwind": {"path": "$profile", "preserveNullAndEmptyArrays": True}}
+MATCH = {"$match": {"is_active": True}}
+SORT = {"$sort": {"age": -1}}
+SCALAR = frozenset({"email"})
+
+
+def test_match_moves_before_lookups_and_sort():
+    pipeline = [LOOKUP, UNWIND, {"$addFields": {"x": 1}}, SORT, MATCH]
+    assert hoist_matches(pipeline) == [MATCH] + pipeline[:-1]
+
+
+def test_match_stays_after_the_stage_that_produces_its_field():
+    on_profile = {"$match": {"profile.bio": "x"}}
+    assert hoist_matches([MATCH, LOOKUP, SORT, on_profile]) == [
+        MATCH,
+        LOOKUP,
+        on_profile,
+        SORT,
+    ]
+    on_root = {"$match": {"$expr": {"$gt": [{"$size": "$$ROOT"}, 1]}}}
+    assert hoist_matches([LOOKUP, SORT, on_root]) == [LOOKUP, on_root, SORT]
+    text = {"$match": {"$text": {"$search": "ana"}}}
+    assert hoist_matches([LOOKUP, text]) == [LOOKUP, text]
+
+
+def test_one_to_one_lookup_moves_after_sort():
+    assert defer_lookups([MATCH, LOOKUP, UNWIND, SORT], SCALAR) == [
+        MATCH,
+        SORT,
+        LOOKUP,
+        UNWIND,
+    ]
+    paged = BaseRepository._page_pipeline(
+        [MATCH, SORT, LOOKUP, UNWIND], 4, 2, SCALAR
+    )
+    assert paged == [MATCH, SORT, {"$skip": 4}, {"$limit": 2}, LOOKUP, UNWIND]
+
+
+def test_unwind_over_an_array_local_field_is_not_one_to_one():
+    # Sin saber que `email` es escalar (o si fuera un `List[Link]`), el
+    # `$unwind` puede multiplicar filas: la página no cruza el bloque.
+    pipeline = [MATCH, LOOKUP, UNWIND, SORT]
+    assert defer_lookups(pipeline) == pipeline
+    assert defer_lookups(pipeline, {"tags"}) == pipeline
+    paged = BaseRepository._page_pipeline([MATCH, SORT, LOOKUP, UNWIND], 4, 2)
+    assert paged == [MATCH, SORT, LOOKUP, UNWIND, {"$skip": 4}, {"$limit": 2}]
+    assert optimize_pipeline([LOOKUP, UNWIND, SORT], {"_id"}) == [
+        LOOKUP,
+        UNWIND,
+        SORT,
+    ]
+
+
+def test_lookups_that_change_the_rows_stay_put():
+    dropping = {"$unwind": "$profile"}  # sin preserve: descarta filas
+    assert defer_lookups([LOOKUP, dropping, SORT]) == [LOOKUP, dropping, SORT]
+    by_profile = {"$sort": {"profile.bio": 1}}
+    assert defer_lookups([LOOKUP, UNWIND, by_profile]) == [
+        LOOKUP,
+        UNWIND,
+        by_profile,
+    ]
+
+
+def test_lookup_is_trimmed_to_the_fields_it_feeds():
+    pipeline = [LOOKUP, UNWIND, {"$sort": {"profile.bio": 1}}]
+    optimized = optimize_pipeline(
+        pipeline, output_fields={"_id", "name"}, scalar_fields=SCALAR
+    )
+    assert optimized[0]["$lookup"]["pipeline"] == [{"$project": {"bio": 1}}]
+    assert optimized[1:] == pipeline[1:]
+    # Sin `output_fields` el documento unido llega a la salida: intacto.
+    assert optimize_pipeline(pipeline, scalar_fields=SCALAR) == pipeline
+    # Nadie lo lee: el join se elimina.
+    assert optimize_pipeline([LOOKUP, UNWIND, SORT], {"_id"}, SCALAR) == [
+        SORT
+    ]
+
+
+def test_nested_order_lookup_only_fetches_the_sort_field():
+    class TeamRepo(BaseRepository):
+        model = UserDocument
+
+        def _get_collection_name_from_field(self, field_name):
+            return "teams"
+
+        def _scalar_paths(self):
+            return frozenset({"team.$id"})  # `team: Link[Team]`
+
+    repo = TeamRepo()
+    pipeline = repo.build_list_pipeline(order_by="team__name")
+    optimized = repo.optimize_list_pipeline(pipeline)
+    lookup = optimized[0]["$lookup"]
+    assert lookup["localField"] == "team.$id"
+    assert lookup["pipeline"] == [{"$project": {"name": 1}}]
+    assert repo.optimize_list_pipeline(pipeline, validate=False) == pipeline
+
+
+@pytest.fixture
+async def users(monkeypatch):
+    # Beanie 2.x hace `await collection.aggregate(...)`, pero el cursor de
+    # mongomock-motor no es awaitable (ver test_beanie_aggregation_integration).
+    async def get_cursor(self):
+        return self.document_model.get_pymongo_collection().aggregate(
+            self.get_aggregation_pipeline()
+        )
+
+    monkeypatch.setattr(AggregationQuery, "get_cursor", get_cursor)
+    client = mongomock_motor.AsyncMongoMockClient()
+    await init_beanie(database=client.test_db, document_models=[UserDocument])
+    for i in range(7):
+        email = f"u{i}@x.com"
+        await UserDocument(
+            name=f"u{i}", email=email, age=20 + i, is_active=i < 5
+        ).insert()
+        if i % 2:
+            await client.test_db.profiles.insert_one(
+                {"_id": email, "bio": f"bio{i}"}
+            )
+    yield UserBeanieRepository()
+    client.close()
+
+
+async def test_service_optimized_pipeline_matches_plain(users, monkeypatch):
+    pipelines = []
+    original = UserDocument.aggregate
+
+    def spy(pipeline, *args, **kwargs):
+        pipelines.append(pipeline)
+        return original(pipeline, *args, **kwargs)
+
+    monkeypatch.setattr(UserDocument, "aggregate", spy)
+
+    class UserService(BaseService):
+        use_aggregation = True
+        aggregation_validate = False
+
+        def build_list_pipeline(self, **kwargs):
+            pipeline = super().build_list_pipeline(**kwargs)
+            return pipeline[:1] + [LOOKUP, UNWIND] + pipeline[1:]
+
+    class OptimizedService(UserService):
+        optimize_pipeline = True
+
+    params = dict(page=2, count=2, filters={"is_active": True}, order_by="-age")
+    plain = await UserService(users).list(**params)
+    optimized = await OptimizedService(users).list(**params)
+    assert optimized == plain
+    assert [row["name"] for row in plain[0]] == ["u2", "u1"]
+    assert plain[0][1]["profile"]["bio"] == "bio1" and plain[1] == 5
+
+    # Sin optimizar, el `$facet` pagina al final, como siempre.
+    assert pipelines[0][-1]["$facet"]["data"] == [
+        {"$skip": 2},
+        {"$limit": 2},
+    ]
+    facet = pipelines[-1][-1]["$facet"]
+    assert [next(iter(stage)) for stage in pipelines[-1]] == [
+        "$match",
+        "$sort",
+        "$facet",
+    ]
+    assert facet["data"] == [{"$skip": 2}, {"$limit": 2}, LOOKUP, UNWIND]
@@ -0,0 +1,196 @@
+"""Tests del modo split de `paginate_pipeline` (Beanie): pipeline de datos y
+pipeline de conteo reducido en paralelo, en vez de un `$facet`.
+
+Cubre que split devuelve lo mismo que `$facet`, la ubicación de
+`$skip`/`$limit` antes de las etapas uno-a-uno, el pipeline de conteo
+reducido, la ejecución concurrente, `estimated_document_count` sin `$match`,
+`has_next`/`none`, la caída automática desde `$facet` y el
+`pipeline_count_mode` del service.
+"""
+
+import asyncio
+
+import mongomock_motor
+import pytest
+from beanie import init_beanie
+from beanie.odm.queries.aggregation import AggregationQuery
+from pymongo.errors import ExecutionTimeout, OperationFailure
+
+from fastapi_basekit.aio.beanie.repository.base import BaseRepository
+from fastapi_basekit.aio.beanie.service.base import BaseService
+
+from example_crud_beanie.models import UserDocument
+from example_crud_beanie.repository import UserBeanieRepository
+
+LOOKUP = {
+    "$lookup": {
+        "from": "teams",
+        "localField": "team",
+        "foreignField": "_id",
+        "as": "team_data",
+    }
+}
+UNWIND = {"$unwind": "$tags"}
+
+
+@pytest.fixture
+async def users(monkeypatch):
+    # Beanie 2.x hace `await collection.aggregate(...)`, pero el cursor de
+    # mongomock-motor no es awaitable (ver test_beanie_aggregation_integration).
+    async def get_cursor(self):
+        return self.document_model.get_pymongo_collection().aggregate(
+            self.get_aggregation_pipeline()
+        )
+
+    monkeypatch.setattr(AggregationQuery, "get_cursor", get_cursor)
+    client = mongomock_motor.AsyncMongoMockClient()
+    await init_beanie(database=client.test_db, document_models=[UserDocument])
+    for i in range(7):
+        await UserDocument(
+            name=f"u{i}", email=f"u{i}@x.com", age=20 + i, is_active=i < 5
+        ).insert()
+    yield UserBeanieRepository()
+    client.close()
+
+
+@pytest.fixture
+def aggregates(monkeypatch):
+    pipelines = []
+    original = UserDocument.aggregate
+
+    def spy(pipeline, *args, **kwargs):
+        pipelines.append(pipeline)
+        return original(pipeline, *args, **kwargs)
+
+    monkeypatch.setattr(UserDocument, "aggregate", spy)
+    return pipelines
+
+
+PIPELINE = [{"$match": {"is_active": True}}, {"$sort": {"age": -1}}]
+
+
+def test_page_pipeline_limits_before_one_to_one_stages():
+    page = BaseRepository._page_pipeline(PIPELINE + [LOOKUP], 4, 2)
+    assert page == PIPELINE + [{"$skip": 4}, {"$limit": 2}, LOOKUP]
+    unwound = BaseRepository._page_pipeline(PIPELINE + [UNWIND], 0, 2)
+    assert unwound == PIPELINE + [UNWIND, {"$limit": 2}]
+
+
+def test_count_pipeline_keeps_only_what_changes_the_count():
+    assert BaseRepository._count_pipeline(PIPELINE + [LOOKUP]) == PIPELINE[:1]
+    with_unwind = PIPELINE + [UNWIND]
+    assert BaseRepository._count_pipeline(with_unwind) == [
+        PIPELINE[0],
+        UNWIND,
+    ]
+    top = [{"$sort": {"age": -1}}, {"$limit": 3}, {"$match": {"x": 1}}]
+    assert BaseRepository._count_pipeline(top) == top
+
+
+@pytest.mark.parametrize("page", [1, 2, 3])
+async def test_split_matches_facet(users, page):
+    facet = await users.paginate_pipeline(PIPELINE, page, 2, validate=False)
+    split = await users.paginate_pipeline(
+        PIPELINE, page, 2, validate=False, count_mode="split"
+    )
+    assert split == facet
+    assert split[1] == 5
+
+
+async def test_split_runs_count_and_data_concurrently(users, monkeypatch):
+    # Cada lado espera a que el otro arranque: en secuencia no termina.
+    data_started, count_started = asyncio.Event(), asyncio.Event()
+    original_total = users._pipeline_total
+    original_aggregate = UserDocument.aggregate
+
+    async def total(*args):
+        count_started.set()
+        await asyncio.wait_for(data_started.wait(), timeout=1)
+        return await original_total(*args)
+
+    def aggregate(pipeline, *args, **kwargs):
+        query = original_aggregate(pipeline, *args, **kwargs)
+        original_to_list = query.to_list
+
+        async def to_list(*a, **kw):
+            data_started.set()
+            await asyncio.wait_for(count_started.wait(), timeout=1)
+            return await original_to_list(*a, **kw)
+
+        query.to_list = to_list
+        return query
+
+    monkeypatch.setattr(users, "_pipeline_total", total)
+    monkeypatch.setattr(UserDocument, "aggregate", aggregate)
+    items, total_count = await users.paginate_pipeline(
+        PIPELINE, 1, 2, count_mode="split"
+    )
+    assert len(items) == 2 and total_count == 5
+
+
+async def test_count_pipeline_is_slim(users, aggregates):
+    await users.paginate_pipeline(
+        PIPELINE + [{"$project": {"email": 0}}], 1, 2, count_mode="split"
+    )
+    assert [{"$match": {"is_active": True}}, {"$count": "total"}] in aggregates
+
+
+async def test_estimated_total_without_match(users, aggregates):
+    _, total = await users.paginate_pipeline(
+        [{"$sort": {"age": 1}}], 1, 2, count_mode="split"
+    )
+    assert total == 7
+    assert len(aggregates) == 1  # solo datos; el total sale de la metadata
+
+
+async def test_has_next_and_none_skip_the_count(users, aggregates):
+    items, bound = await users.paginate_pipeline(
+        PIPELINE, 2, 2, total_strategy="has_next"
+    )
+    assert len(items) == 2 and bound == 5
+    items, total = await users.paginate_pipeline(
+        PIPELINE, 3, 2, total_strategy="none"
+    )
+    assert len(items) == 1 and total is None
+    assert len(aggregates) == 2
+    assert all("$facet" not in stage for p in aggregates for stage in p)
+
+
+async def test_auto_falls_back_when_facet_is_too_large(users, monkeypatch):
+    async def too_large(*args):
+        raise OperationFailure("BSONObjectTooLarge", code=10334)
+
+    monkeypatch.setattr(users, "_paginate_facet", too_large)
+    items, total = await users.paginate_pipeline(
+        PIPELINE, 1, 2, count_mode="auto"
+    )
+    assert len(items) == 2 and total == 5
+
+    with pytest.raises(OperationFailure):
+        await users.paginate_pipeline(PIPELINE, 1, 2)
+
+
+async def test_auto_does_not_swallow_other_errors(users, monkeypatch):
+    async def timeout(*args):
+        raise ExecutionTimeout("operation exceeded time limit", code=50)
+
+    monkeypatch.setattr(users, "_paginate_facet", timeout)
+    with pytest.raises(ExecutionTimeout):
+        await users.paginate_pipeline(PIPELINE, 1, 2, count_mode="auto")
+
+
+async def test_invalid_count_mode_is_rejected(users):
+    with pytest.raises(ValueError, match="count_mode"):
+        await users.paginate_pipeline(PIPELINE, 1, 2, count_mode="lazy")
+
+
+async def test_service_pipeline_count_mode(users, aggregates):
+    class UserService(BaseService):
+        use_aggregation = True
+        pipeline_count_mode = "split"
+
+    items, total = await UserService(users).list(
+        page=1, count=3, filters={"is_active": True}, order_by="-age"
+    )
+    assert [u.age for u in items] == [24, 23, 22] and total == 5
+    assert all("$facet" not in stage for p in aggregates for stage in p)
@@ -0,0 +1,133 @@
+"""Tests de los modos de `search` del listado Beanie.
+
+Cubre el escape del término (substring), el prefijo anclado sobre campos
+normalizados, los trigramas (con caída a prefijo para términos cortos), la
+forma de `$text` + `textScore` en FindMany y en el pipeline, y el
+`search_mode` del service.
+"""
+
+from typing import List
+
+import mongomock_motor
+import pytest
+from beanie import Document, init_beanie
+from pydantic import Field
+
+from fastapi_basekit.aio.beanie.repository.base import BaseRepository
+from fastapi_basekit.aio.beanie.repository.search import (
+    TEXT_SCORE,
+    build_search_condition,
+    normalize_search,
+    search_trigrams,
+)
+from fastapi_basekit.aio.beanie.service.base import BaseService
+
+
+class Article(Document):
+    title: str
+    title_norm: str = ""
+    search_trigrams: List[str] = Field(default_factory=list)
+
+    class Settings:
+        name = "search_articles"
+
+
+class ArticleRepo(BaseRepository):
+    model = Article
+
+
+@pytest.fixture
+async def articles():
+    client = mongomock_motor.AsyncMongoMockClient()
+    await init_beanie(database=client.test_db, document_models=[Article])
+    for title in ("Ángel Pérez", "Mariana", "a.b", "axb", "(a+)+$"):
+        await Article(
+            title=title,
+            title_norm=normalize_search(title),
+            search_trigrams=search_trigrams(title),
+        ).insert()
+    yield ArticleRepo()
+    client.close()
+
+
+async def _titles(repo, search, mode, fields=("title",)):
+    query = repo.build_filter_query(
+        search=search, search_fields=list(fields), search_mode=mode
+    )
+    return sorted(a.title for a in await query.to_list())
+
+
+def test_normalize_and_trigrams():
+    assert normalize_search("  Ángel   PÉREZ ") == "angel perez"
+    assert search_trigrams("Ana ana") == ["ana"]
+    assert search_trigrams("ab") == []
+
+
+async def test_substring_escapes_user_input(articles):
+    assert await _titles(articles, "a.b", "substring") == ["a.b"]
+    assert await _titles(articles, "(a+)+$", "substring") == ["(a+)+$"]
+    assert await _titles(articles, "ANA", "substring") == ["Mariana"]
+
+
+async def test_prefix_is_anchored_on_normalized_fields(articles):
+    titles = await _titles(articles, "ÁNG", "prefix", fields=["title_norm"])
+    assert titles == ["Ángel Pérez"]
+    assert await _titles(articles, "ana", "prefix", ["title_norm"]) == []
+    condition = build_search_condition("a.b", ["title_norm"], mode="prefix")
+    assert condition == {"$or": [{"title_norm": {"$regex": r"^a\.b"}}]}
+
+
+async def test_trigram_mode_and_short_term_fallback(articles):
+    assert await _titles(articles, "ARIA", "trigram") == ["Mariana"]
+    assert await _titles(articles, "perez ang", "trigram") == ["Ángel Pérez"]
+    short = await _titles(articles, "ma", "trigram", fields=["title_norm"])
+    assert short == ["Mariana"]
+
+
+def test_text_mode_sorts_by_score():
+    repo = ArticleRepo()
+    query = repo.build_filter_query(
+        search="ángel", search_fields=[], search_mode="text"
+    )
+    assert query.get_filter_query() == {"$text": {"$search": "ángel"}}
+    assert query.sort_expressions == [("score", TEXT_SCORE)]
+
+    ordered = repo.build_filter_query(
+        search="ángel",
+        search_fields=[],
+        search_mode="text",
+        order_by=[("title", 1)],
+    )
+    assert ordered.sort_expressions == [("title", 1)]
+
+
+def test_text_mode_pipeline_matches_first():
+    repo = ArticleRepo()
+    pipeline = repo.build_list_pipeline(
+        search="ángel", filters={"title_norm": "x"}, search_mode="text"
+    )
+    assert pipeline == [
+        {
+            "$match": {
+                "$and": [
+                    {"title_norm": "x"},
+                    {"$text": {"$search": "ángel"}},
+                ]
+            }
+        },
+        {"$sort": {"score": TEXT_SCORE}},
+    ]
+
+
+def test_invalid_mode_is_rejected():
+    with pytest.raises(ValueError, match="search_mode"):
+        build_search_condition("x", ["title"], mode="fuzzy")
+
+
+async def test_service_search_mode(articles):
+    class ArticleService(BaseService):
+        search_fields = ["title_norm"]
+        search_mode = "prefix"
+
+    items, total = await ArticleService(articles).list(search="mar")
+    assert [a.title for a in items] == ["Mariana"] and total == 1
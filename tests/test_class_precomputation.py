@@ -0,0 +1,142 @@
+"""Tests de la precomputación por clase de servicios y controllers.
+
+Cubre `CopyOnAccess` (copia de los defaults mutables recién al leerlos, sin
+contaminar la clase) en los tres servicios y la reutilización de instancias de
+permisos en `check_permissions`.
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from example_crud.repository import UserRepository
+from example_crud.service import UserService
+from example_crud_beanie.repository import UserBeanieRepository
+from example_crud_beanie.service import UserBeanieService
+from fastapi_basekit.aio.class_defaults import CopyOnAccess
+from fastapi_basekit.aio.controller.base import BaseController
+from fastapi_basekit.aio.permissions.base import BasePermission
+from fastapi_basekit.aio.sqlalchemy.service.base import (
+    BaseService as SQLAlchemyBaseService,
+)
+from fastapi_basekit.aio.sqlmodel.service.base import (
+    BaseService as SQLModelBaseService,
+)
+from fastapi_basekit.exceptions.api_exceptions import PermissionException
+
+
+def test_defaults_are_wrapped_at_class_definition():
+    assert isinstance(UserService.__dict__["search_fields"], CopyOnAccess)
+    assert isinstance(
+        SQLAlchemyBaseService.__dict__["kwargs_query"], CopyOnAccess
+    )
+    assert isinstance(
+        SQLModelBaseService.__dict__["search_fields"], CopyOnAccess
+    )
+
+
+def test_class_access_returns_declared_default():
+    assert UserBeanieService.search_fields == ["name", "email"]
+    assert SQLAlchemyBaseService.mangle_fields == []
+
+
+def test_copy_happens_on_first_read_only():
+    service = UserService(repository=UserRepository(db=None))
+    assert "mangle_fields" not in vars(service)
+    fields = service.mangle_fields
+    assert vars(service)["mangle_fields"] is fields
+    assert fields is not SQLAlchemyBaseService.mangle_fields
+
+
+def test_mutation_stays_on_the_instance():
+    a = UserService(repository=UserRepository(db=None))
+    b = UserService(repository=UserRepository(db=None))
+    a.delete_references.append(("Model", "fk"))
+    a.kwargs_query["joins"] = ["role"]
+    assert b.delete_references == []
+    assert b.kwargs_query == {}
+    assert SQLAlchemyBaseService.delete_references == []
+
+
+def test_beanie_mutation_stays_on_the_instance():
+    service = UserBeanieService(repository=UserBeanieRepository())
+    service.search_fields.append("phone")
+    assert "phone" not in UserBeanieService.search_fields
+
+
+def test_instance_assignment_overrides_default():
+    service = UserService(repository=UserRepository(db=None))
+    service.search_fields = ["email"]
+    assert service.search_fields == ["email"]
+    assert UserService(
+        repository=UserRepository(db=None)
+    ).search_fields == UserService.search_fields
+
+
+# ---------------------------------------------------------------------------
+# Permisos reutilizables
+# ---------------------------------------------------------------------------
+
+
+class _Counting(BasePermission):
+    reusable = True
+    created = 0
+
+    def __init__(self):
+        type(self).created += 1
+
+    async def has_permission(self, request):
+        return True
+
+
+class _PerRequest(BasePermission):
+    """Sin `reusable`: el default construye una instancia por chequeo."""
+
+    created = 0
+
+    def __init__(self):
+        type(self).created += 1
+        self.seen = None
+
+    async def has_permission(self, request):
+        self.seen = request
+        return True
+
+
+class _Deny(BasePermission):
+    message_exception = "No"
+
+    async def has_permission(self, request):
+        return False
+
+
+def _controller(permissions):
+    class _Controller(BaseController):
+        permission_classes = permissions
+
+    controller = _Controller()
+    controller.request = SimpleNamespace(state=SimpleNamespace())
+    return controller
+
+
+async def test_permission_instances_are_reused():
+    _Counting.created = 0
+    controller = _controller([_Counting])
+    for _ in range(5):
+        await controller.check_permissions()
+    assert _Counting.created == 1
+
+
+async def test_non_reusable_permissions_are_built_per_call():
+    controller = _controller([_PerRequest])
+    created = _PerRequest.created
+    for _ in range(2):
+        controller.request = SimpleNamespace(state=SimpleNamespace())
+        await controller.check_permissions()
+    assert _PerRequest.created == created + 2
+
+
+async def test_permission_instances_are_accepted():
+    controller = _controller([_Deny()])
+    with pytest.raises(PermissionException):
+        await controller.check_permissions()
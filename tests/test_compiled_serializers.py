@@ -0,0 +1,190 @@
+"""Tests de los serializadores compilados (`compiled_responses`).
+
+Cubre el adapter de lista cacheado por schema en `format_response`, la
+validación directa desde atributos (sin `to_dict` por ítem), el envelope
+compilado de `serialize_response` con su fallback y la paridad del JSON de
+list/retrieve por HTTP con y sin `compiled_responses`.
+"""
+
+from datetime import datetime
+
+import pytest
+from fastapi import FastAPI, Request
+from httpx import ASGITransport
+from httpx import AsyncClient as HTTPXAsyncClient
+from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from example_crud.models import Base, User
+from example_crud.repository import UserRepository
+from example_crud.schemas import UserSchema
+from example_crud.service import UserService
+from fastapi_basekit.aio.controller.base import (
+    BaseController,
+    _envelope_for,
+    _list_adapter_for,
+)
+
+
+class _Row:
+    """Objeto tipo ORM: solo atributos."""
+
+    def __init__(self, id, name):
+        self.id = id
+        self.name = name
+
+
+class _ItemSchema(BaseModel):
+    id: int
+    name: str
+
+
+class _Controller(BaseController):
+    schema_class = _ItemSchema
+
+
+@pytest.fixture
+def controller():
+    return _Controller()
+
+
+def test_list_adapter_is_built_once_per_schema(controller):
+    controller.format_response([_Row(1, "a")])
+    before = _list_adapter_for.cache_info().hits
+    controller.format_response([_Row(2, "b")])
+    assert _list_adapter_for.cache_info().hits == before + 1
+
+
+def test_list_validates_from_attributes_without_dict_copies(
+    controller, monkeypatch
+):
+    def _no_copy(obj):
+        raise AssertionError("to_dict no debe usarse")
+
+    monkeypatch.setattr(controller, "to_dict", _no_copy)
+    response = controller.format_response([_Row(1, "a"), _Row(2, "b")])
+    assert [item.name for item in response.data] == ["a", "b"]
+    assert isinstance(response.data[0], _ItemSchema)
+
+
+def test_envelope_compiled_at_class_definition():
+    class _Schema(BaseModel):
+        value: int
+
+    class _Other(BaseController):
+        schema_class = _Schema
+
+    before = _envelope_for.cache_info().hits
+    _envelope_for(_Schema, True)
+    _envelope_for(_Schema, False)
+    assert _envelope_for.cache_info().hits == before + 2
+
+
+def test_serialize_response_matches_format_response(controller):
+    rows = [_Row(1, "a"), _Row(2, "b")]
+    pagination = {"page": 1, "count": 10, "total": 2, "total_pages": 1}
+    assert controller.serialize_response(
+        rows, pagination=pagination
+    ) == controller.format_response(
+        rows, pagination=pagination
+    ).model_dump_json().encode()
+    assert (
+        controller.serialize_response(_Row(3, "c"), message="OK")
+        == controller.format_response(_Row(3, "c"), message="OK")
+        .model_dump_json()
+        .encode()
+    )
+
+
+def test_serialize_response_falls_back_for_foreign_data(controller):
+    data = {"ok": True}
+    assert (
+        controller.serialize_response(data)
+        == controller.format_response(data).model_dump_json().encode()
+    )
+
+
+def test_serialize_response_none(controller):
+    body = controller.serialize_response(None, message="Eliminado")
+    assert body == (
+        b'{"data":null,"message":"Eliminado","status":"success"}'
+    )
+
+
+# ---------------------------------------------------------------------------
+# HTTP (SQLAlchemy)
+# ---------------------------------------------------------------------------
+
+
+@pytest.fixture
+async def session():
+    engine = create_async_engine(
+        "sqlite+aiosqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    maker = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with maker() as s:
+        stamp = datetime(2026, 1, 1, 12, 0, 0)
+        for name in ("Ana", "Beto"):
+            s.add(
+                User(
+                    name=name,
+                    email=f"{name.lower()}@x.com",
+                    created_at=stamp,
+                    updated_at=stamp,
+                )
+            )
+        await s.commit()
+        yield s
+    await engine.dispose()
+
+
+@pytest.fixture
+async def client(session):
+    from example_crud import controller as example_controller
+
+    def get_user_service(request: Request):
+        return UserService(
+            repository=UserRepository(db=session), request=request
+        )
+
+    app = FastAPI()
+    app.dependency_overrides[example_controller.get_user_service] = (
+        get_user_service
+    )
+    app.include_router(example_controller.router)
+    async with HTTPXAsyncClient(
+        transport=ASGITransport(app=app), base_url="http://test"
+    ) as c:
+        yield c
+
+
+async def test_compiled_http_responses_match_default(client, monkeypatch):
+    from example_crud.controller import UserController
+
+    default_list = await client.get("/users/?page=1&count=10")
+    default_retrieve = await client.get("/users/1")
+
+    monkeypatch.setattr(UserController, "compiled_responses", True)
+    compiled_list = await client.get("/users/?page=1&count=10")
+    compiled_retrieve = await client.get("/users/1")
+
+    assert compiled_list.status_code == 200
+    assert compiled_list.json() == default_list.json()
+    assert compiled_retrieve.json() == default_retrieve.json()
+    assert compiled_list.headers["content-type"] == "application/json"
+
+
+async def test_compiled_serializer_reads_orm_objects(session):
+    class _UserController(BaseController):
+        schema_class = UserSchema
+
+    users, _ = await UserRepository(db=session).list_paginated()
+    body = _UserController().serialize_response(users)
+    assert b'"name":"Ana"' in body
+    assert b'"created_at":"2026-01-01T12:00:00"' in body
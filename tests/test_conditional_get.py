@@ -0,0 +1,297 @@
+"""Tests del GET condicional (`conditional_get` / `cache_control`).
+
+Cubre ETag/Last-Modified en `retrieve` (desde `updated_at`), ETag de `list`
+desde `(max(updated_at), count)` del conjunto filtrado, respuestas 304 sin
+cargar filas, invalidación al escribir, `Cache-Control` por controller y los
+validadores del repositorio Beanie.
+"""
+
+from datetime import datetime, timedelta
+from email.utils import format_datetime
+
+import mongomock_motor
+import pytest
+from beanie import init_beanie
+from beanie.odm.queries.aggregation import AggregationQuery
+from fastapi import FastAPI, Request
+from httpx import ASGITransport
+from httpx import AsyncClient as HTTPXAsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from example_crud.models import Base
+from example_crud.repository import UserRepository
+from example_crud.service import UserService
+from example_crud_beanie.models import UserDocument
+from example_crud_beanie.repository import UserBeanieRepository
+from example_crud_beanie.service import UserBeanieService
+from fastapi_basekit.exceptions import register_exception_handlers
+
+
+@pytest.fixture
+async def session():
+    engine = create_async_engine(
+        "sqlite+aiosqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    maker = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with maker() as s:
+        for data in [
+            {"name": "Ana", "email": "ana@x.com", "is_active": True},
+            {"name": "Beto", "email": "beto@x.com", "is_active": False},
+        ]:
+            await UserRepository(db=s).create(data)
+        await s.commit()
+        yield s
+    await engine.dispose()
+
+
+class CountingUserService(UserService):
+    loads = 0
+
+    async def list(self, **kwargs):
+        type(self).loads += 1
+        return await super().list(**kwargs)
+
+    async def retrieve(self, id, joins=None):
+        type(self).loads += 1
+        return await super().retrieve(id, joins=joins)
+
+
+@pytest.fixture
+async def client(session, monkeypatch):
+    from example_crud import controller as example_controller
+
+    monkeypatch.setattr(
+        example_controller.UserController, "conditional_get", True
+    )
+    monkeypatch.setattr(
+        example_controller.UserController,
+        "cache_control",
+        "private, max-age=0, must-revalidate",
+    )
+    CountingUserService.loads = 0
+
+    def get_user_service(request: Request):
+        return CountingUserService(
+            repository=UserRepository(db=session), request=request
+        )
+
+    app = FastAPI()
+    register_exception_handlers(app)
+    app.dependency_overrides[example_controller.get_user_service] = (
+        get_user_service
+    )
+    app.include_router(example_controller.router)
+    async with HTTPXAsyncClient(
+        transport=ASGITransport(app=app), base_url="http://test"
+    ) as c:
+        yield c
+
+
+async def test_retrieve_emits_validators(client):
+    response = await client.get("/users/1")
+    assert response.status_code == 200
+    assert response.json()["data"]["name"] == "Ana"
+    assert response.headers["etag"].startswith('W/"')
+    assert response.headers["last-modified"].endswith("GMT")
+    assert (
+        response.headers["cache-control"]
+        == "private, max-age=0, must-revalidate"
+    )
+
+
+async def test_retrieve_if_none_match_returns_304_without_loading(client):
+    etag = (await client.get("/users/1")).headers["etag"]
+    response = await client.get("/users/1", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == etag
+    assert "cache-control" in response.headers
+    assert CountingUserService.loads == 1
+
+
+async def test_if_none_match_accepts_lists_and_strong_form(client):
+    etag = (await client.get("/users/1")).headers["etag"]
+    strong = etag[2:]
+    response = await client.get(
+        "/users/1", headers={"If-None-Match": f'"other", {strong}'}
+    )
+    assert response.status_code == 304
+
+
+async def test_retrieve_if_modified_since(client):
+    first = await client.get("/users/1")
+    last_modified = first.headers["last-modified"]
+    response = await client.get(
+        "/users/1", headers={"If-Modified-Since": last_modified}
+    )
+    assert response.status_code == 304
+
+    old = format_datetime(datetime(2000, 1, 1), usegmt=False)
+    response = await client.get("/users/1", headers={"If-Modified-Since": old})
+    assert response.status_code == 200
+
+
+async def test_retrieve_etag_changes_after_update(client, session):
+    etag = (await client.get("/users/1")).headers["etag"]
+    await UserRepository(db=session).update(
+        1,
+        {"name": "Ana María", "updated_at": datetime.utcnow() + timedelta(1)},
+    )
+    response = await client.get("/users/1", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+    assert response.json()["data"]["name"] == "Ana María"
+
+
+async def test_missing_row_is_still_404(client):
+    response = await client.get("/users/99", headers={"If-None-Match": "*"})
+    assert response.status_code == 404
+
+
+async def test_list_if_none_match_returns_304_without_loading(client):
+    first = await client.get("/users/?is_active=true")
+    assert first.status_code == 200
+    assert "last-modified" not in first.headers
+    response = await client.get(
+        "/users/?is_active=true",
+        headers={"If-None-Match": first.headers["etag"]},
+    )
+    assert response.status_code == 304
+    assert CountingUserService.loads == 1
+
+
+async def test_list_etag_depends_on_filters_and_page(client):
+    a = await client.get("/users/?is_active=true")
+    b = await client.get("/users/?is_active=false")
+    c = await client.get("/users/?is_active=true&page=2")
+    assert len({r.headers["etag"] for r in (a, b, c)}) == 3
+
+
+async def test_list_etag_changes_on_insert_and_delete(client, session):
+    repo = UserRepository(db=session)
+    etag = (await client.get("/users/")).headers["etag"]
+    user = await repo.create({"name": "Caro", "email": "caro@x.com"})
+    after_insert = (await client.get("/users/")).headers["etag"]
+    assert after_insert != etag
+    # Borrar baja el count aunque max(updated_at) no cambie.
+    await repo.hard_delete(user)
+    response = await client.get(
+        "/users/", headers={"If-None-Match": after_insert}
+    )
+    assert response.status_code == 200
+
+
+async def test_disabled_by_default(session):
+    from example_crud.controller import UserController
+
+    assert UserController.conditional_get is False
+    assert UserController.cache_control is None
+
+
+async def test_sql_validator_without_column(session):
+    class NoValidator(UserRepository):
+        validator_field = None
+
+    repo = NoValidator(db=session)
+    assert await repo.get_validator(1) is None
+    assert await repo.list_validator() is None
+
+
+async def test_sql_list_validator_applies_filters(session):
+    repo = UserRepository(db=session)
+    latest, total = await repo.list_validator(filters={"is_active": True})
+    assert total == 1
+    assert isinstance(latest, datetime)
+    assert (await repo.list_validator(filters={"name": "Nadie"}))[1] == 0
+
+
+async def test_sql_list_validator_respects_the_override_signature(session):
+    from sqlalchemy import select
+
+    from example_crud.models import User
+
+    class Legacy(UserRepository):
+        def build_list_queryset(self):
+            return select(User).where(User.is_active.is_(True))
+
+    class Named(UserRepository):
+        seen = None
+
+        def build_list_queryset(self, filters=None):
+            type(self).seen = filters
+            return select(User)
+
+    assert (await Legacy(db=session).list_validator())[1] == 1
+    await Named(db=session).list_validator(filters={"name": "Ana"})
+    assert Named.seen == {"name": "Ana"}
+
+
+async def test_sql_list_validator_propagates_override_errors(session):
+    class Broken(UserRepository):
+        def build_list_queryset(self, **kwargs):
+            raise TypeError("error propio del override")
+
+    # Antes se reintentaba sin kwargs y se perdían los filtros en silencio.
+    with pytest.raises(TypeError, match="error propio"):
+        await Broken(db=session).list_validator(filters={"name": "Ana"})
+
+
+# ---------------------------------------------------------------------------
+# Beanie
+# ---------------------------------------------------------------------------
+
+
+@pytest.fixture
+async def beanie_db(monkeypatch):
+    # Beanie 2.x hace `await collection.aggregate(...)`, pero el cursor de
+    # mongomock-motor no es awaitable (ver test_beanie_aggregation_integration).
+    async def get_cursor(self):
+        return self.document_model.get_pymongo_collection().aggregate(
+            self.get_aggregation_pipeline()
+        )
+
+    monkeypatch.setattr(AggregationQuery, "get_cursor", get_cursor)
+    client = mongomock_motor.AsyncMongoMockClient()
+    await init_beanie(database=client.test_db, document_models=[UserDocument])
+    yield
+    client.close()
+
+
+async def test_beanie_validators(beanie_db):
+    newest = datetime(2030, 1, 1)
+    ana = await UserDocument(
+        name="Ana", email="a@x.com", updated_at=datetime(2020, 1, 1)
+    ).insert()
+    await UserDocument(
+        name="Beto", email="b@x.com", is_active=False, updated_at=newest
+    ).insert()
+    repo = UserBeanieRepository()
+
+    assert await repo.get_validator(str(ana.id)) == datetime(2020, 1, 1)
+    assert await repo.list_validator(UserDocument.find()) == (newest, 2)
+    assert await repo.list_validator(UserDocument.find({"name": "X"})) == (
+        None,
+        0,
+    )
+
+
+async def test_beanie_pipeline_validator(beanie_db):
+    await UserDocument(name="Ana", email="a@x.com").insert()
+    repo = UserBeanieRepository()
+    pipeline = [{"$match": {"name": "Ana"}}, {"$sort": {"name": 1}}]
+    assert (await repo.list_validator(pipeline))[1] == 1
+    assert await repo.list_validator([{"$project": {"name": 1}}]) is None
+
+
+async def test_beanie_service_list_validator_uses_filters(beanie_db):
+    await UserDocument(name="Ana", email="a@x.com").insert()
+    await UserDocument(name="Beto", email="b@x.com").insert()
+    service = UserBeanieService(repository=UserBeanieRepository())
+    _, total = await service.list_validator(filters={"name": "Ana"})
+    assert total == 1
@@ -1,5 +1,7 @@
 """Tests unitarios que simulan llamadas de API reales con permisos."""
 
+import json
+
 import pytest
 from unittest.mock import AsyncMock, MagicMock, patch
 from fastapi import FastAPI, Request, Depends
@@ -575,8 +577,9 @@ class TestControllerCustomPermissions:
 
         # Verificar que se ejecutó correctamente
         assert result is not None
-        assert hasattr(result, "data")
-        assert hasattr(result, "pagination")
+        body = json.loads(result.body)
+        assert "data" in body
+        assert "pagination" in body
 
     @pytest.mark.asyncio
     async def test_permission_class_none_no_check(
@@ -0,0 +1,157 @@
+"""Tests de `BaseKitJSONResponse` (serialización rápida del envelope).
+
+Cubre los tipos nativos (UUID, datetime, Decimal, Enum, ObjectId) con orjson
+y con el fallback de pydantic_core, el paso directo de bytes ya serializados,
+los envelopes de error de `register_exception_handlers` y la clase de
+respuesta de los controllers (también sin cache ni `compiled_responses`).
+"""
+
+import enum
+import uuid
+from datetime import datetime
+from decimal import Decimal
+
+import pytest
+from bson import ObjectId
+from fastapi import FastAPI
+from httpx import ASGITransport
+from httpx import AsyncClient as HTTPXAsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+import fastapi_basekit.responses as responses
+from example_crud import controller as example_controller
+from example_crud.models import Base
+from example_crud.repository import UserRepository
+from example_crud.service import UserService
+from fastapi_basekit.aio.controller.base import BaseController
+from fastapi_basekit.exceptions import register_exception_handlers
+from fastapi_basekit.exceptions.api_exceptions import ValidationException
+from fastapi_basekit.exceptions.domain import DomainError
+from fastapi_basekit.responses import BaseKitJSONResponse, dumps
+from fastapi_basekit.schema.base import BaseResponse
+
+
+class _Color(str, enum.Enum):
+    RED = "red"
+
+
+_UUID = uuid.UUID("12345678-1234-5678-1234-567812345678")
+_OID = ObjectId("64b7f0c2a1b2c3d4e5f60718")
+_PAYLOAD = {
+    "id": _UUID,
+    "oid": _OID,
+    "at": datetime(2026, 1, 2, 3, 4, 5),
+    "price": Decimal("9.90"),
+    "color": _Color.RED,
+}
+_EXPECTED = {
+    "id": str(_UUID),
+    "oid": str(_OID),
+    "at": "2026-01-02T03:04:05",
+    "price": "9.90",
+    "color": "red",
+}
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_dumps_handles_native_types(monkeypatch, use_orjson):
+    import json
+
+    if not use_orjson:
+        monkeypatch.setattr(responses, "orjson", None)
+    assert json.loads(dumps(_PAYLOAD)) == _EXPECTED
+
+
+def test_envelope_uses_pydantic_serializer():
+    body = dumps(BaseResponse(data=_PAYLOAD, message="OK"))
+    assert body.startswith(b'{"data":{"id":"12345678-')
+    assert b'"oid":"64b7f0c2a1b2c3d4e5f60718"' in body
+
+
+def test_bytes_are_sent_as_is():
+    response = BaseKitJSONResponse(content=b'{"a":1}')
+    assert response.body == b'{"a":1}'
+    assert response.media_type == "application/json"
+
+
+def test_controllers_use_fast_response_class():
+    assert BaseController.response_class is BaseKitJSONResponse
+
+
+async def test_error_envelopes_serialize_rich_data():
+    app = FastAPI()
+    register_exception_handlers(app)
+
+    @app.get("/api")
+    async def api_error():
+        raise ValidationException(data={"id": _UUID, "oid": _OID})
+
+    @app.get("/domain")
+    async def domain_error():
+        raise DomainError("FAILED", "falló")
+
+    async with HTTPXAsyncClient(
+        transport=ASGITransport(app=app), base_url="http://test"
+    ) as client:
+        api = await client.get("/api")
+        domain = await client.get("/domain")
+
+    assert api.status_code == 422
+    assert api.json() == {
+        "data": {"id": str(_UUID), "oid": str(_OID)},
+        "message": "Error de validación",
+        "status": "VALIDATION_ERROR",
+    }
+    assert domain.json()["status"] == "FAILED"
+    assert domain.json()["message"] == "falló"
+
+
+class _TaggedResponse(BaseKitJSONResponse):
+    """Marca las respuestas armadas por el controller."""
+
+    rendered = 0
+
+    def render(self, content):
+        type(self).rendered += 1
+        return super().render(content)
+
+
+async def test_plain_list_and_retrieve_use_response_class(monkeypatch):
+    """Sin cache, GET condicional ni `compiled_responses`, list/retrieve
+    también se serializan con `response_class` (no `jsonable_encoder`)."""
+    engine = create_async_engine(
+        "sqlite+aiosqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    maker = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    monkeypatch.setattr(
+        example_controller.UserController, "response_class", _TaggedResponse
+    )
+    _TaggedResponse.rendered = 0
+
+    async with maker() as session:
+        await UserRepository(db=session).create(
+            {"name": "Ana", "email": "ana@x.com"}
+        )
+        await session.commit()
+        app = FastAPI()
+        app.dependency_overrides[example_controller.get_user_service] = (
+            lambda: UserService(repository=UserRepository(db=session))
+        )
+        app.include_router(example_controller.router)
+        async with HTTPXAsyncClient(
+            transport=ASGITransport(app=app), base_url="http://test"
+        ) as client:
+            listed = await client.get("/users/")
+            detail = await client.get("/users/1")
+
+    await engine.dispose()
+    assert listed.status_code == detail.status_code == 200
+    assert listed.json()["pagination"]["total"] == 1
+    assert detail.json()["data"]["email"] == "ana@x.com"
+    assert _TaggedResponse.rendered == 2
@@ -0,0 +1,166 @@
+"""Tests de la revocación de JWT (`RevocationList` + `BloomFilter`).
+
+Cubre el filtro sin falsos negativos, que un token no revocado no toca el
+storage, la revocación por `jti` y por `sub` (según `iat`), el refresco
+incremental entre workers, la reconstrucción que descarta vencidas, el `jti`
+de `create_token` (que `refresh_token` conserva) y el middleware tratando un
+token revocado como anónimo.
+"""
+
+from types import SimpleNamespace
+
+from fastapi import FastAPI, Request
+from httpx import ASGITransport
+from httpx import AsyncClient as HTTPXAsyncClient
+
+from fastapi_basekit.aio.middleware import AuthenticationMiddleware
+from fastapi_basekit.servicios import (
+    InMemoryRevocationStore,
+    JWTService,
+    RevocationList,
+)
+from fastapi_basekit.servicios.thrid.revocation import BloomFilter
+
+
+class _CountingStore(InMemoryRevocationStore):
+    def __init__(self, clock):
+        super().__init__(clock=clock)
+        self.lookups = 0
+
+    async def lookup(self, kind, value):
+        self.lookups += 1
+        return await super().lookup(kind, value)
+
+
+def _token(sub="u1", jti="j1", iat=100):
+    return SimpleNamespace(sub=sub, jti=jti, iat=iat)
+
+
+def _setup(**kwargs):
+    now = [1000.0]
+    store = _CountingStore(clock=lambda: now[0])
+    revocation = RevocationList(store, clock=lambda: now[0], **kwargs)
+    return now, store, revocation
+
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter(1000, 0.01)
+    keys = [f"jti:{i}" for i in range(1000)]
+    for key in keys:
+        bloom.add(key)
+    assert all(key in bloom for key in keys)
+    false_positives = sum(f"other:{i}" in bloom for i in range(10_000))
+    assert false_positives < 300
+
+
+async def test_unrevoked_tokens_never_touch_the_store():
+    _, store, revocation = _setup()
+    for i in range(50):
+        assert not await revocation.is_revoked(_token(sub=f"u{i}", jti=f"j{i}"))
+    assert store.lookups == 0
+
+
+async def test_revoke_jti_applies_immediately():
+    _, store, revocation = _setup()
+    await revocation.revoke(jti="j1", expires_at=5000)
+    assert await revocation.is_revoked(_token(jti="j1"))
+    assert not await revocation.is_revoked(_token(jti="j2"))
+    assert store.lookups == 0  # positivo exacto ya conocido
+
+
+async def test_revoke_sub_only_affects_earlier_tokens():
+    now, _, revocation = _setup()
+    await revocation.revoke(sub="u1")
+    assert await revocation.is_revoked(_token(sub="u1", iat=999))
+    assert not await revocation.is_revoked(_token(sub="u1", iat=1001))
+    assert not await revocation.is_revoked(_token(sub="u2", iat=999))
+
+
+async def test_revoke_sub_boundary_is_the_whole_second():
+    now, _, revocation = _setup()
+    now[0] = 1000.7
+    await revocation.revoke(sub="u1")
+    # `iat` es entero: el segundo de la revocación entra completo (falla
+    # cerrado); el siguiente ya vale.
+    assert await revocation.is_revoked(_token(sub="u1", iat=1000))
+    assert await revocation.is_revoked(_token(sub="u1", iat=999))
+    assert not await revocation.is_revoked(_token(sub="u1", iat=1001))
+
+
+async def test_other_worker_sees_revocation_after_refresh():
+    now, store, worker_a = _setup(refresh_interval=5)
+    worker_b = RevocationList(store, refresh_interval=5, clock=lambda: now[0])
+    assert not await worker_b.is_revoked(_token(jti="j1"))
+
+    await worker_a.revoke(jti="j1")
+    now[0] += 1
+    assert not await worker_b.is_revoked(_token(jti="j1"))  # aún no refresca
+    now[0] += 5
+    assert await worker_b.is_revoked(_token(jti="j1"))
+    assert store.lookups == 1  # solo el acierto probable se confirma
+    assert await worker_b.is_revoked(_token(jti="j1"))
+    assert store.lookups == 1
+
+
+async def test_rebuild_drops_expired_revocations():
+    now, store, revocation = _setup(rebuild_interval=60)
+    await revocation.revoke(jti="j1", expires_at=1030)
+    await revocation.is_revoked(_token(jti="j2"))
+    now[0] += 61
+    await revocation.ensure_fresh()
+    assert "jti:j1" not in revocation._bloom
+    assert not await revocation.is_revoked(_token(jti="j1"))
+
+
+async def test_false_positives_are_confirmed_once():
+    _, store, revocation = _setup()
+    await revocation.ensure_fresh()
+    revocation._bloom.add("jti:ghost")  # fuerza un falso positivo
+    for _ in range(3):
+        assert not await revocation.is_revoked(_token(jti="ghost"))
+    assert store.lookups == 1
+
+
+def test_create_token_issues_unique_jti():
+    service = JWTService()
+    first = service.decode_token(service.create_token("u1"))
+    second = service.decode_token(service.create_token("u1"))
+    assert first.jti and second.jti and first.jti != second.jti
+    refreshed = service.decode_token(
+        service.refresh_token(service.create_token("u1"))
+    )
+    assert refreshed.jti and refreshed.iat is not None
+
+
+async def test_refreshing_a_revoked_token_keeps_it_revoked():
+    _, _, revocation = _setup()
+    service = JWTService()
+    token = service.create_token("u1")
+    original = service.decode_token(token)
+    await revocation.revoke(jti=original.jti)
+    refreshed = service.decode_token(service.refresh_token(token))
+    assert refreshed.jti == original.jti
+    assert await revocation.is_revoked(refreshed)
+
+
+async def test_middleware_treats_revoked_tokens_as_anonymous():
+    _, _, revocation = _setup()
+    service = JWTService()
+    token = service.create_token("u1")
+
+    app = FastAPI()
+
+    @app.get("/me")
+    async def me(request: Request):
+        return {"sub": getattr(request.state, "auth_sub", None)}
+
+    app.add_middleware(
+        AuthenticationMiddleware, jwt_service=service, revocation=revocation
+    )
+    headers = {"Authorization": f"Bearer {token}"}
+    async with HTTPXAsyncClient(
+        transport=ASGITransport(app=app), base_url="http://test"
+    ) as client:
+        assert (await client.get("/me", headers=headers)).json()["sub"] == "u1"
+        await revocation.revoke(jti=service.decode_token(token).jti)
+        assert (await client.get("/me", headers=headers)).json()["sub"] is None
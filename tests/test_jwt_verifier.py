@@ -0,0 +1,196 @@
+"""Tests del verificador de `JWTService`: cache de tokens verificados y
+algoritmos asimétricos (PEM y JWKS local).
+
+Cubre que un token repetido no vuelve a pasar por `jwt.decode`, que la
+entrada del cache vence con el `exp` del token, el LRU acotado, el parseo
+único de claves y RS256/ES256/EdDSA con selección por `kid`.
+"""
+
+import json
+import time
+
+import jwt as pyjwt
+import pytest
+
+from fastapi_basekit.exceptions.api_exceptions import JWTAuthenticationException
+from fastapi_basekit.servicios.thrid import jwt as jwt_module
+from fastapi_basekit.servicios.thrid.jwt import JWTService
+
+
+@pytest.fixture
+def count_decodes(monkeypatch):
+    calls = []
+    original = jwt_module.jwt.decode
+
+    def counting(*args, **kwargs):
+        calls.append(1)
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(jwt_module.jwt, "decode", counting)
+    return calls
+
+
+def test_repeated_token_skips_verification(count_decodes):
+    service = JWTService()
+    token = service.create_token("user-1")
+    for _ in range(5):
+        assert service.decode_token(token).sub == "user-1"
+    assert len(count_decodes) == 1
+
+
+def test_cached_entry_expires_with_token(monkeypatch, count_decodes):
+    service = JWTService()
+    token = service.create_token("user-1")
+    service.decode_token(token)
+    exp = service.decode_token(token).exp
+    monkeypatch.setattr(jwt_module.time, "time", lambda: exp + 1)
+    service.decode_token(token)  # vencida en el cache → se verifica de nuevo
+    assert len(count_decodes) == 2
+
+
+def test_verified_cache_is_bounded(monkeypatch, count_decodes):
+    monkeypatch.setenv("JWT_VERIFIED_CACHE_SIZE", "2")
+    service = JWTService()
+    tokens = [service.create_token(f"user-{i}") for i in range(3)]
+    for token in tokens:
+        service.decode_token(token)
+    service.decode_token(tokens[0])  # desalojado por el LRU
+    service.decode_token(tokens[2])
+    assert len(count_decodes) == 4
+
+
+def test_cache_can_be_disabled(monkeypatch, count_decodes):
+    monkeypatch.setenv("JWT_VERIFIED_CACHE_SIZE", "0")
+    service = JWTService()
+    token = service.create_token("user-1")
+    service.decode_token(token)
+    service.decode_token(token)
+    assert len(count_decodes) == 2
+
+
+def test_invalid_tokens_are_not_cached(count_decodes):
+    service = JWTService()
+    for _ in range(2):
+        with pytest.raises(JWTAuthenticationException):
+            service.decode_token("a.b.c")
+    assert len(count_decodes) == 2
+
+
+# ---------------------------------------------------------------------------
+# Algoritmos asimétricos
+# ---------------------------------------------------------------------------
+
+
+def _keys(algorithm):
+    pytest.importorskip("cryptography")
+    from cryptography.hazmat.primitives import serialization
+    from cryptography.hazmat.primitives.asymmetric import ec, ed25519, rsa
+
+    if algorithm == "RS256":
+        private = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    elif algorithm == "ES256":
+        private = ec.generate_private_key(ec.SECP256R1())
+    else:
+        private = ed25519.Ed25519PrivateKey.generate()
+    private_pem = private.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    ).decode()
+    public_pem = (
+        private.public_key()
+        .public_bytes(
+            serialization.Encoding.PEM,
+            serialization.PublicFormat.SubjectPublicKeyInfo,
+        )
+        .decode()
+    )
+    return private, private_pem, public_pem
+
+
+@pytest.fixture
+def asymmetric_env(monkeypatch):
+    for name in (
+        "JWT_PRIVATE_KEY",
+        "JWT_PRIVATE_KEY_FILE",
+        "JWT_PUBLIC_KEY",
+        "JWT_PUBLIC_KEY_FILE",
+        "JWT_JWKS_FILE",
+        "JWT_KID",
+    ):
+        monkeypatch.delenv(name, raising=False)
+    monkeypatch.delenv("JWT_SECRET", raising=False)
+    return monkeypatch
+
+
+@pytest.mark.parametrize("algorithm", ["RS256", "ES256", "EdDSA"])
+def test_asymmetric_round_trip(asymmetric_env, algorithm):
+    _, private_pem, public_pem = _keys(algorithm)
+    asymmetric_env.setenv("JWT_ALGORITHM", algorithm)
+    asymmetric_env.setenv("JWT_PRIVATE_KEY", private_pem)
+    signer = JWTService()
+    token = signer.create_token("user-1")
+
+    asymmetric_env.delenv("JWT_PRIVATE_KEY")
+    asymmetric_env.setenv("JWT_PUBLIC_KEY", public_pem)
+    verifier = JWTService()
+    assert verifier.decode_token(token).sub == "user-1"
+    with pytest.raises(RuntimeError, match="clave privada"):
+        verifier.create_token("user-2")
+
+
+def test_pem_files_are_parsed_once(asymmetric_env, tmp_path):
+    _, private_pem, _ = _keys("ES256")
+    path = tmp_path / "private.pem"
+    path.write_text(private_pem)
+    asymmetric_env.setenv("JWT_ALGORITHM", "ES256")
+    asymmetric_env.setenv("JWT_PRIVATE_KEY_FILE", str(path))
+    jwt_module._prepare_key.cache_clear()
+    first, second = JWTService(), JWTService()
+    assert first._signing_key is second._signing_key
+    assert jwt_module._prepare_key.cache_info().misses == 1
+
+
+def test_jwks_file_selects_key_by_kid(asymmetric_env, tmp_path):
+    _, private_a, public_a = _keys("RS256")
+    _, private_b, public_b = _keys("RS256")
+    rs256 = pyjwt.algorithms.get_default_algorithms()["RS256"]
+    jwks = {"keys": []}
+    for kid, public in (("a", public_a), ("b", public_b)):
+        jwk = json.loads(rs256.to_jwk(rs256.prepare_key(public)))
+        jwk.update(kid=kid, alg="RS256", use="sig")
+        jwks["keys"].append(jwk)
+    jwks_path = tmp_path / "jwks.json"
+    jwks_path.write_text(json.dumps(jwks))
+
+    asymmetric_env.setenv("JWT_ALGORITHM", "RS256")
+    asymmetric_env.setenv("JWT_JWKS_FILE", str(jwks_path))
+    asymmetric_env.setenv("JWT_PRIVATE_KEY", private_b)
+    asymmetric_env.setenv("JWT_KID", "b")
+    service = JWTService()
+    token = service.create_token("user-1")
+    assert pyjwt.get_unverified_header(token)["kid"] == "b"
+    assert service.decode_token(token).sub == "user-1"
+
+    forged = pyjwt.encode(
+        {"sub": "x", "exp": int(time.time()) + 60},
+        private_a,
+        algorithm="RS256",
+        headers={"kid": "b"},
+    )
+    unknown = pyjwt.encode(
+        {"sub": "x", "exp": int(time.time()) + 60},
+        private_a,
+        algorithm="RS256",
+        headers={"kid": "zzz"},
+    )
+    for bad in (forged, unknown):
+        with pytest.raises(JWTAuthenticationException, match="inválido"):
+            service.decode_token(bad)
+
+
+def test_asymmetric_without_keys_fails_loud(asymmetric_env):
+    pytest.importorskip("cryptography")
+    asymmetric_env.setenv("JWT_ALGORITHM", "RS256")
+    with pytest.raises(RuntimeError, match="JWT_PUBLIC_KEY"):
+        JWTService()
@@ -0,0 +1,307 @@
+"""Tests del cache stale-while-revalidate de `list` (`list_cache_ttl`).
+
+Cubre la clave (params normalizados + scope de `get_filters`), la invalidación
+por generación de modelo al escribir, el refresco único en vuelo con
+respuestas vencidas para el resto y el fallback a la vencida si el refresco
+falla.
+"""
+
+import asyncio
+
+import pytest
+from fastapi import FastAPI, Request
+from httpx import ASGITransport
+from httpx import AsyncClient as HTTPXAsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from example_crud.models import Base, User
+from example_crud.repository import UserRepository
+from example_crud.service import UserService
+from fastapi_basekit.aio.cache import (
+    InMemoryCacheBackend,
+    StaleWhileRevalidateCache,
+    bump_generation,
+    get_generation,
+)
+
+
+@pytest.fixture
+async def session():
+    engine = create_async_engine(
+        "sqlite+aiosqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    maker = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with maker() as s:
+        for data in [
+            {"name": "Ana", "email": "ana@x.com", "is_active": True},
+            {"name": "Beto", "email": "beto@x.com", "is_active": False},
+        ]:
+            await UserRepository(db=s).create(data)
+        await s.commit()
+        yield s
+    await engine.dispose()
+
+
+class ScopedUserService(UserService):
+    """Scoping por "tenant" (header) aplicado en `get_filters`."""
+
+    list_calls = 0
+
+    def get_filters(self, filters=None):
+        filters = dict(filters or {})
+        filters["is_active"] = self.request.headers.get("X-Tenant") == "on"
+        return filters
+
+    async def list(self, **kwargs):
+        type(self).list_calls += 1
+        return await super().list(**kwargs)
+
+
+@pytest.fixture
+async def client(session, monkeypatch):
+    from example_crud import controller as example_controller
+
+    monkeypatch.setattr(
+        example_controller.UserController, "list_cache_ttl", 60
+    )
+    monkeypatch.setattr(
+        example_controller.UserController,
+        "list_cache_backend",
+        InMemoryCacheBackend(),
+    )
+    ScopedUserService.list_calls = 0
+
+    def get_user_service(request: Request):
+        return ScopedUserService(
+            repository=UserRepository(db=session), request=request
+        )
+
+    app = FastAPI()
+    app.dependency_overrides[example_controller.get_user_service] = (
+        get_user_service
+    )
+    app.include_router(example_controller.router)
+    async with HTTPXAsyncClient(
+        transport=ASGITransport(app=app), base_url="http://test"
+    ) as c:
+        yield c
+
+
+def _names(response):
+    return [u["name"] for u in response.json()["data"]]
+
+
+async def test_repeated_list_is_served_from_cache(client):
+    headers = {"X-Tenant": "on"}
+    first = await client.get("/users/?page=1&count=10", headers=headers)
+    second = await client.get("/users/?count=10&page=1", headers=headers)
+    assert first.status_code == 200
+    assert first.content == second.content
+    assert _names(first) == ["Ana"]
+    assert ScopedUserService.list_calls == 1
+
+
+async def test_scope_from_get_filters_is_part_of_the_key(client):
+    on = await client.get("/users/", headers={"X-Tenant": "on"})
+    off = await client.get("/users/", headers={"X-Tenant": "off"})
+    assert _names(on) == ["Ana"]
+    assert _names(off) == ["Beto"]
+    assert ScopedUserService.list_calls == 2
+
+
+async def test_query_params_change_the_key(client):
+    await client.get("/users/?page=1", headers={"X-Tenant": "on"})
+    await client.get("/users/?page=2", headers={"X-Tenant": "on"})
+    await client.get("/users/?search=Ana", headers={"X-Tenant": "on"})
+    assert ScopedUserService.list_calls == 3
+
+
+async def test_repository_write_bumps_generation(client, session):
+    await client.get("/users/", headers={"X-Tenant": "on"})
+    await UserRepository(db=session).create(
+        {"name": "Caro", "email": "caro@x.com", "is_active": True}
+    )
+    response = await client.get("/users/", headers={"X-Tenant": "on"})
+    assert sorted(_names(response)) == ["Ana", "Caro"]
+    assert ScopedUserService.list_calls == 2
+
+
+async def test_commit_bumps_generation_again(session):
+    before = get_generation(User)
+    await UserRepository(db=session).update(1, {"name": "Ana María"})
+    assert get_generation(User) == before + 1
+    await session.commit()
+    assert get_generation(User) == before + 2
+
+
+async def test_every_write_path_bumps_generation(session):
+    repo = UserRepository(db=session)
+    before = get_generation(User)
+    user = await repo.create({"name": "Caro", "email": "caro@x.com"})
+    user.name = "Carolina"
+    await repo.save(user)
+    await repo.hard_delete(user)
+    await repo.delete(1)
+    assert get_generation(User) == before + 4
+
+
+async def test_disabled_by_default(session):
+    from example_crud.controller import UserController
+
+    assert UserController.list_cache_ttl is None
+
+
+# ---------------------------------------------------------------------------
+# StaleWhileRevalidateCache
+# ---------------------------------------------------------------------------
+
+
+class _Loader:
+    def __init__(self):
+        self.calls = 0
+        self.release = asyncio.Event()
+        self.fail = False
+
+    async def __call__(self):
+        self.calls += 1
+        await self.release.wait()
+        if self.fail:
+            raise RuntimeError("db down")
+        return f"v{self.calls}".encode()
+
+
+async def _expire(cache, key):
+    body, _ = await cache.backend.get(key)
+    await cache.backend.set(key, (body, 0), 60)
+
+
+async def _settled(cache, key, body):
+    for _ in range(100):
+        entry = await cache.backend.get(key)
+        if entry and entry[0] == body:
+            return True
+        await asyncio.sleep(0.001)
+    return False
+
+
+async def test_stale_is_served_while_one_background_refresh_runs():
+    cache = StaleWhileRevalidateCache(
+        InMemoryCacheBackend(), ttl=60, stale_ttl=60
+    )
+    load = _Loader()
+    load.release.set()
+    assert await cache.get_or_load("k", load) == b"v1"
+    await _expire(cache, "k")
+
+    load.release.clear()
+    # El request que encuentra la vencida no espera el refresco.
+    assert await cache.get_or_load("k", load) == b"v1"
+    await asyncio.sleep(0.01)
+    assert await cache.get_or_load("k", load) == b"v1"
+    assert await cache.get_or_load("k", load) == b"v1"
+    load.release.set()
+    assert await _settled(cache, "k", b"v2")
+    assert load.calls == 2
+    assert await cache.get_or_load("k", load) == b"v2"
+
+
+async def test_refresh_uses_the_refresh_loader():
+    cache = StaleWhileRevalidateCache(
+        InMemoryCacheBackend(), ttl=60, stale_ttl=60
+    )
+    load = _Loader()
+    load.release.set()
+    await cache.get_or_load("k", load)
+    await _expire(cache, "k")
+
+    async def refresh():
+        return b"fresh"
+
+    assert await cache.get_or_load("k", load, refresh=refresh) == b"v1"
+    assert await _settled(cache, "k", b"fresh")
+    assert load.calls == 1
+
+
+async def test_failed_refresh_serves_stale():
+    cache = StaleWhileRevalidateCache(
+        InMemoryCacheBackend(), ttl=60, stale_ttl=60
+    )
+    load = _Loader()
+    load.release.set()
+    await cache.get_or_load("k", load)
+    await _expire(cache, "k")
+    load.fail = True
+    assert await cache.get_or_load("k", load) == b"v1"
+    await asyncio.sleep(0.01)
+    assert await cache.get_or_load("k", load) == b"v1"
+
+
+async def test_controller_refresh_runs_on_its_own_session(client, session):
+    from example_crud import controller as example_controller
+
+    headers = {"X-Tenant": "on"}
+    await client.get("/users/", headers=headers)
+    backend = example_controller.UserController.list_cache_backend
+    (key,) = list(backend._data)
+    body, _ = await backend.get(key)
+    await backend.set(key, (body, 0), 60)
+
+    sessions = []
+    original = UserRepository.list_paginated
+
+    async def spy(self, *args, **kwargs):
+        sessions.append(self.session)
+        return await original(self, *args, **kwargs)
+
+    UserRepository.list_paginated = spy
+    try:
+        stale = await client.get("/users/", headers=headers)
+        assert stale.content == body
+        for _ in range(100):
+            if sessions:
+                break
+            await asyncio.sleep(0.001)
+    finally:
+        UserRepository.list_paginated = original
+    assert sessions and sessions[0] is not session
+
+
+async def test_entry_disappears_after_stale_window():
+    cache = StaleWhileRevalidateCache(
+        InMemoryCacheBackend(), ttl=0.01, stale_ttl=0.01
+    )
+    load = _Loader()
+    load.release.set()
+    await cache.get_or_load("k", load)
+    await asyncio.sleep(0.03)
+    assert await cache.backend.get("k") is None
+
+
+async def test_one_commit_listener_per_session(session):
+    repo = UserRepository(db=session)
+    for i in range(3):
+        await repo.create({"name": f"n{i}", "email": f"n{i}@x.com"})
+    listeners = session.sync_session.dispatch.after_commit
+    assert len(listeners) == 1
+    before = get_generation(User)
+    await session.commit()
+    assert get_generation(User) == before + 1
+
+
+def test_bump_generation_is_per_model():
+    class A:
+        pass
+
+    class B:
+        pass
+
+    bump_generation(A)
+    bump_generation(A)
+    assert get_generation(A) == 2
+    assert get_generation(B) == 0
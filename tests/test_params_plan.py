@@ -0,0 +1,211 @@
+"""Tests del plan compilado de query params (`_endpoint_param_plan_cached`).
+
+Cubre la paridad del coercer compilado con `_coerce_param`, el cacheo por
+endpoint, la clasificación estándar/excluido/filtro y las claves repetidas
+(`status=a&status=b` → lista → IN) en `_params`, SQLAlchemy y Beanie.
+"""
+
+import uuid
+from datetime import date
+from decimal import Decimal
+from typing import List, Optional
+
+import mongomock_motor
+import pytest
+from beanie import init_beanie
+from fastapi import FastAPI, Query, Request
+from httpx import ASGITransport
+from httpx import AsyncClient as HTTPXAsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from starlette.datastructures import QueryParams
+
+from example_crud.models import Base
+from example_crud.repository import UserRepository
+from example_crud.service import UserService
+from example_crud_beanie.models import UserDocument
+from example_crud_beanie.repository import UserBeanieRepository
+from fastapi_basekit.aio.controller.base import (
+    BaseController,
+    _compile_coercer,
+    _endpoint_param_plan_cached,
+)
+
+
+class _FakeRequest:
+    def __init__(self, query_string: str, endpoint=None):
+        self.query_params = QueryParams(query_string)
+        self.scope = {"endpoint": endpoint} if endpoint is not None else {}
+
+
+def _make(query_string: str, endpoint=None):
+    ctrl = BaseController.__new__(BaseController)
+    ctrl.request = _FakeRequest(query_string, endpoint)
+    return ctrl
+
+
+async def ep_typed(
+    self,
+    page: int = Query(1),
+    is_active: Optional[bool] = Query(None),
+    age: Optional[int] = Query(None),
+    ids: Optional[List[int]] = Query(None),
+    id: Optional[str] = Query(None),
+):
+    ...
+
+
+@pytest.mark.parametrize(
+    "annotation,raw",
+    [
+        (None, "5"),
+        (str, "5"),
+        (Optional[int], "5"),
+        (int, "x"),
+        (Optional[float], "1.5"),
+        (float, "nan?"),
+        (bool, "TRUE"),
+        (Optional[bool], "off"),
+        (date, "2026-01-02"),
+        (Optional[date], "no-date"),
+        (uuid.UUID, "12345678-1234-5678-1234-567812345678"),
+        (Decimal, "9.90"),
+    ],
+)
+def test_compiled_coercer_matches_coerce_param(annotation, raw):
+    coercer, many = _compile_coercer(annotation)
+    assert many is False
+    assert coercer(raw) == BaseController._coerce_param(raw, annotation)
+
+
+def test_list_annotation_coerces_each_item():
+    coercer, many = _compile_coercer(Optional[List[int]])
+    assert many is True
+    assert coercer("7") == 7
+
+
+def test_plan_is_compiled_once_per_endpoint():
+    _endpoint_param_plan_cached.cache_clear()
+    _make("age=1", ep_typed)._params()
+    _make("age=2", ep_typed)._params()
+    info = _endpoint_param_plan_cached.cache_info()
+    assert (info.misses, info.hits) == (1, 1)
+
+
+def test_plan_classifies_params():
+    plan = _endpoint_param_plan_cached(
+        ep_typed, BaseController._excluded_params()
+    )
+    assert plan["page"][0] == "standard"
+    assert plan["id"][0] == "excluded"
+    assert plan["age"][0] == "filter"
+
+
+def test_repeated_keys_become_a_list():
+    params = _make("status=a&status=b&status=c&age=3", ep_typed)._params()
+    assert params["filters"] == {"status": ["a", "b", "c"], "age": 3}
+
+
+def test_repeated_typed_keys_are_coerced():
+    params = _make("age=1&age=2", ep_typed)._params()
+    assert params["filters"] == {"age": [1, 2]}
+
+
+def test_list_annotated_param_is_always_a_list():
+    params = _make("ids=4", ep_typed)._params()
+    assert params["filters"] == {"ids": [4]}
+
+
+def test_coerce_param_override_is_used_by_the_plan():
+    class Upper(BaseController):
+        @staticmethod
+        def _coerce_param(raw, annotation):
+            return f"{raw}:{getattr(annotation, '__name__', annotation)}"
+
+    ctrl = Upper.__new__(Upper)
+    ctrl.request = _FakeRequest("age=1&ids=2&other=x", ep_typed)
+    params = ctrl._params()
+    assert params["filters"] == {
+        "age": "1:Optional",
+        "ids": ["2:int"],
+        "other": "x:None",
+    }
+
+
+def test_endpoint_param_types_override_is_used_by_the_plan():
+    class Typed(BaseController):
+        def _endpoint_param_types(self):
+            return {"age": int, "is_active": bool}
+
+    ctrl = Typed.__new__(Typed)
+    ctrl.request = _FakeRequest("age=3&is_active=yes")
+    assert ctrl._params()["filters"] == {"age": 3, "is_active": True}
+
+
+def test_plain_dict_query_params_still_work():
+    ctrl = _make("", ep_typed)
+    ctrl.request.query_params = {"is_active": "true", "page": "2"}
+    params = ctrl._params()
+    assert params["page"] == 2
+    assert params["filters"] == {"is_active": True}
+
+
+# ---------------------------------------------------------------------------
+# Claves repetidas → IN
+# ---------------------------------------------------------------------------
+
+
+@pytest.fixture
+async def client():
+    from example_crud import controller as example_controller
+
+    engine = create_async_engine(
+        "sqlite+aiosqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    maker = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with maker() as session:
+        for name in ("Ana", "Beto", "Caro"):
+            await UserRepository(db=session).create(
+                {"name": name, "email": f"{name.lower()}@x.com"}
+            )
+        await session.commit()
+
+        def get_user_service(request: Request):
+            return UserService(
+                repository=UserRepository(db=session), request=request
+            )
+
+        app = FastAPI()
+        app.dependency_overrides[example_controller.get_user_service] = (
+            get_user_service
+        )
+        app.include_router(example_controller.router)
+        async with HTTPXAsyncClient(
+            transport=ASGITransport(app=app), base_url="http://test"
+        ) as c:
+            yield c
+    await engine.dispose()
+
+
+async def test_sql_repeated_key_filters_with_in(client):
+    response = await client.get("/users/?name=Ana&name=Caro")
+    names = sorted(u["name"] for u in response.json()["data"])
+    assert names == ["Ana", "Caro"]
+
+
+async def test_beanie_list_filter_uses_in():
+    mongo = mongomock_motor.AsyncMongoMockClient()
+    await init_beanie(database=mongo.test_db, document_models=[UserDocument])
+    for name in ("Ana", "Beto", "Caro"):
+        await UserDocument(name=name, email=f"{name}@x.com").insert()
+    repo = UserBeanieRepository()
+    query = repo.build_filter_query(
+        search=None, search_fields=[], filters={"name": ["Ana", "Beto"]}
+    )
+    assert sorted(d.name for d in await query.to_list()) == ["Ana", "Beto"]
+    mongo.close()
@@ -0,0 +1,208 @@
+"""Tests de la evaluación de permisos en `check_permissions`.
+
+Cubre la ejecución concurrente de permisos `independent`, la cancelación de
+las hermanas ante la primera denegación, el orden entre grupos y el memo por
+request en `request.state` (incluido un endpoint custom que delega en
+`super().list()`).
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from fastapi import APIRouter, Depends, FastAPI, Request
+from fastapi_restful.cbv import cbv
+from httpx import ASGITransport
+from httpx import AsyncClient as HTTPXAsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from example_crud.models import Base
+from example_crud.repository import UserRepository
+from example_crud.schemas import UserSchema
+from example_crud.service import UserService
+from fastapi_basekit.aio.controller.base import BaseController
+from fastapi_basekit.aio.permissions.base import BasePermission
+from fastapi_basekit.aio.sqlalchemy.controller.base import (
+    SQLAlchemyBaseController,
+)
+from fastapi_basekit.exceptions import register_exception_handlers
+from fastapi_basekit.exceptions.api_exceptions import PermissionException
+
+calls = []
+
+
+class _Slow(BasePermission):
+    independent = True
+
+    async def has_permission(self, request):
+        calls.append(type(self).__name__)
+        await asyncio.sleep(0.05)
+        return True
+
+
+class _SlowToo(_Slow):
+    pass
+
+
+class _DenyFast(BasePermission):
+    independent = True
+    message_exception = "Denegado rápido"
+
+    async def has_permission(self, request):
+        await asyncio.sleep(0)
+        return False
+
+
+class _Hang(BasePermission):
+    independent = True
+    cancelled = False
+
+    async def has_permission(self, request):
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            type(self).cancelled = True
+            raise
+        return True
+
+
+class _Sequential(BasePermission):
+    async def has_permission(self, request):
+        calls.append("sequential")
+        return True
+
+
+class _Volatile(BasePermission):
+    memoize = False
+
+    async def has_permission(self, request):
+        calls.append("volatile")
+        return True
+
+
+def _controller(permissions):
+    class _Controller(BaseController):
+        permission_classes = permissions
+
+    controller = _Controller()
+    controller.request = SimpleNamespace(state=SimpleNamespace())
+    return controller
+
+
+@pytest.fixture(autouse=True)
+def _reset_calls():
+    calls.clear()
+
+
+async def test_independent_permissions_run_concurrently():
+    controller = _controller([_Slow, _SlowToo])
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    await controller.check_permissions()
+    assert loop.time() - start < 0.09
+    assert sorted(calls) == ["_Slow", "_SlowToo"]
+
+
+async def test_first_denial_cancels_siblings():
+    _Hang.cancelled = False
+    controller = _controller([_Hang, _DenyFast])
+    with pytest.raises(PermissionException) as exc:
+        await asyncio.wait_for(controller.check_permissions(), 1)
+    assert exc.value.data == "Denegado rápido"
+    await asyncio.sleep(0)
+    assert _Hang.cancelled
+
+
+async def test_dependent_permission_waits_for_previous_group():
+    controller = _controller([_Slow, _Sequential, _SlowToo])
+    await controller.check_permissions()
+    assert calls == ["_Slow", "sequential", "_SlowToo"]
+
+
+async def test_granted_permissions_are_memoized_per_request():
+    controller = _controller([_Sequential, _Volatile])
+    await controller.check_permissions()
+    await controller.check_permissions()
+    assert calls == ["sequential", "volatile", "volatile"]
+
+    controller.request = SimpleNamespace(state=SimpleNamespace())
+    await controller.check_permissions()
+    assert calls.count("sequential") == 2
+
+
+async def test_denials_are_not_memoized():
+    controller = _controller([_DenyFast])
+    for _ in range(2):
+        with pytest.raises(PermissionException):
+            await controller.check_permissions()
+    assert not getattr(
+        controller.request.state, "_basekit_permissions_granted", {}
+    )
+
+
+async def test_request_without_state_is_not_memoized():
+    controller = _controller([_Sequential])
+    controller.request = None
+    await controller.check_permissions()
+    await controller.check_permissions()
+    assert calls == ["sequential", "sequential"]
+
+
+# ---------------------------------------------------------------------------
+# Endpoint custom que delega en super().list()
+# ---------------------------------------------------------------------------
+
+
+class _Counted(BasePermission):
+    async def has_permission(self, request: Request) -> bool:
+        calls.append("counted")
+        return True
+
+
+@pytest.fixture
+async def session():
+    engine = create_async_engine(
+        "sqlite+aiosqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    maker = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with maker() as db:
+        yield db
+    await engine.dispose()
+
+
+async def test_custom_action_delegating_to_list_checks_once(session):
+    router = APIRouter(prefix="/people")
+
+    def get_service(request: Request) -> UserService:
+        return UserService(
+            repository=UserRepository(db=session), request=request
+        )
+
+    @cbv(router)
+    class PeopleController(SQLAlchemyBaseController):
+        schema_class = UserSchema
+        service: UserService = Depends(get_service)
+        permission_classes = [_Counted]
+
+        @router.get("/active")
+        async def list_active(self):
+            await self.prepare_action("list_active")
+            return await super().list()
+
+    app = FastAPI()
+    register_exception_handlers(app)
+    app.include_router(router)
+    async with HTTPXAsyncClient(
+        transport=ASGITransport(app=app), base_url="http://test"
+    ) as client:
+        response = await client.get("/people/active")
+        assert response.status_code == 200
+        await client.get("/people/active")
+
+    assert calls == ["counted", "counted"]
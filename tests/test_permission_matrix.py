@@ -0,0 +1,250 @@
+"""Tests de `PermissionMatrix` y `MatrixPermission`.
+
+Cubre las búsquedas con comodines, la carga única compartida, la recarga por
+`bump()` (también durante una carga en vuelo), por cambio de versión y por TTL
+(sirviendo la matriz anterior si la carga o la versión fallan), y el permiso
+resuelto desde el endpoint y `request.state.user`.
+"""
+
+import asyncio
+import enum
+from types import SimpleNamespace
+
+import pytest
+
+from fastapi_basekit.aio.permissions.matrix import (
+    MatrixPermission,
+    PermissionMatrix,
+)
+
+
+class _Role(str, enum.Enum):
+    admin = "admin"
+    seller = "seller"
+
+
+class _Loader:
+    def __init__(self, rows):
+        self.rows = rows
+        self.calls = 0
+        self.fail = False
+
+    async def __call__(self):
+        self.calls += 1
+        await asyncio.sleep(0)
+        if self.fail:
+            raise RuntimeError("db caída")
+        return list(self.rows)
+
+
+_ROWS = [
+    (_Role.admin, "*", "*"),
+    (_Role.seller, "OrderController", "list_orders"),
+    (_Role.seller, "ProductController", "*"),
+]
+
+
+@pytest.fixture
+def clock():
+    return [1000.0]
+
+
+async def test_lookups_with_wildcards():
+    matrix = PermissionMatrix(_Loader(_ROWS))
+    await matrix.load()
+    assert matrix.allows("admin", "Anything", "delete_thing")
+    assert matrix.allows(_Role.seller, "OrderController", "list_orders")
+    assert not matrix.allows("seller", "OrderController", "delete_order")
+    assert matrix.allows("seller", "ProductController", "delete_product")
+    assert not matrix.allows("guest", "ProductController", "list_products")
+
+
+async def test_concurrent_first_checks_share_one_load():
+    loader = _Loader(_ROWS)
+    matrix = PermissionMatrix(loader)
+    results = await asyncio.gather(
+        *(matrix.has("admin", "X", "y") for _ in range(10))
+    )
+    assert all(results)
+    assert loader.calls == 1
+
+
+async def test_bump_reloads_on_next_check():
+    loader = _Loader(_ROWS)
+    matrix = PermissionMatrix(loader)
+    await matrix.load()
+    loader.rows = [(_Role.seller, "*", "*")]
+    assert not await matrix.has("seller", "OrderController", "delete_order")
+    matrix.bump()
+    assert await matrix.has("seller", "OrderController", "delete_order")
+    assert loader.calls == 2
+
+
+class _GatedLoader(_Loader):
+    """Lee las filas al empezar y devuelve recién al abrir `gate`."""
+
+    def __init__(self, rows):
+        super().__init__(rows)
+        self.gate = asyncio.Event()
+        self.gate.set()
+
+    async def __call__(self):
+        self.calls += 1
+        rows = list(self.rows)
+        await self.gate.wait()
+        return rows
+
+
+async def test_bump_during_load_is_not_lost():
+    loader = _GatedLoader(_ROWS)
+    matrix = PermissionMatrix(loader)
+    await matrix.load()
+    loader.gate.clear()
+    matrix.bump()
+    first = asyncio.ensure_future(matrix.ensure_fresh())
+    while loader.calls < 2:
+        await asyncio.sleep(0)
+    # La carga en vuelo ya leyó las filas previas a este cambio.
+    loader.rows = [(_Role.seller, "*", "*")]
+    matrix.bump()
+    check = asyncio.ensure_future(
+        matrix.has("seller", "OrderController", "delete_order")
+    )
+    await asyncio.sleep(0)
+    loader.gate.set()
+    assert await check
+    await first
+    assert loader.calls == 3
+
+
+async def test_version_change_reloads(clock):
+    loader = _Loader(_ROWS)
+    version = {"value": 1}
+
+    async def current_version():
+        return version["value"]
+
+    matrix = PermissionMatrix(
+        loader,
+        ttl=None,
+        version=current_version,
+        version_interval=5,
+        clock=lambda: clock[0],
+    )
+    await matrix.load()
+    version["value"] = 2
+    clock[0] += 1
+    await matrix.ensure_fresh()
+    assert loader.calls == 1  # versión consultada como mucho cada 5 s
+    clock[0] += 5
+    await matrix.ensure_fresh()
+    assert loader.calls == 2
+    clock[0] += 5
+    await matrix.ensure_fresh()
+    assert loader.calls == 2  # misma versión: sin recarga
+
+
+async def test_ttl_reload_and_failure_keeps_previous(clock):
+    loader = _Loader(_ROWS)
+    matrix = PermissionMatrix(loader, ttl=60, clock=lambda: clock[0])
+    await matrix.load()
+    clock[0] += 30
+    await matrix.ensure_fresh()
+    assert loader.calls == 1
+
+    clock[0] += 31
+    loader.fail = True
+    await matrix.ensure_fresh()
+    assert loader.calls == 2
+    assert matrix.allows("admin", "X", "y")
+
+    loader.fail = False
+    loader.rows = []
+    await matrix.ensure_fresh()
+    assert not matrix.allows("admin", "X", "y")
+
+
+async def test_version_failure_keeps_previous(clock):
+    loader = _Loader(_ROWS)
+    calls = {"n": 0}
+
+    async def broken_version():
+        calls["n"] += 1
+        if calls["n"] > 1:
+            raise ConnectionError("redis caído")
+        return 1
+
+    matrix = PermissionMatrix(
+        loader,
+        ttl=None,
+        version=broken_version,
+        version_interval=5,
+        clock=lambda: clock[0],
+    )
+    await matrix.load()
+    clock[0] += 5
+    assert await matrix.has("admin", "X", "y")
+    assert calls["n"] == 2 and loader.calls == 1
+
+
+async def test_first_load_failure_propagates():
+    loader = _Loader(_ROWS)
+    loader.fail = True
+    matrix = PermissionMatrix(loader)
+    with pytest.raises(RuntimeError):
+        await matrix.has("admin", "X", "y")
+    assert not matrix.loaded
+
+
+# ---------------------------------------------------------------------------
+# MatrixPermission
+# ---------------------------------------------------------------------------
+
+
+class OrderController:
+    async def list_orders(self):
+        ...
+
+    async def delete_order(self):
+        ...
+
+
+def _request(user, endpoint):
+    return SimpleNamespace(
+        state=SimpleNamespace(user=user), scope={"endpoint": endpoint}
+    )
+
+
+@pytest.fixture
+async def permission():
+    class _Permission(MatrixPermission):
+        matrix = PermissionMatrix(_Loader(_ROWS))
+
+    return _Permission()
+
+
+async def test_permission_resolves_controller_and_action(permission):
+    seller = SimpleNamespace(role=_Role.seller)
+    assert await permission.has_permission(
+        _request(seller, OrderController.list_orders)
+    )
+    assert not await permission.has_permission(
+        _request(seller, OrderController.delete_order)
+    )
+
+
+async def test_permission_checks_any_of_user_roles(permission):
+    user = SimpleNamespace(roles=["guest", "admin"])
+    assert await permission.has_permission(
+        _request(user, OrderController.delete_order)
+    )
+
+
+async def test_permission_denies_anonymous_and_unconfigured(permission):
+    assert not await permission.has_permission(
+        _request(None, OrderController.list_orders)
+    )
+    bare = MatrixPermission()
+    assert not await bare.has_permission(
+        _request(SimpleNamespace(role="admin"), OrderController.list_orders)
+    )
@@ -0,0 +1,279 @@
+"""Tests de `query_timeout`: statement_timeout (PG), cancelación asyncio,
+`maxTimeMS` en Beanie y el mapeo a `QueryTimeoutException` (HTTP 504)."""
+
+import asyncio
+from types import SimpleNamespace
+
+import mongomock_motor
+import pytest
+from beanie import init_beanie
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from pymongo.errors import ExecutionTimeout
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from example_crud.models import Base
+from example_crud.repository import UserRepository
+from example_crud.service import UserService
+from example_crud_beanie.models import UserDocument
+from example_crud_beanie.repository import UserBeanieRepository
+from example_crud_beanie.service import UserBeanieService
+from fastapi_basekit.aio.sqlalchemy import timeout as timeout_module
+from fastapi_basekit.exceptions import register_exception_handlers
+from fastapi_basekit.exceptions.api_exceptions import QueryTimeoutException
+
+
+# ---------------------------------------------------------------------------
+# SQLAlchemy
+# ---------------------------------------------------------------------------
+
+
+@pytest.fixture
+async def session():
+    engine = create_async_engine(
+        "sqlite+aiosqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    maker = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with maker() as s:
+        yield s
+    await engine.dispose()
+
+
+class _PgSessionStub:
+    """Sesión mínima que reporta dialecto PostgreSQL y registra sentencias."""
+
+    dialect = "postgresql"
+
+    #: Lo que devuelve ``scalar()`` (``SHOW statement_timeout``…).
+    scalar_value = "30s"
+
+    def __init__(self):
+        self.statements = []
+        self.params = []
+        self.invalidated = False
+
+    def get_bind(self):
+        return SimpleNamespace(dialect=SimpleNamespace(name=self.dialect))
+
+    async def execute(self, statement, params=None):
+        self.statements.append(str(statement))
+        self.params.append(params)
+        return SimpleNamespace(scalar=lambda: self.scalar_value)
+
+    async def invalidate(self):
+        self.invalidated = True
+
+
+class _MySQLSessionStub(_PgSessionStub):
+    dialect = "mysql"
+    scalar_value = 42
+
+
+async def test_sql_list_times_out_via_asyncio(session):
+    service = UserService(repository=UserRepository(db=session))
+    service.query_timeout = 0.05
+
+    async def slow(**_):
+        await asyncio.sleep(1)
+
+    service.repository.list_paginated = slow
+    with pytest.raises(QueryTimeoutException) as exc_info:
+        await service.list()
+    assert exc_info.value.status == 504
+    assert exc_info.value.status_code == "QUERY_TIMEOUT"
+
+
+async def test_sql_per_action_timeout_overrides_service_default(session):
+    class Svc(UserService):
+        query_timeout = 30
+
+        def get_kwargs_query(self):
+            if self.action == "list":
+                return {"query_timeout": 0.05}
+            return super().get_kwargs_query()
+
+    service = Svc(repository=UserRepository(db=session))
+    service.action = "list"
+    assert service.get_query_timeout() == 0.05
+    service.action = "retrieve"
+    assert service.get_query_timeout() == 30
+
+
+async def test_sql_without_timeout_runs_untouched(session):
+    service = UserService(repository=UserRepository(db=session))
+    items, total = await service.list()
+    assert (items, total) == ([], 0)
+
+
+RESTORE = "SELECT set_config('statement_timeout', :value, true)"
+
+
+async def test_postgres_uses_set_local_and_restores_the_previous_value():
+    stub = _PgSessionStub()
+    repo = UserRepository(db=stub)
+
+    async def op():
+        return "ok"
+
+    assert await repo.run_with_timeout(op, 1.5) == "ok"
+    assert stub.statements == [
+        "SHOW statement_timeout",
+        "SET LOCAL statement_timeout = 1500",
+        RESTORE,
+    ]
+    # El valor previo (del caller o de un timeout que envuelve), no el
+    # default del servidor.
+    assert stub.params[-1] == {"value": "30s"}
+
+
+async def test_postgres_query_canceled_maps_to_timeout_exception():
+    repo = UserRepository(db=_PgSessionStub())
+    orig = Exception("canceling statement due to statement timeout")
+    orig.sqlstate = "57014"
+
+    async def op():
+        raise DBAPIError("SELECT 1", {}, orig)
+
+    with pytest.raises(QueryTimeoutException):
+        await repo.run_with_timeout(op, 1)
+
+
+async def test_postgres_other_db_errors_propagate():
+    repo = UserRepository(db=_PgSessionStub())
+
+    async def op():
+        raise DBAPIError("SELECT 1", {}, Exception("syntax error"))
+
+    with pytest.raises(DBAPIError):
+        await repo.run_with_timeout(op, 1)
+
+
+async def test_postgres_resets_the_timeout_after_any_error():
+    stub = _PgSessionStub()
+    repo = UserRepository(db=stub)
+
+    async def op():
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError):
+        await repo.run_with_timeout(op, 1)
+    assert stub.statements[-1] == RESTORE
+
+
+async def test_mysql_timeout_kills_the_query_on_the_server(monkeypatch):
+    killed = []
+
+    async def kill(session, connection_id):
+        killed.append(connection_id)
+
+    monkeypatch.setattr(timeout_module, "_kill_query", kill)
+    stub = _MySQLSessionStub()
+
+    async def slow():
+        await asyncio.sleep(1)
+
+    with pytest.raises(QueryTimeoutException):
+        await UserRepository(db=stub).run_with_timeout(slow, 0.05)
+    assert stub.statements == ["SELECT CONNECTION_ID()"]
+    assert killed == [42] and stub.invalidated
+
+
+# ---------------------------------------------------------------------------
+# Beanie
+# ---------------------------------------------------------------------------
+
+
+@pytest.fixture
+async def mongo():
+    client = mongomock_motor.AsyncMongoMockClient()
+    await init_beanie(database=client.test_db, document_models=[UserDocument])
+    yield
+    client.close()
+
+
+def test_beanie_query_kwargs_translate_timeout_to_max_time_ms():
+    class Svc(UserBeanieService):
+        query_timeout = 2
+        kwargs_query = {"fetch_links": False}
+
+    service = Svc(repository=UserBeanieRepository())
+    assert service._query_kwargs() == {
+        "fetch_links": False,
+        "max_time_ms": 2000,
+    }
+
+
+def test_beanie_max_time_kwarg_depends_on_fetch_links():
+    repo = UserBeanieRepository()
+    assert repo._get_query_kwargs(max_time_ms=5)["max_time_ms"] == 5
+    assert repo._get_query_kwargs(fetch_links=True, max_time_ms=5)[
+        "maxTimeMS"
+    ] == 5
+
+
+async def test_beanie_list_applies_max_time_ms(mongo):
+    await UserDocument(name="Ana", email="ana@x.com").insert()
+    service = UserBeanieService(repository=UserBeanieRepository())
+    service.query_timeout = 1
+    items, total = await service.list()
+    assert total == 1 and items[0].name == "Ana"
+
+
+async def test_beanie_execution_timeout_maps_to_query_timeout(mongo):
+    service = UserBeanieService(repository=UserBeanieRepository())
+    service.query_timeout = 1
+
+    async def boom(*args, **kwargs):
+        assert kwargs["max_time_ms"] == 1000
+        raise ExecutionTimeout("operation exceeded time limit", code=50)
+
+    service.repository.paginate = boom
+    with pytest.raises(QueryTimeoutException):
+        await service.list()
+
+
+# ---------------------------------------------------------------------------
+# register_exception_handlers
+# ---------------------------------------------------------------------------
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    register_exception_handlers(app)
+
+    @app.get("/mongo-timeout")
+    async def mongo_timeout():
+        raise ExecutionTimeout("operation exceeded time limit", code=50)
+
+    @app.get("/pg-timeout")
+    async def pg_timeout():
+        orig = Exception("canceling statement")
+        orig.sqlstate = "57014"
+        raise DBAPIError("SELECT 1", {}, orig)
+
+    @app.get("/pg-other")
+    async def pg_other():
+        raise DBAPIError("SELECT 1", {}, Exception("boom"))
+
+    return TestClient(app, raise_server_exceptions=False)
+
+
+@pytest.mark.parametrize("path", ["/mongo-timeout", "/pg-timeout"])
+def test_driver_timeouts_map_to_504(client, path):
+    response = client.get(path)
+    assert response.status_code == 504
+    assert response.json()["status"] == "QUERY_TIMEOUT"
+
+
+def test_other_driver_errors_stay_500(client):
+    response = client.get("/pg-other")
+    assert response.status_code == 500
+    assert response.json()["status"] == "ERROR_GENERIC"
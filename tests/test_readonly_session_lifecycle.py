@@ -0,0 +1,167 @@
+"""Tests de `make_readonly_session_lifecycle` (lifecycle de solo lectura).
+
+Cubre: commit omitido sin escrituras, commit cuando sí hubo flush, autoflush
+deshabilitado, checkout perezoso del pool y el `SET TRANSACTION READ ONLY`
+condicionado por dialecto.
+"""
+
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import event, func, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from example_crud.models import Base, User
+from fastapi_basekit.aio.sqlalchemy import make_readonly_session_lifecycle
+from fastapi_basekit.aio.sqlalchemy.session import _mark_read_only
+
+
+@pytest.fixture
+async def engine():
+    engine = create_async_engine(
+        "sqlite+aiosqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield engine
+    await engine.dispose()
+
+
+@pytest.fixture
+def factory(engine):
+    return async_sessionmaker(engine, expire_on_commit=False)
+
+
+class _SpyFactory:
+    """Envuelve el sessionmaker para contar commits de la sesión del request."""
+
+    def __init__(self, factory):
+        self.factory = factory
+        self.commits = 0
+        self.session = None
+
+    def __call__(self):
+        session = self.factory()
+        original = session.commit
+
+        async def commit():
+            self.commits += 1
+            await original()
+
+        session.commit = commit
+        self.session = session
+        return session
+
+
+async def _drive(get_db, body=None):
+    gen = get_db()
+    session = await gen.__anext__()
+    if body is not None:
+        await body(session)
+    with pytest.raises(StopAsyncIteration):
+        await gen.__anext__()
+    return session
+
+
+async def test_read_only_request_skips_commit(factory):
+    spy = _SpyFactory(factory)
+    get_db = make_readonly_session_lifecycle(spy)
+
+    async def body(session):
+        await session.execute(select(func.count()).select_from(User))
+
+    await _drive(get_db, body)
+    assert spy.commits == 0
+
+
+async def test_flushed_write_is_still_committed(factory):
+    spy = _SpyFactory(factory)
+    get_db = make_readonly_session_lifecycle(spy)
+
+    async def body(session):
+        session.add(User(name="Ana", email="ana@x.com"))
+        await session.flush()
+        # Tras el flush `new` queda vacío, pero la fila no está commiteada.
+        assert not session.new
+
+    await _drive(get_db, body)
+    assert spy.commits == 1
+    async with factory() as other:
+        total = (
+            await other.execute(select(func.count()).select_from(User))
+        ).scalar_one()
+    assert total == 1
+
+
+async def test_autoflush_disabled(factory):
+    get_db = make_readonly_session_lifecycle(factory)
+    seen = {}
+
+    async def body(session):
+        seen["autoflush"] = session.sync_session.autoflush
+
+    await _drive(get_db, body)
+    assert seen["autoflush"] is False
+
+
+async def test_unused_session_never_checks_out_a_connection(engine, factory):
+    checkouts = []
+    event.listen(
+        engine.sync_engine, "checkout", lambda *a: checkouts.append(1)
+    )
+    get_db = make_readonly_session_lifecycle(factory)
+
+    await _drive(get_db)
+    assert checkouts == []
+
+
+async def test_error_rolls_back_and_calls_hook(factory):
+    errors = []
+
+    async def on_error(exc, session):
+        errors.append(exc)
+
+    get_db = make_readonly_session_lifecycle(factory, on_error=on_error)
+    gen = get_db()
+    await gen.__anext__()
+    boom = RuntimeError("boom")
+    with pytest.raises(RuntimeError):
+        await gen.athrow(boom)
+    assert errors == [boom]
+
+
+async def test_listeners_removed_after_request(factory):
+    get_db = make_readonly_session_lifecycle(factory)
+    session = await _drive(get_db)
+    assert not event.contains(
+        session.sync_session, "after_begin", _mark_read_only
+    )
+
+
+@pytest.mark.parametrize(
+    "dialect,expected",
+    [("postgresql", ["SET TRANSACTION READ ONLY"]), ("sqlite", [])],
+)
+def test_read_only_statement_depends_on_dialect(dialect, expected):
+    executed = []
+    connection = SimpleNamespace(
+        dialect=SimpleNamespace(name=dialect),
+        exec_driver_sql=executed.append,
+    )
+    transaction = SimpleNamespace(nested=False, parent=None)
+    _mark_read_only(None, transaction, connection)
+    assert executed == expected
+
+
+def test_read_only_statement_skipped_for_savepoints():
+    executed = []
+    connection = SimpleNamespace(
+        dialect=SimpleNamespace(name="postgresql"),
+        exec_driver_sql=executed.append,
+    )
+    transaction = SimpleNamespace(nested=True, parent=object())
+    _mark_read_only(None, transaction, connection)
+    assert executed == []
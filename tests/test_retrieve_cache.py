@@ -0,0 +1,318 @@
+"""Tests del cache de `retrieve` (`cache_ttl`).
+
+Cubre los backends (LRU en proceso y el fake async), hits sin tocar la base,
+claves por joins, invalidación en create/update/delete (incluida la
+post-commit en SQL), caching negativo de 404 y el camino HTTP del controller.
+"""
+
+import asyncio
+import json
+
+import mongomock_motor
+import pytest
+from beanie import init_beanie
+from fastapi import FastAPI, Request
+from httpx import ASGITransport
+from httpx import AsyncClient as HTTPXAsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from example_crud.models import Base
+from example_crud.repository import UserRepository
+from example_crud.service import UserService
+from example_crud_beanie.models import UserDocument
+from example_crud_beanie.repository import UserBeanieRepository
+from example_crud_beanie.service import UserBeanieService
+from fastapi_basekit.aio.cache import InMemoryCacheBackend, LRUCacheBackend
+from fastapi_basekit.exceptions import register_exception_handlers
+from fastapi_basekit.exceptions.api_exceptions import NotFoundException
+
+
+def _render(obj) -> bytes:
+    return json.dumps({"id": str(obj.id), "name": obj.name}).encode()
+
+
+class _CountingRepository(UserRepository):
+    """Cuenta las lecturas por id que llegan a la base."""
+
+    loads = 0
+
+    async def get_with_joins(self, record_id, joins=None):
+        type(self).loads += 1
+        return await super().get_with_joins(record_id, joins=joins)
+
+
+# ---------------------------------------------------------------------------
+# Backends
+# ---------------------------------------------------------------------------
+
+
+async def test_lru_evicts_least_recently_used():
+    backend = LRUCacheBackend(maxsize=2)
+    await backend.set("a", 1)
+    await backend.set("b", 2)
+    assert await backend.get("a") == 1  # "a" pasa a ser el más reciente
+    await backend.set("c", 3)
+    assert await backend.get("b") is None
+    assert await backend.get("a") == 1 and await backend.get("c") == 3
+    assert len(backend) == 2
+
+
+@pytest.mark.parametrize("backend_cls", [LRUCacheBackend, InMemoryCacheBackend])
+async def test_backends_expire_entries(backend_cls):
+    backend = backend_cls()
+    await backend.set("k", "v", ttl=0.01)
+    assert await backend.get("k") == "v"
+    await asyncio.sleep(0.02)
+    assert await backend.get("k") is None
+
+
+# ---------------------------------------------------------------------------
+# SQLAlchemy
+# ---------------------------------------------------------------------------
+
+
+@pytest.fixture
+async def session():
+    engine = create_async_engine(
+        "sqlite+aiosqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    maker = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with maker() as s:
+        yield s
+    await engine.dispose()
+
+
+@pytest.fixture
+def backend():
+    return InMemoryCacheBackend()
+
+
+@pytest.fixture
+def service(session, backend):
+    _CountingRepository.loads = 0
+
+    class CachedUserService(UserService):
+        cache_ttl = 60
+        cache_backend = backend
+
+    return CachedUserService(repository=_CountingRepository(db=session))
+
+
+async def test_hit_skips_database(service):
+    user = await service.create({"name": "Ana", "email": "ana@x.com"})
+    first = await service.retrieve_cached(str(user.id), render=_render)
+    second = await service.retrieve_cached(str(user.id), render=_render)
+    assert first == second
+    assert json.loads(first)["name"] == "Ana"
+    assert _CountingRepository.loads == 1
+
+
+async def test_joins_and_variant_are_part_of_the_key(service):
+    user = await service.create({"name": "Ana", "email": "ana@x.com"})
+    await service.retrieve_cached(str(user.id), render=_render)
+    await service.retrieve_cached(str(user.id), render=_render, joins=[])
+    await service.retrieve_cached(str(user.id), render=_render, variant="v2")
+    assert _CountingRepository.loads == 2  # joins=None y [] coinciden
+
+
+async def test_update_invalidates(service):
+    user = await service.create({"name": "Ana", "email": "ana@x.com"})
+    await service.retrieve_cached(str(user.id), render=_render)
+    await service.update(str(user.id), {"name": "Ana María"})
+    body = await service.retrieve_cached(str(user.id), render=_render)
+    assert json.loads(body)["name"] == "Ana María"
+
+
+async def test_delete_invalidates_and_404_is_cached(service):
+    user = await service.create({"name": "Ana", "email": "ana@x.com"})
+    await service.retrieve_cached(str(user.id), render=_render)
+    await service.delete(str(user.id))
+    for _ in range(2):
+        with pytest.raises(NotFoundException):
+            await service.retrieve_cached(str(user.id), render=_render)
+    assert _CountingRepository.loads == 2  # el segundo 404 viene del cache
+
+
+async def test_create_clears_negative_entry(service):
+    with pytest.raises(NotFoundException):
+        await service.retrieve_cached("7", render=_render)
+    await service.create({"id": 7, "name": "Siete", "email": "7@x.com"})
+    body = await service.retrieve_cached("7", render=_render)
+    assert json.loads(body)["name"] == "Siete"
+
+
+async def test_negative_ttl_zero_disables_404_caching(service):
+    service.cache_negative_ttl = 0
+    for _ in range(2):
+        with pytest.raises(NotFoundException):
+            await service.retrieve_cached("404", render=_render)
+    assert _CountingRepository.loads == 2
+
+
+async def test_commit_invalidates_again(service, session):
+    user = await service.create({"name": "Ana", "email": "ana@x.com"})
+    await session.commit()
+    await service.update(str(user.id), {"name": "Nuevo"})
+    # Un lector concurrente repuebla el cache antes del commit.
+    cache = service.get_retrieve_cache()
+    await cache.backend.set(cache.key(user.id), {"stale": b"{}"}, 60)
+    await session.commit()
+    await asyncio.sleep(0.01)
+    assert await cache.backend.get(cache.key(user.id)) is None
+
+
+async def test_without_cache_ttl_renders_fresh(session):
+    _CountingRepository.loads = 0
+    service = UserService(repository=_CountingRepository(db=session))
+    user = await service.create({"name": "Ana", "email": "ana@x.com"})
+    await service.retrieve_cached(str(user.id), render=_render)
+    await service.retrieve_cached(str(user.id), render=_render)
+    assert service.get_retrieve_cache() is None
+    assert _CountingRepository.loads == 2
+
+
+class _OwnerScopedService(UserService):
+    """`retrieve` scopeado por dueño (aquí, el `name` del llamador)."""
+
+    cache_ttl = 60
+    owner = None
+
+    def get_filters(self, filters=None):
+        return {**(filters or {}), "name": self.owner}
+
+    async def retrieve(self, id, joins=None):
+        obj = await super().retrieve(id, joins=joins)
+        if obj.name != self.owner:
+            raise NotFoundException(f"id={id} no encontrado")
+        return obj
+
+    def get_cache_scope(self):
+        return self.get_filters({})
+
+
+async def test_scopes_do_not_share_bytes_nor_404(session, backend):
+    _CountingRepository.loads = 0
+    service = _OwnerScopedService(repository=_CountingRepository(db=session))
+    service.cache_backend = backend
+    user = await service.create({"name": "Ana", "email": "ana@x.com"})
+    id = str(user.id)
+
+    service.owner = "Otro"
+    for _ in range(2):
+        with pytest.raises(NotFoundException):
+            await service.retrieve_cached(id, render=_render)
+    # El 404 cacheado de "Otro" no oculta la fila a su dueña.
+    service.owner = "Ana"
+    for _ in range(2):
+        body = await service.retrieve_cached(id, render=_render)
+        assert json.loads(body)["name"] == "Ana"
+    service.owner = "Otro"
+    with pytest.raises(NotFoundException):
+        await service.retrieve_cached(id, render=_render)
+    assert _CountingRepository.loads == 2  # un load por scope
+
+
+async def test_scoped_retrieve_without_hook_is_not_cached(session, backend):
+    class Unscoped(_OwnerScopedService):
+        get_cache_scope = UserService.get_cache_scope
+
+    _CountingRepository.loads = 0
+    service = Unscoped(repository=_CountingRepository(db=session))
+    service.cache_backend = backend
+    service.owner = "Ana"
+    user = await service.create({"name": "Ana", "email": "ana@x.com"})
+    await service.retrieve_cached(str(user.id), render=_render)
+    await service.retrieve_cached(str(user.id), render=_render)
+    assert _CountingRepository.loads == 2
+    assert backend.sets == 0
+
+
+async def test_controller_serves_cached_json(session, backend):
+    from example_crud import controller as example_controller
+
+    _CountingRepository.loads = 0
+
+    class CachedUserService(UserService):
+        cache_ttl = 60
+        cache_backend = backend
+
+    def get_user_service(request: Request):
+        return CachedUserService(
+            repository=_CountingRepository(db=session), request=request
+        )
+
+    app = FastAPI()
+    register_exception_handlers(app)
+    app.dependency_overrides[example_controller.get_user_service] = (
+        get_user_service
+    )
+    app.include_router(example_controller.router)
+    await UserRepository(db=session).create(
+        {"name": "Ana", "email": "ana@x.com"}
+    )
+    await session.commit()
+
+    async with HTTPXAsyncClient(
+        transport=ASGITransport(app=app), base_url="http://test"
+    ) as client:
+        first = await client.get("/users/1")
+        second = await client.get("/users/1")
+        missing = await client.get("/users/99")
+
+    assert first.status_code == second.status_code == 200
+    assert first.headers["content-type"] == "application/json"
+    assert first.content == second.content
+    assert first.json()["data"]["email"] == "ana@x.com"
+    assert missing.status_code == 404
+    assert _CountingRepository.loads == 2
+
+
+# ---------------------------------------------------------------------------
+# Beanie
+# ---------------------------------------------------------------------------
+
+
+@pytest.fixture
+async def beanie_service(backend):
+    client = mongomock_motor.AsyncMongoMockClient()
+    await init_beanie(database=client.test_db, document_models=[UserDocument])
+
+    class CachedUserService(UserBeanieService):
+        cache_ttl = 60
+        cache_backend = backend
+
+    yield CachedUserService(repository=UserBeanieRepository())
+    client.close()
+
+
+async def test_beanie_hit_and_update_invalidation(beanie_service, backend):
+    doc = await beanie_service.create({"name": "Ana", "email": "ana@x.com"})
+    id = str(doc.id)
+    await beanie_service.retrieve_cached(id, render=_render)
+    gets_before = backend.gets
+    body = await beanie_service.retrieve_cached(id, render=_render)
+    assert json.loads(body)["name"] == "Ana"
+    assert backend.gets == gets_before + 1 and backend.sets == 1
+
+    await beanie_service.update(id, {"name": "Otra"})
+    body = await beanie_service.retrieve_cached(id, render=_render)
+    assert json.loads(body)["name"] == "Otra"
+
+
+async def test_beanie_delete_caches_404(beanie_service, backend):
+    doc = await beanie_service.create({"name": "Ana", "email": "ana@x.com"})
+    id = str(doc.id)
+    await beanie_service.retrieve_cached(id, render=_render)
+    await beanie_service.delete(id)
+    with pytest.raises(NotFoundException):
+        await beanie_service.retrieve_cached(id, render=_render)
+    sets = backend.sets
+    with pytest.raises(NotFoundException):
+        await beanie_service.retrieve_cached(id, render=_render)
+    assert backend.sets == sets
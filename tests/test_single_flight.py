@@ -0,0 +1,237 @@
+"""Tests del single-flight de lecturas (`coalesce_reads`).
+
+Cubre la primitiva (`single_flight`: espera compartida, cancelación por
+seguidor, tope de espera, cancelación del líder y propagación de errores) y su
+uso en los servicios SQLAlchemy y Beanie (una sola consulta, resultado adoptado
+en la sesión/copia propia, scope distinto = consulta distinta).
+"""
+
+import asyncio
+
+import mongomock_motor
+import pytest
+from beanie import init_beanie
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from example_crud.models import Base
+from example_crud.repository import UserRepository
+from example_crud.service import UserService
+from example_crud_beanie.models import UserDocument
+from example_crud_beanie.repository import UserBeanieRepository
+from example_crud_beanie.service import UserBeanieService
+from fastapi_basekit.aio.cache.singleflight import single_flight
+
+
+class _SlowLoad:
+    def __init__(self, result="row", delay=0.05):
+        self.calls = 0
+        self.result = result
+        self.delay = delay
+
+    async def __call__(self):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if isinstance(self.result, Exception):
+            raise self.result
+        return self.result
+
+
+# ---------------------------------------------------------------------------
+# single_flight
+# ---------------------------------------------------------------------------
+
+
+async def test_concurrent_callers_share_one_load():
+    load = _SlowLoad()
+    results = await asyncio.gather(
+        *(single_flight("k-share", load) for _ in range(10))
+    )
+    assert load.calls == 1
+    assert [r for r, _ in results] == ["row"] * 10
+    assert sum(shared for _, shared in results) == 9
+
+
+async def test_cancelled_follower_does_not_cancel_shared_load():
+    load = _SlowLoad()
+    leader = asyncio.ensure_future(single_flight("k-cancel", load))
+    await asyncio.sleep(0)
+    follower = asyncio.ensure_future(single_flight("k-cancel", load))
+    await asyncio.sleep(0.01)
+    follower.cancel()
+    assert await leader == ("row", False)
+    with pytest.raises(asyncio.CancelledError):
+        await follower
+
+
+async def test_follower_runs_own_load_after_max_wait():
+    load = _SlowLoad(delay=0.1)
+    leader = asyncio.ensure_future(single_flight("k-wait", load))
+    await asyncio.sleep(0)
+    result = await single_flight("k-wait", load, max_wait=0.01)
+    assert result == ("row", False)
+    assert load.calls == 2
+    await leader
+
+
+async def test_leader_cancellation_makes_followers_fall_back():
+    load = _SlowLoad()
+    leader = asyncio.ensure_future(single_flight("k-leader", load))
+    await asyncio.sleep(0)
+    follower = asyncio.ensure_future(single_flight("k-leader", load))
+    await asyncio.sleep(0.01)
+    leader.cancel()
+    assert await follower == ("row", False)
+    assert load.calls == 2
+
+
+async def test_leader_error_propagates_to_followers():
+    load = _SlowLoad(result=RuntimeError("db down"))
+    results = await asyncio.gather(
+        *(single_flight("k-error", load) for _ in range(3)),
+        return_exceptions=True,
+    )
+    assert all(isinstance(r, RuntimeError) for r in results)
+    assert load.calls == 1
+
+
+# ---------------------------------------------------------------------------
+# Servicio SQLAlchemy
+# ---------------------------------------------------------------------------
+
+
+class _SlowRepository(UserRepository):
+    calls = 0
+
+    async def get_with_joins(self, record_id, joins=None):
+        type(self).calls += 1
+        await asyncio.sleep(0.05)
+        return await super().get_with_joins(record_id, joins=joins)
+
+    async def list_paginated(self, **kwargs):
+        type(self).calls += 1
+        await asyncio.sleep(0.05)
+        return await super().list_paginated(**kwargs)
+
+
+class CoalescedUserService(UserService):
+    coalesce_reads = True
+
+
+@pytest.fixture
+async def maker():
+    engine = create_async_engine(
+        "sqlite+aiosqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    maker = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with maker() as s:
+        await UserRepository(db=s).create({"name": "Ana", "email": "a@x.com"})
+        await s.commit()
+    _SlowRepository.calls = 0
+    yield maker
+    await engine.dispose()
+
+
+async def test_sql_retrieve_is_coalesced_and_adopted(maker):
+    async with maker() as s1, maker() as s2:
+        a = CoalescedUserService(repository=_SlowRepository(db=s1))
+        b = CoalescedUserService(repository=_SlowRepository(db=s2))
+        obj_a, obj_b = await asyncio.gather(a.retrieve("1"), b.retrieve("1"))
+        assert _SlowRepository.calls == 1
+        assert obj_a is not obj_b
+        assert obj_a in s1 and obj_b in s2
+        assert obj_b.name == "Ana"
+
+
+async def test_sql_list_with_different_scope_is_not_coalesced(maker):
+    class Scoped(CoalescedUserService):
+        tenant = None
+
+        def get_filters(self, filters=None):
+            return {**(filters or {}), "name": self.tenant}
+
+    async with maker() as s1, maker() as s2:
+        a = Scoped(repository=_SlowRepository(db=s1))
+        a.tenant = "Ana"
+        b = Scoped(repository=_SlowRepository(db=s2))
+        b.tenant = "Otro"
+        (items_a, total_a), (items_b, total_b) = await asyncio.gather(
+            a.list(), b.list()
+        )
+    assert _SlowRepository.calls == 2
+    assert (total_a, total_b) == (1, 0)
+
+
+async def test_sql_identical_lists_share_one_query(maker):
+    async with maker() as s1, maker() as s2:
+        a = CoalescedUserService(repository=_SlowRepository(db=s1))
+        b = CoalescedUserService(repository=_SlowRepository(db=s2))
+        (items_a, _), (items_b, total_b) = await asyncio.gather(
+            a.list(), b.list()
+        )
+        assert _SlowRepository.calls == 1
+        assert total_b == 1 and items_b[0] in s2
+
+
+async def test_sql_followers_adopt_a_snapshot_not_live_instances(maker):
+    class Mutating(CoalescedUserService):
+        async def post_process_list(self, items):
+            for item in items:
+                item.name = "mutado"  # instancia dirty en la sesión líder
+            await asyncio.sleep(0)
+            return items
+
+    async with maker() as s1, maker() as s2:
+        a = Mutating(repository=_SlowRepository(db=s1))
+        b = CoalescedUserService(repository=_SlowRepository(db=s2))
+        (items_a, _), (items_b, _) = await asyncio.gather(a.list(), b.list())
+        assert _SlowRepository.calls == 1
+        assert items_a[0].name == "mutado"
+        assert items_b[0].name == "Ana" and items_b[0] in s2
+        assert items_b[0] not in s2.dirty
+
+
+async def test_sql_disabled_by_default(maker):
+    async with maker() as s1, maker() as s2:
+        a = UserService(repository=_SlowRepository(db=s1))
+        b = UserService(repository=_SlowRepository(db=s2))
+        await asyncio.gather(a.retrieve("1"), b.retrieve("1"))
+    assert _SlowRepository.calls == 2
+
+
+# ---------------------------------------------------------------------------
+# Servicio Beanie
+# ---------------------------------------------------------------------------
+
+
+class _SlowBeanieRepository(UserBeanieRepository):
+    calls = 0
+
+    async def get_by_id(self, id, **kwargs):
+        type(self).calls += 1
+        await asyncio.sleep(0.05)
+        return await super().get_by_id(id, **kwargs)
+
+
+async def test_beanie_retrieve_is_coalesced_with_copies():
+    client = mongomock_motor.AsyncMongoMockClient()
+    await init_beanie(database=client.test_db, document_models=[UserDocument])
+    doc = await UserDocument(name="Ana", email="a@x.com").insert()
+    _SlowBeanieRepository.calls = 0
+
+    class Coalesced(UserBeanieService):
+        coalesce_reads = True
+
+    services = [
+        Coalesced(repository=_SlowBeanieRepository()) for _ in range(3)
+    ]
+    docs = await asyncio.gather(*(s.retrieve(str(doc.id)) for s in services))
+    assert _SlowBeanieRepository.calls == 1
+    assert len({id(d) for d in docs}) == 3
+    assert {d.name for d in docs} == {"Ana"}
+    client.close()
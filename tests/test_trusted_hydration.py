@@ -0,0 +1,212 @@
+"""Tests de la hidratación confiable (`hydrator_for` / `trusted_reads`).
+
+Cubre los arreglos de tipo livianos (ObjectId, datetime, Enum, Link,
+modelos anidados), la validación completa de 1 de cada N filas, el repo
+Beanie (`paginate` y `paginate_pipeline` con `trusted_reads`) y el
+`BaseController` sobre filas SQLModel.
+"""
+
+import logging
+from datetime import datetime
+from enum import Enum
+from typing import List, Optional
+
+import mongomock_motor
+import pytest
+from beanie import Document, Link, PydanticObjectId, init_beanie
+from beanie.odm.queries.aggregation import AggregationQuery
+from bson import DBRef, ObjectId
+from pydantic import BaseModel, Field
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import StaticPool
+from sqlmodel import SQLModel
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from fastapi_basekit.aio.beanie.repository.base import BaseRepository
+from fastapi_basekit.aio.controller.base import BaseController
+from fastapi_basekit.aio.hydration import hydrator_for
+
+from example_crud_sqlmodel.models import User
+from example_crud_sqlmodel.repository import UserSQLModelRepository
+from example_crud_sqlmodel.schemas import UserSchema
+
+
+class Kind(str, Enum):
+    cat = "cat"
+    dog = "dog"
+
+
+class Vet(Document):
+    name: str
+
+    class Settings:
+        name = "trusted_vets"
+
+
+class Tag(BaseModel):
+    label: str
+
+
+class Animal(Document):
+    name: str
+    kind: Kind = Kind.cat
+    age: int = Field(0, ge=0)
+    born_at: Optional[datetime] = None
+    vet: Optional[Link[Vet]] = None
+    tags: List[Tag] = Field(default_factory=list)
+
+    class Settings:
+        name = "trusted_animals"
+
+
+class AnimalRepo(BaseRepository):
+    model = Animal
+    trusted_reads = True
+    trusted_sample_rate = 0
+
+
+@pytest.fixture
+async def db(monkeypatch):
+    # El cursor de agregación de mongomock-motor no es awaitable.
+    async def get_cursor(self):
+        return self.document_model.get_pymongo_collection().aggregate(
+            self.get_aggregation_pipeline()
+        )
+
+    monkeypatch.setattr(AggregationQuery, "get_cursor", get_cursor)
+    client = mongomock_motor.AsyncMongoMockClient()
+    await init_beanie(database=client.test_db, document_models=[Vet, Animal])
+    yield client.test_db
+    client.close()
+
+
+def test_construct_applies_type_fixes():
+    vet_id = ObjectId()
+    row = {
+        "_id": str(ObjectId()),
+        "name": "rex",
+        "kind": "dog",
+        "born_at": "2026-01-02T03:04:05",
+        "vet": DBRef("trusted_vets", vet_id),
+        "tags": [{"label": "a"}],
+    }
+    animal = hydrator_for(Animal).construct(row)
+    assert isinstance(animal.id, PydanticObjectId)
+    assert animal.kind is Kind.dog
+    assert animal.born_at == datetime(2026, 1, 2, 3, 4, 5)
+    assert isinstance(animal.vet, Link) and animal.vet.ref.id == vet_id
+    assert animal.tags == [Tag(label="a")]
+    assert animal.age == 0  # default del modelo
+    assert hydrator_for(Animal) is hydrator_for(Animal)
+
+
+def test_missing_required_field_falls_back_to_validation():
+    with pytest.raises(ValueError):
+        hydrator_for(Animal).construct({"_id": ObjectId()})
+
+
+def test_one_in_n_rows_is_fully_validated():
+    class Row(BaseModel):
+        n: int = Field(ge=0)
+
+    hydrator = hydrator_for(Row)
+    rows = [{"n": -1}] * 4
+    # La fila 0 es la muestra: se valida y su error se propaga.
+    with pytest.raises(ValueError):
+        hydrator.hydrate(rows[0], sample_every=3)
+    assert [hydrator.hydrate(r, sample_every=3).n for r in rows[1:3]] == [
+        -1,
+        -1,
+    ]
+    with pytest.raises(ValueError):
+        hydrator.hydrate(rows[3], sample_every=3)
+
+
+async def test_paginate_with_trusted_reads(db, monkeypatch):
+    vet = await Vet(name="v").insert()
+    for i in range(3):
+        await Animal(name=f"a{i}", age=i, vet=vet).insert()
+
+    def no_validate(*args, **kwargs):
+        raise AssertionError("trusted_reads no debe validar cada fila")
+
+    repo = AnimalRepo()
+    monkeypatch.setattr(Animal, "model_validate", no_validate)
+    items, total = await repo.paginate(
+        Animal.find(), page=1, count=2, order_by=[("age", 1)]
+    )
+    assert total == 3
+    assert [a.name for a in items] == ["a0", "a1"]
+    assert isinstance(items[0], Animal) and items[0].vet.ref.id == vet.id
+
+
+async def test_pipeline_sample_drops_corrupt_rows(db, caplog):
+    class SampledRepo(AnimalRepo):
+        trusted_sample_rate = 1
+
+    await Animal(name="ok", age=1).insert()
+    await Animal.get_pymongo_collection().insert_one(
+        {"name": "bad", "age": -5, "kind": "dog"}
+    )
+    with caplog.at_level(logging.WARNING):
+        items, total = await SampledRepo().paginate_pipeline(
+            [{"$sort": {"name": -1}}], page=1, count=10
+        )
+    assert total == 2 and [a.name for a in items] == ["ok"]
+    assert "fila descartada" in caplog.text
+
+
+@pytest.fixture
+async def sqlmodel_users():
+    engine = create_async_engine(
+        "sqlite+aiosqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        repo = UserSQLModelRepository(db=session)
+        for i in range(3):
+            await repo.create(
+                {"name": f"u{i}", "email": f"u{i}@x.com", "age": 20 + i}
+            )
+        result = await session.exec(User.__table__.select())
+        ids = [row.id for row in result]
+        yield [await session.get(User, i) for i in ids]
+    await engine.dispose()
+
+
+class _TrustedController(BaseController):
+    schema_class = UserSchema
+    trusted_reads = True
+    trusted_sample_rate = 0
+
+
+async def test_controller_hydrates_sqlmodel_rows(sqlmodel_users, monkeypatch):
+    def no_validate(*args, **kwargs):
+        raise AssertionError("trusted_reads no debe validar cada fila")
+
+    monkeypatch.setattr(UserSchema, "model_validate", no_validate)
+    items = _TrustedController()._hydrate_items(sqlmodel_users)
+    assert all(isinstance(u, UserSchema) for u in items)
+    assert [u.email for u in items] == ["u0@x.com", "u1@x.com", "u2@x.com"]
+    monkeypatch.undo()
+
+    response = _TrustedController().format_response(
+        items, pagination={"page": 1, "count": 3, "total": 3}
+    )
+    assert response.data == items
+
+
+def test_controller_falls_back_when_the_sample_fails(caplog):
+    class Sampled(_TrustedController):
+        trusted_sample_rate = 1
+
+    class Row:
+        id = "nope"
+
+    rows = [Row()]
+    with caplog.at_level(logging.WARNING):
+        assert Sampled()._hydrate_items(rows) is rows
+    assert "se valida el listado completo" in caplog.text